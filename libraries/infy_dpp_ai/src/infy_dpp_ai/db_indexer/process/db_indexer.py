@@ -5,12 +5,14 @@
 # ===============================================================================================================#
 
 import time
+import json
 import concurrent.futures
 import infy_dpp_sdk
 import infy_gen_ai_sdk
 from infy_dpp_sdk.data import DocumentData, ProcessorResponseData
 from infy_dpp_ai.db_indexer.process.sparse_indexer import SparseIndexer
 from infy_dpp_ai.db_indexer.process.vector_indexer import VectorIndexer
+from infy_dpp_ai.reader.service.provider.tokenizer_service import TokenizerService
 
 
 PROCESSEOR_CONTEXT_DATA_NAME = "db_indexer"
@@ -47,6 +49,7 @@ class DbIndexer(infy_dpp_sdk.interface.IProcessor):
         vector_index_obj, sparse_index_obj = None, None
         get_llm, model_name = None, None
         index_id = ''
+        token_count_encoding = None
 
         for key, value in __processor_config_data.items():
             if key == 'index' and value.get('enabled'):
@@ -59,6 +62,9 @@ class DbIndexer(infy_dpp_sdk.interface.IProcessor):
                     index_id = f"{index_name}{group_request_id}" if group_request_id else ''
                 else:
                     index_id = value.get('index_id')
+            if key == 'token_count' and value.get('enabled'):
+                token_count_encoding = value.get(
+                    'encoding_name', TokenizerService.ENCODING_CL100K_BASE)
             if key == 'embedding':
                 for e_key, e_val in value.items():
                     if e_val.get('enabled'):
@@ -96,6 +102,10 @@ class DbIndexer(infy_dpp_sdk.interface.IProcessor):
                                     sparse_storage, sparse_storage_config, chunk_data, document_id, index_id, self.__file_sys_handler, self.__logger, self.__app_config)
                                 break
 
+        # Token counts are stored with chunk metadata, for reader to fit chunks in LLM context
+        if token_count_encoding and chunk_data:
+            self.__add_token_counts(chunk_data, token_count_encoding)
+
         # Parallel index creation
         start = time.time()
         self.__logger.debug("Index creation started: %s", start)
@@ -158,3 +168,23 @@ class DbIndexer(infy_dpp_sdk.interface.IProcessor):
 
     def do_execute_batch(self, document_data: DocumentData, context_data: dict, config_data: dict):
         return self._do_execute_batch_serial(document_data, context_data, config_data)
+
+    # ---------- Private Methods ---------
+    def __add_token_counts(self, chunk_data: dict, encoding_name: str):
+        tokenizer_service = TokenizerService()
+        for _key, chunked_method in chunk_data.items():
+            metadata_file_path_list = chunked_method.get(
+                'chunked_file_meta_data_list', [])
+            for text_file_path in chunked_method.get('chunked_data_list', []):
+                metadata_file_path = f'{text_file_path}_metadata.json'
+                if metadata_file_path not in metadata_file_path_list:
+                    continue
+                metadata = json.loads(
+                    self.__file_sys_handler.read_file(metadata_file_path))
+                if metadata.get('token_encoding') == encoding_name:
+                    continue
+                metadata['token_count'] = tokenizer_service.count_tokens(
+                    self.__file_sys_handler.read_file(text_file_path), encoding_name)
+                metadata['token_encoding'] = encoding_name
+                self.__file_sys_handler.write_file(
+                    metadata_file_path, json.dumps(metadata, indent=4))
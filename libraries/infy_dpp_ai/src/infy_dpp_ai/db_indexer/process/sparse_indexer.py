@@ -62,6 +62,8 @@ class SparseIndexer:
                     sparse_db_provider = infy_gen_ai_sdk.sparsedb.provider.bm25s.Bm25sSparseDbProvider(
                         sparse_db_provider_config_data)
 
+                    # Records are saved in one go after all chunks are read
+                    db_record_data_list = []
                     for _key, chunked_method in self.chunk_data.items():
                         for text_file_path in chunked_method.get('chunked_data_list'):
                             if f'{text_file_path}_metadata.json' in chunked_method.get('chunked_file_meta_data_list'):
@@ -82,7 +84,7 @@ class SparseIndexer:
                                         }
                                         db_record_data = infy_gen_ai_sdk.sparsedb.provider.bm25s.SparseDbRecordConfigData(
                                             **db_record_data_dict)
-                                        sparse_db_provider.save_record(
+                                        db_record_data_list.append(
                                             db_record_data)
                                 elif chunk_type is None or chunk_type == '':
                                     # Add record(s) to sparse db
@@ -92,8 +94,9 @@ class SparseIndexer:
                                     }
                                     db_record_data = infy_gen_ai_sdk.sparsedb.provider.bm25s.SparseDbRecordConfigData(
                                         **db_record_data_dict)
-                                    sparse_db_provider.save_record(
+                                    db_record_data_list.append(
                                         db_record_data)
+                    sparse_db_provider.save_records(db_record_data_list)
 
                     encoded_path_list.append(server_faiss_write_path)
             elif not self.sparse_collections:
@@ -106,6 +109,7 @@ class SparseIndexer:
                 sparse_db_provider = infy_gen_ai_sdk.sparsedb.provider.bm25s.Bm25sSparseDbProvider(
                     sparse_db_provider_config_data)
 
+                db_record_data_list = []
                 for _key, chunked_method in self.chunk_data.items():
                     for text_file_path in chunked_method.get('chunked_data_list'):
                         if f'{text_file_path}_metadata.json' in chunked_method.get('chunked_file_meta_data_list'):
@@ -123,8 +127,8 @@ class SparseIndexer:
                             }
                             db_record_data = infy_gen_ai_sdk.sparsedb.provider.bm25s.SparseDbRecordConfigData(
                                 **db_record_data_dict)
-                            sparse_db_provider.save_record(
-                                db_record_data)
+                            db_record_data_list.append(db_record_data)
+                sparse_db_provider.save_records(db_record_data_list)
 
                 encoded_path_list.append(server_faiss_write_path)
         elif self.sparse_storage == 'infy_db_service':
@@ -59,6 +59,13 @@ class VectorIndexer:
                 **embedding_provider_config_data_dict)
             embedding_provider = infy_gen_ai_sdk.embedding.provider.CustomEmbeddingProvider(
                 embedding_provider_config_data)
+        # Same chunks are embedded again for each collection, so reuse embeddings when cache is enabled
+        embedding_cache_config_dict = embedding_provider_config_data_dict.get(
+            'embedding_cache') or {}
+        if embedding_cache_config_dict.get('enabled'):
+            embedding_provider = infy_gen_ai_sdk.embedding.provider.CachedEmbeddingProvider(
+                embedding_provider, infy_gen_ai_sdk.embedding.provider.CachedEmbeddingProviderConfigData(
+                    **{'model_name': f'{self.get_llm}-{self.model_name}', **embedding_cache_config_dict}))
 
         # Set write path for faiss
         if self.vector_db_name:
@@ -76,7 +83,9 @@ class VectorIndexer:
                     vector_db_provider_config_data_dict = {
                         'db_folder_path': server_faiss_write_path,
                         'db_index_name': collection.get('collection_name', self.vector_db_name) or self.document_id,
-                        'db_index_secret_key': collection.get('collection_secret_key', '')
+                        'db_index_secret_key': collection.get('collection_secret_key', ''),
+                        'index_type': self.vector_storage_config.get('index_type', 'flat'),
+                        'index_params': self.vector_storage_config.get('index_params')
                     }
                     vector_db_provider_config_data = infy_gen_ai_sdk.vectordb.provider.faiss.VectorDbProviderConfigData(
                         **vector_db_provider_config_data_dict)
@@ -95,6 +104,8 @@ class VectorIndexer:
                     vector_db_provider = infy_gen_ai_sdk.vectordb.provider.online.OnlineVectorDbProvider(
                         vector_db_provider_config_data)
 
+                # Records are saved in one go after all chunks are read
+                db_record_data_list = []
                 for _key, chunked_method in self.chunk_data.items():
                     for text_file_path in chunked_method.get('chunked_data_list'):
                         if f'{text_file_path}_metadata.json' in chunked_method.get('chunked_file_meta_data_list'):
@@ -116,7 +127,7 @@ class VectorIndexer:
                                         }
                                         db_record_data = infy_gen_ai_sdk.vectordb.provider.faiss.InsertVectorDbRecordData(
                                             **db_record_data_dict)
-                                        vector_db_provider.save_record(
+                                        db_record_data_list.append(
                                             db_record_data)
                                     elif self.vector_storage == 'infy_db_service':
                                         content = self.__file_sys_handler.read_file(
@@ -126,9 +137,8 @@ class VectorIndexer:
                                                 "content": content,
                                                 "metadata": metadata
                                             })
-                                        # fmt: off
-                                        encoded_path = vector_db_provider.save_record(request_body) # pylint: disable=E1111
-                                        # fmt: on
+                                        db_record_data_list.append(
+                                            request_body)
 
                             elif chunk_type is None or chunk_type == '':
                                 # Add record(s) to vector db
@@ -139,7 +149,7 @@ class VectorIndexer:
                                     }
                                     db_record_data = infy_gen_ai_sdk.vectordb.provider.faiss.InsertVectorDbRecordData(
                                         **db_record_data_dict)
-                                    vector_db_provider.save_record(
+                                    db_record_data_list.append(
                                         db_record_data)
                                 elif self.vector_storage == 'infy_db_service':
                                     content = self.__file_sys_handler.read_file(
@@ -149,9 +159,14 @@ class VectorIndexer:
                                             "content": content,
                                             "metadata": metadata
                                         })
-                                    # fmt: off
-                                    encoded_path = vector_db_provider.save_record(request_body) # pylint: disable=E1111
-                                    # fmt: on
+                                    db_record_data_list.append(request_body)
+                if db_record_data_list:
+                    if self.vector_storage == 'infy_db_service':
+                        # fmt: off
+                        encoded_path = vector_db_provider.save_records(db_record_data_list) # pylint: disable=E1111
+                        # fmt: on
+                    elif self.vector_storage == 'faiss':
+                        vector_db_provider.save_records(db_record_data_list)
                 if encoded_path:
                     encoded_path_list.append(encoded_path)
                 else:
@@ -162,12 +177,15 @@ class VectorIndexer:
                 vector_db_provider_config_data_dict = {
                     'db_folder_path': server_faiss_write_path,
                     'db_index_name': self.vector_db_name if self.vector_db_name else self.document_id,
+                    'index_type': self.vector_storage_config.get('index_type', 'flat'),
+                    'index_params': self.vector_storage_config.get('index_params')
                 }
                 vector_db_provider_config_data = infy_gen_ai_sdk.vectordb.provider.faiss.VectorDbProviderConfigData(
                     **vector_db_provider_config_data_dict)
                 vector_db_provider = infy_gen_ai_sdk.vectordb.provider.faiss.FaissVectorDbProvider(
                     vector_db_provider_config_data, embedding_provider)
 
+                db_record_data_list = []
                 for _key, chunked_method in self.chunk_data.items():
                     for text_file_path in chunked_method.get('chunked_data_list'):
                         if f'{text_file_path}_metadata.json' in chunked_method.get('chunked_file_meta_data_list'):
@@ -185,7 +203,8 @@ class VectorIndexer:
                             }
                         db_record_data = infy_gen_ai_sdk.vectordb.provider.faiss.InsertVectorDbRecordData(
                             **db_record_data_dict)
-                        vector_db_provider.save_record(db_record_data)
+                        db_record_data_list.append(db_record_data)
+                vector_db_provider.save_records(db_record_data_list)
             elif self.vector_storage == 'elasticsearch':
                 if 'ca_certs_path' in self.vector_storage_config:
                     os.environ["CA_CERTS_PATH"] = self.vector_storage_config['ca_certs_path']
@@ -202,6 +221,7 @@ class VectorIndexer:
                 vector_db_provider = infy_gen_ai_sdk.vectordb.provider.elasticsearch.ESVectorDbProvider(
                     vector_db_provider_config_data, embedding_provider)
 
+                db_record_data_list = []
                 for _key, chunked_method in self.chunk_data.items():
                     for text_file_path in chunked_method.get('chunked_data_list'):
                         if f'{text_file_path}_metadata.json' in chunked_method.get('chunked_file_meta_data_list'):
@@ -219,8 +239,10 @@ class VectorIndexer:
                             }
                         db_record_data = infy_gen_ai_sdk.vectordb.provider.elasticsearch.InsertVectorDbRecordData(
                             **db_record_data_dict)
-                        encoded_path = vector_db_provider.save_record(
-                            db_record_data)
+                        db_record_data_list.append(db_record_data)
+                if db_record_data_list:
+                    encoded_path = vector_db_provider.save_records(
+                        db_record_data_list)
 
             if encoded_path:
                 encoded_path_list.append(encoded_path)
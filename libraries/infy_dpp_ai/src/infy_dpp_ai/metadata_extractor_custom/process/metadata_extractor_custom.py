@@ -16,6 +16,8 @@ from ...common.string_util import StringUtil
 
 
 class MetadataExtractorCustom(infy_dpp_sdk.interface.IProcessor):
+    # No per-request state is kept on instance
+    _REUSABLE_INSTANCE = True
 
     def __init__(self) -> None:
         self.__file_sys_handler = self.get_fs_handler()
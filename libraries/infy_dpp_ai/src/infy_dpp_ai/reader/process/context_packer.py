@@ -0,0 +1,103 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+"""Module for selecting retrieved chunks that fit in the LLM context"""
+
+import threading
+import collections
+from ..service.provider.tokenizer_service import TokenizerService
+
+
+class ContextPacker():
+    """Selects chunks from ranked matches so that their tokens fit in `max_tokens`.
+    - `greedy` takes chunks in rank order, skipping those that don't fit in what's left.
+    - `score_weighted` prefers chunks with the most rank weight per token, so a few short
+      relevant chunks can replace one long chunk.
+    Selected chunks are returned in rank order. Token counts are taken from chunk metadata when
+    they were stored at indexing time with the same encoding, else counted and remembered per
+    chunk. A chunk whose approximate count alone exceeds what's left of `max_tokens` is skipped
+    without being encoded. What's left is always tracked using actual counts."""
+
+    STRATEGY_GREEDY = 'greedy'
+    STRATEGY_SCORE_WEIGHTED = 'score_weighted'
+    # Smoothing constant of rank weight, same as used for reciprocal rank fusion
+    RANK_WEIGHT_K = 60
+    # Approximate counts are divided by this before comparing with what's left, as they may be
+    # higher than actual counts
+    APPROX_MARGIN_RATIO = 1.25
+    MAX_MEMO_ENTRIES = 100000
+
+    # (encoding name, chunk id, hash of content) -> token count
+    __token_count_dict = collections.OrderedDict()
+    __lock = threading.Lock()
+
+    def __init__(self, encoding_name: str, strategy: str = STRATEGY_GREEDY) -> None:
+        if strategy not in [self.STRATEGY_GREEDY, self.STRATEGY_SCORE_WEIGHTED]:
+            raise ValueError(f"Unsupported context packing strategy {strategy}")
+        self.__encoding_name = encoding_name
+        self.__strategy = strategy
+        self.__tokenizer_service = TokenizerService()
+        self.__stats = {'memo_hits': 0, 'metadata_hits': 0,
+                        'counted': 0, 'screened_out': 0}
+
+    def pack(self, match_list: list, max_tokens: int) -> list:
+        """Returns matches whose content fits in `max_tokens`. Matches without content, e.g.
+        messages, are always kept. The top match is kept even if it alone exceeds the limit."""
+        chunk_idx_list = [idx for idx, x in enumerate(
+            match_list) if x.get('content') is not None]
+        if self.__strategy == self.STRATEGY_SCORE_WEIGHTED:
+            # Rank weight per approximate token
+            chunk_idx_list.sort(key=lambda idx: -1 / (self.RANK_WEIGHT_K + idx + 1) /
+                                max(TokenizerService.estimate_tokens(match_list[idx]['content']), 1))
+
+        selected_idx_set, total_tokens = set(), 0
+        for idx in chunk_idx_list:
+            approx_tokens = TokenizerService.estimate_tokens(
+                match_list[idx]['content']) / self.APPROX_MARGIN_RATIO
+            if approx_tokens > max_tokens - total_tokens:
+                self.__stats['screened_out'] += 1
+                continue
+            tokens = self.get_token_count(match_list[idx])
+            if total_tokens + tokens <= max_tokens:
+                selected_idx_set.add(idx)
+                total_tokens += tokens
+        if chunk_idx_list and not selected_idx_set:
+            selected_idx_set.add(min(chunk_idx_list))
+        return [x for idx, x in enumerate(match_list)
+                if idx in selected_idx_set or x.get('content') is None]
+
+    def get_token_count(self, match: dict) -> int:
+        """Get token count of content of a match"""
+        content = match['content']
+        meta_data = match.get('meta_data') or {}
+        if meta_data.get('token_encoding') == self.__encoding_name and \
+                meta_data.get('token_count') is not None:
+            self.__stats['metadata_hits'] += 1
+            return meta_data['token_count']
+        key = (self.__encoding_name, meta_data.get('chunk_id'), hash(content))
+        with self.__lock:
+            token_count = self.__token_count_dict.get(key)
+            if token_count is not None:
+                self.__token_count_dict.move_to_end(key)
+                self.__stats['memo_hits'] += 1
+                return token_count
+        token_count = self.__tokenizer_service.count_tokens(
+            content, self.__encoding_name)
+        self.__stats['counted'] += 1
+        with self.__lock:
+            self.__token_count_dict[key] = token_count
+            if len(self.__token_count_dict) > self.MAX_MEMO_ENTRIES:
+                self.__token_count_dict.popitem(last=False)
+        return token_count
+
+    def count_tokens(self, text: str) -> int:
+        """Get token count of text"""
+        return self.__tokenizer_service.count_tokens(text, self.__encoding_name)
+
+    def get_stats(self) -> dict:
+        """Get count of token counts taken from memo and metadata, counted, and chunks screened out
+        using approximate counts"""
+        return dict(self.__stats)
@@ -5,17 +5,29 @@
 # ===============================================================================================================#
 
 import json
-import os
-import uuid
+import threading
 from infy_dpp_sdk.data import *
 import infy_gen_ai_sdk
 from infy_dpp_ai.reader.service.provider.moderator import Moderator
-from .cache_manager import CacheManager
 from ...common.string_util import StringUtil
 
 
 class LLMSequenceRequestHandler:
-    def __init__(self, file_sys_handler, logger, app_config, llm_provider, get_llm, get_llm_config, processor_config_data, cache_enabled, moderation_enabled, moderation_config, moderation_payload, response_validation):
+    """Sends one LLM request per question. Questions are processed concurrently by
+    `LlmRequestScheduler`, which keeps requests within the rate limits of `scheduler_config` and
+    retries throttled or failed requests.
+    When `cache_config` is enabled, responses are cached in `SqliteLlmResponseCache` by model,
+    decoding params and prompt. Only responses without error status, which passed validation and
+    moderation, are cached."""
+
+    # Decoding params of LLM config which change the response for the same prompt
+    __CACHE_KEY_PARAMS = ['temperature', 'max_tokens', 'top_p', 'frequency_penalty', 'presence_penalty',
+                          'stop', 'is_chat_model']
+    # Cache file path -> SqliteLlmResponseCache, so that memory cache is kept across documents
+    __response_cache_dict = {}
+    __response_cache_lock = threading.Lock()
+
+    def __init__(self, file_sys_handler, logger, app_config, llm_provider, get_llm, get_llm_config, processor_config_data, cache_enabled, moderation_enabled, moderation_config, moderation_payload, response_validation, scheduler_config: dict = None, cache_config: dict = None):
         self.file_sys_handler = file_sys_handler
         self.logger = logger
         self.app_config = app_config
@@ -28,145 +40,139 @@ class LLMSequenceRequestHandler:
         self.moderation_config = moderation_config
         self.moderation_payload = moderation_payload
         self.response_validation = response_validation
+        self.scheduler_config = scheduler_config if scheduler_config else {}
+        self.cache_config = cache_config if cache_config else {}
 
     def get_response(self, request_data_list):
-        response_list = []
-        qr_attr_key = ''
+        # Limits are shared by all requests to the same model
+        scheduler = infy_gen_ai_sdk.llm.scheduler.LlmRequestScheduler(
+            infy_gen_ai_sdk.llm.scheduler.LlmRequestSchedulerConfigData(**self.scheduler_config),
+            self.__get_model_name())
+        response_cache = self.__get_response_cache() if self.cache_enabled else None
+        try:
+            response_list = scheduler.map(
+                lambda x: self.__get_single_response(scheduler, response_cache, x), request_data_list)
+        finally:
+            scheduler.close()
+        self.logger.debug("LLM request scheduler stats: %s",
+                          scheduler.get_stats())
+        if response_cache:
+            self.logger.debug("LLM response cache stats: %s",
+                              response_cache.get_stats())
+        return response_list
+
+    def __get_single_response(self, scheduler, response_cache, request_data_dict):
+        """Get response of one request. Called concurrently, so state shared by requests isn't modified."""
+        llm_response_json = None
+        llm_attempts, max_attempts = 1, 1
         moderation_results = {}
         moderation_status = "PASSED"
-        for request_data_dict in request_data_list:
-            combined_text = request_data_dict.get(
-                'template_var_to_value_dict').get('context')
-            QUESTION = request_data_dict.get(
-                'template_var_to_value_dict').get('question')
-            PROMPT_TEMPLATE = request_data_dict.get('prompt_template')
-            qr_attr_key = request_data_dict.pop('qr_attr_key', None)
+        moderation_payload = dict(self.moderation_payload) if self.moderation_payload else {}
+        used_cache = False
+        combined_text = request_data_dict.get(
+            'template_var_to_value_dict').get('context')
+        QUESTION = request_data_dict.get(
+            'template_var_to_value_dict').get('question')
+        PROMPT_TEMPLATE = request_data_dict.get('prompt_template')
+        qr_attr_key = request_data_dict.pop('qr_attr_key', None)
 
-            llm_request_data = infy_gen_ai_sdk.llm.provider.OpenAILlmRequestData(
-                **request_data_dict)
+        llm_request_data = infy_gen_ai_sdk.llm.provider.OpenAILlmRequestData(
+            **request_data_dict)
+        request_tokens = self.__estimate_tokens(
+            PROMPT_TEMPLATE, combined_text, QUESTION)
+
+        # CACHE HANDLING#
+        if response_cache:
+            combined_query = PROMPT_TEMPLATE.replace(
+                '{context}', combined_text).replace('{question}', QUESTION)
+            cache_key = response_cache.get_key(
+                self.__get_model_name(),
+                {x: self.get_llm_config.get(x) for x in self.__CACHE_KEY_PARAMS if x in self.get_llm_config},
+                combined_query)
+            llm_response_txt = response_cache.get(cache_key)
+            if llm_response_txt is not None:
+                used_cache = True
+                llm_response_json = StringUtil.parse_string_to_json(
+                    llm_response_txt)
+        if not used_cache:
+            if self.moderation_enabled:
+                moderator = Moderator()
+                prompt = self.__build_prompt(llm_request_data)
+                moderation_payload['Prompt'] = prompt
+                moderation_results = moderator.perform_moderation_checks(
+                    self.moderation_config, moderation_payload)
+                moderation_status = moderation_results.get(
+                    'summary').get('status')
+            if moderation_status == "PASSED":
+                # Step 3 - Fire query to LLM
+                if self.response_validation.get('enabled', False):
+                    max_attempts = self.response_validation.get(
+                        'total_attempts', 1)
+                expected_type = self.response_validation.get(
+                    'type', 'string')
+                while llm_attempts <= max_attempts:
+                    llm_response_data: infy_gen_ai_sdk.llm.provider.OpenAILlmResponseData = scheduler.call(
+                        self.llm_provider.get_llm_response, llm_request_data, tokens=request_tokens)
+                    llm_response_txt = llm_response_data.llm_response_txt
+                    llm_response_json = StringUtil.parse_string_to_json(
+                        llm_response_txt)
+                    if not self.response_validation.get('enabled', False) or expected_type != 'json' or \
+                            not isinstance(llm_response_txt, str):
+                        break
+                    try:
+                        llm_response_json = json.loads(llm_response_txt)
+                        break
+                    except json.JSONDecodeError:
+                        llm_attempts += 1
+                # Attempts are exhausted only if no response was valid
+                is_valid = llm_attempts <= max_attempts
+                has_error = bool(getattr(llm_response_data, 'status_code', None))
 
-            # CACHE HANDLING#
-            if self.get_llm == 'openai':
-                cache_rel_root_path = self.processor_config_data.get(
-                    'llm').get('openai').get('cache').get('cache_root_path')
-                cache_root_path = cache_rel_root_path
-                config_params = {
-                    "cache_enabled": self.cache_enabled,
-                    "cache_path_root": cache_root_path
-                }
-                __cache_manager = CacheManager(
-                    config_params, self.file_sys_handler, self.logger, self.app_config)
-                __bucket_name = "openai"
-                temp_folder_path = f'{cache_root_path}/temp/infy_model_service/{__bucket_name}'
-                uuid = self.__get_uuid()
-                temp_uuid_folder_path, _ = self.__create_uuid_dir(
-                    temp_folder_path, uuid)
-                combined_query_temp_file_path = f'{temp_uuid_folder_path}/llm_input_prompt.txt'
-                self.__create_dirs_if_absent(
-                    os.path.dirname(combined_query_temp_file_path))
-                combined_query = PROMPT_TEMPLATE.replace(
-                    '{context}', combined_text).replace('{question}', QUESTION)
-                combined_query += f'  \n Temperature : {self.get_llm_config.get("temperature")}'
-                self.file_sys_handler.write_file(
-                    combined_query_temp_file_path, combined_query)
-                cache_file_path = __cache_manager.get(
-                    combined_query_temp_file_path, __bucket_name)
-                if self.cache_enabled:
-                    if cache_file_path:
-                        for cache_file in self.file_sys_handler.list_files(cache_file_path, "*"):
-                            if os.path.basename(cache_file) == 'llm_response.txt':
-                                llm_response_txt = self.file_sys_handler.read_file(
-                                    cache_file)
-                                used_cache = True
-                    else:
-                        self.cache_enabled = False
-            if not self.cache_enabled:
                 if self.moderation_enabled:
-                    moderator = Moderator()
-                    prompt = self.__build_prompt(llm_request_data)
-                    self.moderation_payload['Prompt'] = prompt
+                    moderation_payload['Prompt'] = llm_response_txt
                     moderation_results = moderator.perform_moderation_checks(
-                        self.moderation_config, self.moderation_payload)
+                        self.moderation_config, moderation_payload)
                     moderation_status = moderation_results.get(
                         'summary').get('status')
-                if moderation_status == "PASSED":
-                    # Step 3 - Fire query to LLM
-                    if self.response_validation.get('enabled', False):
-                        max_attempts = self.response_validation.get(
-                            'total_attempts', 1)
-                        llm_attempts = 1
-                        while llm_attempts <= max_attempts:
-                            llm_response_data: infy_gen_ai_sdk.llm.provider.OpenAILlmResponseData = self.llm_provider.get_llm_response(
-                                llm_request_data)
-                            llm_response_txt = llm_response_data.llm_response_txt
-                            llm_response_json = StringUtil.parse_string_to_json(llm_response_txt)
-                            expected_type = self.response_validation.get(
-                                'type', 'string')
-                            if expected_type == 'json':
-                                if isinstance(llm_response_txt, str):
-                                    try:
-                                        llm_response_json = json.loads(
-                                            llm_response_txt)
-                                        break
-                                    except json.JSONDecodeError:
-                                        llm_attempts += 1
-                                        continue
-                                else:
-                                    break
-                    else:
-                        llm_response_data: infy_gen_ai_sdk.llm.provider.OpenAILlmResponseData = self.llm_provider.get_llm_response(
-                            llm_request_data)
-                        llm_response_txt = llm_response_data.llm_response_txt
-                        llm_response_json = StringUtil.parse_string_to_json(llm_response_txt)
-
-                    if self.moderation_enabled:
-                        self.moderation_payload['Prompt'] = llm_response_txt
-                        moderation_results = moderator.perform_moderation_checks(
-                            self.moderation_config, self.moderation_payload)
-                        moderation_status = moderation_results.get(
-                            'summary').get('status')
-                    if moderation_status != "PASSED":
-                        llm_response_txt = "ANSWER FAILED MODERATION CHECKS"
-                    # Save response to cache only if self.get_llm == 'openai'
-                    if self.get_llm == 'openai':
-                        result_temp_file_path = f'{temp_uuid_folder_path}/llm_response.txt'
-                        self.file_sys_handler.write_file(
-                            result_temp_file_path, llm_response_txt)
-                        __cache_manager.add(combined_query_temp_file_path, [
-                                            result_temp_file_path], __bucket_name)
-                        for temp_files in self.file_sys_handler.list_files(temp_uuid_folder_path, "*"):
-                            self.file_sys_handler.delete_file(
-                                temp_files)
-                else:
-                    llm_response_txt = "FAILED MODERATION CHECKS"
-                    self.logger.debug("Moderation Results :%s", json.dumps(
-                        moderation_results, indent=4))
-            # answer = llm_response_json
-            response_list.append({
-                'qr_attr_key': qr_attr_key,
-                'llm_response': llm_response_json,
-                'llm_attempts': llm_attempts,
-                'max_attempts': max_attempts,
-                'moderation_results': moderation_results,
-                'request_data_dict': request_data_dict
-            })
-
-        return response_list
+                if moderation_status != "PASSED":
+                    llm_response_txt = "ANSWER FAILED MODERATION CHECKS"
+                if response_cache and isinstance(llm_response_txt, str) and is_valid and \
+                        not has_error and moderation_status == "PASSED":
+                    response_cache.put(cache_key, llm_response_txt)
+            else:
+                llm_response_txt = "FAILED MODERATION CHECKS"
+                self.logger.debug("Moderation Results :%s", json.dumps(
+                    moderation_results, indent=4))
+        return {
+            'qr_attr_key': qr_attr_key,
+            'llm_response': llm_response_json,
+            'llm_attempts': llm_attempts,
+            'max_attempts': max_attempts,
+            'moderation_payload': moderation_payload,
+            'moderation_results': moderation_results,
+            'request_data_dict': request_data_dict,
+            'used_cache': used_cache
+        }
 
-    def __get_uuid(self):
-        return str(uuid.uuid4())
+    def __estimate_tokens(self, prompt_template, context, question):
+        """Approximate tokens of request and response, for tokens/min limit"""
+        prompt_chars = sum(len(x) for x in [prompt_template, context, question] if x)
+        return prompt_chars // 4 + (self.get_llm_config.get('max_tokens') or 0)
 
-    def __create_uuid_dir(self, work_input_location, uuid=None):
-        if not uuid:
-            uuid = self.__get_uuid()
-        work_input_location = self.__create_dirs_if_absent(
-            work_input_location + "/" + uuid)
-        return work_input_location, uuid
+    def __get_model_name(self):
+        return '-'.join([self.get_llm, str(self.get_llm_config.get('model_name', '')),
+                         str(self.get_llm_config.get('deployment_name', ''))])
 
-    def __create_dirs_if_absent(self, dir_path):
-        if not self.file_sys_handler.exists(dir_path):
-            self.file_sys_handler.create_folders(dir_path)
-        return dir_path
+    def __get_response_cache(self):
+        cache_config_data = infy_gen_ai_sdk.llm.cache.SqliteLlmResponseCacheConfigData(
+            **{k: v for k, v in self.cache_config.items() if k in [
+                'cache_file_path', 'max_memory_entries', 'max_size_mb', 'ttl_seconds']})
+        with self.__response_cache_lock:
+            cache_key = cache_config_data.cache_file_path
+            if cache_key not in self.__response_cache_dict:
+                self.__response_cache_dict[cache_key] = infy_gen_ai_sdk.llm.cache.SqliteLlmResponseCache(
+                    cache_config_data)
+            return self.__response_cache_dict[cache_key]
 
     def __build_prompt(self, llm_request_data):
         context = llm_request_data.template_var_to_value_dict.get(
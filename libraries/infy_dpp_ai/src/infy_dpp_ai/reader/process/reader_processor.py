@@ -14,13 +14,18 @@ import infy_gen_ai_sdk
 
 from .llm_sequence_request_handler import LLMSequenceRequestHandler
 from .llm_batch_request_handler import LLMBatchRequestHandler
+from .context_packer import ContextPacker
 from ..service.provider.custom_llm_provider import CustomLlmProvider, CustomLlmProviderConfigData
 from ..service.provider.llama_3_1_llm_provider import LlamaLlmProvider, LlamaLlmProviderConfigData
+from ..service.provider.tokenizer_service import TokenizerService
 
 PROCESSEOR_CONTEXT_DATA_NAME = "reader"
 
 
 class Reader(infy_dpp_sdk.interface.IProcessor):
+    # No per-request state is kept on instance
+    _REUSABLE_INSTANCE = True
+
     def __init__(self):
         self.__file_sys_handler = self.get_fs_handler()
         self.__app_config = self.get_app_config()
@@ -39,7 +44,7 @@ class Reader(infy_dpp_sdk.interface.IProcessor):
         batch_size = ""
         get_llm = ""
         get_llm_config = {}
-        used_cache = False
+        cache_config = {}
         moderation_config = {}
         moderation_payload = {}
         moderation_results = {}
@@ -54,6 +59,7 @@ class Reader(infy_dpp_sdk.interface.IProcessor):
                         if e_val.get('enabled'):
                             get_llm = e_key
                             get_llm_config = e_val.get('configuration')
+                            cache_config = e_val.get('cache', {})
                             break
                     elif e_key == 'llama-3-1':
                         if e_val.get('enabled'):
@@ -76,6 +82,7 @@ class Reader(infy_dpp_sdk.interface.IProcessor):
                                 get_llm = e_key
                                 get_llm_config = model.get('configuration')
                                 batch_size = model.get('batch').get('size')
+                                cache_config = model.get('cache', {})
                                 break
             if key == 'storage':
                 for storage_key, storage_value in value.items():
@@ -117,8 +124,7 @@ class Reader(infy_dpp_sdk.interface.IProcessor):
                 **get_llm_config)
             llm_provider = infy_gen_ai_sdk.llm.provider.OpenAILlmProvider(
                 llm_provider_config_data)
-            cache_enabled = __processor_config_data.get('llm').get('openai'
-                                                                   ).get('cache').get('enabled')
+            cache_enabled = cache_config.get('enabled', False)
             model_name = llm_provider_config_data.model_name
             deployment_name = llm_provider_config_data.deployment_name
         if get_llm == 'custom' and (vector_storage in vector_types or sparse_storage in sparse_types):
@@ -142,7 +148,7 @@ class Reader(infy_dpp_sdk.interface.IProcessor):
                 **get_llm_config)
             llm_provider = infy_gen_ai_sdk.llm.provider.OpenAIFormatLlmProvider(
                 llm_provider_config_data)
-            cache_enabled = False
+            cache_enabled = cache_config.get('enabled', False)
             model_name = llm_provider_config_data.model_name
             deployment_name = llm_provider_config_data.deployment_name
 
@@ -169,6 +175,16 @@ class Reader(infy_dpp_sdk.interface.IProcessor):
         named_propt_temp_dict = __processor_config_data['named_prompt_templates']
         named_context_templates_dict = __processor_config_data['named_context_templates']
         model_based_prompt_list = __processor_config_data.get('model_based_prompts', [])
+        context_packing_config = __processor_config_data.get('context_packing', {})
+        context_packer = None
+        if context_packing_config.get('enabled'):
+            encoding_name = context_packing_config.get(
+                'encoding_name') or TokenizerService().get_encoding_name_for_model(model_name)
+            context_packer = ContextPacker(
+                encoding_name, context_packing_config.get('strategy', ContextPacker.STRATEGY_GREEDY))
+            # Reserved tokens are for prompt template, context templates and answer
+            max_context_tokens = context_packing_config.get(
+                'max_context_tokens', 4096) - context_packing_config.get('reserved_tokens', 0)
         output_list = []
         request_data_list = []
         for query in data_ret_queries_list:
@@ -192,10 +208,16 @@ class Reader(infy_dpp_sdk.interface.IProcessor):
                     top_k_matches_list.extend(item[key_to_use])
                 else:
                     continue
+            context_matches_list = top_k_matches_list[:reader_input_list[0]['top_k']]
+            if context_packer:
+                context_matches_list = context_packer.pack(
+                    context_matches_list, max_context_tokens - context_packer.count_tokens(QUESTION))
+                self.__logger.debug(
+                    f'Chunks packed in context: {len(context_matches_list)}, stats: {context_packer.get_stats()}')
             # Combining text logic
             combined_files_dict = {}
             key_occurrences = {}
-            for match in top_k_matches_list[:reader_input_list[0]['top_k']]:
+            for match in context_matches_list:
                 custom_metadata = match.get('meta_data', {}).get('custom_metadata', {})
                 for key in custom_metadata.keys():
                     if key in key_occurrences:
@@ -209,7 +231,7 @@ class Reader(infy_dpp_sdk.interface.IProcessor):
                 remain_repl_words_list = copy.deepcopy(all_replace_words_list)
                 remain_repl_words_list.remove('chunk_text')
                 skip_llm_call = False
-                for idx, match in enumerate(top_k_matches_list[:reader_input_list[0]['top_k']]):
+                for idx, match in enumerate(context_matches_list):
                     if "message" in match:
                         skip_llm_call = True
                         continue
@@ -219,7 +241,7 @@ class Reader(infy_dpp_sdk.interface.IProcessor):
                     # template = re.sub(
                     #     '{chunk_text}', re.escape(f_file), v)
                     template = v.replace('{chunk_text}', f_file)
-                    unique_custom_metadata = {key: value for key, value in custom_metadata.items() if key_occurrences[key] < len(top_k_matches_list[:reader_input_list[0]['top_k']])}
+                    unique_custom_metadata = {key: value for key, value in custom_metadata.items() if key_occurrences[key] < len(context_matches_list)}
                     unique_custom_metadata_str = ";".join([f"{key}:{value}" for key, value in unique_custom_metadata.items()])
                     if not unique_custom_metadata_str:
                         unique_custom_metadata_str = ""
@@ -236,7 +258,7 @@ class Reader(infy_dpp_sdk.interface.IProcessor):
                                 f'{{{replace_word}}}', repr(relevant_metadata_value))
                         comb_file_content = comb_file_content + template
 
-                    if idx == len(top_k_matches_list[:reader_input_list[0]['top_k']])-1:
+                    if idx == len(context_matches_list)-1:
                         combined_files_dict[k] = comb_file_content
 
             for input in reader_input_list:
@@ -317,12 +339,13 @@ class Reader(infy_dpp_sdk.interface.IProcessor):
 
                     request_data_list.append(request_data_dict)
 
-        if get_llm == 'models' and batch_size > 1 and len(request_data_list) > 1:
+        # Batch handler doesn't use response cache
+        if get_llm == 'models' and batch_size > 1 and len(request_data_list) > 1 and not cache_enabled:
             request_handler_obj = LLMBatchRequestHandler(
-                self.__file_sys_handler, self.__app_config, self.__logger, llm_provider, get_llm, get_llm_config, __processor_config_data, cache_enabled, moderation_enabled, moderation_config, moderation_payload, response_validation, batch_size)
+                self.__file_sys_handler, self.__logger, self.__app_config, llm_provider, get_llm, get_llm_config, __processor_config_data, cache_enabled, moderation_enabled, moderation_config, moderation_payload, response_validation, batch_size)
         else:
             request_handler_obj = LLMSequenceRequestHandler(
-                self.__file_sys_handler, self.__app_config, self.__logger, llm_provider, get_llm, get_llm_config, __processor_config_data, cache_enabled, moderation_enabled, moderation_config, moderation_payload, response_validation)
+                self.__file_sys_handler, self.__logger, self.__app_config, llm_provider, get_llm, get_llm_config, __processor_config_data, cache_enabled, moderation_enabled, moderation_config, moderation_payload, response_validation, __processor_config_data.get('request_scheduler', {}), cache_config)
 
         llm_response_list = request_handler_obj.get_response(
             request_data_list)
@@ -335,6 +358,8 @@ class Reader(infy_dpp_sdk.interface.IProcessor):
             ques_attr_key = llm_response_json.get('qr_attr_key')
             request_dict = llm_response_json.get('request_data_dict')
             moderation_results = llm_response_json.get('moderation_results')
+            request_moderation_payload = llm_response_json.get(
+                'moderation_payload', moderation_payload)
             source_metadata = []
             retriver_confidence_pct = -1
             try:
@@ -365,11 +390,11 @@ class Reader(infy_dpp_sdk.interface.IProcessor):
                 "total_attempts": min(llm_attempts, max_attempts),
                 "model_input": request_dict,
                 "model_output": answer,
-                "moderation_input": moderation_payload.copy(),
+                "moderation_input": request_moderation_payload.copy(),
                 "moderation_output": moderation_results,
                 "retriver_confidence_pct": retriver_confidence_pct,
                 "source_metadata": source_metadata,
-                "used_cache": used_cache
+                "used_cache": llm_response_json.get('used_cache', False)
             })
         context_data[PROCESSEOR_CONTEXT_DATA_NAME] = {'output': output_list}
 
@@ -5,18 +5,57 @@
 # ===============================================================================================================#
 
 import os
+import threading
 import tiktoken
 
 
 class TokenizerService():
+    """Counts tokens using tiktoken. Encodings are loaded once per process and shared by all instances."""
 
     SECTION_TOKENIZER = "TOKENIZER"
     ENCODING_P50K_BASE = "p50k_base"
+    ENCODING_CL100K_BASE = "cl100k_base"
+    # Average characters per token of English text, for approximate counts
+    APPROX_CHARS_PER_TOKEN = 4
 
-    def __init__(self,tiktoken_cache_dir):
-        os.environ["TIKTOKEN_CACHE_DIR"] = tiktoken_cache_dir
+    # Encoding name -> tiktoken encoding
+    __encoding_dict = {}
+    # Model name -> encoding name
+    __model_encoding_name_dict = {}
+    __lock = threading.Lock()
+
+    def __init__(self, tiktoken_cache_dir=None):
+        if tiktoken_cache_dir:
+            os.environ["TIKTOKEN_CACHE_DIR"] = tiktoken_cache_dir
 
     def count_tokens(self, text, encoding_name):
-        encoding = tiktoken.get_encoding(encoding_name)
-        count = len(encoding.encode(text))
+        encoding = self.get_encoding(encoding_name)
+        count = len(encoding.encode(text, disallowed_special=()))
         return count
+
+    def get_encoding(self, encoding_name):
+        """Get encoding, loading it on first use"""
+        encoding = self.__encoding_dict.get(encoding_name)
+        if encoding is None:
+            with self.__lock:
+                if encoding_name not in self.__encoding_dict:
+                    self.__encoding_dict[encoding_name] = tiktoken.get_encoding(
+                        encoding_name)
+                encoding = self.__encoding_dict[encoding_name]
+        return encoding
+
+    def get_encoding_name_for_model(self, model_name):
+        """Get encoding name of an OpenAI model, `cl100k_base` for other models"""
+        encoding_name = self.__model_encoding_name_dict.get(model_name)
+        if encoding_name is None:
+            try:
+                encoding_name = tiktoken.encoding_name_for_model(model_name)
+            except (KeyError, TypeError):
+                encoding_name = self.ENCODING_CL100K_BASE
+            self.__model_encoding_name_dict[model_name] = encoding_name
+        return encoding_name
+
+    @classmethod
+    def estimate_tokens(cls, text):
+        """Approximate count of tokens without encoding the text"""
+        return -(-len(text) // cls.APPROX_CHARS_PER_TOKEN) if text else 0
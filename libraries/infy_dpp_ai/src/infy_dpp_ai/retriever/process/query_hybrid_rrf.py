@@ -4,6 +4,8 @@
 # http://www.apache.org/licenses/                                                                                #
 # ===============================================================================================================#
 
+import infy_gen_ai_sdk
+
 
 class QueryHybridRrf():
     def __init__(self, file_sys_handler, logger, app_config):
@@ -11,7 +13,12 @@ class QueryHybridRrf():
         self.__app_config = app_config
         self.__file_sys_handler = file_sys_handler
 
-    def query_rrf(self, queries_list):
+    def query_rrf(self, queries_list, rrf_config: dict = None):
+        """Fuse sparse index and vector DB matches of each query. `rrf_config` may set fields of
+        `HybridRetrieverConfigData` e.g. `rrf_k`, or `fusion_method` as weighted or convex."""
+        rrf_config = {k: v for k, v in (rrf_config or {}).items() if k != 'enabled'}
+        hybrid_retriever = infy_gen_ai_sdk.retriever.HybridRetriever(
+            infy_gen_ai_sdk.retriever.HybridRetrieverConfigData(**rrf_config))
         for query in queries_list:
             if len(query['top_k_matches']) > 1:
                 top_k = query['top_k']
@@ -35,6 +42,7 @@ class QueryHybridRrf():
                         'context': item.get('content'),
                         'meta_data': item.get('meta_data', {}),
                         'file_path': item.get('file_path', ''),
+                        'score': item.get('score'),
                         'method': 'sparseindex'
                     })
                     rank += 1
@@ -49,12 +57,13 @@ class QueryHybridRrf():
                         'context': item.get('content'),
                         'meta_data': item.get('meta_data', {}),
                         'file_path': item.get('file_path', ''),
+                        'score': item.get('score'),
                         'method': 'vectordb'
                     })
                     rank += 1
 
                 rrf_scores = self.calculate_rrf(
-                    sparse_list, vector_list)
+                    sparse_list, vector_list, hybrid_retriever, top_k)
 
                 rrf_matches = []
                 for record in rrf_scores:
@@ -86,39 +95,35 @@ class QueryHybridRrf():
 
         return queries_list
 
-    def calculate_rrf(self, sparse_list, vector_list):
-        combined_scores = {}
-        k = 60
-
-        combined_list = sparse_list + vector_list
-
-        for item in combined_list:
-            chunk_id = item['chunk_id']
-            rank = item['rank']
-            rrf_score = 1 / (rank + k)
-            if chunk_id in combined_scores:
-                combined_scores[chunk_id]['score'] += rrf_score
-                combined_scores[chunk_id]['methods'].add(item['method'])
-            else:
-                combined_scores[chunk_id] = {
-                    'chunk_id': chunk_id,
-                    'score': rrf_score,
-                    'context': item['context'],
-                    'meta_data': item['meta_data'],
-                    'file_path': item['file_path'],
-                    'methods': {item['method']}
-                }
-
-        sorted_items = sorted(combined_scores.values(),
-                              key=lambda x: x['score'], reverse=True)
-
-        rrf_scores = [{
-            'chunk_id': item['chunk_id'],
-            'score': item['score'],
-            'context': item['context'],
-            'meta_data': item['meta_data'],
-            'file_path': item['file_path'],
-            'methods': list(item['methods'])
-        } for item in sorted_items]
+    def calculate_rrf(self, sparse_list, vector_list, hybrid_retriever=None, top_k: int = None):
+        hybrid_retriever = hybrid_retriever or infy_gen_ai_sdk.retriever.HybridRetriever()
+        item_dict = {}
+        match_list_dict = {'sparseindex': [], 'vectordb': []}
+        for item in sparse_list + vector_list:
+            item_dict[(item['method'], item['rank'])] = item
+            match_list_dict[item['method']].append(infy_gen_ai_sdk.retriever.HybridMatchData(
+                content=item['context'], metadata=item['meta_data'], score=item.get('score')))
+        top_k = len(item_dict) if top_k is None else top_k
+        hybrid_match_data_list = hybrid_retriever.fuse_matches(
+            match_list_dict['sparseindex'], match_list_dict['vectordb'], top_k)
+
+        rrf_scores = []
+        for hybrid_match_data in hybrid_match_data_list:
+            methods = []
+            if hybrid_match_data.sparse_rank is not None:
+                methods.append('sparseindex')
+            if hybrid_match_data.dense_rank is not None:
+                methods.append('vectordb')
+            item = item_dict[('sparseindex', hybrid_match_data.sparse_rank)
+                             if hybrid_match_data.sparse_rank is not None
+                             else ('vectordb', hybrid_match_data.dense_rank)]
+            rrf_scores.append({
+                'chunk_id': item['chunk_id'],
+                'score': hybrid_match_data.score,
+                'context': item['context'],
+                'meta_data': item['meta_data'],
+                'file_path': item['file_path'],
+                'methods': methods
+            })
 
         return rrf_scores
@@ -18,6 +18,9 @@ PROCESSOR_CONTEXT_DATA_NAME = "query_retriever"
 
 
 class QueryRetriever(infy_dpp_sdk.interface.IProcessor):
+    # No per-request state is kept on instance
+    _REUSABLE_INSTANCE = True
+
     def __init__(self):
         self.__file_sys_handler = self.get_fs_handler()
         self.__app_config = self.get_app_config()
@@ -83,7 +86,7 @@ class QueryRetriever(infy_dpp_sdk.interface.IProcessor):
                             rrf_obj = QueryHybridRrf(
                                 self.__file_sys_handler, self.__logger, self.__app_config)
                             queries_list = rrf_obj.query_rrf(
-                                queries_list)
+                                queries_list, hybrid_value)
 
         context_data[PROCESSOR_CONTEXT_DATA_NAME] = {
             'queries': queries_list}
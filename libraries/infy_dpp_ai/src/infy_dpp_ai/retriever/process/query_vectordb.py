@@ -161,6 +161,8 @@ class QueryVectordb():
 
                     embedding_provider = infy_gen_ai_sdk.embedding.provider.CustomEmbeddingProvider(
                         embedding_provider_config_data)
+                embedding_provider = self.__get_cached_embedding_provider(
+                    embedding_provider, embedding_provider_config_data_dict, sub_folder_name)
 
                 if db_name:
                     server_faiss_write_path = f'{encoded_files_root_path}/{get_embedding}-{model_name}/{db_name}'
@@ -208,6 +210,8 @@ class QueryVectordb():
                             **embedding_provider_config_data_dict)
                         embedding_provider = infy_gen_ai_sdk.embedding.provider.CustomEmbeddingProvider(
                             embedding_provider_config_data)
+                    embedding_provider = self.__get_cached_embedding_provider(
+                        embedding_provider, embedding_provider_config_data_dict, sub_folder_name)
 
                 else:
                     message_data = infy_dpp_sdk.data.MessageData()
@@ -285,7 +289,9 @@ class QueryVectordb():
                                     'query': query,
                                     'top_k': top_result,
                                     'pre_filter_fetch_k': query_dict['pre_filter_fetch_k'],
-                                    'filter_metadata': mde_schema if use_mde_schema else query_dict['filter_metadata']
+                                    'filter_metadata': mde_schema if use_mde_schema else query_dict['filter_metadata'],
+                                    'nprobe': query_dict.get('nprobe'),
+                                    'ef_search': query_dict.get('ef_search')
                                 })
                         elif vector_storage == 'infy_db_service':
                             query_params_data = infy_gen_ai_sdk.vectordb.provider.online.VectorDbQueryParamsData(
@@ -456,6 +462,17 @@ class QueryVectordb():
         else:
             return None
 
+    def __get_cached_embedding_provider(self, embedding_provider, embedding_provider_config_data_dict, sub_folder_name):
+        """Wrap embedding provider so that embeddings of repeated queries are reused, when enabled
+        using `embedding_cache` in embedding configuration"""
+        embedding_cache_config_dict = embedding_provider_config_data_dict.get(
+            'embedding_cache') or {}
+        if not embedding_cache_config_dict.get('enabled'):
+            return embedding_provider
+        return infy_gen_ai_sdk.embedding.provider.CachedEmbeddingProvider(
+            embedding_provider, infy_gen_ai_sdk.embedding.provider.CachedEmbeddingProviderConfigData(
+                **{'model_name': sub_folder_name, **embedding_cache_config_dict}))
+
     class ElasticsearchUtility:
         def __init__(self, vector_storage_config, index_id):
             self.__db_server_url = vector_storage_config.get("db_server_url")
@@ -5,13 +5,12 @@
 # ===============================================================================================================#
 import os
 import json
-import time
-import requests
 import pandas as pd
 import infy_dpp_sdk
 from infy_dpp_sdk.data import *
 import infy_gen_ai_sdk
 from ...common.file_util import FileUtil
+from ..service.provider.search_service_client import SearchServiceClient
 
 PROCESSEOR_CONTEXT_DATA_NAME = "semantic_search"
 
@@ -60,7 +59,6 @@ class SemanticSearch(infy_dpp_sdk.interface.IProcessor):
                         if svc_name == 'infy_search_service':
                             svc_max_req_per_min = service.get(
                                 'max_requests_per_minute')
-                            min_interval = 60 / svc_max_req_per_min
                             self.__logger.info(
                                 "Max requests allowed per minute:%s", svc_max_req_per_min)
                             svc_req_payload = service.get('request_payload')
@@ -70,53 +68,24 @@ class SemanticSearch(infy_dpp_sdk.interface.IProcessor):
                                 svc_top_k_used = svc_generation.get(
                                     'top_k_used')
                                 df = pd.read_excel(truth_data_file_path)
-                                for index, row in df.iterrows():
-                                    rrf_context_list = []
-                                    question = row['Question']
-                                    self.__logger.debug(
-                                        "Question:%s", question)
-                                    svc_req_payload['question'] = question
-                                    start_time = time.time()
-                                    result = self._call_service(
-                                        svc_url, svc_req_payload, svc_headers)
-                                    end_time = time.time()
-                                    elapsed_time = end_time - start_time
-                                    sleep_interval = min_interval-elapsed_time
-                                    result_json = result.json()
-                                    if result_json.get('responseCde') == 200:
-                                        response = result_json.get(
-                                            'response')
-                                        answers = response.get('answers')
-                                        answer = answers[0].get('answer')
-                                        self.__logger.debug(
-                                            "Answer:%s", answer)
-                                        top_k_list = answers[0].get(
-                                            'top_k_list')
-                                        for item in top_k_list:
-                                            if "rrf" in item:
-                                                rrf_list = item["rrf"]
-                                                rrf_context_list = [
-                                                    item.get('content') for item in rrf_list]
-                                    else:
-                                        response_message = result_json.get(
-                                            'responseMsg')
-                                        self.__logger.error(
-                                            "Error::%s", response_message)
-                                        raise ValueError(
-                                            f"Semantic search service failed with response message: {response_message}")
-                                    context_list = self._build_context_list(
-                                        rrf_context_list, svc_top_k_used)
-                                    # sleep only when interval is non-negative
-                                    if sleep_interval > 0:
-                                        self.__logger.debug(
-                                            "Sleeping for %.2f seconds", sleep_interval)
-                                        time.sleep(sleep_interval)
-                                    df.at[index, 'answer'] = answer
-                                    if not isinstance(context_list, list):
-                                        context_list = list(context_list)
-                                    if 'contexts' not in df.columns:
-                                        df['contexts'] = None
-                                    df.at[index, 'contexts'] = context_list
+                                if 'contexts' not in df.columns:
+                                    df['contexts'] = None
+                                search_service_client = SearchServiceClient(
+                                    svc_url, svc_headers, svc_max_req_per_min,
+                                    max_workers=service.get('max_workers', 4),
+                                    max_retries=service.get('max_retries', 5))
+                                payloads = ({**svc_req_payload, 'question': question}
+                                            for question in df['Question'])
+                                # Results come in order of rows, as soon as each is done
+                                result_json_iter = search_service_client.search_all(
+                                    payloads)
+                                try:
+                                    for index, result_json in zip(df.index, result_json_iter):
+                                        self.__process_result(
+                                            df, index, result_json, svc_top_k_used)
+                                finally:
+                                    result_json_iter.close()
+                                    search_service_client.close()
         df.rename(columns={'Question': 'question',
                   'Ground_Truth': 'ground_truth'}, inplace=True)
         dataframe_list = df.to_dict(orient='records')
@@ -136,12 +105,32 @@ class SemanticSearch(infy_dpp_sdk.interface.IProcessor):
 
         return processor_response_data
 
-    def _call_service(self, svc_url, svc_req_payload, svc_headers):
-        """This function calls the service and returns the response"""
-        result = requests.post(
-            svc_url, json=svc_req_payload, timeout=120, headers=svc_headers)
-
-        return result
+    def __process_result(self, df, index, result_json, top_k_used):
+        """This function writes answer and contexts of a service response to the row"""
+        self.__logger.debug("Question:%s", df.at[index, 'Question'])
+        rrf_context_list = []
+        if result_json.get('responseCde') == 200:
+            response = result_json.get('response')
+            answers = response.get('answers')
+            answer = answers[0].get('answer')
+            self.__logger.debug("Answer:%s", answer)
+            top_k_list = answers[0].get('top_k_list')
+            for item in top_k_list:
+                if "rrf" in item:
+                    rrf_list = item["rrf"]
+                    rrf_context_list = [
+                        item.get('content') for item in rrf_list]
+        else:
+            response_message = result_json.get('responseMsg')
+            self.__logger.error("Error::%s", response_message)
+            raise ValueError(
+                f"Semantic search service failed with response message: {response_message}")
+        context_list = self._build_context_list(
+            rrf_context_list, top_k_used)
+        df.at[index, 'answer'] = answer
+        if not isinstance(context_list, list):
+            context_list = list(context_list)
+        df.at[index, 'contexts'] = context_list
 
     def _build_context_list(self, rrf_context_list, top_k_used):
         """This function builds the context list based on the top_k_used value"""
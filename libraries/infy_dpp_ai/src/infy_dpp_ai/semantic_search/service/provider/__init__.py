@@ -3,3 +3,4 @@
 # Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
 # http://www.apache.org/licenses/                                                                                #
 # ===============================================================================================================#
+from .search_service_client import SearchServiceClient
@@ -0,0 +1,135 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+"""Module for concurrent client of search service"""
+
+import time
+import random
+import logging
+import threading
+import collections
+import concurrent.futures
+from typing import Iterable, Iterator
+import requests
+from requests.adapters import HTTPAdapter
+import infy_fs_utils
+from infy_gen_ai_sdk.llm.scheduler import TokenBucket
+
+
+class SearchServiceClient():
+    """Sends search requests concurrently on a pooled HTTP session.
+    Requests are paced by a token bucket starting at `max_requests_per_minute`. When the service
+    throttles (HTTP 429, or an LLM rate limit error in the response), the rate is halved and the
+    request is retried after a jittered delay. Each successful request raises the rate again by a
+    tenth of the maximum. A response whose body isn't json, e.g. an error page of a proxy, is
+    returned as a failed response with its HTTP status as `responseCde`."""
+
+    # Rate limit errors of LLM, returned by the service in response message
+    __THROTTLED_MESSAGES = ['ratelimiterror', 'rate limit', '429']
+    __BACKOFF_FACTOR = 0.5
+    __RECOVERY_RATIO = 0.1
+
+    def __init__(self, url: str, headers: dict, max_requests_per_minute: float, max_workers: int = 4,
+                 max_retries: int = 5, timeout: float = 120) -> None:
+        if infy_fs_utils.manager.FileSystemLoggingManager().has_fs_logging_handler():
+            self.__logger = infy_fs_utils.manager.FileSystemLoggingManager(
+            ).get_fs_logging_handler().get_logger()
+        else:
+            self.__logger = logging.getLogger(__name__)
+        self.__url = url
+        self.__timeout = timeout
+        self.__max_retries = max_retries
+        self.__max_workers = max(max_workers, 1)
+        self.__max_rate = max_requests_per_minute
+        self.__min_rate = max_requests_per_minute / 16
+        # Requests are spread evenly, without a burst at start
+        self.__bucket = TokenBucket(max_requests_per_minute, 1)
+        self.__rate_lock = threading.Lock()
+        self.__session = requests.Session()
+        self.__session.headers.update(headers or {})
+        adapter = HTTPAdapter(pool_connections=1,
+                              pool_maxsize=self.__max_workers)
+        self.__session.mount('http://', adapter)
+        self.__session.mount('https://', adapter)
+        self.__executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.__max_workers, thread_name_prefix='search_service_client')
+
+    def search(self, payload: dict) -> dict:
+        """Send one request and return response json"""
+        attempt = 0
+        while True:
+            self.__bucket.acquire(1)
+            result = self.__session.post(
+                self.__url, json=payload, timeout=self.__timeout)
+            result_json = self.__get_result_json(result)
+            if not self.__is_throttled(result, result_json):
+                self.__change_rate(self.__max_rate * self.__RECOVERY_RATIO)
+                return result_json
+            if attempt >= self.__max_retries:
+                return result_json
+            rate = self.__change_rate(None)
+            delay = random.uniform(0, min(60, 2 ** attempt))
+            delay = max(delay, self.__get_retry_after(result))
+            attempt += 1
+            self.__logger.warning("Search service is throttling, rate reduced to %.1f per minute, "
+                                  "retry %s of %s in %.2f seconds", rate, attempt, self.__max_retries, delay)
+            time.sleep(delay)
+
+    def search_all(self, payloads: Iterable[dict]) -> Iterator[dict]:
+        """Send requests concurrently and yield response json of each payload in order, as soon
+        as it and those before it are done. Payloads are read as workers become free. Requests
+        not yet started are cancelled if the caller stops early."""
+        future_queue = collections.deque()
+        try:
+            for payload in payloads:
+                if len(future_queue) >= 2 * self.__max_workers:
+                    yield future_queue.popleft().result()
+                future_queue.append(
+                    self.__executor.submit(self.search, payload))
+            while future_queue:
+                yield future_queue.popleft().result()
+        finally:
+            for future in future_queue:
+                future.cancel()
+
+    def close(self):
+        """Stop workers and close connections"""
+        self.__executor.shutdown(wait=True)
+        self.__session.close()
+
+    # ---------- Private Methods ---------
+    def __get_result_json(self, result: requests.Response) -> dict:
+        if result.status_code != 429:
+            try:
+                return result.json()
+            except ValueError:
+                pass
+        return {'responseCde': result.status_code, 'responseMsg': result.text}
+
+    def __is_throttled(self, result: requests.Response, result_json: dict) -> bool:
+        if result.status_code == 429:
+            return True
+        if result_json.get('responseCde') == 200:
+            return False
+        response_message = str(result_json.get('responseMsg', '')).lower()
+        return any(x in response_message for x in self.__THROTTLED_MESSAGES)
+
+    def __change_rate(self, increase: float) -> float:
+        """Increase rate by `increase` or back off if None. Returns new rate."""
+        with self.__rate_lock:
+            rate = self.__bucket.get_rate()
+            if increase is None:
+                rate = max(rate * self.__BACKOFF_FACTOR, self.__min_rate)
+            else:
+                rate = min(rate + increase, self.__max_rate)
+            self.__bucket.set_rate(rate)
+        return rate
+
+    def __get_retry_after(self, result: requests.Response) -> float:
+        try:
+            return min(float(result.headers.get('retry-after', 0)), 60)
+        except (TypeError, ValueError):
+            return 0.0
@@ -0,0 +1,55 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+"""Test context packing. Token counts are stored in metadata, so that no encoding is loaded."""
+from infy_dpp_ai.reader.process.context_packer import ContextPacker
+
+ENCODING_NAME = 'cl100k_base'
+
+
+def _get_match(chunk_id: str, token_count: int, approx_token_count: int = None) -> dict:
+    """Match whose content has `approx_token_count` approximate tokens and `token_count` actual ones"""
+    content = 'a' * 4 * (approx_token_count or token_count)
+    return {'content': content, 'meta_data': {'chunk_id': chunk_id, 'token_encoding': ENCODING_NAME,
+                                               'token_count': token_count}}
+
+
+def _get_chunk_ids(match_list: list) -> list:
+    return [x['meta_data']['chunk_id'] for x in match_list if x.get('content') is not None]
+
+
+def test_context_packer_greedy_1():
+    """Chunks too long for the budget are skipped and the rest still fill it"""
+    context_packer = ContextPacker(ENCODING_NAME, ContextPacker.STRATEGY_GREEDY)
+    match_list = [_get_match('0', 1100), _get_match('1', 100), _get_match('2', 100), _get_match('3', 1300)]
+    assert _get_chunk_ids(context_packer.pack(match_list, 1000)) == ['1', '2']
+    # Approximate count of only the last chunk alone exceeds budget left, so it isn't counted
+    assert context_packer.get_stats()['screened_out'] == 1
+    assert context_packer.get_stats()['metadata_hits'] == 3
+
+
+def test_context_packer_greedy_2():
+    """Approximate count higher than budget left doesn't drop a chunk that fits"""
+    context_packer = ContextPacker(ENCODING_NAME, ContextPacker.STRATEGY_GREEDY)
+    match_list = [_get_match('0', 600), _get_match('1', 300, 450),
+                  {'content': None, 'message': 'no content'}, _get_match('2', 100)]
+    packed_match_list = context_packer.pack(match_list, 1000)
+    assert _get_chunk_ids(packed_match_list) == ['0', '1', '2']
+    assert {'content': None, 'message': 'no content'} in packed_match_list
+
+    # Top match is kept even if it alone exceeds the budget
+    assert _get_chunk_ids(context_packer.pack(match_list[:1], 500)) == ['0']
+
+
+def test_context_packer_score_weighted_1():
+    """Short chunks replace a long one, and are returned in rank order"""
+    match_list = [_get_match('0', 600), _get_match('1', 300), _get_match('2', 300), _get_match('3', 100)]
+    context_packer = ContextPacker(ENCODING_NAME, ContextPacker.STRATEGY_SCORE_WEIGHTED)
+    assert _get_chunk_ids(context_packer.pack(match_list, 700)) == ['1', '2', '3']
+    assert context_packer.get_stats()['screened_out'] == 1
+
+    context_packer = ContextPacker(ENCODING_NAME, ContextPacker.STRATEGY_GREEDY)
+    assert _get_chunk_ids(context_packer.pack(match_list, 700)) == ['0', '3']
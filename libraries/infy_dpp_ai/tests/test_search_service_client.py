@@ -0,0 +1,141 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+"""Test search service client using a stubbed session, so that no search service is required"""
+import json
+import time
+import types
+import threading
+import pytest
+from infy_dpp_ai.semantic_search.service.provider import search_service_client
+from infy_dpp_ai.semantic_search.service.provider.search_service_client import SearchServiceClient
+
+MAX_REQUESTS_PER_MINUTE = 60000
+
+
+class _StubResponse():
+    """Response of requests having only what the client reads"""
+
+    def __init__(self, status_code: int, text: str):
+        self.status_code = status_code
+        self.text = text
+        self.headers = {}
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class _StubSession():
+    """Returns responses of `get_response(payload)` and records payloads and client rate at each post"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.payloads = []
+        self.rates = []
+        self.client = None
+        self.__lock = threading.Lock()
+
+    def post(self, url, json=None, timeout=None):
+        with self.__lock:
+            self.payloads.append(json)
+            self.rates.append(self.client._SearchServiceClient__bucket.get_rate())
+        return self.get_response(json)
+
+    def close(self):
+        pass
+
+
+def _get_client(get_response, max_workers: int = 4) -> tuple:
+    client = SearchServiceClient('http://localhost/search', {}, MAX_REQUESTS_PER_MINUTE,
+                                 max_workers=max_workers, max_retries=3)
+    session = _StubSession(get_response)
+    session.client = client
+    client._SearchServiceClient__session = session
+    return client, session
+
+
+def _get_success_response(payload: dict) -> _StubResponse:
+    return _StubResponse(200, json.dumps({'responseCde': 200, 'responseMsg': payload['id']}))
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    """Retry without waiting"""
+    monkeypatch.setattr(search_service_client, 'random',
+                        types.SimpleNamespace(uniform=lambda a, b: 0))
+
+
+def test_search_all_in_order():
+    """Responses are yielded in order of payloads though later requests finish first"""
+    def get_response(payload):
+        time.sleep(0.01 * (8 - payload['id'] % 8))
+        return _get_success_response(payload)
+
+    client, session = _get_client(get_response)
+    try:
+        result_list = list(client.search_all({'id': x} for x in range(20)))
+    finally:
+        client.close()
+    assert [x['responseMsg'] for x in result_list] == list(range(20))
+    assert len(session.payloads) == 20
+
+
+def test_search_throttled():
+    """Rate is halved on every 429 and raised again by a tenth of the maximum on success"""
+    status_code_list = [429, 429, 200, 200, 200, 200, 200, 200, 200, 200]
+
+    def get_response(payload):
+        status_code = status_code_list.pop(0)
+        if status_code == 429:
+            return _StubResponse(429, 'Too many requests')
+        return _get_success_response(payload)
+
+    client, session = _get_client(get_response, max_workers=1)
+    try:
+        assert client.search({'id': 0}) == {'responseCde': 200, 'responseMsg': 0}
+        assert session.rates == pytest.approx([MAX_REQUESTS_PER_MINUTE * x for x in [1, 0.5, 0.25]])
+        # Recovery
+        result_list = list(client.search_all({'id': x} for x in range(1, 8)))
+        assert [x['responseMsg'] for x in result_list] == list(range(1, 8))
+        assert session.rates[3:6] == pytest.approx([MAX_REQUESTS_PER_MINUTE * x for x in [0.35, 0.45, 0.55]])
+        assert client._SearchServiceClient__bucket.get_rate() == pytest.approx(MAX_REQUESTS_PER_MINUTE)
+    finally:
+        client.close()
+
+
+def test_search_non_json_response():
+    """Error page which isn't json is a failed response, and isn't retried"""
+    client, session = _get_client(lambda payload: _StubResponse(502, '<html>Bad Gateway</html>'))
+    try:
+        result_list = list(client.search_all({'id': x} for x in range(3)))
+    finally:
+        client.close()
+    assert result_list == [{'responseCde': 502, 'responseMsg': '<html>Bad Gateway</html>'}] * 3
+    assert len(session.payloads) == 3
+
+
+def test_search_all_stopped_early():
+    """Requests not yet started are cancelled when the caller stops"""
+    read_payload_list = []
+
+    def get_payloads():
+        for idx in range(10):
+            read_payload_list.append(idx)
+            yield {'id': idx}
+
+    def get_response(payload):
+        time.sleep(0.05)
+        return _get_success_response(payload)
+
+    client, session = _get_client(get_response, max_workers=1)
+    try:
+        result_iter = client.search_all(get_payloads())
+        assert next(result_iter)['responseMsg'] == 0
+        result_iter.close()
+    finally:
+        client.close()
+    assert len(read_payload_list) == 3
+    assert len(session.payloads) <= 2
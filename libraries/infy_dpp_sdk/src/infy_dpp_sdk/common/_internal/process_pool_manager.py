@@ -0,0 +1,148 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+"""Module for ProcessPoolManager class"""
+import os
+import json
+import pickle
+import importlib
+import threading
+import traceback
+import contextvars
+import concurrent.futures
+from typing import List
+import infy_fs_utils
+from .singleton import Singleton
+from .processor_helper import ProcessorHelper
+from ...common import Constants
+from ...data import DocumentData, ProcessorResponseData
+
+# Processor instances created inside a worker process, reused across chunks
+_WORKER_PROCESSOR_INSTANCE_DICT = {}
+# (executor, chunk size) acquired by the current run
+_CURRENT_POOL = contextvars.ContextVar('dpp_process_pool', default=None)
+
+
+class ProcessPoolManager(metaclass=Singleton):
+    """Holds the process pool used by `IProcessor.do_execute_batch` when enabled
+    from orchestrator config (`orchestrator.processor_invocation.process_pool`).
+    The pool is created by the first run which acquires it and kept for later runs, so workers
+    are spawned once per process. Runs in progress share it; it's created again only when
+    acquired with other settings while no run is using it. The pool is seen via `get_executor`
+    only by the run which acquired it (and threads started with a copy of its context), so
+    other runs in the same process are unaffected."""
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__executor: concurrent.futures.ProcessPoolExecutor = None
+        self.__pool_key = None
+        self.__run_count = 0
+
+    def acquire(self, max_workers: int = None, chunk_size: int = 1) -> contextvars.Token:
+        """Use the process pool in this context, creating it if needed with workers
+        initialised with current FS and logging handlers. Returns token to be passed to
+        `release`."""
+        storage_config_data, logging_config_data = None, None
+        if infy_fs_utils.manager.FileSystemManager().has_fs_handler(Constants.FSH_DPP):
+            storage_config_data = infy_fs_utils.manager.FileSystemManager(
+            ).get_fs_handler(Constants.FSH_DPP).get_storage_config_data()
+        if infy_fs_utils.manager.FileSystemLoggingManager().has_fs_logging_handler(Constants.FSLH_DPP):
+            logging_config_data = infy_fs_utils.manager.FileSystemLoggingManager(
+            ).get_fs_logging_handler(Constants.FSLH_DPP).get_logging_config_data()
+        pool_key = json.dumps([max_workers, storage_config_data, logging_config_data],
+                              sort_keys=True, default=str)
+        old_executor = None
+        with self.__lock:
+            if self.__executor and self.__pool_key != pool_key and self.__run_count == 0:
+                old_executor, self.__executor = self.__executor, None
+            if self.__executor is None:
+                self.__executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=max_workers, initializer=initialize_worker,
+                    initargs=(storage_config_data, logging_config_data))
+                self.__pool_key = pool_key
+            self.__run_count += 1
+            executor = self.__executor
+        if old_executor:
+            old_executor.shutdown(wait=True)
+        return _CURRENT_POOL.set((executor, max(1, chunk_size or 1)))
+
+    def release(self, token: contextvars.Token):
+        """Stop using the process pool in this context. The pool is kept for later runs."""
+        _CURRENT_POOL.reset(token)
+        with self.__lock:
+            self.__run_count -= 1
+
+    def shutdown(self):
+        """Shutdown the process pool if no run is using it, e.g. when application stops"""
+        with self.__lock:
+            if self.__run_count > 0:
+                return
+            executor, self.__executor = self.__executor, None
+        if executor:
+            executor.shutdown(wait=True)
+
+    def get_executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        """Get process pool executor of the current run. Returns None when not acquired."""
+        current_pool = _CURRENT_POOL.get()
+        return current_pool[0] if current_pool else None
+
+    def get_chunk_size(self) -> int:
+        """Get number of documents of the current run dispatched to a worker in one go"""
+        current_pool = _CURRENT_POOL.get()
+        return current_pool[1] if current_pool else 1
+
+
+def initialize_worker(storage_config_data, logging_config_data):
+    """Run once per worker process to setup FSHandler and LoggingHandler.
+    Handlers inherited from the parent process (e.g. when forked) are reused."""
+    if storage_config_data and not infy_fs_utils.manager.FileSystemManager().has_fs_handler(
+            Constants.FSH_DPP):
+        file_sys_handler = infy_fs_utils.provider.FileSystemHandler(
+            storage_config_data)
+        infy_fs_utils.manager.FileSystemManager().set_root_handler_name(Constants.FSH_DPP)
+        infy_fs_utils.manager.FileSystemManager().add_fs_handler(file_sys_handler)
+    if logging_config_data and storage_config_data and \
+            not infy_fs_utils.manager.FileSystemLoggingManager().has_fs_logging_handler(Constants.FSLH_DPP):
+        # Separate log file per worker process
+        logging_config_data = logging_config_data.copy(deep=True)
+        logging_config_data.log_file_data.log_file_name_prefix = \
+            f"{logging_config_data.log_file_data.log_file_name_prefix}_{os.getpid()}"
+        file_sys_logging_handler = infy_fs_utils.provider.FileSystemLoggingHandler(
+            logging_config_data, infy_fs_utils.manager.FileSystemManager().get_fs_handler())
+        infy_fs_utils.manager.FileSystemLoggingManager(
+        ).set_root_handler_name(Constants.FSLH_DPP)
+        infy_fs_utils.manager.FileSystemLoggingManager(
+        ).add_fs_logging_handler(file_sys_logging_handler)
+
+
+def execute_chunk(processor_module_name: str, processor_class_name: str, processor_name: str,
+                  document_data_list: List[DocumentData], context_data_list: List[dict],
+                  config_data_bytes: bytes) -> List[ProcessorResponseData]:
+    """Run `do_execute` for a chunk of documents inside a worker process. Config is pickled
+    once per batch and unpickled for each document, so that each gets a pristine copy as in
+    serial execution without a deep copy per document."""
+    key = f"{processor_module_name}.{processor_class_name}"
+    processor_obj = _WORKER_PROCESSOR_INSTANCE_DICT.get(key)
+    if processor_obj is None:
+        library = importlib.import_module(processor_module_name)
+        processor_obj = getattr(library, processor_class_name)()
+        _WORKER_PROCESSOR_INSTANCE_DICT[key] = processor_obj
+    processor_obj.set_proc_name(processor_name)
+    logger = processor_obj.get_logger()
+    processor_response_data_list = []
+    for document_data, context_data in zip(document_data_list, context_data_list):
+        processor_obj.start()
+        try:
+            processor_response_data_list.append(processor_obj.do_execute(
+                document_data, context_data, pickle.loads(config_data_bytes)))
+        except Exception as ex:
+            logger.error(traceback.format_exc())
+            processor_response_data_list.append(ProcessorHelper.create_processor_response_data(
+                document_data, context_data, ex))
+        finally:
+            document_id = document_data.document_id if document_data else ""
+            processor_obj.end(processor_name, document_id)
+    return processor_response_data_list
@@ -29,6 +29,21 @@ class ProcessorHelper():
             message_data=message_data)
         return processor_response_data
 
+    @classmethod
+    def create_message_data(cls, message_data_dict: dict) -> MessageData:
+        """Create Message Data from dict (e.g. read from a file)"""
+        message_data = MessageData(**message_data_dict)
+        for message_item_data in message_data.messages:
+            # Assign enum object to message_code if it got diluted
+            if isinstance(message_item_data.message_code, int):
+                message_code_enum = [
+                    x for x in MessageCodeEnum if x.value == message_item_data.
+                    message_code]
+                message_code_enum = message_code_enum[0] if message_code_enum else None
+                if message_code_enum:
+                    message_item_data.message_code = message_code_enum
+        return message_data
+
     @classmethod
     def get_messages(cls, processor_response_data: ProcessorResponseData,
                      message_code_enum: MessageCodeEnum = None) -> list:
@@ -0,0 +1,151 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+"""Module for ProcessorInstancePool class"""
+import copy
+import json
+import logging
+import hashlib
+import importlib
+import threading
+import contextlib
+import collections
+from .singleton import Singleton
+from ...interface.i_processor import IProcessor
+
+
+class ProcessorInstancePool(metaclass=Singleton):
+    """Keeps processor instances alive across `run_batch` calls and requests in the same process.
+    Only processors which opt in by setting `_REUSABLE_INSTANCE = True` are kept; others get a
+    new instance on every call (with the imported class cached).
+    Instances are keyed by processor namespace, class name and, for processors which override
+    `on_load`, hash of config data. Other processors get config only on execute, so an instance
+    suits any config e.g. one changed per request. An instance is handed to one caller at a time, so concurrent callers get separate instances.
+    Within `worker_scope`, a thread gets the same instance of a non-reusable processor on every
+    call, e.g. a pipeline stage worker runs all its documents through one instance."""
+
+    def __init__(self, max_keys: int = 32):
+        self.__lock = threading.Lock()
+        self.__max_keys = max_keys
+        self.__class_dict = {}
+        # key -> list of idle instances, in LRU order
+        self.__idle_instance_dict = collections.OrderedDict()
+        self.__stats = {'created': 0, 'reused': 0, 'unloaded': 0}
+        # instance_dict of the current thread's worker scope
+        self.__local = threading.local()
+
+    def get_processor_class(self, processor_namespace: str, processor_class_name: str):
+        """Import (once) and return processor class"""
+        class_key = f"{processor_namespace}.{processor_class_name}"
+        processor_class = self.__class_dict.get(class_key)
+        if processor_class is None:
+            library = importlib.import_module(processor_namespace)
+            processor_class = getattr(library, processor_class_name)
+            with self.__lock:
+                self.__class_dict[class_key] = processor_class
+        return processor_class
+
+    def acquire(self, processor_namespace: str, processor_class_name: str,
+                config_data: dict) -> tuple:
+        """Get a processor instance. Returns tuple of (instance, instance_key).
+        `instance_key` is None for processors which are not reusable."""
+        processor_class = self.get_processor_class(
+            processor_namespace, processor_class_name)
+        instance_key = self.__get_instance_key(
+            processor_class, processor_namespace, processor_class_name, config_data)
+        if not getattr(processor_class, '_REUSABLE_INSTANCE', False):
+            worker_instance_dict = getattr(self.__local, 'instance_dict', None)
+            if worker_instance_dict is None:
+                return processor_class(), None
+            processor_obj = worker_instance_dict.get(instance_key)
+            if processor_obj is None:
+                processor_obj = processor_class()
+                worker_instance_dict[instance_key] = processor_obj
+            return processor_obj, None
+        with self.__lock:
+            idle_instance_list = self.__idle_instance_dict.get(instance_key)
+            if idle_instance_list:
+                self.__idle_instance_dict.move_to_end(instance_key)
+                self.__stats['reused'] += 1
+                return idle_instance_list.pop(), instance_key
+        processor_obj = processor_class()
+        processor_obj.on_load(copy.deepcopy(config_data))
+        with self.__lock:
+            self.__stats['created'] += 1
+        return processor_obj, instance_key
+
+    def release(self, instance_key: str, processor_obj):
+        """Return an instance obtained from `acquire` so that it can be reused"""
+        if instance_key is None:
+            return
+        evicted_instance_list = []
+        with self.__lock:
+            self.__idle_instance_dict.setdefault(
+                instance_key, []).append(processor_obj)
+            self.__idle_instance_dict.move_to_end(instance_key)
+            while len(self.__idle_instance_dict) > self.__max_keys:
+                _, instance_list = self.__idle_instance_dict.popitem(
+                    last=False)
+                evicted_instance_list.extend(instance_list)
+        self.__unload(evicted_instance_list)
+
+    def warm_up(self, processor_namespace: str, processor_class_name: str, config_data: dict):
+        """Import processor and keep one loaded instance ready if the processor is reusable.
+        Processors which are not reusable are only imported, as their instances are not kept."""
+        processor_class = self.get_processor_class(
+            processor_namespace, processor_class_name)
+        if not getattr(processor_class, '_REUSABLE_INSTANCE', False):
+            return
+        processor_obj, instance_key = self.acquire(
+            processor_namespace, processor_class_name, config_data)
+        self.release(instance_key, processor_obj)
+
+    @contextlib.contextmanager
+    def worker_scope(self):
+        """Context manager within which the calling thread keeps its own instance of each
+        non-reusable processor. Instances are dropped when the scope ends."""
+        previous_instance_dict = getattr(self.__local, 'instance_dict', None)
+        self.__local.instance_dict = {}
+        try:
+            yield
+        finally:
+            self.__local.instance_dict = previous_instance_dict
+
+    def clear(self):
+        """Unload and remove all idle instances"""
+        with self.__lock:
+            evicted_instance_list = [y for x in self.__idle_instance_dict.values()
+                                     for y in x]
+            self.__idle_instance_dict.clear()
+        self.__unload(evicted_instance_list)
+
+    def get_stats(self) -> dict:
+        """Get counts of instances created, reused and unloaded, and currently idle"""
+        with self.__lock:
+            stats = dict(self.__stats)
+            stats['idle'] = sum(len(x)
+                                for x in self.__idle_instance_dict.values())
+        return stats
+
+    # ---------- Private Methods ---------
+    def __get_instance_key(self, processor_class, processor_namespace: str, processor_class_name: str,
+                           config_data: dict) -> str:
+        if getattr(processor_class, 'on_load', None) is IProcessor.on_load:
+            return f"{processor_namespace}.{processor_class_name}"
+        config_hash = hashlib.sha256(json.dumps(
+            config_data, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+        return f"{processor_namespace}.{processor_class_name}:{config_hash}"
+
+    def __unload(self, processor_obj_list: list):
+        for processor_obj in processor_obj_list:
+            try:
+                processor_obj.on_unload()
+            except Exception as ex:
+                # Failure of one instance shouldn't stop others from being unloaded
+                logging.getLogger(__name__).warning(
+                    "on_unload failed for %s: %s", type(processor_obj).__name__, ex)
+            with self.__lock:
+                self.__stats['unloaded'] += 1
@@ -0,0 +1,150 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+"""Module for snapshot codec classes"""
+import json
+from typing import List
+try:
+    import msgpack
+except ImportError:
+    # This is optional component only required for msgpack snapshot codecs
+    pass
+try:
+    import zstandard
+except ImportError:
+    # This is optional component only required for zstd_msgpack snapshot codec
+    pass
+
+
+class SnapshotCodec():
+    """Base class for snapshot codec. Encodes a dict (e.g. DocumentData as dict), or any other
+    JSON value (e.g. null context data), to bytes and back."""
+    name = None
+    file_extension = None
+
+    def encode(self, data: dict) -> bytes:
+        """Encode dict to bytes"""
+        raise NotImplementedError
+
+    def decode(self, data: bytes, fields: List[str] = None) -> dict:
+        """Decode bytes to dict. If `fields` is given, only those top level keys are returned."""
+        raise NotImplementedError
+
+    @classmethod
+    def _select_fields(cls, data: dict, fields: List[str] = None) -> dict:
+        if fields is None or not isinstance(data, dict):
+            return data
+        return {k: v for k, v in data.items() if k in fields}
+
+
+class JsonSnapshotCodec(SnapshotCodec):
+    """Indented JSON (default and backward compatible format)"""
+    name = "json"
+    file_extension = ".json"
+    _INDENT = 4
+
+    def encode(self, data: dict) -> bytes:
+        return json.dumps(data, indent=self._INDENT).encode('utf-8')
+
+    def decode(self, data: bytes, fields: List[str] = None) -> dict:
+        return self._select_fields(json.loads(data), fields)
+
+
+class CompactJsonSnapshotCodec(JsonSnapshotCodec):
+    """JSON without indentation and whitespace"""
+    name = "json_compact"
+    _INDENT = None
+
+    def encode(self, data: dict) -> bytes:
+        return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+class MsgpackSnapshotCodec(SnapshotCodec):
+    """Columnar msgpack. Each top level key is packed separately so that a subset of keys can be
+    decoded without parsing the rest. Values other than dict are packed as a single column."""
+    name = "msgpack"
+    file_extension = ".msgpack"
+    # Encoded data always starts with a 2 entry map whose first key is `codec`
+    MAGIC = b'\x82\xa5codec'
+
+    def __init__(self):
+        if 'msgpack' not in globals():
+            raise ImportError(
+                f"msgpack is required for snapshot codec '{self.name}'")
+
+    def encode(self, data: dict) -> bytes:
+        if not isinstance(data, dict):
+            return msgpack.packb({'codec': self.name, 'value': self._encode_column(
+                msgpack.packb(data, use_bin_type=True))}, use_bin_type=True)
+        columns = {k: self._encode_column(msgpack.packb(v, use_bin_type=True))
+                   for k, v in data.items()}
+        return msgpack.packb({'codec': self.name, 'columns': columns}, use_bin_type=True)
+
+    def decode(self, data: bytes, fields: List[str] = None) -> dict:
+        unpacked_data = msgpack.unpackb(data, raw=False)
+        if 'columns' not in unpacked_data:
+            return msgpack.unpackb(self._decode_column(unpacked_data['value']), raw=False)
+        return {k: msgpack.unpackb(self._decode_column(v), raw=False)
+                for k, v in self._select_fields(unpacked_data['columns'], fields).items()}
+
+    def _encode_column(self, data: bytes) -> bytes:
+        return data
+
+    def _decode_column(self, data: bytes) -> bytes:
+        return data
+
+
+class ZstdMsgpackSnapshotCodec(MsgpackSnapshotCodec):
+    """Columnar msgpack with each column compressed using zstd. The file itself is msgpack, not
+    a zstd frame."""
+    name = "zstd_msgpack"
+    file_extension = ".zstd.msgpack"
+    _LEVEL = 3
+
+    def __init__(self):
+        super().__init__()
+        if 'zstandard' not in globals():
+            raise ImportError(
+                f"zstandard is required for snapshot codec '{self.name}'")
+
+    def _encode_column(self, data: bytes) -> bytes:
+        return zstandard.ZstdCompressor(level=self._LEVEL).compress(data)
+
+    def _decode_column(self, data: bytes) -> bytes:
+        return zstandard.ZstdDecompressor().decompress(data)
+
+
+class SnapshotCodecFactory():
+    """Factory for snapshot codecs"""
+    __CODEC_DICT = {x.name: x for x in [JsonSnapshotCodec, CompactJsonSnapshotCodec,
+                                        MsgpackSnapshotCodec, ZstdMsgpackSnapshotCodec]}
+
+    @classmethod
+    def get_codec(cls, codec_name: str = None) -> SnapshotCodec:
+        """Get codec by name. Defaults to `json`."""
+        codec_name = codec_name or JsonSnapshotCodec.name
+        codec_class = cls.__CODEC_DICT.get(codec_name)
+        if not codec_class:
+            raise ValueError(
+                f"Unsupported snapshot codec '{codec_name}'. Supported are {list(cls.__CODEC_DICT)}")
+        return codec_class()
+
+    @classmethod
+    def detect_codec(cls, data: bytes) -> SnapshotCodec:
+        """Detect codec from encoded data. Data not starting with the msgpack codec header is
+        taken to be JSON (any JSON value, e.g. `null`)."""
+        if not data.startswith(MsgpackSnapshotCodec.MAGIC):
+            # Both JSON variants are decoded the same way
+            return JsonSnapshotCodec()
+        if 'msgpack' not in globals():
+            raise ImportError(
+                "msgpack is required to read binary snapshot files")
+        unpacker = msgpack.Unpacker(raw=False)
+        # Only the header is read here. `codec` is always the first key.
+        unpacker.feed(data[:64])
+        unpacker.read_map_header()
+        unpacker.skip()
+        return cls.get_codec(unpacker.unpack())
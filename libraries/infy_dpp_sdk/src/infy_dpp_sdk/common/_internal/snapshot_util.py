@@ -11,8 +11,11 @@ import infy_fs_utils
 from .singleton import Singleton
 from ...data import (DocumentData, ControllerRequestData, SnapshotData,
                      RecordData, ControllerResponseData, ProcessorResponseData,
-                     MessageData, MessageCodeEnum)
+                     MessageData)
 from .dpp_json_encoder import DppJSONEncoder
+from .snapshot_codec import SnapshotCodec, SnapshotCodecFactory, JsonSnapshotCodec
+from .tracer import Tracer
+from .processor_helper import ProcessorHelper
 from .. import Constants, PydanticUtil
 
 
@@ -46,9 +49,174 @@ class SnapshotUtil(metaclass=Singleton):
             processor_response_data_list.append(processor_response_data)
         return processor_response_data_list
 
-    def load_snapshots(self, controller_request_data: ControllerRequestData):
-        """Load snapshot(s) to memory"""
+    def load_snapshots(self, controller_request_data: ControllerRequestData,
+                       document_data_fields: List[str] = None):
+        """Load snapshot(s) to memory. Snapshot format is detected from file content.
+        If `document_data_fields` is given, only those fields of DocumentData are loaded."""
+        tracer = Tracer.get_current()
+        with tracer.span('snapshot_load', request_id=controller_request_data.request_id):
+            document_data_list, context_data_list, message_data_list = self.__load_snapshots(
+                controller_request_data, document_data_fields)
+        tracer.add_counter('documents_loaded', len(document_data_list))
+        return document_data_list, context_data_list, message_data_list
+
+    def save_snapshots(self, controller_request_data: ControllerRequestData,
+                       processor_response_data_list: List[ProcessorResponseData],
+                       document_data_fields: List[str] = None,
+                       codec_name: str = None) -> ControllerResponseData:
+        """Save snapshot(s) to storage.
+        Codec is `codec_name` (default `json`). Callers resolve it from
+        `orchestrator.snapshot.codec` of input config once per run and pass it in.
+        If `document_data_fields` is given, the documents were loaded partially and the rest of
+        the fields are carried over from the incoming snapshot."""
+        tracer = Tracer.get_current()
+        with tracer.span('snapshot_save', request_id=controller_request_data.request_id):
+            controller_response_data = self.__save_snapshots(
+                controller_request_data, processor_response_data_list, document_data_fields,
+                codec_name)
+        tracer.add_counter('documents_saved', len(processor_response_data_list))
+        return controller_response_data
+
+    def read_controller_response_data(self, controller_res_file_path) -> ControllerResponseData:
+        """Read ControllerResponseData from file"""
+        controller_response_data: ControllerResponseData = None
+        if controller_res_file_path:
+            # TODO: Handle multiple controller response files
+            if isinstance(controller_res_file_path, list):
+                controller_res_file_path = controller_res_file_path[0]
+            tracer = Tracer.get_current()
+            with tracer.span('controller_file_read', file_path=controller_res_file_path):
+                data_as_json_str = self.__fs_handler.read_file(
+                    controller_res_file_path)
+            tracer.add_counter('bytes_read', len(data_as_json_str))
+            data = json.loads(data_as_json_str)
+            controller_response_data = ControllerResponseData(**data)
+        return controller_response_data
+
+    def save_controller_response_data(self, controller_response_data: ControllerResponseData):
+        """Create ControllerResponseData file"""
+        temp_folder_path = Constants._ORCHESTRATOR_ROOT_PATH
+        request_id = controller_response_data.request_id
+        self.__fs_handler.create_folders(temp_folder_path)
+        json_file_path = f"{temp_folder_path}/{request_id}{Constants._CONTROLLER_RESPONSE_FILE_NAME_SUFFIX}"
+        self.__logger.info("Processor input config file path - %s",
+                           json_file_path)
+        # Due to TypeError: Object of type ProcessorFilterData is not JSON serializable
+        controller_response_data = json.loads(
+            DppJSONEncoder().encode(controller_response_data))
+        data_as_json_str = json.dumps(controller_response_data, indent=4)
+        tracer = Tracer.get_current()
+        with tracer.span('controller_file_write', file_path=json_file_path):
+            self.__fs_handler.write_file(
+                json_file_path, data_as_json_str, encoding='utf-8')
+        tracer.add_counter('bytes_written', len(data_as_json_str))
+        # rel_path = json_file_path.replace(data_root_path, "")
+        # return rel_path
+        return json_file_path
+
+    def consolidate_controller_response_data(self, controller_res_file_path_list: list,
+                                             processor_response_data_lists: List[List[ProcessorResponseData]] = None,
+                                             base_processor_response_data_list: List[ProcessorResponseData] = None,
+                                             codec_name: str = None) \
+            -> ControllerResponseData:
+        """Consolidate ProcessorResponseData list.
+        If the sub-processor results are already in memory, pass them in
+        `processor_response_data_lists` (same order as `controller_res_file_path_list`) so that
+        snapshots are not loaded again. See `consolidate_processor_response_data` for
+        `base_processor_response_data_list`. Snapshots are saved using `codec_name`."""
+        processor_filter_list = []
+        merged_controller_response_data: ControllerResponseData = None
+        _processor_response_data_lists: List[List[ProcessorResponseData]] = []
+        # Loop through all controller response files
+        for idx, path_idx in enumerate(sorted(range(len(controller_res_file_path_list)),
+                                              key=lambda x: controller_res_file_path_list[x])):
+            controller_resp_data = self.read_controller_response_data(
+                controller_res_file_path_list[path_idx])
+            if idx == 0:
+                merged_controller_response_data = controller_resp_data
+                merged_controller_response_data.description = "Auto-consolidated by DPP orchestrator"
+                merged_controller_response_data.request_id = merged_controller_response_data.request_id.split(".")[
+                    0]
+            processor_filter_list.extend(
+                controller_resp_data.processor_filter.includes)
+            if processor_response_data_lists is None:
+                _processor_response_data_lists.append(
+                    self.create_processor_response_data_list(controller_resp_data))
+            else:
+                _processor_response_data_lists.append(
+                    processor_response_data_lists[path_idx])
+
+        processor_response_data_list = self.consolidate_processor_response_data(
+            _processor_response_data_lists, base_processor_response_data_list)
+
+        merged_controller_response_data.processor_filter.includes = processor_filter_list
+        merged_controller_response_data = self.save_snapshots(
+            merged_controller_response_data,
+            processor_response_data_list, codec_name=codec_name)
+
+        return merged_controller_response_data, processor_response_data_list
+
+    def consolidate_processor_response_data(self,
+                                            processor_response_data_lists: List[List[ProcessorResponseData]],
+                                            base_processor_response_data_list: List[ProcessorResponseData] = None
+                                            ) -> List[ProcessorResponseData]:
+        """Consolidate in-memory ProcessorResponseData lists of parallel sub-processors.
+        `base_processor_response_data_list` is the common input given to the sub-processors.
+        When given, only the fields (and context keys) changed by a sub-processor are merged
+        into the input document, and context keys removed by a sub-processor are removed.
+        Else the last sub-processor wins for each field.
+        Messages of all sub-processors are kept."""
+        base_map = {x.document_data.document_id: x
+                    for x in base_processor_response_data_list or [] if x.document_data}
+        response_map = {}
+        for processor_response_data_list in processor_response_data_lists:
+            for processor_response_data in processor_response_data_list:
+                response_map.setdefault(
+                    processor_response_data.document_data.document_id, []).append(
+                        processor_response_data)
+
+        # dict retains the order in which documents were first seen
+        processor_response_data_list: List[ProcessorResponseData] = []
+        for document_id, _processor_response_data_list in response_map.items():
+            base_processor_response_data = base_map.get(document_id)
+            document_data = self.__merge_model_fields(
+                [x.document_data for x in _processor_response_data_list],
+                base_processor_response_data.document_data if base_processor_response_data else None)
+            context_data = self.__merge_dict_keys(
+                [x.context_data for x in _processor_response_data_list],
+                base_processor_response_data.context_data if base_processor_response_data else None)
+            message_data = self.__merge_message_data(
+                [x.message_data for x in _processor_response_data_list])
+            processor_response_data = ProcessorResponseData(
+                document_data=document_data, context_data=context_data,
+                message_data=message_data)
+            processor_response_data_list.append(processor_response_data)
+
+        return processor_response_data_list
+
+    def carry_forward_processor_response_data(self,
+                                              incoming_processor_response_data_list: List[ProcessorResponseData],
+                                              processor_response_data_list: List[ProcessorResponseData]
+                                              ) -> List[ProcessorResponseData]:
+        """In-memory equivalent of `save_snapshots` record handling. Documents not returned by
+        the processor are carried forward from the incoming list and new documents are appended."""
+        merged_map = {}
+        for incoming_processor_response_data in incoming_processor_response_data_list or []:
+            document_id = incoming_processor_response_data.document_data.document_id
+            if document_id in merged_map:
+                message = f"Duplicate records found for document_id: {document_id}"
+                raise ValueError(message)
+            merged_map[document_id] = incoming_processor_response_data
+        for processor_response_data in processor_response_data_list:
+            merged_map[processor_response_data.document_data.document_id] = processor_response_data
+        return list(merged_map.values())
+
+    # --------- Private Methods -------------
+    def __load_snapshots(self, controller_request_data: ControllerRequestData,
+                         document_data_fields: List[str] = None):
         snapshot_dir_root_path = controller_request_data.snapshot_dir_root_path
+        if document_data_fields is not None and 'document_id' not in document_data_fields:
+            document_data_fields = ['document_id'] + list(document_data_fields)
         document_data_list: List[DocumentData] = []
         context_data_list: List[dict] = []
         message_data_list: List[MessageData] = []
@@ -56,25 +224,18 @@ class SnapshotUtil(metaclass=Singleton):
             for record in controller_request_data.records:
                 record: RecordData = record
                 if record.snapshot.document_data_file_path:
-                    document_data: DocumentData = DocumentData(**self.__load_json(
-                        snapshot_dir_root_path + "/" + record.snapshot.document_data_file_path))
+                    document_data: DocumentData = DocumentData(**self.__load_data(
+                        snapshot_dir_root_path + "/" + record.snapshot.document_data_file_path,
+                        document_data_fields))
                     document_data_list.append(document_data)
-                    context_data: dict = self.__load_json(
+                    context_data: dict = self.__load_data(
                         snapshot_dir_root_path + "/" + record.snapshot.context_data_file_path)
                     context_data_list.append(context_data)
                     message_data = None
                     if record.snapshot.message_data_file_path:
-                        message_data: MessageData = MessageData(**self.__load_json(
-                            snapshot_dir_root_path + "/" + record.snapshot.message_data_file_path))
-                        for message_item_data in message_data.messages:
-                            # Assign enum object to message_code if it got diluted
-                            if isinstance(message_item_data.message_code, int):
-                                message_code_enum = [
-                                    x for x in MessageCodeEnum if x.value == message_item_data.
-                                    message_code]
-                                message_code_enum = message_code_enum[0] if message_code_enum else None
-                                if message_code_enum:
-                                    message_item_data.message_code = message_code_enum
+                        message_data: MessageData = ProcessorHelper.create_message_data(
+                            self.__load_data(
+                                snapshot_dir_root_path + "/" + record.snapshot.message_data_file_path))
                     message_data_list.append(message_data)
         if not document_data_list and controller_request_data.context:
             # This should run only first time when there are no records and context is present
@@ -82,14 +243,20 @@ class SnapshotUtil(metaclass=Singleton):
 
         return document_data_list, context_data_list, message_data_list
 
-    def save_snapshots(self, controller_request_data: ControllerRequestData,
-                       processor_response_data_list: List[ProcessorResponseData]) \
-            -> ControllerResponseData:
-        """Save snapshot(s) to storage"""
+    def __save_snapshots(self, controller_request_data: ControllerRequestData,
+                         processor_response_data_list: List[ProcessorResponseData],
+                         document_data_fields: List[str] = None,
+                         codec_name: str = None) -> ControllerResponseData:
+        codec = SnapshotCodecFactory.get_codec(codec_name)
         snapshot_dir_root_path = controller_request_data.snapshot_dir_root_path
         self.__fs_handler.create_folders(snapshot_dir_root_path)
         incoming_request_records: List[RecordData] = controller_request_data.records or [
         ]
+        # Index incoming records by document_id to avoid a scan per document
+        incoming_record_dict = {}
+        for incoming_request_record in incoming_request_records:
+            incoming_record_dict.setdefault(
+                incoming_request_record.document_id, []).append(incoming_request_record)
         new_records: List[RecordData] = []
         # Copy all data from incoming app request to app response object
         controller_response_data: ControllerResponseData = controller_request_data.copy()
@@ -102,19 +269,27 @@ class SnapshotUtil(metaclass=Singleton):
             request_id = controller_request_data.request_id
             document_id = document_data.document_id
             # Generate file names based on request id and document id combination
-            document_data_file_path = f"{request_id}_{document_id}.{Constants._FILE_NAME_DOCUMENT_DATA}"
-            context_data_file_path = f"{request_id}_{document_id}.{Constants._FILE_NAME_CONTEXT_DATA}"
+            document_data_file_path = self.__get_file_name(
+                f"{request_id}_{document_id}.{Constants._FILE_NAME_DOCUMENT_DATA}", codec)
+            context_data_file_path = self.__get_file_name(
+                f"{request_id}_{document_id}.{Constants._FILE_NAME_CONTEXT_DATA}", codec)
             message_data_file_path = None
             if message_data:
-                message_data_file_path = f"{request_id}_{document_id}.{Constants._FILE_NAME_MESSAGE_DATA}"
+                message_data_file_path = self.__get_file_name(
+                    f"{request_id}_{document_id}.{Constants._FILE_NAME_MESSAGE_DATA}", codec)
 
-            incoming_record = [
-                x for x in incoming_request_records if x.document_id == document_id]
+            incoming_record = incoming_record_dict.get(document_id, [])
             if len(incoming_record) > 1:
                 message = f"Duplicate records found for document_id: {document_id}"
                 raise ValueError(message)
+            document_data_dict = PydanticUtil.get_json_dict(document_data)
             if len(incoming_record) == 1:
                 record: RecordData = incoming_record[0]
+                if document_data_fields is not None and record.snapshot.document_data_file_path:
+                    document_data_dict.update(self.__load_data(
+                        snapshot_dir_root_path + "/" + record.snapshot.document_data_file_path,
+                        [x for x in PydanticUtil.get_field_names(DocumentData)
+                         if x not in document_data_fields]))
                 record.snapshot.document_data_file_path = document_data_file_path
                 record.snapshot.context_data_file_path = context_data_file_path
                 record.snapshot.message_data_file_path = message_data_file_path
@@ -125,143 +300,79 @@ class SnapshotUtil(metaclass=Singleton):
                                                message_data_file_path=message_data_file_path)
                 new_records.append(record)
 
-            data_as_json_str = PydanticUtil.get_json_str(
-                document_data, indent=4)
-            self.__fs_handler.write_file(
-                snapshot_dir_root_path + "/" + document_data_file_path, data_as_json_str, encoding='utf-8')
-            data_as_json_str = json.dumps(context_data, indent=4)
-            self.__fs_handler.write_file(
-                snapshot_dir_root_path + "/" + context_data_file_path, data_as_json_str, encoding='utf-8')
+            self.__save_data(snapshot_dir_root_path + "/" + document_data_file_path,
+                             document_data_dict, codec)
+            self.__save_data(snapshot_dir_root_path + "/" + context_data_file_path,
+                             context_data, codec)
             if message_data:
-                data_as_json_str = PydanticUtil.get_json_str(message_data)
-                self.__fs_handler.write_file(
-                    snapshot_dir_root_path + "/" + message_data_file_path, data_as_json_str, encoding='utf-8')
+                self.__save_data(snapshot_dir_root_path + "/" + message_data_file_path,
+                                 PydanticUtil.get_json_dict(message_data), codec)
 
         if not controller_response_data.records:
             controller_response_data.records = []
         controller_response_data.records.extend(new_records)
         return controller_response_data
 
-    def read_controller_response_data(self, controller_res_file_path) -> ControllerResponseData:
-        """Read ControllerResponseData from file"""
-        controller_response_data: ControllerResponseData = None
-        if controller_res_file_path:
-            # TODO: Handle multiple controller response files
-            if isinstance(controller_res_file_path, list):
-                controller_res_file_path = controller_res_file_path[0]
-            data = json.loads(self.__fs_handler.read_file(
-                controller_res_file_path))
-            controller_response_data = ControllerResponseData(**data)
-        return controller_response_data
+    def __load_data(self, file_path: str, fields: List[str] = None) -> any:
+        with self.__fs_handler.get_file_object(file_path, 'rb') as file:
+            data = file.read()
+        Tracer.get_current().add_counter('bytes_read', len(data))
+        return SnapshotCodecFactory.detect_codec(data).decode(data, fields)
 
-    def save_controller_response_data(self, controller_response_data: ControllerResponseData):
-        """Create ControllerResponseData file"""
-        temp_folder_path = Constants._ORCHESTRATOR_ROOT_PATH
-        request_id = controller_response_data.request_id
-        self.__fs_handler.create_folders(temp_folder_path)
-        json_file_path = f"{temp_folder_path}/{request_id}{Constants._CONTROLLER_RESPONSE_FILE_NAME_SUFFIX}"
-        self.__logger.info("Processor input config file path - %s",
-                           json_file_path)
-        # Due to TypeError: Object of type ProcessorFilterData is not JSON serializable
-        controller_response_data = json.loads(
-            DppJSONEncoder().encode(controller_response_data))
-        data_as_json_str = json.dumps(controller_response_data, indent=4)
-        self.__fs_handler.write_file(
-            json_file_path, data_as_json_str, encoding='utf-8')
-        # rel_path = json_file_path.replace(data_root_path, "")
-        # return rel_path
-        return json_file_path
-
-    def consolidate_controller_response_data(self, controller_res_file_path_list: list) \
-            -> ControllerResponseData:
-        """Consolidate ProcessorResponseData list"""
-        document_id_list = []
-        processor_filter_list = []
-        merged_controller_response_data: ControllerResponseData = None
-        document_snapshot_map = {}
-        context_snapshot_map = {}
-        message_snapshot_map = {}
-        # Loop through all controller response files
-        for idx, controller_res_file_path in enumerate(sorted(controller_res_file_path_list)):
-            controller_resp_data = self.read_controller_response_data(
-                controller_res_file_path)
-            if idx == 0:
-                merged_controller_response_data = controller_resp_data
-                merged_controller_response_data.description = "Auto-consolidated by DPP orchestrator"
-                merged_controller_response_data.request_id = merged_controller_response_data.request_id.split(".")[
-                    0]
-            processor_filter_list.extend(
-                controller_resp_data.processor_filter.includes)
-            document_data_list, context_data_list, message_data_list = self.load_snapshots(
-                controller_resp_data)
-            # Loop through all records in controller response file
-            for document_data, context_data, message_data in zip(document_data_list,
-                                                                 context_data_list, message_data_list):
-                document_id = document_data.document_id
-                if not document_id in document_snapshot_map:
-                    document_id_list.append(document_id)
-                    document_snapshot_map[document_id] = []
-                    context_snapshot_map[document_id] = []
-                    message_snapshot_map[document_id] = []
-
-                document_snapshot_map[document_id].append(document_data)
-                context_snapshot_map[document_id].append(context_data)
-                message_snapshot_map[document_id].append(message_data)
-
-        # Now we've snapshots for each document_id fetched from all the controller response files
-        for document_id, snapshots in document_snapshot_map.items():
-            document_data = self.__merge_objects(*snapshots)
-            document_snapshot_map[document_id] = document_data
-
-        for document_id, snapshots in context_snapshot_map.items():
-            context_data = self.__merge_objects(*snapshots)
-            context_snapshot_map[document_id] = context_data
-
-        for document_id, snapshots in message_snapshot_map.items():
-            message_data = self.__merge_objects(*snapshots)
-            message_snapshot_map[document_id] = message_data
-
-        # We can now create a new controller response data object
-        processor_response_data_list: List[ProcessorResponseData] = []
-        for document_id in document_id_list:
-            processor_response_data = ProcessorResponseData(
-                document_data=document_snapshot_map.get(document_id),
-                context_data=context_snapshot_map.get(document_id),
-                message_data=message_snapshot_map.get(document_id))
-            processor_response_data_list.append(processor_response_data)
-
-        merged_controller_response_data.processor_filter.includes = processor_filter_list
-        merged_controller_response_data = self.save_snapshots(
-            merged_controller_response_data,
-            processor_response_data_list)
+    def __save_data(self, file_path: str, data: dict, codec: SnapshotCodec):
+        encoded_data = codec.encode(data)
+        Tracer.get_current().add_counter('bytes_written', len(encoded_data))
+        if isinstance(codec, JsonSnapshotCodec):
+            self.__fs_handler.write_file(
+                file_path, encoded_data.decode('utf-8'), encoding='utf-8')
+        else:
+            with self.__fs_handler.get_file_object(file_path, 'wb') as file:
+                file.write(encoded_data)
 
-        return merged_controller_response_data, processor_response_data_list
+    def __get_file_name(self, file_name: str, codec: SnapshotCodec) -> str:
+        return file_name[:-len(JsonSnapshotCodec.file_extension)] + codec.file_extension
 
-    # --------- Private Methods -------------
-    def __load_json(self, file_path) -> any:
-        data = json.loads(self.__fs_handler.read_file(
-            file_path))
-        return data
-
-    def __merge_objects(self, *objs: any):
-        """Merge objects"""
-        merged_obj = None
+    def __merge_model_fields(self, objs: list, base_obj: any = None):
+        """Merge pydantic objects field by field"""
+        objs = [x for x in objs if x is not None]
         if not objs:
-            return merged_obj
-        if isinstance(objs[0], dict):
-            dicts = objs
-        else:
-            dicts = [obj.dict() for obj in objs if obj]
+            return base_obj
+        if base_obj is None:
+            return objs[-1]
         merged_dict = {}
-        if dicts:
-            for d in dicts:
-                merged_dict.update(d)
-        if merged_dict:
-            if isinstance(objs[0], DocumentData):
-                merged_obj = DocumentData(**merged_dict)
-            elif isinstance(objs[0], MessageData):
-                merged_obj = MessageData(**merged_dict)
-            else:
-                merged_obj = merged_dict
+        for field_name in PydanticUtil.get_field_names(type(base_obj)):
+            base_value = getattr(base_obj, field_name)
+            merged_dict[field_name] = base_value
+            for obj in objs:
+                value = getattr(obj, field_name)
+                if value != base_value:
+                    merged_dict[field_name] = value
+        return type(base_obj)(**merged_dict)
+
+    def __merge_dict_keys(self, dicts: list, base_dict: dict = None) -> dict:
+        """Merge dicts key by key. Keys of `base_dict` missing in a dict were deleted by it."""
+        if base_dict is None and all(x is None for x in dicts):
+            return None
+        merged_dict = dict(base_dict or {})
+        for _dict in dicts:
+            if _dict is None:
+                continue
+            for key, value in _dict.items():
+                if base_dict is None or key not in base_dict or value != base_dict[key]:
+                    merged_dict[key] = value
+            for key in (base_dict or {}):
+                if key not in _dict:
+                    merged_dict.pop(key, None)
+        return merged_dict
 
-        return merged_obj
+    def __merge_message_data(self, message_data_list: List[MessageData]) -> MessageData:
+        """Merge messages of all objects"""
+        message_data_list = [x for x in message_data_list if x is not None]
+        if not message_data_list:
+            return None
+        message_item_data_list = []
+        for message_data in message_data_list:
+            for message_item_data in message_data.messages:
+                if message_item_data not in message_item_data_list:
+                    message_item_data_list.append(message_item_data)
+        return MessageData(messages=message_item_data_list)
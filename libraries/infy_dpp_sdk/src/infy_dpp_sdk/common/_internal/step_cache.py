@@ -0,0 +1,241 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+"""Module for StepCache class"""
+import re
+import json
+import hashlib
+import logging
+import threading
+import contextvars
+import collections
+import infy_fs_utils
+from .singleton import Singleton
+from .. import Constants
+
+# Step cache config of the current run
+_CURRENT_CONFIG = contextvars.ContextVar('dpp_step_cache_config', default=None)
+
+
+class StepCache(metaclass=Singleton):
+    """Content addressed cache of processor results stored using `infy_fs_utils` storage.
+    Key is hash of processor namespace/class, its (filtered) config data and the incoming
+    document and context data, so a result is reused only when all of them are unchanged.
+    Ids generated per run, i.e. `document_id` and uuids found in the incoming data (e.g. in work
+    folder paths), are left out of the key and replaced by placeholders in entries, so that a
+    re-run of the same input with new ids gets results with its own ids.
+    Caching is opt-in per processor, as processors may have side effects (e.g. upload).
+    Entries are evicted in LRU order when `max_entries` or `max_size_bytes` is exceeded.
+    Entries are shared by runs in the process, while config is per run (and threads started with
+    a copy of its context), so runs don't enable or disable the cache for each other."""
+    __CACHE_FOLDER_PATH = Constants._ORCHESTRATOR_ROOT_PATH + '/step_cache'
+    __INDEX_FILE_PATH = __CACHE_FOLDER_PATH + '/index.json'
+    __DEFAULT_MAX_ENTRIES = 10000
+    __DEFAULT_MAX_SIZE_BYTES = 1024 * 1024 * 1024
+    __RUN_ID_PATTERN = re.compile(
+        r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}')
+    __PLACEHOLDER_PATTERN = re.compile(r'<step_cache_run_id_(\d+)>')
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__run_count = 0
+        # key -> size in bytes, in LRU order. Loaded from storage on first use.
+        self.__index_dict: collections.OrderedDict = None
+        self.__total_size = 0
+        self.__dirty = False
+        self.__stats = {'hits': 0, 'misses': 0, 'puts': 0, 'evictions': 0}
+        if infy_fs_utils.manager.FileSystemLoggingManager().has_fs_logging_handler(Constants.FSLH_DPP):
+            self.__logger = infy_fs_utils.manager.FileSystemLoggingManager(
+            ).get_fs_logging_handler(Constants.FSLH_DPP).get_logger()
+        else:
+            self.__logger = logging.getLogger(__name__)
+
+    def start(self, config_data: dict) -> contextvars.Token:
+        """Enable cache for this context as per config i.e. {"max_entries": int,
+        "max_size_bytes": int, "processor_names": [], "exclude_processor_names": []}.
+        Processors in `processor_names` and those which set `_STEP_CACHEABLE`, unless excluded,
+        are cached. Returns token to be passed to `stop`."""
+        with self.__lock:
+            if self.__run_count == 0:
+                # Index is reloaded as storage may have changed since last run
+                self.__index_dict = None
+            self.__run_count += 1
+        return _CURRENT_CONFIG.set(config_data)
+
+    def stop(self, token: contextvars.Token):
+        """Save index and disable cache for this context"""
+        _CURRENT_CONFIG.reset(token)
+        with self.__lock:
+            self.__run_count -= 1
+        self.flush()
+
+    def is_enabled(self, processor_name: str = None, cacheable: bool = False) -> bool:
+        """Returns True if cache is enabled (for the processor, if given). `cacheable` is the
+        processor's `_STEP_CACHEABLE`."""
+        config_data = _CURRENT_CONFIG.get()
+        if config_data is None:
+            return False
+        if processor_name is None:
+            return True
+        if processor_name in (config_data.get('exclude_processor_names') or []):
+            return False
+        return cacheable or processor_name in (config_data.get('processor_names') or [])
+
+    @classmethod
+    def get_run_id_list(cls, document_data_dict: dict, context_data: any) -> list:
+        """Get ids generated per run found in incoming data, in order of first appearance.
+        Pass them to `get_key`, `get` and `put`."""
+        run_id_list = []
+        if document_data_dict.get('document_id'):
+            run_id_list.append(document_data_dict['document_id'])
+        data_as_json_str = json.dumps([document_data_dict, context_data], sort_keys=True, default=str)
+        for run_id in cls.__RUN_ID_PATTERN.findall(data_as_json_str):
+            if run_id not in run_id_list:
+                run_id_list.append(run_id)
+        return run_id_list
+
+    @classmethod
+    def get_key(cls, processor_namespace: str, processor_class_name: str, config_data: dict,
+                document_data_dict: dict, context_data: any, run_id_list: list = None) -> str:
+        """Get cache key. `document_id` and uuids in `run_id_list` don't change it."""
+        document_data_dict = {x: y for x, y in document_data_dict.items() if x != 'document_id'}
+        data = [processor_namespace, processor_class_name, config_data,
+                document_data_dict, context_data]
+        data_as_json_str = cls.__to_placeholders(
+            json.dumps(data, sort_keys=True, default=str), run_id_list)
+        return hashlib.sha256(data_as_json_str.encode('utf-8')).hexdigest()
+
+    def get(self, key: str, run_id_list: list = None) -> any:
+        """Get cached data, else None. Placeholders are replaced by ids of `run_id_list`."""
+        fs_handler = self.__get_fs_handler()
+        with self.__lock:
+            index_dict = self.__load_index(fs_handler)
+            found = key in index_dict
+        data = None
+        if found:
+            try:
+                data = json.loads(self.__from_placeholders(fs_handler.read_file(
+                    self.__get_entry_file_path(key)), run_id_list))
+            except Exception as ex:
+                # Entry removed from storage outside of cache
+                self.__logger.warning("Step cache entry %s not readable: %s", key, ex)
+        with self.__lock:
+            if data is None:
+                self.__stats['misses'] += 1
+                if key in self.__index_dict:
+                    self.__total_size -= self.__index_dict.pop(key)
+                    self.__dirty = True
+            else:
+                self.__stats['hits'] += 1
+                if key in self.__index_dict:
+                    self.__index_dict.move_to_end(key)
+                    self.__dirty = True
+        return data
+
+    def put(self, key: str, data: any, run_id_list: list = None):
+        """Add data to cache, with ids of `run_id_list` replaced by placeholders, and evict
+        least recently used entries if over limits"""
+        fs_handler = self.__get_fs_handler()
+        data_as_json_str = self.__to_placeholders(json.dumps(data), run_id_list)
+        entry_file_path = self.__get_entry_file_path(key)
+        fs_handler.create_folders(entry_file_path.rsplit('/', 1)[0])
+        fs_handler.write_file(entry_file_path, data_as_json_str, encoding='utf-8')
+        evicted_key_list = []
+        with self.__lock:
+            index_dict = self.__load_index(fs_handler)
+            self.__total_size -= index_dict.pop(key, 0)
+            index_dict[key] = len(data_as_json_str)
+            self.__total_size += index_dict[key]
+            self.__stats['puts'] += 1
+            self.__dirty = True
+            config_data = _CURRENT_CONFIG.get() or {}
+            max_entries = config_data.get(
+                'max_entries', self.__DEFAULT_MAX_ENTRIES)
+            max_size_bytes = config_data.get(
+                'max_size_bytes', self.__DEFAULT_MAX_SIZE_BYTES)
+            while len(index_dict) > 1 and (len(index_dict) > max_entries or
+                                           self.__total_size > max_size_bytes):
+                evicted_key, size = index_dict.popitem(last=False)
+                self.__total_size -= size
+                self.__stats['evictions'] += 1
+                evicted_key_list.append(evicted_key)
+        for evicted_key in evicted_key_list:
+            try:
+                fs_handler.delete_file(self.__get_entry_file_path(evicted_key))
+            except Exception as ex:
+                self.__logger.warning("Step cache entry %s not deleted: %s", evicted_key, ex)
+
+    def flush(self):
+        """Save index to storage if changed"""
+        with self.__lock:
+            if not self.__dirty or self.__index_dict is None:
+                return
+            data_as_json_str = json.dumps(self.__index_dict)
+            self.__dirty = False
+        fs_handler = self.__get_fs_handler()
+        fs_handler.create_folders(self.__CACHE_FOLDER_PATH)
+        fs_handler.write_file(self.__INDEX_FILE_PATH,
+                              data_as_json_str, encoding='utf-8')
+
+    def clear(self):
+        """Delete all entries"""
+        fs_handler = self.__get_fs_handler()
+        with self.__lock:
+            self.__index_dict = collections.OrderedDict()
+            self.__total_size = 0
+            self.__dirty = False
+        if fs_handler.exists(self.__CACHE_FOLDER_PATH):
+            fs_handler.delete_folder(self.__CACHE_FOLDER_PATH)
+
+    def get_stats(self) -> dict:
+        """Get hit/miss statistics and current size"""
+        with self.__lock:
+            stats = dict(self.__stats)
+            stats['entries'] = len(self.__index_dict or {})
+            stats['size_bytes'] = self.__total_size
+        return stats
+
+    # ---------- Private Methods ---------
+    @classmethod
+    def __to_placeholders(cls, data_as_json_str: str, run_id_list: list) -> str:
+        if not run_id_list:
+            return data_as_json_str
+        run_id_idx_dict = {x: idx for idx, x in enumerate(run_id_list)}
+        # Document id is replaced only as a whole value, as it may not be unique text
+        for idx, run_id in enumerate(run_id_list):
+            if not cls.__RUN_ID_PATTERN.fullmatch(run_id):
+                data_as_json_str = data_as_json_str.replace(
+                    json.dumps(run_id), json.dumps(f"<step_cache_run_id_{idx}>"))
+        return cls.__RUN_ID_PATTERN.sub(
+            lambda x: f"<step_cache_run_id_{run_id_idx_dict[x.group(0)]}>"
+            if x.group(0) in run_id_idx_dict else x.group(0), data_as_json_str)
+
+    @classmethod
+    def __from_placeholders(cls, data_as_json_str: str, run_id_list: list) -> str:
+        if not run_id_list:
+            return data_as_json_str
+        return cls.__PLACEHOLDER_PATTERN.sub(
+            lambda x: json.dumps(run_id_list[int(x.group(1))])[1:-1]
+            if int(x.group(1)) < len(run_id_list) else x.group(0), data_as_json_str)
+
+    def __get_fs_handler(self) -> infy_fs_utils.interface.IFileSystemHandler:
+        return infy_fs_utils.manager.FileSystemManager().get_fs_handler(Constants.FSH_DPP)
+
+    def __get_entry_file_path(self, key: str) -> str:
+        # Sub-folders keep the number of files per folder small
+        return f"{self.__CACHE_FOLDER_PATH}/{key[:2]}/{key}.json"
+
+    def __load_index(self, fs_handler) -> collections.OrderedDict:
+        """To be called with lock held"""
+        if self.__index_dict is None:
+            index_dict = collections.OrderedDict()
+            if fs_handler.exists(self.__INDEX_FILE_PATH):
+                index_dict.update(json.loads(
+                    fs_handler.read_file(self.__INDEX_FILE_PATH)))
+            self.__index_dict = index_dict
+            self.__total_size = sum(index_dict.values())
+            self.__dirty = False
+        return self.__index_dict
@@ -0,0 +1,213 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+"""Module for Tracer class"""
+import os
+import time
+import pstats
+import cProfile
+import threading
+import contextlib
+import contextvars
+import tracemalloc
+
+_CURRENT_TRACER = contextvars.ContextVar('dpp_tracer', default=None)
+
+
+class Tracer():
+    """Records spans (timed sections), counters and optional profiles of a run.
+    The tracer of the current run is available to any code on the same thread (or on threads
+    started with a copy of the context) via `Tracer.get_current()`. When tracing is not enabled
+    a no-op tracer is returned so that instrumented code doesn't need to check."""
+
+    # tracemalloc (and cProfile from Python 3.12) is process wide, so profiled blocks are run
+    # one at a time, across all tracers, to keep their measurements apart
+    __PROFILE_LOCK = threading.RLock()
+
+    def __init__(self, trace_name: str, profile_config_data: dict = None):
+        self.__trace_name = trace_name
+        self.__profile_config_data = profile_config_data or {}
+        self.__lock = threading.Lock()
+        self.__start_time = time.time()
+        self.__span_list = []
+        self.__counter_dict = {}
+        self.__profile_list = []
+
+    @classmethod
+    def get_current(cls) -> 'Tracer':
+        """Get tracer of current run, else a no-op tracer"""
+        tracer = _CURRENT_TRACER.get()
+        return tracer if tracer else _NO_OP_TRACER
+
+    @classmethod
+    def set_current(cls, tracer: 'Tracer') -> contextvars.Token:
+        """Make tracer current for this context. Returns token to be passed to `reset_current`."""
+        return _CURRENT_TRACER.set(tracer)
+
+    @classmethod
+    def reset_current(cls, token: contextvars.Token):
+        """Restore the tracer which was current before `set_current`"""
+        _CURRENT_TRACER.reset(token)
+
+    def is_enabled(self) -> bool:
+        """Returns False for no-op tracer"""
+        return True
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str = 'dpp', **args):
+        """Record time taken by the enclosed block"""
+        start_time = time.time()
+        start_counter = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start_counter
+            thread = threading.current_thread()
+            span_data = {
+                'name': name,
+                'category': category,
+                'start_time': start_time,
+                'duration_secs': round(duration, 6),
+                'pid': os.getpid(),
+                'thread_id': thread.ident,
+                'thread_name': thread.name,
+                'args': args
+            }
+            with self.__lock:
+                self.__span_list.append(span_data)
+
+    def add_counter(self, name: str, value: int = 1):
+        """Add value to counter"""
+        with self.__lock:
+            self.__counter_dict[name] = self.__counter_dict.get(
+                name, 0) + value
+
+    @contextlib.contextmanager
+    def profile(self, name: str):
+        """Capture cProfile and/or tracemalloc data of the enclosed block if enabled in
+        profile config i.e. {"cprofile": bool, "tracemalloc": bool, "processor_names": [],
+        "top_n": 20}. Empty `processor_names` means all.
+        Profiled blocks run one at a time in a process, e.g. parallel sub-processors being
+        profiled wait for each other, so that profiles don't include each other's allocations."""
+        config_data = self.__profile_config_data
+        processor_names = config_data.get('processor_names') or []
+        use_cprofile = config_data.get('cprofile', False)
+        use_tracemalloc = config_data.get('tracemalloc', False)
+        if (processor_names and name not in processor_names) or \
+                not (use_cprofile or use_tracemalloc):
+            yield
+            return
+        top_n = config_data.get('top_n', 20)
+        with self.__PROFILE_LOCK:
+            with self.__profile(name, use_cprofile, use_tracemalloc, top_n):
+                yield
+
+    def get_trace_data(self) -> dict:
+        """Get spans, counters and profiles recorded so far"""
+        with self.__lock:
+            return {
+                'trace_name': self.__trace_name,
+                'start_time': self.__start_time,
+                'spans': list(self.__span_list),
+                'counters': dict(self.__counter_dict),
+                'profiles': list(self.__profile_list)
+            }
+
+    def get_chrome_trace_data(self) -> dict:
+        """Get trace in Chrome trace event format (chrome://tracing, Perfetto)"""
+        trace_data = self.get_trace_data()
+        event_list = []
+        for span_data in trace_data['spans']:
+            event_list.append({
+                'name': span_data['name'],
+                'cat': span_data['category'],
+                'ph': 'X',
+                'ts': round((span_data['start_time'] - self.__start_time) * 1e6),
+                'dur': round(span_data['duration_secs'] * 1e6),
+                'pid': span_data['pid'],
+                'tid': span_data['thread_id'],
+                'args': span_data['args']
+            })
+        end_ts = max([x['ts'] + x['dur'] for x in event_list] or [0])
+        for name, value in trace_data['counters'].items():
+            event_list.append({'name': name, 'ph': 'C', 'ts': end_ts, 'pid': os.getpid(),
+                               'args': {name: value}})
+        return {'traceEvents': event_list, 'displayTimeUnit': 'ms',
+                'otherData': {'trace_name': self.__trace_name}}
+
+    # ---------- Private Methods ---------
+    @contextlib.contextmanager
+    def __profile(self, name: str, use_cprofile: bool, use_tracemalloc: bool, top_n: int):
+        profiler, started_tracemalloc = None, False
+        if use_tracemalloc:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracemalloc = True
+            tracemalloc.reset_peak()
+            snapshot_before = tracemalloc.take_snapshot()
+        if use_cprofile:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        try:
+            yield
+        finally:
+            profile_data = {'name': name}
+            if profiler:
+                profiler.disable()
+                profile_data['cprofile'] = self.__get_cprofile_stats(
+                    profiler, top_n)
+            if use_tracemalloc:
+                current_size, peak_size = tracemalloc.get_traced_memory()
+                top_stats = tracemalloc.take_snapshot().compare_to(
+                    snapshot_before, 'lineno')[:top_n]
+                profile_data['tracemalloc'] = {
+                    'current_bytes': current_size,
+                    'peak_bytes': peak_size,
+                    'top_allocations': [{'location': str(x.traceback), 'size_diff_bytes': x.size_diff,
+                                         'count_diff': x.count_diff} for x in top_stats]
+                }
+                if started_tracemalloc:
+                    tracemalloc.stop()
+            with self.__lock:
+                self.__profile_list.append(profile_data)
+
+    def __get_cprofile_stats(self, profiler: cProfile.Profile, top_n: int) -> list:
+        stats = pstats.Stats(profiler)
+        stats_list = []
+        # Each entry => (file, line, function): (primitive calls, calls, tottime, cumtime, callers)
+        for (file_name, line_no, function_name), (_, ncalls, tottime, cumtime, _) in sorted(
+                stats.stats.items(), key=lambda x: x[1][3], reverse=True)[:top_n]:
+            stats_list.append({
+                'function': f"{file_name}:{line_no}({function_name})",
+                'ncalls': ncalls,
+                'tottime_secs': round(tottime, 6),
+                'cumtime_secs': round(cumtime, 6)
+            })
+        return stats_list
+
+
+class _NoOpTracer(Tracer):
+    """Tracer used when tracing is not enabled"""
+
+    def __init__(self):
+        super().__init__(None)
+
+    def is_enabled(self) -> bool:
+        return False
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str = 'dpp', **args):
+        yield
+
+    def add_counter(self, name: str, value: int = 1):
+        pass
+
+    @contextlib.contextmanager
+    def profile(self, name: str):
+        yield
+
+
+_NO_OP_TRACER = _NoOpTracer()
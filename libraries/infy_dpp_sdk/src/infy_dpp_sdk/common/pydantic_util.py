@@ -6,6 +6,7 @@
 
 """Module for PydanticUtil class"""
 
+import json
 import pydantic
 
 
@@ -29,3 +30,37 @@ class PydanticUtil():
         else:
             data_json = obj.model_dump_json(indent=4)
         return data_json
+
+    @classmethod
+    def get_json_dict(cls, obj: any) -> dict:
+        """
+        Get JSON compatible dict from pydantic object.
+
+        Args:
+            obj (any): Pydantic object.
+
+        Returns:
+            dict: Dict containing only JSON compatible types.
+        """
+        if pydantic.VERSION.startswith('1.'):
+            data_dict = json.loads(obj.json())
+        else:
+            data_dict = obj.model_dump(mode='json')
+        return data_dict
+
+    @classmethod
+    def get_field_names(cls, model_class: any) -> list:
+        """
+        Get field names of pydantic class.
+
+        Args:
+            model_class (any): Pydantic class.
+
+        Returns:
+            list: List of field names.
+        """
+        if pydantic.VERSION.startswith('1.'):
+            field_names = list(model_class.__fields__)
+        else:
+            field_names = list(model_class.model_fields)
+        return field_names
@@ -19,6 +19,7 @@ class BController(IController):
     """Base class for controller"""
 
     __fs_handler: infy_fs_utils.interface.IFileSystemHandler = None
+    __snapshot_codec_name: str = None
 
     def __init__(self):
         super().__init__()
@@ -38,6 +39,9 @@ class BController(IController):
         input_config_file_path = controller_request_data.input_config_file_path
         input_config_data = self.__load_json(
             input_config_file_path)
+        # Snapshots of this request are saved with the same codec
+        self.__snapshot_codec_name = input_config_data.get(
+            'orchestrator', {}).get('snapshot', {}).get('codec')
         return input_config_data
 
     def load_snapshots(self, controller_request_data: ControllerRequestData):
@@ -46,7 +50,8 @@ class BController(IController):
     def save_snapshots(self, controller_request_data: ControllerRequestData,
                        processor_response_data_list: List[ProcessorResponseData]) \
             -> ControllerResponseData:
-        return SnapshotUtil().save_snapshots(controller_request_data, processor_response_data_list)
+        return SnapshotUtil().save_snapshots(controller_request_data, processor_response_data_list,
+                                             codec_name=self.__snapshot_codec_name)
 
     def _get_logger(self):
         return self.__logger
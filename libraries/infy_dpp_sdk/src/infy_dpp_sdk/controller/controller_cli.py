@@ -65,10 +65,14 @@ class ControllerCLI(BController, IControllerCLI):
                 # dpp_version back to 0.0.0
                 # "description": "Auto-generated by DPP orchestrator",
                 # logic to consolidate list of pre_processor reponse data files
+                input_config_file_data = json.loads(
+                    self.__fs_handler.read_file(input_config_file_path))
                 snapshot_util = SnapshotUtil()
                 controller_response_data, processor_response_data_list = \
                     snapshot_util.consolidate_controller_response_data(
-                        prev_proc_response_file_path_list)
+                        prev_proc_response_file_path_list,
+                        codec_name=input_config_file_data.get('orchestrator', {}).get(
+                            'snapshot', {}).get('codec'))
                 prev_proc_response_file_path = snapshot_util.save_controller_response_data(
                     controller_response_data)
                 print("prev_proc_response_file_path",
@@ -80,8 +84,6 @@ class ControllerCLI(BController, IControllerCLI):
                     **prev_proc_response_data_dict)
                 prev_request_id = prev_proc_response_data.request_id
                 processor_num = f"{int(prev_request_id[-3:])+1:03d}"
-                input_config_file_data = json.loads(
-                    self.__fs_handler.read_file(input_config_file_path))
                 processor_list = input_config_file_data.get('processor_list')
                 for processor in processor_list:
                     if processor.get('processor_list'):
@@ -5,6 +5,7 @@
 # ===============================================================================================================#
 
 import copy
+import pickle
 import logging
 import traceback
 from datetime import datetime
@@ -14,6 +15,8 @@ import infy_fs_utils
 from ..common import Constants
 from ..data import (DocumentData, ProcessorResponseData)
 from ..common._internal.processor_helper import ProcessorHelper
+from ..common._internal.process_pool_manager import ProcessPoolManager, execute_chunk
+from ..common._internal.tracer import Tracer
 from ..common.app_config_manager import AppConfigManager
 try:
     from dask import delayed, compute
@@ -28,6 +31,18 @@ except ImportError:
 class IProcessor(ABC):
     """Interface for Processor"""
 
+    # Set to True in subclasses whose instance can be kept and reused across `run_batch` calls
+    # and requests. Such processors shouldn't keep per-document state on the instance.
+    _REUSABLE_INSTANCE = False
+    # Set to list of DocumentData field names (e.g. ['document_id', 'metadata']) in subclasses
+    # which need only those fields. Other fields are neither loaded from snapshot nor
+    # changed by the processor. None means all fields.
+    _SNAPSHOT_DOCUMENT_DATA_FIELDS = None
+    # Set to True in subclasses whose output depends only on config and incoming document and
+    # context data, and which have no side effects, so that their results can be reused from
+    # step cache (`orchestrator.step_cache`).
+    _STEP_CACHEABLE = False
+
     # ------------------------abstract methods----------------------------
     # These operations have to be implemented in subclasses.
 
@@ -54,10 +69,15 @@ class IProcessor(ABC):
                 client = Client.current()
             except (NameError, ValueError):
                 client = None
+            process_pool_executor = ProcessPoolManager().get_executor()
             if client:
                 # Parallel execution
                 self._do_execute_batch_parallel(
                     document_data_list, context_data_list, config_data)
+            elif process_pool_executor:
+                # Multi-process execution
+                self._do_execute_batch_process_pool(
+                    document_data_list, context_data_list, config_data)
             else:
                 # Serial execution
                 self._do_execute_batch_serial(
@@ -74,12 +94,15 @@ class IProcessor(ABC):
                                  config_data: dict) -> List[ProcessorResponseData]:
         """Run the processor in batch mode"""
         __logger = self.get_logger()
+        tracer = Tracer.get_current()
         self.response_list: List[ProcessorResponseData] = []
         for document_data, context_data in zip(document_data_list, context_data_list):
             try:
                 config_data_pristine = copy.deepcopy(config_data)
-                _processor_response_data = self.do_execute(
-                    document_data, context_data, config_data_pristine)
+                with tracer.span('do_execute', processor_name=self.processor_name,
+                                 document_id=document_data.document_id if document_data else None):
+                    _processor_response_data = self.do_execute(
+                        document_data, context_data, config_data_pristine)
                 self.response_list.append(_processor_response_data)
             except Exception as ex:
                 full_trace_error = traceback.format_exc()
@@ -87,6 +110,7 @@ class IProcessor(ABC):
                 _processor_response_data = ProcessorHelper.create_processor_response_data(
                     document_data, context_data, ex)
                 self.response_list.append(_processor_response_data)
+        tracer.add_counter('documents_executed', len(self.response_list))
 
         return self.response_list
 
@@ -123,6 +147,52 @@ class IProcessor(ABC):
 
         return self.response_list
 
+    def _do_execute_batch_process_pool(self, document_data_list: List[DocumentData],
+                                       context_data_list: List[dict],
+                                       config_data: dict) -> List[ProcessorResponseData]:
+        """Run the processor in batch mode using process pool"""
+        __logger = self.get_logger()
+        process_pool_manager = ProcessPoolManager()
+        executor = process_pool_manager.get_executor()
+        chunk_size = process_pool_manager.get_chunk_size()
+        document_data_list, context_data_list = list(
+            document_data_list), list(context_data_list)
+        config_data_bytes = pickle.dumps(config_data)
+        futures = []
+        for idx in range(0, min(len(document_data_list), len(context_data_list)), chunk_size):
+            chunk = (document_data_list[idx:idx + chunk_size],
+                     context_data_list[idx:idx + chunk_size])
+            future = executor.submit(execute_chunk, self.__class__.__module__,
+                                     self.__class__.__name__, self.processor_name,
+                                     chunk[0], chunk[1], config_data_bytes)
+            futures.append((future, chunk))
+        self.response_list: List[ProcessorResponseData] = []
+        # Results are collected in the order of submission.
+        # Spans are recorded per chunk as the worker processes have no tracer.
+        tracer = Tracer.get_current()
+        for idx, (future, chunk) in enumerate(futures):
+            try:
+                with tracer.span('do_execute_chunk_wait', processor_name=self.processor_name,
+                                 chunk_num=idx, document_count=len(chunk[0])):
+                    self.response_list.extend(future.result())
+            except Exception as ex:
+                full_trace_error = traceback.format_exc()
+                __logger.error(full_trace_error)
+                for document_data, context_data in zip(*chunk):
+                    _processor_response_data = ProcessorHelper.create_processor_response_data(
+                        document_data, context_data, ex)
+                    self.response_list.append(_processor_response_data)
+        tracer.add_counter('documents_executed', len(self.response_list))
+
+        return self.response_list
+
+    def on_load(self, config_data: dict):
+        """Called once after a reusable instance is created (see `_REUSABLE_INSTANCE`).
+        Override to do expensive setup such as loading clients and models."""
+
+    def on_unload(self):
+        """Called when a reusable instance is discarded. Override to release resources."""
+
     def set_proc_name(self, processor_name):
         """Set processor name"""
         self.processor_name = processor_name
@@ -181,3 +251,8 @@ class IProcessor(ABC):
     def get_app_config(self):
         """Get app_config instance"""
         return AppConfigManager().get_app_config()
+
+    def get_tracer(self) -> Tracer:
+        """Get tracer of current run to record custom spans and counters. It's a no-op tracer
+        when tracing is not enabled."""
+        return Tracer.get_current()
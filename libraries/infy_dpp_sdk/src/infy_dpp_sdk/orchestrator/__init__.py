@@ -6,6 +6,7 @@
 
 from .orchestrator_native_basic import OrchestratorNativeBasic
 from .orchestrator_native import OrchestratorNative
+from .orchestrator_native_in_memory import OrchestratorNativeInMemory
 from .orchestrator_cli import OrchestratorCLI
 from .orchestrator_http import OrchestratorHTTP
 from .orchestrator_hybrid import OrchestratorHybrid
@@ -5,22 +5,29 @@
 # ===============================================================================================================#
 
 from abc import ABC, abstractmethod
+import copy
 import json
 from typing import List
 import logging
 import time
 import uuid
+import contextlib
 import concurrent.futures
+import contextvars
 import traceback
 import infy_fs_utils
 from ...common._internal.dask_worker_plugin import DaskWorkerPlugin
-from ...data import (ControllerRequestData, ControllerResponseData,
+from ...common._internal.process_pool_manager import ProcessPoolManager
+from ...common._internal.tracer import Tracer
+from ...common._internal.step_cache import StepCache
+from ...data import (ControllerRequestData, ControllerResponseData, DocumentData,
                      ProcessorFilterData, ProcessorResponseData, MessageCodeEnum)
 from ...common._internal.dpp_json_encoder import DppJSONEncoder
 from ...common import Constants
 from ...common._internal.snapshot_util import SnapshotUtil
 from ...common._internal.processor_helper import ProcessorHelper
 from ...interface import IOrchestrator
+from .pipeline_scheduler import PipelineScheduler
 try:
     from dask.distributed import Client
 except ImportError:
@@ -34,6 +41,12 @@ class BOrchestrator(IOrchestrator, ABC):
     _fs_handler: infy_fs_utils.interface.IFileSystemHandler = None
     _logger: logging.Logger = None
     __PROCESSOR_DISABLED = "disabled"
+    __SNAPSHOT_MODE_STORAGE = "storage"
+    __SNAPSHOT_MODE_IN_MEMORY = "in_memory"
+    __SCHEDULER_MODE_BATCH = "batch"
+    __SCHEDULER_MODE_PIPELINED = "pipelined"
+    # Set to True by orchestrators which implement `execute_processor_in_memory`
+    _IN_MEMORY_SNAPSHOT_SUPPORTED = False
 
     def __init__(self, input_config_file_path: str, deployment_config_file_path: str = None):
         super().__init__(input_config_file_path, deployment_config_file_path)
@@ -42,6 +55,12 @@ class BOrchestrator(IOrchestrator, ABC):
         self._fs_handler = self._get_fs_handler()
         self.__processor_exec_list = None
         self.__processor_exec_output_dict = None
+        self.__snapshot_config_data = None
+        self.__pipeline_metrics = None
+        self.__trace_data = None
+        self.__snapshot_codec_name = self.__model.input_config_data.get(
+            'orchestrator', {}).get('snapshot', {}).get('codec')
+        self.__warm_up_processors()
 
     # ---------- Abstract Methods ---------
     @ abstractmethod
@@ -51,12 +70,62 @@ class BOrchestrator(IOrchestrator, ABC):
         """Execute a processor"""
         raise NotImplementedError("execute_processor not implemented")
 
+    # ---------- Overridable Methods ---------
+    def execute_processor_in_memory(self, processor_input_config_data: dict,
+                                    document_data_list: List[DocumentData],
+                                    context_data_list: List[dict]) -> List[ProcessorResponseData]:
+        """Execute a processor on in-memory data (used by `in_memory` snapshot mode)"""
+        raise NotImplementedError(
+            "execute_processor_in_memory not implemented")
+
+    def warm_up_processor(self, processor_input_config_data: dict):
+        """Prepare a processor ahead of the first run (e.g. import and keep a loaded instance)"""
+
+    def processor_worker_scope(self):
+        """Context manager which each pipeline stage worker runs in (e.g. so that processors are
+        created once per worker instead of once per document)"""
+        return contextlib.nullcontext()
+
     # ---------- Public Methods ---------
     def run_batch(self, context_data: dict = None):
+        tracing_config_data = self.__model.input_config_data.get(
+            'orchestrator', {}).get('tracing', {})
+        if not tracing_config_data.get('enabled'):
+            return self.__run_batch(context_data)
+        tracer = Tracer(f"T-{str(uuid.uuid4())[24:]}",
+                        tracing_config_data.get('profile'))
+        token = Tracer.set_current(tracer)
+        try:
+            with tracer.span('run_batch'):
+                return self.__run_batch(context_data)
+        finally:
+            Tracer.reset_current(token)
+            self.__trace_data = tracer.get_trace_data()
+            self.__export_trace(tracer, tracing_config_data)
+
+    def get_run_batch_summary(self) -> list:
+        """Get run summary post run_batch execution"""
+        return self.__processor_exec_list, self.__processor_exec_output_dict
+
+    def get_pipeline_metrics(self) -> list:
+        """Get per-stage metrics post run_batch execution in `pipelined` scheduler mode"""
+        return self.__pipeline_metrics
+
+    def get_trace_data(self) -> dict:
+        """Get spans, counters and profiles post run_batch execution if
+        `orchestrator.tracing.enabled` is set"""
+        return self.__trace_data
+
+    # ---------- Private Methods ---------
+    def __run_batch(self, context_data: dict = None):
+        if self.__is_pipelined_scheduler_mode():
+            return self.__run_batch_pipelined(context_data)
         model = self.__model
         snapshot_util = SnapshotUtil()
         processor_exec_list = []
         processor_exec_output_dict = {}
+        processor_exec_response_dict = {}
+        processor_response_data_list = []
         request_group_num = f"R-{str(uuid.uuid4())[24:]}"
         processor_list = model.input_config_data.get('processor_list', [])
         processor_list_count = len(processor_list)
@@ -81,38 +150,74 @@ class BOrchestrator(IOrchestrator, ABC):
             worker_plugin = DaskWorkerPlugin(
                 self._fs_handler, logging_data_dict, storage_data_dict)
             client.register_worker_plugin(worker_plugin)
+        process_pool_token = None if use_dask else self.__start_process_pool()
+        step_cache_token = self.__start_step_cache()
+
+        snapshot_config_data = self.__get_snapshot_config_data()
+        self.__snapshot_config_data = snapshot_config_data
+        in_memory_mode = snapshot_config_data is not None
+        # Last executed (not yet flushed) step in in-memory mode
+        # [processor_num, processor_names, processor_response_data_list]
+        pending_snapshot_step = None
+        executed_step_count = 0
+        failed = False
         try:
             for idx, processor_input_config_data in enumerate(processor_list):
                 processor_num = f"{idx+1:03d}"
                 sub_processor_list = processor_input_config_data.get(
                     'processor_list')
                 if sub_processor_list:
+                    # Common input of the sub-processors, used to find what each of them changed
+                    base_processor_response_data_list = processor_response_data_list if isinstance(
+                        processor_response_data_list, list) else None
                     concurrent_result_list = []
+                    sub_processor_response_data_dict = {}
                     with concurrent.futures.ThreadPoolExecutor() as executor:
                         futures = []
                         for idxY, processor_input_config_dataY in enumerate(sub_processor_list):
                             sub_processor_num = f"{processor_num}.{idxY+1:03d}"
-                            future = executor.submit(self.__prepare_and_run_processor,
+                            # Run in a copy of the context so that the current tracer is seen
+                            future = executor.submit(contextvars.copy_context().run,
+                                                     self.__prepare_and_run_processor,
                                                      processor_input_config_dataY, sub_processor_num,
                                                      request_group_num, processor_list_count,
                                                      processor_exec_output_dict, context_data,
-                                                     processor_exec_list)
-                            futures.append(future)
-                        for future in futures:
+                                                     processor_exec_list, processor_exec_response_dict)
+                            futures.append((sub_processor_num, future))
+                        for sub_processor_num, future in futures:
                             result = future.result()
                             if result[0] == self.__PROCESSOR_DISABLED:
                                 continue
                             concurrent_result_list.append(result)
+                            sub_processor_response_data_dict[sub_processor_num] = result[0]
                             # if result and len(result) == 2:
                             #     processor_response_data_list, stop_orchestrator = result
                     if not concurrent_result_list:
                         continue
                     sub_processor_nums = [
                         x for x in processor_exec_output_dict if f"{processor_num}." in x]
+                    if in_memory_mode:
+                        processor_response_data_list = snapshot_util.consolidate_processor_response_data(
+                            [x[0] for x in concurrent_result_list], base_processor_response_data_list)
+                        for sub_processor_num in sub_processor_nums:
+                            del processor_exec_output_dict[sub_processor_num]
+                        processor_exec_output_dict[processor_num] = {}
+                        processor_names = [x.get('processor_name') for x in sub_processor_list
+                                           if x.get('enabled')]
+                        executed_step_count += 1
+                        pending_snapshot_step = self.__complete_in_memory_step(
+                            [processor_num, processor_names, processor_response_data_list],
+                            executed_step_count, False, request_group_num, context_data,
+                            processor_exec_output_dict, processor_exec_response_dict)
+                        continue
                     controller_res_file_path_list = [processor_exec_output_dict.get(x, {}).get(
                         Constants._SYS_CONTROLLER_RES_FILE_PATH) for x in sub_processor_nums]
+                    # Sub-processor results are already in memory so snapshots aren't reloaded
                     controller_response_data, processor_response_data_list = snapshot_util.consolidate_controller_response_data(
-                        controller_res_file_path_list)
+                        controller_res_file_path_list,
+                        [sub_processor_response_data_dict[x]
+                            for x in sub_processor_nums],
+                        base_processor_response_data_list, self.__snapshot_codec_name)
                     controller_res_file_path = snapshot_util.save_controller_response_data(
                         controller_response_data)
                     for sub_processor_num in sub_processor_nums:
@@ -129,34 +234,46 @@ class BOrchestrator(IOrchestrator, ABC):
                     result = self.__prepare_and_run_processor(
                         processor_input_config_data, processor_num, request_group_num,
                         processor_list_count, processor_exec_output_dict, context_data,
-                        processor_exec_list)
+                        processor_exec_list, processor_exec_response_dict)
                     if result and len(result) == 2:
                         processor_response_data_list, stop_orchestrator = result
+                    if in_memory_mode and result[0] != self.__PROCESSOR_DISABLED:
+                        executed_step_count += 1
+                        pending_snapshot_step = self.__complete_in_memory_step(
+                            [processor_num, [processor_input_config_data.get('processor_name')],
+                             processor_response_data_list],
+                            executed_step_count, stop_orchestrator, request_group_num, context_data,
+                            processor_exec_output_dict, processor_exec_response_dict)
                     if stop_orchestrator:
                         # self.__logger.debug(message)
                         # print(message)
                         break
         except Exception as e:
+            failed = True
             full_trace_error = traceback.format_exc()
             print(full_trace_error)
             print(e)
         finally:
             if client:
                 client.close()
+            if process_pool_token:
+                ProcessPoolManager().release(process_pool_token)
+            if step_cache_token:
+                self.__stop_step_cache(step_cache_token)
+        if pending_snapshot_step and (snapshot_config_data.get('on_end') or
+                                      (failed and snapshot_config_data.get('on_failure'))):
+            self.__save_in_memory_snapshots(
+                request_group_num, pending_snapshot_step, context_data,
+                processor_exec_output_dict)
         self.__processor_exec_list = processor_exec_list
         self.__processor_exec_output_dict = processor_exec_output_dict
         # return processor_exec_list, processor_exec_output_dict
         return processor_response_data_list
 
-    def get_run_batch_summary(self) -> list:
-        """Get run summary post run_batch execution"""
-        return self.__processor_exec_list, self.__processor_exec_output_dict
-
-    # ---------- Private Methods ---------
     def __prepare_and_run_processor(self, processor_input_config_data: dict,
                                     processor_num, request_group_num, processor_list_count,
                                     processor_exec_output_dict, context_data,
-                                    processor_exec_list):
+                                    processor_exec_list, processor_exec_response_dict):
 
         model = self.__model
         processor_name = processor_input_config_data.get(
@@ -180,36 +297,19 @@ class BOrchestrator(IOrchestrator, ABC):
             prev_processor_num, {})
         input_variable_dict.update(prev_processor_output_dict)
 
-        # Prepare config data which is a subset of entire "processor_input_config" data
-        # containing only the required config data specified in "processor_input_config_name_list"
-        filtered_config_data = {}
-        for processor_input_config_name in processor_input_config_data.get(
-                'processor_input_config_name_list', []):
-            filtered_config_data[processor_input_config_name] = model.input_config_data.get(
-                'processor_input_config').get(processor_input_config_name)
-        # Update to main entity
-        processor_input_config_data['processor_input_config'] = filtered_config_data
-
-        # Generate controller request data
-        controller_request_data = self.__create_controller_request_data(
-            processor_input_config_data, request_id, input_variable_dict, context_data)
-
-        # Get processor specific deployment config data
-        processor_deployment_config_data = None
-        if model.deployment_config_data:
-            item = model.deployment_config_data['processors'].get(
-                processor_name)
-            alias_of = item.get("alias_of")
-            item = model.deployment_config_data['processors'].get(
-                alias_of) if alias_of else item
-            processor_deployment_config_data = item.copy()
-
-        controller_response_data, output_variable_dict = self.__run_processor(
-            controller_request_data, processor_input_config_data,
-            processor_deployment_config_data, input_variable_dict)
+        self.__update_processor_input_config(processor_input_config_data)
 
-        processor_response_data_list: List[ProcessorResponseData] = SnapshotUtil(
-        ).create_processor_response_data_list(controller_response_data)
+        tracer = Tracer.get_current()
+        with tracer.span('processor', processor_name=processor_name, processor_num=processor_num), \
+                tracer.profile(processor_name):
+            if self.__snapshot_config_data is not None:
+                processor_response_data_list = self.__run_processor_in_memory(
+                    processor_input_config_data, processor_num, prev_processor_num,
+                    processor_exec_response_dict, context_data)
+                output_variable_dict = {}
+            else:
+                processor_response_data_list, output_variable_dict = self.__prepare_and_run_processor_with_storage(
+                    processor_input_config_data, request_id, input_variable_dict, context_data)
 
         self.__update_processor_name(
             processor_name, processor_response_data_list)
@@ -243,6 +343,388 @@ class BOrchestrator(IOrchestrator, ABC):
                 message_info + " | Completed | " + message_start_time + " | " + message_elapsed_time)
         return processor_response_data_list, stop_orchestrator
 
+    def __prepare_and_run_processor_with_storage(self, processor_input_config_data: dict,
+                                                 request_id, input_variable_dict, context_data):
+        model = self.__model
+        processor_name = processor_input_config_data.get(
+            'processor_name')
+
+        # Generate controller request data
+        controller_request_data = self.__create_controller_request_data(
+            processor_input_config_data, request_id, input_variable_dict, context_data)
+
+        # Get processor specific deployment config data
+        processor_deployment_config_data = None
+        if model.deployment_config_data:
+            item = model.deployment_config_data['processors'].get(
+                processor_name)
+            alias_of = item.get("alias_of")
+            item = model.deployment_config_data['processors'].get(
+                alias_of) if alias_of else item
+            processor_deployment_config_data = item.copy()
+
+        controller_response_data, output_variable_dict = self.__run_processor(
+            controller_request_data, processor_input_config_data,
+            processor_deployment_config_data, input_variable_dict)
+
+        processor_response_data_list: List[ProcessorResponseData] = SnapshotUtil(
+        ).create_processor_response_data_list(controller_response_data)
+        return processor_response_data_list, output_variable_dict
+
+    def __run_processor_in_memory(self, processor_input_config_data: dict, processor_num,
+                                  prev_processor_num, processor_exec_response_dict, context_data
+                                  ) -> List[ProcessorResponseData]:
+        if isinstance(prev_processor_num, list):
+            prev_processor_num = prev_processor_num[0]
+        prev_processor_response_data_list = processor_exec_response_dict.get(
+            prev_processor_num)
+        if prev_processor_response_data_list is None:
+            # First processor i.e. no records yet
+            document_data_list = []
+            context_data_list = [context_data] if context_data else []
+        else:
+            document_data_list = [
+                x.document_data for x in prev_processor_response_data_list]
+            context_data_list = [
+                x.context_data for x in prev_processor_response_data_list]
+            if "." in processor_num:
+                # Parallel sub-processors must not share (and mutate) the same objects
+                document_data_list = copy.deepcopy(document_data_list)
+                context_data_list = copy.deepcopy(context_data_list)
+        processor_response_data_list = self.execute_processor_in_memory(
+            processor_input_config_data, document_data_list, context_data_list)
+        return SnapshotUtil().carry_forward_processor_response_data(
+            prev_processor_response_data_list, processor_response_data_list)
+
+    def __update_processor_input_config(self, processor_input_config_data: dict):
+        # Prepare config data which is a subset of entire "processor_input_config" data
+        # containing only the required config data specified in "processor_input_config_name_list"
+        filtered_config_data = {}
+        for processor_input_config_name in processor_input_config_data.get(
+                'processor_input_config_name_list', []):
+            filtered_config_data[processor_input_config_name] = self.__model.input_config_data.get(
+                'processor_input_config').get(processor_input_config_name)
+        # Update to main entity
+        processor_input_config_data['processor_input_config'] = filtered_config_data
+
+    def __get_snapshot_config_data(self) -> dict:
+        """Returns snapshot checkpoint config when in-memory snapshot mode is enabled else None"""
+        snapshot_config_data = self.__model.input_config_data.get(
+            'orchestrator', {}).get('snapshot', {})
+        mode = snapshot_config_data.get(
+            'mode', self.__SNAPSHOT_MODE_STORAGE).lower()
+        if mode != self.__SNAPSHOT_MODE_IN_MEMORY:
+            return None
+        if not self._IN_MEMORY_SNAPSHOT_SUPPORTED:
+            self._logger.warning(
+                "Snapshot mode '%s' is not supported by %s. Using '%s' instead.",
+                mode, type(self).__name__, self.__SNAPSHOT_MODE_STORAGE)
+            return None
+        return self.__get_checkpoint_config_data()
+
+    def __get_checkpoint_config_data(self) -> dict:
+        checkpoint_config_data = self.__model.input_config_data.get(
+            'orchestrator', {}).get('snapshot', {}).get('checkpoint', {})
+        return {
+            'every_n_processors': checkpoint_config_data.get('every_n_processors', 0),
+            'on_end': checkpoint_config_data.get('on_end', True),
+            'on_failure': checkpoint_config_data.get('on_failure', True)
+        }
+
+    def __complete_in_memory_step(self, snapshot_step: list, executed_step_count: int,
+                                  stop_orchestrator: bool, request_group_num, context_data,
+                                  processor_exec_output_dict, processor_exec_response_dict) -> list:
+        """Hand over the step output to the next processor and flush it if it's a checkpoint.
+        Returns the step if it is still pending to be flushed else None."""
+        processor_num, _, processor_response_data_list = snapshot_step
+        # Only the latest output is needed by the next processor
+        processor_exec_response_dict.clear()
+        processor_exec_response_dict[processor_num] = processor_response_data_list
+        snapshot_config_data = self.__snapshot_config_data
+        every_n_processors = snapshot_config_data.get('every_n_processors')
+        is_checkpoint = bool(every_n_processors) and executed_step_count % every_n_processors == 0
+        is_checkpoint = is_checkpoint or bool(
+            stop_orchestrator and snapshot_config_data.get('on_failure'))
+        if is_checkpoint:
+            self.__save_in_memory_snapshots(
+                request_group_num, snapshot_step, context_data, processor_exec_output_dict)
+            return None
+        return snapshot_step
+
+    def __save_in_memory_snapshots(self, request_group_num, pending_snapshot_step: list,
+                                   context_data, processor_exec_output_dict):
+        """Flush in-memory snapshots of a step to storage in the same layout as storage mode"""
+        processor_num, processor_names, processor_response_data_list = pending_snapshot_step
+        snapshot_util = SnapshotUtil()
+        self._fs_handler.create_folders(
+            Constants._ORCHESTRATOR_SNAPSHOT_PATH)
+        controller_request_data = ControllerRequestData(
+            dpp_version=Constants._DPP_VERSION,
+            request_id=f"{request_group_num}-{processor_num}",
+            description="Auto-generated by DPP orchestrator",
+            input_config_file_path=self.__model.input_config_file_path,
+            processor_filter=ProcessorFilterData(includes=processor_names),
+            context=context_data,
+            snapshot_dir_root_path=Constants._ORCHESTRATOR_SNAPSHOT_PATH
+        )
+        controller_response_data = snapshot_util.save_snapshots(
+            controller_request_data, processor_response_data_list,
+            codec_name=self.__snapshot_codec_name)
+        controller_res_file_path = snapshot_util.save_controller_response_data(
+            controller_response_data)
+        processor_exec_output_dict[processor_num] = {
+            Constants._SYS_CONTROLLER_RES_FILE_PATH: controller_res_file_path
+        }
+        return controller_res_file_path
+
+    def __warm_up_processors(self):
+        """Warm up processors at start if `orchestrator.processor_instance_pool.warm_up` is
+        enabled (default)"""
+        instance_pool_config = self.__model.input_config_data.get(
+            'orchestrator', {}).get('processor_instance_pool', {})
+        if not instance_pool_config.get('warm_up', True):
+            return
+        for processor_input_config_data in self.__model.input_config_data.get('processor_list', []):
+            sub_processor_list = processor_input_config_data.get(
+                'processor_list', [processor_input_config_data])
+            for sub_processor_input_config_data in sub_processor_list:
+                if not sub_processor_input_config_data.get('enabled'):
+                    continue
+                self.__update_processor_input_config(
+                    sub_processor_input_config_data)
+                try:
+                    self.warm_up_processor(sub_processor_input_config_data)
+                except Exception as ex:
+                    # Not fatal here. The same error will be reported when the processor is run.
+                    self._logger.warning("Warm up failed for processor %s: %s",
+                                         sub_processor_input_config_data.get('processor_name'), ex)
+
+    def __start_process_pool(self) -> contextvars.Token:
+        """Acquire process pool for `do_execute_batch` of this run if enabled in
+        `orchestrator.processor_invocation.process_pool`. Returns None if not enabled."""
+        process_pool_config = self.__model.input_config_data.get('orchestrator', {}).get(
+            'processor_invocation', {}).get('process_pool', {})
+        if not (process_pool_config and process_pool_config.get('enabled')):
+            return None
+        token = ProcessPoolManager().acquire(process_pool_config.get('max_workers'),
+                                             process_pool_config.get('chunk_size', 1))
+        self._logger.info("Process pool acquired | max_workers: %s | chunk_size: %s",
+                          process_pool_config.get('max_workers'),
+                          ProcessPoolManager().get_chunk_size())
+        return token
+
+    def __start_step_cache(self) -> contextvars.Token:
+        """Enable step cache for this run if enabled in `orchestrator.step_cache`. Only
+        processors run in-process (native) use it. Returns None if not enabled."""
+        step_cache_config = self.__model.input_config_data.get(
+            'orchestrator', {}).get('step_cache', {})
+        if not (step_cache_config and step_cache_config.get('enabled')):
+            return None
+        return StepCache().start(step_cache_config)
+
+    def __stop_step_cache(self, token: contextvars.Token):
+        step_cache = StepCache()
+        try:
+            step_cache.stop(token)
+        except Exception as ex:
+            self._logger.warning("Step cache index not saved: %s", ex)
+        stats = step_cache.get_stats()
+        self._logger.info("Step cache | Hits: %s | Misses: %s | Puts: %s | Evictions: %s | "
+                          "Entries: %s | Size: %s bytes", stats['hits'], stats['misses'],
+                          stats['puts'], stats['evictions'], stats['entries'], stats['size_bytes'])
+
+    def __export_trace(self, tracer: Tracer, tracing_config_data: dict):
+        """Write trace as JSON and/or Chrome trace format (`orchestrator.tracing.export`) to
+        `traces` folder next to the snapshots folder"""
+        export_formats = tracing_config_data.get('export', ['json', 'chrome'])
+        trace_folder_path = Constants._ORCHESTRATOR_ROOT_PATH + '/traces'
+        trace_name = self.__trace_data['trace_name']
+        try:
+            self._fs_handler.create_folders(trace_folder_path)
+            if 'json' in export_formats:
+                file_path = f"{trace_folder_path}/{trace_name}_trace.json"
+                self._fs_handler.write_file(file_path, json.dumps(
+                    self.__trace_data, indent=4, default=str), encoding='utf-8')
+                self._logger.info("Trace file path - %s", file_path)
+            if 'chrome' in export_formats:
+                file_path = f"{trace_folder_path}/{trace_name}_chrome_trace.json"
+                self._fs_handler.write_file(file_path, json.dumps(
+                    tracer.get_chrome_trace_data(), default=str), encoding='utf-8')
+                self._logger.info("Chrome trace file path - %s", file_path)
+        except Exception as ex:
+            # Tracing must not fail the run
+            self._logger.warning("Trace export failed: %s", ex)
+
+    def __is_pipelined_scheduler_mode(self) -> bool:
+        scheduler_config_data = self.__model.input_config_data.get(
+            'orchestrator', {}).get('scheduler', {})
+        mode = scheduler_config_data.get(
+            'mode', self.__SCHEDULER_MODE_BATCH).lower()
+        if mode != self.__SCHEDULER_MODE_PIPELINED:
+            return False
+        if not self._IN_MEMORY_SNAPSHOT_SUPPORTED:
+            self._logger.warning(
+                "Scheduler mode '%s' is not supported by %s. Using '%s' instead.",
+                mode, type(self).__name__, self.__SCHEDULER_MODE_BATCH)
+            return False
+        return True
+
+    def __run_batch_pipelined(self, context_data: dict = None) -> List[ProcessorResponseData]:
+        """Run each document through the processor chain on its own. Stages are connected by
+        bounded queues so that processing of different documents overlaps across processors.
+        Data is handed over in memory and snapshots are flushed at the end as per
+        `orchestrator.snapshot.checkpoint` (`on_end`, `on_failure`)."""
+        model = self.__model
+        scheduler_config_data = model.input_config_data.get(
+            'orchestrator', {}).get('scheduler', {})
+        default_workers = scheduler_config_data.get('default_workers', 1)
+        workers_dict = scheduler_config_data.get('workers', {})
+        checkpoint_config_data = self.__get_checkpoint_config_data()
+        self.__snapshot_config_data = checkpoint_config_data
+        request_group_num = f"R-{str(uuid.uuid4())[24:]}"
+        processor_exec_list = []
+        processor_exec_output_dict = {}
+
+        # A stage is either a processor or a group of parallel sub-processors
+        stage_list = []
+        for idx, processor_input_config_data in enumerate(model.input_config_data.get('processor_list', [])):
+            processor_num = f"{idx+1:03d}"
+            sub_processor_list = processor_input_config_data.get(
+                'processor_list')
+            if sub_processor_list is None:
+                sub_processor_list = [processor_input_config_data]
+            sub_processor_list = [
+                x for x in sub_processor_list if x.get('enabled')]
+            if not sub_processor_list:
+                continue
+            for sub_processor_input_config_data in sub_processor_list:
+                self.__update_processor_input_config(
+                    sub_processor_input_config_data)
+            processor_names = [x.get('processor_name')
+                               for x in sub_processor_list]
+            workers = max(workers_dict.get(x, default_workers)
+                          for x in processor_names)
+            stage_list.append([processor_num, processor_names,
+                              sub_processor_list, workers])
+            processor_exec_list.extend(processor_names)
+            processor_exec_output_dict[processor_num] = {}
+
+        processor_response_data_list = []
+        done_item_list, scheduler = [], None
+        failed = False
+        process_pool_token = self.__start_process_pool()
+        step_cache_token = self.__start_step_cache()
+        try:
+            if stage_list:
+                # First stage creates the documents so it's always run for the whole batch
+                first_stage = stage_list[0]
+                start_time = time.time()
+                source_response_data_list = self.__run_pipeline_stage(
+                    first_stage, [], [context_data] if context_data else [])
+                self._logger.info("Stage #%s | %s | Completed | Documents: %s | Execution time: %s secs",
+                                  first_stage[0], ",".join(first_stage[1]),
+                                  len(source_response_data_list), round(time.time() - start_time, 4))
+                source_item_list, done_item_list = self.__split_tracked_response_data(
+                    source_response_data_list)
+
+                scheduler = PipelineScheduler(
+                    scheduler_config_data.get('queue_size', 0), self._logger)
+                for stage in stage_list[1:]:
+                    scheduler.add_stage(",".join(stage[1]),
+                                        self.__create_pipeline_stage_func(
+                                            stage),
+                                        stage[3], self.processor_worker_scope)
+                processor_response_data_list = done_item_list + \
+                    scheduler.run(source_item_list)
+        except Exception:
+            failed = True
+            self._logger.error(traceback.format_exc())
+            # Documents completed before the failure are kept so that they can be saved
+            processor_response_data_list = done_item_list + \
+                (scheduler.get_result_list() if scheduler else [])
+        finally:
+            if process_pool_token:
+                ProcessPoolManager().release(process_pool_token)
+            if step_cache_token:
+                self.__stop_step_cache(step_cache_token)
+        if scheduler:
+            self.__pipeline_metrics = scheduler.get_metrics()
+            for metrics in self.__pipeline_metrics:
+                self._logger.info(
+                    "Stage | %s | Workers: %s | Documents: %s | Throughput: %s docs/sec | "
+                    "Max queue depth: %s | Avg queue depth: %s",
+                    metrics['stage_name'], metrics['workers'], metrics['processed_count'],
+                    metrics['throughput_per_sec'], metrics['max_queue_depth'],
+                    metrics['avg_queue_depth'])
+
+        if stage_list and processor_response_data_list and (
+                checkpoint_config_data.get('on_end') or
+                (failed and checkpoint_config_data.get('on_failure'))):
+            processor_names = [y for x in stage_list for y in x[1]]
+            self.__save_in_memory_snapshots(
+                request_group_num, [stage_list[-1][0], processor_names,
+                                    processor_response_data_list],
+                context_data, processor_exec_output_dict)
+        self.__processor_exec_list = processor_exec_list
+        self.__processor_exec_output_dict = processor_exec_output_dict
+        return processor_response_data_list
+
+    def __run_pipeline_stage(self, stage: list, document_data_list: List[DocumentData],
+                             context_data_list: List[dict]) -> List[ProcessorResponseData]:
+        processor_num, processor_names, sub_processor_list, _ = stage
+        tracer = Tracer.get_current()
+        if len(sub_processor_list) == 1:
+            with tracer.span('processor', processor_name=processor_names[0],
+                             processor_num=processor_num):
+                processor_response_data_list = self.execute_processor_in_memory(
+                    sub_processor_list[0], document_data_list, context_data_list)
+            self.__update_processor_name(
+                processor_names[0], processor_response_data_list)
+            return processor_response_data_list
+        processor_response_data_lists = []
+        for processor_name, processor_input_config_data in zip(processor_names, sub_processor_list):
+            # Sub-processors must not share (and mutate) the same objects
+            with tracer.span('processor', processor_name=processor_name,
+                             processor_num=processor_num):
+                _processor_response_data_list = self.execute_processor_in_memory(
+                    processor_input_config_data, copy.deepcopy(document_data_list),
+                    copy.deepcopy(context_data_list))
+            self.__update_processor_name(
+                processor_name, _processor_response_data_list)
+            processor_response_data_lists.append(
+                _processor_response_data_list)
+        base_processor_response_data_list = [
+            ProcessorResponseData(document_data=x, context_data=y)
+            for x, y in zip(document_data_list, context_data_list)]
+        return SnapshotUtil().consolidate_processor_response_data(
+            processor_response_data_lists, base_processor_response_data_list)
+
+    def __create_pipeline_stage_func(self, stage: list):
+        def stage_func(processor_response_data: ProcessorResponseData):
+            processor_response_data_list = self.__run_pipeline_stage(
+                stage, [processor_response_data.document_data],
+                [processor_response_data.context_data])
+            processor_response_data_list = SnapshotUtil().carry_forward_processor_response_data(
+                [processor_response_data], processor_response_data_list)
+            return self.__split_tracked_response_data(processor_response_data_list)
+        return stage_func
+
+    def __split_tracked_response_data(self, processor_response_data_list: List[ProcessorResponseData]):
+        """Split into documents to continue with and documents which are done due to
+        tracked (error/no records) messages"""
+        forward_item_list, done_item_list = [], []
+        for processor_response_data in processor_response_data_list:
+            tracked_message_list = self.__get_tracked_message_list(
+                [processor_response_data])
+            if tracked_message_list:
+                for document_id, message_list in tracked_message_list:
+                    self._logger.error("document_id: %s | Stopped | Error: %s", document_id,
+                                       "\n".join([x.model_dump_json(indent=4) for x in message_list]))
+                done_item_list.append(processor_response_data)
+            else:
+                forward_item_list.append(processor_response_data)
+        return forward_item_list, done_item_list
+
     def __run_processor(self, controller_request_data: ControllerRequestData,
                         processor_input_config_data: dict, processor_deployment_config_data: dict,
                         input_variable_dict: dict):
@@ -302,8 +784,11 @@ class BOrchestrator(IOrchestrator, ABC):
         controller_request_data = json.loads(
             DppJSONEncoder().encode(controller_request_data))
         data_as_json_str = json.dumps(controller_request_data, indent=4)
-        self._fs_handler.write_file(
-            json_file_path, data_as_json_str, encoding='utf-8')
+        tracer = Tracer.get_current()
+        with tracer.span('controller_file_write', file_path=json_file_path):
+            self._fs_handler.write_file(
+                json_file_path, data_as_json_str, encoding='utf-8')
+        tracer.add_counter('bytes_written', len(data_as_json_str))
         # rel_path = json_file_path.replace(data_root_path, "")
         # return rel_path
         return json_file_path
@@ -382,9 +867,10 @@ class BOrchestrator(IOrchestrator, ABC):
 
         is_sub_processor_flow = "." in processor_num
         if is_sub_processor_flow:
-            for item in processor_exec_map:
-                main, _, sub = item.partition('.')
-                if not sub:
+            # Skip sibling sub-processors of the same group which may have already completed
+            group_num = processor_num.partition('.')[0]
+            for main in processor_exec_map:
+                if main != group_num:
                     return main
         else:
             for main_num, sub_nums in processor_exec_map.items():
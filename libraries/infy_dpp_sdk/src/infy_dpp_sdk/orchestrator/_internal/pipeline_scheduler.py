@@ -0,0 +1,171 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+"""Module for PipelineScheduler class"""
+import queue
+import contextlib
+import contextvars
+import threading
+import time
+import logging
+from typing import Callable, List
+
+
+class PipelineScheduler():
+    """Streams items through a chain of stages. Each stage has its own worker threads and a
+    bounded input queue so that a slow item holds only its own stage and not the whole batch.
+
+    A stage function receives one item and returns a tuple of
+    (items to forward to next stage, items which are done).
+    A stage may also have a worker scope, a context manager factory which each of its workers
+    runs in (e.g. to keep its own processor instance).
+    """
+    __STOP = object()
+
+    def __init__(self, queue_size: int = 0, logger: logging.Logger = None):
+        self.__queue_size = queue_size
+        self.__logger = logger if logger else logging.getLogger(__name__)
+        self.__stage_list = []
+        self.__result_list = []
+        self.__error_list = []
+        self.__lock = threading.Lock()
+
+    def add_stage(self, stage_name: str, stage_func: Callable, workers: int = 1,
+                  worker_scope: Callable = None):
+        """Add a stage to the end of the chain"""
+        self.__stage_list.append({
+            'name': stage_name,
+            'func': stage_func,
+            'worker_scope': worker_scope if worker_scope else contextlib.nullcontext,
+            'workers': max(1, workers),
+            'queue': queue.Queue(maxsize=self.__queue_size),
+            'metrics': {
+                'stage_name': stage_name,
+                'workers': max(1, workers),
+                'processed_count': 0,
+                'busy_time_secs': 0.0,
+                'start_time': None,
+                'end_time': None,
+                'max_queue_depth': 0,
+                'queue_depth_total': 0,
+                'queue_depth_samples': 0
+            }
+        })
+
+    def run(self, source_item_list: list) -> list:
+        """Push all source items through the stages and return the completed items in source order.
+        If a stage failed for any item, its error is raised once all items are done. Completed
+        items, including failed items as they were before the stage, are then available from
+        `get_result_list`."""
+        self.__result_list, self.__error_list = [], []
+        if not self.__stage_list:
+            return list(source_item_list)
+        thread_lists = []
+        for stage_idx, stage in enumerate(self.__stage_list):
+            # Each worker runs in a copy of the caller's context (e.g. to see the current tracer)
+            threads = [threading.Thread(target=contextvars.copy_context().run,
+                                        args=(self.__run_worker, stage_idx),
+                                        name=f"{stage['name']}-{x+1}", daemon=True)
+                       for x in range(stage['workers'])]
+            for thread in threads:
+                thread.start()
+            thread_lists.append(threads)
+
+        for seq, item in enumerate(source_item_list):
+            self.__put(0, ((seq,), item))
+        # Stop the stages one after another so that in-flight items are drained
+        for stage_idx, stage in enumerate(self.__stage_list):
+            for _ in range(stage['workers']):
+                stage['queue'].put(self.__STOP)
+            for thread in thread_lists[stage_idx]:
+                thread.join()
+
+        if self.__error_list:
+            raise self.__error_list[0]
+        return self.get_result_list()
+
+    def get_result_list(self) -> list:
+        """Get items completed by the last `run`, in source order"""
+        with self.__lock:
+            result_list = sorted(self.__result_list, key=lambda x: x[0])
+        return [x[1] for x in result_list]
+
+    def get_metrics(self) -> List[dict]:
+        """Get per-stage throughput and queue depth metrics"""
+        metrics_list = []
+        for stage in self.__stage_list:
+            metrics = stage['metrics']
+            elapsed_time = 0
+            if metrics['start_time'] is not None:
+                elapsed_time = metrics['end_time'] - metrics['start_time']
+            samples = metrics['queue_depth_samples']
+            metrics_list.append({
+                'stage_name': metrics['stage_name'],
+                'workers': metrics['workers'],
+                'processed_count': metrics['processed_count'],
+                'busy_time_secs': round(metrics['busy_time_secs'], 4),
+                'elapsed_time_secs': round(elapsed_time, 4),
+                'throughput_per_sec': round(metrics['processed_count'] / elapsed_time, 4)
+                if elapsed_time else 0,
+                'max_queue_depth': metrics['max_queue_depth'],
+                'avg_queue_depth': round(metrics['queue_depth_total'] / samples, 4) if samples else 0
+            })
+        return metrics_list
+
+    # ---------- Private Methods ---------
+    def __put(self, stage_idx: int, seq_item: tuple):
+        if stage_idx >= len(self.__stage_list):
+            with self.__lock:
+                self.__result_list.append(seq_item)
+            return
+        stage = self.__stage_list[stage_idx]
+        stage['queue'].put(seq_item)
+        queue_depth = stage['queue'].qsize()
+        metrics = stage['metrics']
+        with self.__lock:
+            metrics['max_queue_depth'] = max(
+                metrics['max_queue_depth'], queue_depth)
+            metrics['queue_depth_total'] += queue_depth
+            metrics['queue_depth_samples'] += 1
+
+    def __run_worker(self, stage_idx: int):
+        stage = self.__stage_list[stage_idx]
+        with stage['worker_scope']():
+            self.__run_worker_loop(stage_idx)
+
+    def __run_worker_loop(self, stage_idx: int):
+        stage = self.__stage_list[stage_idx]
+        metrics = stage['metrics']
+        while True:
+            seq_item = stage['queue'].get()
+            if seq_item is self.__STOP:
+                break
+            seq, item = seq_item
+            start_time = time.time()
+            with self.__lock:
+                if metrics['start_time'] is None:
+                    metrics['start_time'] = start_time
+            try:
+                forward_item_list, done_item_list = stage['func'](item)
+            except Exception as ex:
+                self.__logger.error(
+                    "Stage %s failed for item %s: %s", stage['name'], seq, ex)
+                with self.__lock:
+                    self.__error_list.append(ex)
+                forward_item_list, done_item_list = [], [item]
+            end_time = time.time()
+            with self.__lock:
+                metrics['processed_count'] += 1
+                metrics['busy_time_secs'] += end_time - start_time
+                metrics['end_time'] = end_time
+            for idx, done_item in enumerate(done_item_list):
+                self.__put(len(self.__stage_list),
+                           (seq + (idx,), done_item))
+            for idx, forward_item in enumerate(forward_item_list):
+                # Items split by a stage get a sub-sequence so that source order is retained
+                forward_seq = seq if len(
+                    forward_item_list) == 1 else seq + (idx,)
+                self.__put(stage_idx + 1, (forward_seq, forward_item))
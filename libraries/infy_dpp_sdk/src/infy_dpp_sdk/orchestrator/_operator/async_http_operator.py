@@ -0,0 +1,175 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+import json
+import asyncio
+import logging
+import threading
+import infy_fs_utils
+from ...data import (ControllerResponseData)
+from ...common import Constants
+from ...common._internal.singleton import Singleton
+from ...common._internal.snapshot_util import SnapshotUtil
+try:
+    import aiohttp
+except ImportError:
+    # This is optional component only required for async HTTP invocation
+    pass
+
+
+class AsyncHTTPClientManager(metaclass=Singleton):
+    """Owns one event loop (running on a background thread) and one pooled HTTP session shared by
+    all HTTP processor calls in the process. Callers on any thread submit coroutines to the loop,
+    so calls made at the same time (e.g. parallel sub-processors) overlap on the same loop."""
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__loop: asyncio.AbstractEventLoop = None
+        self.__session = None
+
+    def run(self, coroutine):
+        """Run coroutine on the shared event loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.__get_loop()).result()
+
+    async def get_session(self):
+        """Get pooled session. To be called from a coroutine running on the shared loop."""
+        if self.__session is None or self.__session.closed:
+            self.__session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100))
+        return self.__session
+
+    def close(self):
+        """Close the session and stop the event loop"""
+        with self.__lock:
+            loop, self.__loop = self.__loop, None
+        if loop is None:
+            return
+        if self.__session is not None:
+            asyncio.run_coroutine_threadsafe(
+                self.__session.close(), loop).result()
+            self.__session = None
+        loop.call_soon_threadsafe(loop.stop)
+
+    # ---------- Private Methods ---------
+    def __get_loop(self) -> asyncio.AbstractEventLoop:
+        with self.__lock:
+            if self.__loop is None:
+                self.__loop = asyncio.new_event_loop()
+                threading.Thread(target=self.__loop.run_forever,
+                                 name="dpp-async-http", daemon=True).start()
+            return self.__loop
+
+
+class _RetryableStatusError(Exception):
+    """Raised for HTTP status codes which are worth retrying"""
+
+
+class AsyncHTTPOperator():
+    """Operator for HTTP using asyncio and a pooled client"""
+    __DEFAULT_TIMEOUT_SECS = 180
+    __RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
+    __CHUNK_SIZE = 64 * 1024
+
+    def __init__(self) -> None:
+        if not self.is_available():
+            raise ImportError(
+                "aiohttp is required for async HTTP invocation (processor_invocation.http.async)")
+        self.__fs_handler = infy_fs_utils.manager.FileSystemManager(
+        ).get_fs_handler(Constants.FSH_DPP)
+        if infy_fs_utils.manager.FileSystemLoggingManager().has_fs_logging_handler(Constants.FSLH_DPP):
+            self.__logger = infy_fs_utils.manager.FileSystemLoggingManager(
+            ).get_fs_logging_handler(Constants.FSLH_DPP).get_logger()
+        else:
+            self.__logger = logging.getLogger(__name__)
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """Returns True if the optional dependency (aiohttp) is installed"""
+        return 'aiohttp' in globals()
+
+    def execute_processor(self, processor_deployment_config_data: dict):
+        """Execute a processor. The calling thread waits while the call runs on the shared loop."""
+        return AsyncHTTPClientManager().run(
+            self.execute_processor_async(processor_deployment_config_data))
+
+    async def execute_processor_async(self, processor_deployment_config_data: dict):
+        """Execute a processor.
+        Per processor deployment config keys (optional):
+        `http_timeout_secs` (default 180) and
+        `http_retry` i.e. {"max_retries": 0, "backoff_secs": 1} where wait doubles on each retry.
+        Connection errors (including the server closing the connection while the request is
+        sent), timeouts and status codes 429/5xx are retried.
+        """
+        new_output_variables_dict = {}
+        try:
+            api_url = processor_deployment_config_data['http_controller_base_url'] + \
+                processor_deployment_config_data['http_controller_path']
+
+            args = processor_deployment_config_data.get('args', {})
+            env = processor_deployment_config_data.get('env', {})
+
+            dpp_headers = {k.replace("_", "-"): v for k,
+                           v in env.items()}
+            dpp_headers['Content-Type'] = 'application/json'
+            dpp_controller_req_file_path = args.get('request_file_path', None)
+
+            timeout_secs = processor_deployment_config_data.get(
+                'http_timeout_secs', self.__DEFAULT_TIMEOUT_SECS)
+            retry_config_data = processor_deployment_config_data.get(
+                'http_retry', {})
+            max_retries = retry_config_data.get('max_retries', 0)
+            backoff_secs = retry_config_data.get('backoff_secs', 1)
+
+            response_data = None
+            for attempt in range(max_retries + 1):
+                try:
+                    response_data = await self.__post(
+                        api_url, dpp_controller_req_file_path, dpp_headers, timeout_secs)
+                    break
+                except (aiohttp.ClientConnectionError, aiohttp.ServerDisconnectedError,
+                        OSError, asyncio.TimeoutError, _RetryableStatusError) as ex:
+                    if attempt >= max_retries:
+                        raise
+                    wait_secs = backoff_secs * (2 ** attempt)
+                    self.__logger.warning("HTTP call to %s failed (%s). Retry %s of %s in %s secs",
+                                          api_url, ex or type(ex).__name__, attempt + 1,
+                                          max_retries, wait_secs)
+                    await asyncio.sleep(wait_secs)
+
+            controller_response_data = ControllerResponseData(**response_data)
+            # File I/O is moved off the loop so that other calls aren't held up
+            dpp_controller_res_file_path = await asyncio.get_running_loop().run_in_executor(
+                None, SnapshotUtil().save_controller_response_data, controller_response_data)
+
+            output_variables_dict = processor_deployment_config_data['output']['variables']
+
+            if output_variables_dict:
+                for output_variable, _ in output_variables_dict.items():
+                    new_output_variables_dict[output_variable] = dpp_controller_res_file_path
+
+        except Exception as ex:
+            raise Exception(ex) from ex
+        return new_output_variables_dict
+
+    # ---------- Private Methods ---------
+    async def __post(self, api_url: str, file_path: str, headers: dict, timeout_secs: float) -> dict:
+        """Post the file content as a stream and read the response in chunks"""
+        session = await AsyncHTTPClientManager().get_session()
+        loop = asyncio.get_running_loop()
+        file = await loop.run_in_executor(None, self.__fs_handler.get_file_object, file_path, 'rb')
+        try:
+            async with session.post(api_url, data=file, headers=headers,
+                                    timeout=aiohttp.ClientTimeout(total=timeout_secs)) as response:
+                if response.status in self.__RETRY_STATUS_CODES:
+                    raise _RetryableStatusError(
+                        f"HTTP status {response.status}")
+                response.raise_for_status()
+                body = bytearray()
+                async for chunk in response.content.iter_chunked(self.__CHUNK_SIZE):
+                    body.extend(chunk)
+        finally:
+            file.close()
+        return json.loads(body)
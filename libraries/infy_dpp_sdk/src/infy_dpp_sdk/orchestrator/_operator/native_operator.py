@@ -7,14 +7,17 @@
 
 import json
 import logging
-import importlib
 import traceback
+from typing import List
 import infy_fs_utils
-from ...interface import IProcessor
-from ...data import (ControllerRequestData, ControllerResponseData)
-from ...common import Constants
+from ...data import (ControllerRequestData, ControllerResponseData,
+                     DocumentData, ProcessorResponseData, MessageTypeEnum)
+from ...common import Constants, PydanticUtil
 from ...common._internal.snapshot_util import SnapshotUtil
 from ...common._internal.processor_helper import ProcessorHelper
+from ...common._internal.processor_instance_pool import ProcessorInstancePool
+from ...common._internal.step_cache import StepCache
+from ...common._internal.tracer import Tracer
 
 
 class NativeOperator():
@@ -36,14 +39,6 @@ class NativeOperator():
         new_output_variables_dict = {}
         try:
 
-            # ------------ Auto import the processors ------------------
-            library = importlib.import_module(
-                processor_input_config_data['processor_namespace'])
-            my_processor_obj: IProcessor = getattr(
-                library, processor_input_config_data['processor_class_name'])()
-            my_processor_obj.set_proc_name(
-                processor_input_config_data['processor_name'])
-
             # ------------ Read the controller request file ------------------
             controller_request_file_path = processor_deployment_config_data.get('args', {}).get(
                 'request_file_path', None)
@@ -66,10 +61,13 @@ class NativeOperator():
             controller_request_data: ControllerRequestData = ControllerRequestData(
                 **controller_request_file_data)
             snapshot_util = SnapshotUtil()
+            # Processor may declare the only DocumentData fields it needs
+            document_data_fields = getattr(ProcessorInstancePool().get_processor_class(
+                processor_input_config_data['processor_namespace'],
+                processor_input_config_data['processor_class_name']),
+                '_SNAPSHOT_DOCUMENT_DATA_FIELDS', None)
             document_data_list, context_data_list, _ = snapshot_util.load_snapshots(
-                controller_request_data)
-            config_data = processor_input_config_data.get(
-                'processor_input_config', {})
+                controller_request_data, document_data_fields)
 
             # # ------------ Read document data and context data list ----------
             # snapshot_dir_root_path = controller_request_file_data['snapshot_dir_root_path'] + "/"
@@ -85,21 +83,14 @@ class NativeOperator():
             #     x)) for x in context_data_file_path_list]
 
             # ------------ Call the processor ------------------
-            try:
-                new_processor_response_list = my_processor_obj.do_execute_batch(
-                    document_data_list, context_data_list, config_data)
-            except Exception as ex:
-                full_trace_error = traceback.format_exc()
-                self.__logger.error(full_trace_error)
-                new_processor_response_list = []
-                for document_data, context_data in zip(document_data_list, context_data_list):
-                    _processor_response_data = ProcessorHelper.create_processor_response_data(
-                        document_data, context_data, ex)
-                    new_processor_response_list.append(
-                        _processor_response_data)
+            new_processor_response_list = self.execute_processor_in_memory(
+                processor_input_config_data, document_data_list, context_data_list)
 
+            codec_name = input_config_file_data.get(
+                'orchestrator', {}).get('snapshot', {}).get('codec')
             controller_response_data: ControllerResponseData = snapshot_util.save_snapshots(
-                controller_request_data, new_processor_response_list)
+                controller_request_data, new_processor_response_list, document_data_fields,
+                codec_name)
 
             dpp_controller_res_file_path = snapshot_util.save_controller_response_data(
                 controller_response_data)
@@ -113,3 +104,125 @@ class NativeOperator():
         except Exception as ex:
             raise Exception(ex) from ex
         return new_output_variables_dict
+
+    def execute_processor_in_memory(self, processor_input_config_data: dict,
+                                    document_data_list: List[DocumentData],
+                                    context_data_list: List[dict]) -> List[ProcessorResponseData]:
+        """Execute a processor on in-memory data without reading or writing any snapshot.
+        Results are taken from step cache, where possible, if it's enabled for the processor.
+        Processors without incoming documents (i.e. first processor) are always run."""
+        if document_data_list and StepCache().is_enabled(
+                processor_input_config_data['processor_name'],
+                getattr(ProcessorInstancePool().get_processor_class(
+                    processor_input_config_data['processor_namespace'],
+                    processor_input_config_data['processor_class_name']),
+                    '_STEP_CACHEABLE', False)):
+            return self.__execute_processor_in_memory_with_cache(
+                processor_input_config_data, document_data_list, context_data_list)
+        return self.__execute_processor_in_memory(
+            processor_input_config_data, document_data_list, context_data_list)
+
+    def warm_up_processor(self, processor_input_config_data: dict):
+        """Import the processor and create a ready instance if it's reusable"""
+        ProcessorInstancePool().warm_up(
+            processor_input_config_data['processor_namespace'],
+            processor_input_config_data['processor_class_name'],
+            processor_input_config_data.get('processor_input_config', {}))
+
+    def processor_worker_scope(self):
+        """Context manager within which the calling thread reuses its instances of processors"""
+        return ProcessorInstancePool().worker_scope()
+
+    # ---------- Private Methods ---------
+    def __execute_processor_in_memory(self, processor_input_config_data: dict,
+                                      document_data_list: List[DocumentData],
+                                      context_data_list: List[dict]) -> List[ProcessorResponseData]:
+        config_data = processor_input_config_data.get(
+            'processor_input_config', {})
+        # ------------ Auto import the processors ------------------
+        processor_instance_pool = ProcessorInstancePool()
+        my_processor_obj, instance_key = processor_instance_pool.acquire(
+            processor_input_config_data['processor_namespace'],
+            processor_input_config_data['processor_class_name'], config_data)
+        my_processor_obj.set_proc_name(
+            processor_input_config_data['processor_name'])
+
+        # ------------ Call the processor ------------------
+        try:
+            new_processor_response_list = my_processor_obj.do_execute_batch(
+                document_data_list, context_data_list, config_data)
+        except Exception as ex:
+            full_trace_error = traceback.format_exc()
+            self.__logger.error(full_trace_error)
+            new_processor_response_list = []
+            for document_data, context_data in zip(document_data_list, context_data_list):
+                _processor_response_data = ProcessorHelper.create_processor_response_data(
+                    document_data, context_data, ex)
+                new_processor_response_list.append(
+                    _processor_response_data)
+        finally:
+            processor_instance_pool.release(instance_key, my_processor_obj)
+        return new_processor_response_list
+
+    def __execute_processor_in_memory_with_cache(self, processor_input_config_data: dict,
+                                                 document_data_list: List[DocumentData],
+                                                 context_data_list: List[dict]) -> List[ProcessorResponseData]:
+        """Run the processor only for the documents not found in step cache"""
+        step_cache = StepCache()
+        processor_namespace = processor_input_config_data['processor_namespace']
+        processor_class_name = processor_input_config_data['processor_class_name']
+        config_data = processor_input_config_data.get(
+            'processor_input_config', {})
+        # Each document is cached on its own
+        key_list, run_id_lists, cached_response_list = [], [], []
+        for document_data, context_data in zip(document_data_list, context_data_list):
+            document_data_dict = PydanticUtil.get_json_dict(document_data)
+            run_id_list = step_cache.get_run_id_list(document_data_dict, context_data)
+            key = step_cache.get_key(
+                processor_namespace, processor_class_name, config_data,
+                document_data_dict, context_data, run_id_list)
+            key_list.append(key)
+            run_id_lists.append(run_id_list)
+            cached_response_list.append(step_cache.get(key, run_id_list))
+        miss_idx_list = [idx for idx, x in enumerate(
+            cached_response_list) if x is None]
+        Tracer.get_current().add_counter(
+            'step_cache_hits', len(key_list) - len(miss_idx_list))
+        Tracer.get_current().add_counter('step_cache_misses', len(miss_idx_list))
+
+        new_response_dict = {}
+        if miss_idx_list:
+            miss_response_list = self.__execute_processor_in_memory(
+                processor_input_config_data, [document_data_list[x] for x in miss_idx_list],
+                [context_data_list[x] for x in miss_idx_list])
+            if len(miss_response_list) != len(miss_idx_list):
+                # Can't be matched to documents so nothing is cached
+                self.__logger.warning("Step cache skipped for %s as response count doesn't match",
+                                      processor_input_config_data['processor_name'])
+                return miss_response_list
+            new_response_dict = {x: [y] for x, y in zip(
+                miss_idx_list, miss_response_list)}
+            for idx, response_list in new_response_dict.items():
+                # Failed results are not cached so they are retried
+                if any(x.message_data and [y for y in x.message_data.messages if y.message_type in [
+                        MessageTypeEnum.ERROR, MessageTypeEnum.CRITICAL]] for x in response_list):
+                    continue
+                step_cache.put(key_list[idx], [
+                    {'document_data': PydanticUtil.get_json_dict(x.document_data),
+                     'context_data': x.context_data,
+                     'message_data': PydanticUtil.get_json_dict(x.message_data) if x.message_data else None}
+                    for x in response_list], run_id_lists[idx])
+
+        processor_response_data_list = []
+        for idx, cached_response in enumerate(cached_response_list):
+            if cached_response is None:
+                processor_response_data_list.extend(new_response_dict[idx])
+                continue
+            processor_response_data_list.extend([
+                ProcessorResponseData(
+                    document_data=DocumentData(**x['document_data']),
+                    context_data=x['context_data'],
+                    message_data=ProcessorHelper.create_message_data(
+                        x['message_data']) if x['message_data'] else None)
+                for x in cached_response])
+        return processor_response_data_list
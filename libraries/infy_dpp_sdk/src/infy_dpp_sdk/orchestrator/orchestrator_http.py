@@ -6,6 +6,7 @@
 
 from ._internal.b_orchestrator import BOrchestrator
 from ._operator.http_operator import HTTPOperator
+from ._operator.async_http_operator import AsyncHTTPOperator
 
 
 class OrchestratorHTTP(BOrchestrator):
@@ -25,4 +26,7 @@ class OrchestratorHTTP(BOrchestrator):
         Returns:
             dict: Result of the processor execution.
         """
+        if orchestrator_config_data.get('processor_invocation', {}).get(
+                'http', {}).get('async', False):
+            return AsyncHTTPOperator().execute_processor(processor_deployment_config_data)
         return HTTPOperator().execute_processor(processor_deployment_config_data)
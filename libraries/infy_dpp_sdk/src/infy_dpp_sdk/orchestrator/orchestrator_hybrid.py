@@ -7,6 +7,7 @@
 from ._internal.b_orchestrator import BOrchestrator
 from ._operator.cli_operator import CLIOperator
 from ._operator.http_operator import HTTPOperator
+from ._operator.async_http_operator import AsyncHTTPOperator
 from ._operator.native_operator import NativeOperator
 
 
@@ -36,7 +37,11 @@ class OrchestratorHybrid(BOrchestrator):
         if invocation_mode == self.__INVOCATION_MODE_CLI:
             result = CLIOperator().execute_processor(processor_deployment_config_data)
         elif invocation_mode == self.__INVOCATION_MODE_HTTP:
-            result = HTTPOperator().execute_processor(processor_deployment_config_data)
+            if self.__use_async_http(orchestrator_config_data):
+                result = AsyncHTTPOperator().execute_processor(
+                    processor_deployment_config_data)
+            else:
+                result = HTTPOperator().execute_processor(processor_deployment_config_data)
         elif invocation_mode == self.__INVOCATION_MODE_NATIVE:
             result = NativeOperator().execute_processor(processor_deployment_config_data,
                                                         processor_input_config_data)
@@ -69,3 +74,16 @@ class OrchestratorHybrid(BOrchestrator):
 
         return processor_name_invocation_mode_dict.get(
             processor_input_config_data.get('processor_name'), default_mode).lower()
+
+    def __use_async_http(self, orchestrator_config_data: dict) -> bool:
+        """
+        Check if HTTP processors are to be called using the async operator.
+
+        Args:
+            orchestrator_config_data (dict): Configuration data for the orchestrator.
+
+        Returns:
+            bool: True if `processor_invocation.http.async` is set to true.
+        """
+        return orchestrator_config_data.get('processor_invocation', {}).get(
+            'http', {}).get('async', False)
@@ -4,6 +4,8 @@
 # http://www.apache.org/licenses/                                                                                #
 # ===============================================================================================================#
 
+from typing import List
+from ..data import DocumentData, ProcessorResponseData
 from ._internal.b_orchestrator import BOrchestrator
 from ._operator.native_operator import NativeOperator
 
@@ -11,6 +13,8 @@ from ._operator.native_operator import NativeOperator
 class OrchestratorNative(BOrchestrator):
     """Orchestrator that invokes processors natively."""
 
+    _IN_MEMORY_SNAPSHOT_SUPPORTED = True
+
     def execute_processor(self, processor_input_config_data: dict,
                           processor_deployment_config_data: dict,
                           orchestrator_config_data: dict) -> dict:
@@ -27,3 +31,38 @@ class OrchestratorNative(BOrchestrator):
         """
         return NativeOperator().execute_processor(processor_deployment_config_data,
                                                   processor_input_config_data)
+
+    def execute_processor_in_memory(self, processor_input_config_data: dict,
+                                    document_data_list: List[DocumentData],
+                                    context_data_list: List[dict]) -> List[ProcessorResponseData]:
+        """
+        Execute a processor on in-memory data without reading or writing snapshots.
+
+        Args:
+            processor_input_config_data (dict): Input configuration data for the processor.
+            document_data_list (List[DocumentData]): List of document data.
+            context_data_list (List[dict]): List of context data.
+
+        Returns:
+            List[ProcessorResponseData]: List of processor response data.
+        """
+        return NativeOperator().execute_processor_in_memory(processor_input_config_data,
+                                                            document_data_list, context_data_list)
+
+    def warm_up_processor(self, processor_input_config_data: dict):
+        """
+        Import the processor and keep a loaded instance if the processor is reusable.
+
+        Args:
+            processor_input_config_data (dict): Input configuration data for the processor.
+        """
+        NativeOperator().warm_up_processor(processor_input_config_data)
+
+    def processor_worker_scope(self):
+        """
+        Context manager within which the calling thread creates each processor only once.
+
+        Returns:
+            ContextManager: Scope of a pipeline stage worker.
+        """
+        return NativeOperator().processor_worker_scope()
@@ -0,0 +1,154 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+import copy
+import json
+import logging
+from typing import List
+import infy_fs_utils
+from ..interface import IOrchestratorNative
+from ..data import DocumentData, ProcessorResponseData, MessageCodeEnum
+from ..common import Constants
+from ..common._internal.processor_helper import ProcessorHelper
+from ..common._internal.config_data_helper import ConfigDataHelper
+from ._operator.native_operator import NativeOperator
+
+
+class OrchestratorNativeInMemory(IOrchestratorNative):
+    """Orchestrator that invokes processors natively on in-memory document and context data,
+    without reading or writing snapshots, e.g. to serve requests.
+    Processor classes are imported once per process, and instances of processors which set
+    `_REUSABLE_INSTANCE` are kept for reuse by later runs and other orchestrator instances."""
+
+    # Messages on which the pipeline stops
+    __STOP_MESSAGE_CODE_LIST = [MessageCodeEnum.SERVER_ERR_UNHANDLED_EXCEPTION,
+                                MessageCodeEnum.INFO_NO_RECORDS_FOUND]
+
+    def __init__(self, input_config_data: dict = None,
+                 input_config_file_path: str = None):
+        self.__fs_handler = infy_fs_utils.manager.FileSystemManager(
+        ).get_fs_handler(Constants.FSH_DPP)
+        if infy_fs_utils.manager.FileSystemLoggingManager().has_fs_logging_handler(Constants.FSLH_DPP):
+            self.__logger = infy_fs_utils.manager.FileSystemLoggingManager(
+            ).get_fs_logging_handler(Constants.FSLH_DPP).get_logger()
+        else:
+            self.__logger = logging.getLogger(__name__)
+        if input_config_file_path:
+            _input_config_data = json.loads(self.__fs_handler.read_file(
+                input_config_file_path))
+        elif input_config_data:
+            _input_config_data = input_config_data
+        else:
+            raise ValueError(
+                'input_config_data or input_config_file_path is required')
+        self.__input_config_data = ConfigDataHelper(
+            self.__logger).do_interpolation(_input_config_data)
+
+    def get_input_config_data(self) -> dict:
+        """
+        Get a copy of the interpolated input config data, e.g. to change it for one request
+        and pass it to a new orchestrator.
+
+        Returns:
+            dict: Input config data.
+        """
+        return copy.deepcopy(self.__input_config_data)
+
+    def warm_up(self):
+        """
+        Import enabled processors and keep a loaded instance of those which are reusable.
+        """
+        for processor_input_config_data in self.__get_enabled_processor_list():
+            NativeOperator().warm_up_processor(processor_input_config_data)
+
+    def run_batch(self, document_data_list: List[DocumentData] = None,
+                  context_data_list: List[dict] = None) -> List[ProcessorResponseData]:
+        """
+        Run the orchestrator pipeline. An exception of a processor is returned as its response
+        with `SERVER_ERR_UNHANDLED_EXCEPTION`, which stops the pipeline.
+
+        Args:
+            document_data_list (List[DocumentData], optional): List of document data.
+            context_data_list (List[dict], optional): List of context data.
+
+        Returns:
+            List[ProcessorResponseData]: List of processor response data.
+        """
+        processor_response_data_list = []
+        document_data_list = document_data_list if document_data_list else [
+            DocumentData()]
+        context_data_list = context_data_list if context_data_list else [{}]
+        for processor_input_config_data in self.__get_enabled_processor_list():
+            processor_instance, processor_response_data_list = self.pre_run_hook(
+                processor_input_config_data, processor_input_config_data['processor_input_config'],
+                processor_response_data_list)
+            if not processor_instance:
+                continue
+            new_processor_response_data_list = NativeOperator().execute_processor_in_memory(
+                processor_input_config_data, document_data_list, context_data_list)
+            processor_response_data_list = self.post_run_hook(
+                processor_instance, processor_input_config_data['processor_input_config'],
+                processor_response_data_list, new_processor_response_data_list)
+
+            stop_message_list = [y for x in processor_response_data_list for z in self.__STOP_MESSAGE_CODE_LIST
+                                 for y in ProcessorHelper.get_messages(x, z)]
+            if stop_message_list:
+                self.__logger.info("\n".join([str(x) for x in stop_message_list]))
+                break
+            document_data_list = [
+                x.document_data for x in processor_response_data_list if x.document_data.document_id]
+            context_data_list = [
+                x.context_data for x in processor_response_data_list if x.document_data.document_id]
+        return processor_response_data_list
+
+    def pre_run_hook(self, processor_instance: object, config_data: dict,
+                     processor_response_data_list: List[ProcessorResponseData]) \
+            -> (object, List[ProcessorResponseData]):
+        """
+        Pre run hook for the processor. Processor instances are taken from the pool when the
+        processor is run, so `processor_instance` is the processor's config from `processor_list`.
+
+        Args:
+            processor_instance (object): Processor config data.
+            config_data (dict): Configuration data.
+            processor_response_data_list (List[ProcessorResponseData]): List of processor response data.
+
+        Returns:
+            tuple: Processor config data, or None to skip the processor, and list of processor response data.
+        """
+        return processor_instance, processor_response_data_list
+
+    def post_run_hook(self, processor_instance: object, config_data: dict,
+                      processor_response_data_list: List[ProcessorResponseData],
+                      new_processor_response_data_list: List[ProcessorResponseData]) \
+            -> List[ProcessorResponseData]:
+        """
+        Post run hook for the processor.
+
+        Args:
+            processor_instance (object): Processor config data.
+            config_data (dict): Configuration data.
+            processor_response_data_list (List[ProcessorResponseData]): List of processor response data.
+            new_processor_response_data_list (List[ProcessorResponseData]): List of new processor response data.
+
+        Returns:
+            List[ProcessorResponseData]: List of processor response data.
+        """
+        return new_processor_response_data_list
+
+    # ---------- Private Methods ---------
+    def __get_enabled_processor_list(self) -> List[dict]:
+        """Returns config of enabled processors, each with its filtered `processor_input_config`"""
+        processor_list = []
+        for processor_config_data in self.__input_config_data.get('processor_list', []):
+            if not processor_config_data.get('enabled'):
+                continue
+            processor_input_config_data = dict(processor_config_data)
+            processor_input_config_data['processor_input_config'] = {
+                x: self.__input_config_data.get('processor_input_config').get(x)
+                for x in processor_config_data.get('processor_input_config_name_list', [])}
+            processor_list.append(processor_input_config_data)
+        return processor_list
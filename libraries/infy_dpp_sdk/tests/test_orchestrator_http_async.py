@@ -0,0 +1,167 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+import json
+import time
+import threading
+import http.server
+import concurrent.futures
+import pytest
+import infy_fs_utils
+import infy_dpp_sdk
+
+
+STORAGE_ROOT_PATH = f"C:/temp/unittest/infy_dpp_sdk/{__name__}/STORAGE"
+CONTROLLER_REQ_FILE_PATH = '/data/temp/R-1_dpp_controller_request.json'
+
+
+@pytest.fixture(scope='module', autouse=True)
+def pre_test(create_root_folders):
+    """Test pre-run method"""
+    # Create data folders
+    create_root_folders([STORAGE_ROOT_PATH])
+    storage_config_data = infy_fs_utils.data.StorageConfigData(
+        **{
+            "storage_root_uri": f"file://{STORAGE_ROOT_PATH}",
+            "storage_server_url": "",
+            "storage_access_key": "",
+            "storage_secret_key": ""
+        })
+    file_sys_handler = infy_fs_utils.provider.FileSystemHandler(
+        storage_config_data)
+    infy_fs_utils.manager.FileSystemManager().set_root_handler_name(
+        infy_dpp_sdk.common.Constants.FSH_DPP)
+    infy_fs_utils.manager.FileSystemManager().add_fs_handler(file_sys_handler)
+
+    logging_config_data = infy_fs_utils.data.LoggingConfigData(
+        **{
+            # "logger_group_name": "my_group_1",
+            "logging_level": 10,
+            "logging_format": "",
+            "logging_timestamp_format": "",
+            "log_file_data": {
+                "log_file_dir_path": "/logs",
+                "log_file_name_prefix": "infy_dpp_sdk",
+                # "log_file_name_suffix": "1",
+                "log_file_extension": ".log"
+
+            }})
+    file_sys_logging_handler = infy_fs_utils.provider.FileSystemLoggingHandler(
+        logging_config_data, file_sys_handler)
+    infy_fs_utils.manager.FileSystemLoggingManager(
+    ).set_root_handler_name(infy_dpp_sdk.common.Constants.FSLH_DPP)
+    infy_fs_utils.manager.FileSystemLoggingManager(
+    ).add_fs_logging_handler(file_sys_logging_handler)
+
+    infy_fs_utils.manager.FileSystemManager().get_fs_handler().write_file(
+        CONTROLLER_REQ_FILE_PATH, json.dumps({"request_id": "R-1", "records": []}))
+
+    yield  # Run all test methods
+    # Post run cleanup
+    # Delete file system handler so that other test modules don't get duplicate key error
+    infy_fs_utils.manager.FileSystemManager().delete_fs_handler()
+    infy_fs_utils.manager.FileSystemLoggingManager().delete_fs_logging_handler()
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    """Echoes the controller request back as response"""
+    fail_count = 0
+    request_count = 0
+    delay_secs = 0
+
+    def do_POST(self):
+        """Handle POST"""
+        _Handler.request_count += 1
+        if _Handler.fail_count > 0:
+            _Handler.fail_count -= 1
+            self.send_response(503)
+            self.end_headers()
+            return
+        time.sleep(_Handler.delay_secs)
+        if self.headers.get('Transfer-Encoding') == 'chunked':
+            body = b''
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                body += self.rfile.read(size)
+                self.rfile.readline()
+        else:
+            body = self.rfile.read(int(self.headers['Content-Length']))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def http_server_url():
+    """Start local HTTP server"""
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def __get_processor_deployment_config_data(http_server_url, **kwargs):
+    processor_deployment_config_data = {
+        "http_controller_base_url": http_server_url,
+        "http_controller_path": "/api/v1/dpp/execute",
+        "args": {"request_file_path": CONTROLLER_REQ_FILE_PATH},
+        "output": {"variables": {"SYS_CONTROLLER_RES_FILE_PATH": "response_file_path"}}
+    }
+    processor_deployment_config_data.update(kwargs)
+    return processor_deployment_config_data
+
+
+def test_async_http_operator_1(http_server_url):
+    """Test method"""
+    pytest.importorskip("aiohttp")
+    from infy_dpp_sdk.orchestrator._operator.async_http_operator import AsyncHTTPOperator
+    _Handler.fail_count, _Handler.request_count, _Handler.delay_secs = 2, 0, 0
+    output_variables_dict = AsyncHTTPOperator().execute_processor(
+        __get_processor_deployment_config_data(
+            http_server_url, http_retry={"max_retries": 2, "backoff_secs": 0.01}))
+    assert _Handler.request_count == 3
+    assert output_variables_dict['SYS_CONTROLLER_RES_FILE_PATH'].endswith(
+        'R-1_dpp_controller_response.json')
+
+    # Retries exhausted
+    _Handler.fail_count, _Handler.request_count = 2, 0
+    with pytest.raises(Exception):
+        AsyncHTTPOperator().execute_processor(
+            __get_processor_deployment_config_data(
+                http_server_url, http_retry={"max_retries": 1, "backoff_secs": 0.01}))
+    assert _Handler.request_count == 2
+    _Handler.fail_count = 0
+
+
+def test_async_http_operator_2(http_server_url):
+    """Test method"""
+    pytest.importorskip("aiohttp")
+    from infy_dpp_sdk.orchestrator._operator.async_http_operator import AsyncHTTPOperator
+    _Handler.fail_count, _Handler.request_count, _Handler.delay_secs = 0, 0, 0.5
+    # Calls from parallel sub-processor threads overlap on the shared event loop
+    start_time = time.time()
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        futures = [executor.submit(AsyncHTTPOperator().execute_processor,
+                                   __get_processor_deployment_config_data(http_server_url))
+                   for _ in range(4)]
+        results = [x.result() for x in futures]
+    assert len(results) == 4
+    assert time.time() - start_time < 1.5
+    _Handler.delay_secs = 0
+
+    # Timeout per processor
+    _Handler.delay_secs = 1
+    with pytest.raises(Exception):
+        AsyncHTTPOperator().execute_processor(
+            __get_processor_deployment_config_data(http_server_url, http_timeout_secs=0.2))
+    _Handler.delay_secs = 0
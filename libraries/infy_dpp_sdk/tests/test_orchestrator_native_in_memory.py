@@ -0,0 +1,211 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+import os
+import pytest
+import infy_fs_utils
+import infy_dpp_sdk
+
+
+STORAGE_ROOT_PATH = f"C:/temp/unittest/infy_dpp_sdk/{__name__}/STORAGE"
+SERIAL_FLOW_INPUT_CONFIG_FILE_PATH = '/data/config/dpp_pipeline1_input_config.json'
+PARALLEL_FLOW_INPUT_CONFIG_FILE_PATH = '/data/config/dpp_pipeline1p_input_config.json'
+SYS_CONTROLLER_RES_FILE_PATH = "SYS_CONTROLLER_RES_FILE_PATH"
+
+
+@pytest.fixture(scope='module', autouse=True)
+def pre_test(create_root_folders, copy_files_to_root_folder):
+    """Test pre-run method"""
+    # Create data folders
+    create_root_folders([STORAGE_ROOT_PATH])
+    # Copy files to pick up folder
+    SAMPLE_ROOT_PATH = "./data/sample"
+    FILES_TO_COPY = [
+        ['company1.txt', f"{SAMPLE_ROOT_PATH}/input",
+            f"{STORAGE_ROOT_PATH}/data/input"],
+        ['company2.txt', f"{SAMPLE_ROOT_PATH}/input",
+            f"{STORAGE_ROOT_PATH}/data/input"],
+        [os.path.basename(SERIAL_FLOW_INPUT_CONFIG_FILE_PATH), f"{SAMPLE_ROOT_PATH}/config",
+            f"{STORAGE_ROOT_PATH}/data/config"],
+        [os.path.basename(PARALLEL_FLOW_INPUT_CONFIG_FILE_PATH), f"{SAMPLE_ROOT_PATH}/config",
+            f"{STORAGE_ROOT_PATH}/data/config"]
+    ]
+    copy_files_to_root_folder(FILES_TO_COPY)
+
+    storage_config_data = infy_fs_utils.data.StorageConfigData(
+        **{
+            "storage_root_uri": f"file://{STORAGE_ROOT_PATH}",
+            "storage_server_url": "",
+            "storage_access_key": "",
+            "storage_secret_key": ""
+        })
+    file_sys_handler = infy_fs_utils.provider.FileSystemHandler(
+        storage_config_data)
+    infy_fs_utils.manager.FileSystemManager().set_root_handler_name(
+        infy_dpp_sdk.common.Constants.FSH_DPP)
+    infy_fs_utils.manager.FileSystemManager().add_fs_handler(file_sys_handler)
+
+    logging_config_data = infy_fs_utils.data.LoggingConfigData(
+        **{
+            # "logger_group_name": "my_group_1",
+            "logging_level": 10,
+            "logging_format": "",
+            "logging_timestamp_format": "",
+            "log_file_data": {
+                "log_file_dir_path": "/logs",
+                "log_file_name_prefix": "infy_dpp_sdk",
+                # "log_file_name_suffix": "1",
+                "log_file_extension": ".log"
+
+            }})
+    file_sys_logging_handler = infy_fs_utils.provider.FileSystemLoggingHandler(
+        logging_config_data, file_sys_handler)
+    infy_fs_utils.manager.FileSystemLoggingManager(
+    ).set_root_handler_name(infy_dpp_sdk.common.Constants.FSLH_DPP)
+    infy_fs_utils.manager.FileSystemLoggingManager(
+    ).add_fs_logging_handler(file_sys_logging_handler)
+
+    yield  # Run all test methods
+    # Post run cleanup
+    # Delete file system handler so that other test modules don't get duplicate key error
+    infy_fs_utils.manager.FileSystemManager().delete_fs_handler()
+    infy_fs_utils.manager.FileSystemLoggingManager().delete_fs_logging_handler()
+
+
+def test_pipeline_serial_in_memory_1(update_json_file):
+    """Test method"""
+    update_json_file(STORAGE_ROOT_PATH + SERIAL_FLOW_INPUT_CONFIG_FILE_PATH,
+                     'orchestrator', {"snapshot": {"mode": "in_memory"}})
+    dpp_orchestrator = infy_dpp_sdk.orchestrator.OrchestratorNative(
+        input_config_file_path=SERIAL_FLOW_INPUT_CONFIG_FILE_PATH)
+    processor_response_data_list = dpp_orchestrator.run_batch()
+
+    assert len(processor_response_data_list) == 2
+    business_attribute_data_list = [x.dict()['document_data']['business_attribute_data']
+                                    for x in processor_response_data_list]
+    company_names = []
+    for business_attribute_data in business_attribute_data_list:
+        company_names.extend(
+            [x['text'] for x in business_attribute_data if x['name'] == 'Company Name'])
+    assert set(company_names) == {'Infosys', 'Microsoft'}
+
+    processor_exec_list, processor_exec_output_dict = dpp_orchestrator.get_run_batch_summary()
+    assert processor_exec_list == [
+        'document_downloader', 'content_extractor',
+        'attribute_extractor', 'document_uploader']
+    assert [x for x in processor_exec_output_dict] == [
+        '001', '002', '003', '004']
+    # Only the last processor is flushed to storage (checkpoint on_end)
+    assert [x for x, y in processor_exec_output_dict.items()
+            if SYS_CONTROLLER_RES_FILE_PATH in y] == ['004']
+
+    # Flushed controller response should follow the same naming as storage mode
+    controller_res_file_path = processor_exec_output_dict['004'][SYS_CONTROLLER_RES_FILE_PATH]
+    assert controller_res_file_path.endswith(
+        '-004_dpp_controller_response.json')
+
+
+def test_pipeline_serial_in_memory_2(update_json_file):
+    """Test method"""
+    update_json_file(STORAGE_ROOT_PATH + SERIAL_FLOW_INPUT_CONFIG_FILE_PATH,
+                     'orchestrator', {"snapshot": {"mode": "in_memory",
+                                                   "checkpoint": {"every_n_processors": 2,
+                                                                  "on_end": False}}})
+    dpp_orchestrator = infy_dpp_sdk.orchestrator.OrchestratorNative(
+        input_config_file_path=SERIAL_FLOW_INPUT_CONFIG_FILE_PATH)
+    processor_response_data_list = dpp_orchestrator.run_batch()
+    assert len(processor_response_data_list) >= 1
+
+    _, processor_exec_output_dict = dpp_orchestrator.get_run_batch_summary()
+    assert [x for x, y in processor_exec_output_dict.items()
+            if SYS_CONTROLLER_RES_FILE_PATH in y] == ['002', '004']
+
+
+def test_pipeline_parallel_in_memory_1(update_json_file):
+    """Test method"""
+    update_json_file(STORAGE_ROOT_PATH + PARALLEL_FLOW_INPUT_CONFIG_FILE_PATH,
+                     'orchestrator', {"snapshot": {"mode": "in_memory"}})
+    dpp_orchestrator = infy_dpp_sdk.orchestrator.OrchestratorNative(
+        input_config_file_path=PARALLEL_FLOW_INPUT_CONFIG_FILE_PATH)
+    processor_response_data_list = dpp_orchestrator.run_batch()
+
+    assert len(processor_response_data_list) == 2
+    business_attribute_data_list = [x.dict()['document_data']['business_attribute_data']
+                                    for x in processor_response_data_list]
+    company_names, company_countries = [], []
+    for business_attribute_data in business_attribute_data_list:
+        company_names.extend(
+            [x['text'] for x in business_attribute_data if x['name'] == 'Company Name'])
+        company_countries.extend(
+            [x['text'] for x in business_attribute_data if x['name'] == 'Country'])
+    assert set(company_names) == {'Infosys', 'Microsoft'}
+    assert set(company_countries) == {'Indian', 'American'}
+
+    processor_exec_list, processor_exec_output_dict = dpp_orchestrator.get_run_batch_summary()
+    assert sorted(processor_exec_list[2:4]) == [
+        'attribute_extractorA', 'attribute_extractorB']
+    assert [x for x in processor_exec_output_dict] == [
+        '001', '002', '003', '005']
+
+
+def test_consolidate_processor_response_data_1():
+    """Test method"""
+    def create_processor_response_data(text, business_attribute_data, context_data, message_code):
+        message_data = infy_dpp_sdk.data.MessageData()
+        if message_code:
+            message_data.messages.append(infy_dpp_sdk.data.MessageItemData(
+                message_type=infy_dpp_sdk.data.MessageTypeEnum.INFO, message_code=message_code))
+        return infy_dpp_sdk.data.ProcessorResponseData(
+            document_data=infy_dpp_sdk.data.DocumentData(
+                document_id='D-1', text_data=[{'text': text}],
+                business_attribute_data=business_attribute_data),
+            context_data=context_data, message_data=message_data)
+
+    base = create_processor_response_data(
+        'hello', [], {'downloader': 1}, None)
+    # Sub-processor A changes business_attribute_data and B changes text_data
+    result_a = create_processor_response_data(
+        'hello', [{'name': 'A'}], {'downloader': 1, 'extractorA': 'a'},
+        infy_dpp_sdk.data.MessageCodeEnum.INFO_SUCCESS)
+    result_b = create_processor_response_data(
+        'hello world', [], {'downloader': 1, 'extractorB': 'b'},
+        infy_dpp_sdk.data.MessageCodeEnum.INFO_NO_RECORDS_FOUND)
+    snapshot_util = infy_dpp_sdk.common._internal.snapshot_util.SnapshotUtil()
+    processor_response_data_list = snapshot_util.consolidate_processor_response_data(
+        [[result_a], [result_b]], [base])
+    assert len(processor_response_data_list) == 1
+    processor_response_data = processor_response_data_list[0]
+    assert processor_response_data.document_data.business_attribute_data == [{
+        'name': 'A'}]
+    assert processor_response_data.document_data.text_data[0].text == 'hello world'
+    assert processor_response_data.context_data == {
+        'downloader': 1, 'extractorA': 'a', 'extractorB': 'b'}
+    assert len(processor_response_data.message_data.messages) == 2
+
+    # Without common input the last sub-processor wins
+    processor_response_data_list = snapshot_util.consolidate_processor_response_data(
+        [[result_a], [result_b]])
+    assert processor_response_data_list[0].document_data.business_attribute_data == [
+    ]
+
+
+def test_consolidate_processor_response_data_2():
+    """Test method"""
+    def create_processor_response_data(context_data):
+        return infy_dpp_sdk.data.ProcessorResponseData(
+            document_data=infy_dpp_sdk.data.DocumentData(document_id='D-1'),
+            context_data=context_data)
+
+    base = create_processor_response_data({'downloader': 1, 'temp': 'x'})
+    # Sub-processor A removes the key which B leaves as is
+    result_a = create_processor_response_data({'downloader': 1, 'extractorA': 'a'})
+    result_b = create_processor_response_data({'downloader': 1, 'temp': 'x', 'extractorB': 'b'})
+    snapshot_util = infy_dpp_sdk.common._internal.snapshot_util.SnapshotUtil()
+    for processor_response_data_lists in [[[result_a], [result_b]], [[result_b], [result_a]]]:
+        processor_response_data_list = snapshot_util.consolidate_processor_response_data(
+            processor_response_data_lists, [base])
+        assert processor_response_data_list[0].context_data == {
+            'downloader': 1, 'extractorA': 'a', 'extractorB': 'b'}
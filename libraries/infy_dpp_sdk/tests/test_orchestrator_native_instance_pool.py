@@ -0,0 +1,206 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+import os
+import pytest
+import infy_fs_utils
+import infy_dpp_sdk
+from infy_dpp_sdk.common._internal.processor_instance_pool import ProcessorInstancePool
+from .use_cases.uc_01.processors.attribute_extractor import AttributeExtractorV1
+
+
+STORAGE_ROOT_PATH = f"C:/temp/unittest/infy_dpp_sdk/{__name__}/STORAGE"
+SERIAL_FLOW_INPUT_CONFIG_FILE_PATH = '/data/config/dpp_pipeline1_input_config.json'
+
+
+@pytest.fixture(scope='module', autouse=True)
+def pre_test(create_root_folders, copy_files_to_root_folder):
+    """Test pre-run method"""
+    # Create data folders
+    create_root_folders([STORAGE_ROOT_PATH])
+    # Copy files to pick up folder
+    SAMPLE_ROOT_PATH = "./data/sample"
+    FILES_TO_COPY = [
+        ['company1.txt', f"{SAMPLE_ROOT_PATH}/input",
+            f"{STORAGE_ROOT_PATH}/data/input"],
+        ['company2.txt', f"{SAMPLE_ROOT_PATH}/input",
+            f"{STORAGE_ROOT_PATH}/data/input"],
+        [os.path.basename(SERIAL_FLOW_INPUT_CONFIG_FILE_PATH), f"{SAMPLE_ROOT_PATH}/config",
+            f"{STORAGE_ROOT_PATH}/data/config"]
+    ]
+    copy_files_to_root_folder(FILES_TO_COPY)
+
+    storage_config_data = infy_fs_utils.data.StorageConfigData(
+        **{
+            "storage_root_uri": f"file://{STORAGE_ROOT_PATH}",
+            "storage_server_url": "",
+            "storage_access_key": "",
+            "storage_secret_key": ""
+        })
+    file_sys_handler = infy_fs_utils.provider.FileSystemHandler(
+        storage_config_data)
+    infy_fs_utils.manager.FileSystemManager().set_root_handler_name(
+        infy_dpp_sdk.common.Constants.FSH_DPP)
+    infy_fs_utils.manager.FileSystemManager().add_fs_handler(file_sys_handler)
+
+    logging_config_data = infy_fs_utils.data.LoggingConfigData(
+        **{
+            # "logger_group_name": "my_group_1",
+            "logging_level": 10,
+            "logging_format": "",
+            "logging_timestamp_format": "",
+            "log_file_data": {
+                "log_file_dir_path": "/logs",
+                "log_file_name_prefix": "infy_dpp_sdk",
+                # "log_file_name_suffix": "1",
+                "log_file_extension": ".log"
+
+            }})
+    file_sys_logging_handler = infy_fs_utils.provider.FileSystemLoggingHandler(
+        logging_config_data, file_sys_handler)
+    infy_fs_utils.manager.FileSystemLoggingManager(
+    ).set_root_handler_name(infy_dpp_sdk.common.Constants.FSLH_DPP)
+    infy_fs_utils.manager.FileSystemLoggingManager(
+    ).add_fs_logging_handler(file_sys_logging_handler)
+
+    yield  # Run all test methods
+    # Post run cleanup
+    # Delete file system handler so that other test modules don't get duplicate key error
+    infy_fs_utils.manager.FileSystemManager().delete_fs_handler()
+    infy_fs_utils.manager.FileSystemLoggingManager().delete_fs_logging_handler()
+
+
+class ReusableAttributeExtractor(AttributeExtractorV1):
+    """Reusable processor for testing"""
+    _REUSABLE_INSTANCE = True
+    load_count, unload_count = 0, 0
+
+    def on_load(self, config_data: dict):
+        ReusableAttributeExtractor.load_count += 1
+
+    def on_unload(self):
+        ReusableAttributeExtractor.unload_count += 1
+
+
+class CountingAttributeExtractor(AttributeExtractorV1):
+    """Non-reusable processor for testing"""
+    init_count = 0
+
+    def __init__(self):
+        CountingAttributeExtractor.init_count += 1
+        super().__init__()
+
+
+def test_processor_instance_pool_1():
+    """Test method"""
+    processor_instance_pool = ProcessorInstancePool()
+    processor_instance_pool.clear()
+    config_data = {"AttributeExtractor": {"required_tokens": []}}
+    processor_obj1, instance_key1 = processor_instance_pool.acquire(
+        __name__, 'ReusableAttributeExtractor', config_data)
+    # Instance in use is not handed out again
+    processor_obj2, instance_key2 = processor_instance_pool.acquire(
+        __name__, 'ReusableAttributeExtractor', config_data)
+    assert processor_obj1 is not processor_obj2
+    assert instance_key1 == instance_key2
+    processor_instance_pool.release(instance_key1, processor_obj1)
+    processor_instance_pool.release(instance_key2, processor_obj2)
+    processor_obj3, instance_key3 = processor_instance_pool.acquire(
+        __name__, 'ReusableAttributeExtractor', config_data)
+    assert processor_obj3 in [processor_obj1, processor_obj2]
+    processor_instance_pool.release(instance_key3, processor_obj3)
+    assert ReusableAttributeExtractor.load_count == 2
+
+    # Different config gets its own instance
+    _, instance_key4 = processor_instance_pool.acquire(
+        __name__, 'ReusableAttributeExtractor', {})
+    assert instance_key4 != instance_key1
+
+    # Non-reusable processor is only imported on warm up
+    processor_instance_pool.warm_up(
+        __name__, 'CountingAttributeExtractor', config_data)
+    assert CountingAttributeExtractor.init_count == 0
+
+    # Non-reusable processor gets a new instance every time
+    processor_obj5, instance_key5 = processor_instance_pool.acquire(
+        __name__, 'AttributeExtractorV1', config_data)
+    assert instance_key5 is None
+    assert isinstance(processor_obj5, AttributeExtractorV1)
+
+    processor_instance_pool.clear()
+    assert ReusableAttributeExtractor.unload_count == 2
+    assert processor_instance_pool.get_stats()['idle'] == 0
+
+
+def test_pipeline_serial_instance_pool_1(monkeypatch):
+    """Test method"""
+    monkeypatch.setattr(AttributeExtractorV1, '_REUSABLE_INSTANCE', True)
+    processor_instance_pool = ProcessorInstancePool()
+    processor_instance_pool.clear()
+    # Warm up at orchestrator start creates the instance
+    dpp_orchestrator = infy_dpp_sdk.orchestrator.OrchestratorNative(
+        input_config_file_path=SERIAL_FLOW_INPUT_CONFIG_FILE_PATH)
+    stats = processor_instance_pool.get_stats()
+    assert stats['idle'] == 1
+    reused_count = stats['reused']
+
+    for _ in range(2):
+        processor_response_data_list = dpp_orchestrator.run_batch()
+        assert len(processor_response_data_list) == 2
+        business_attribute_data_list = [x.dict()['document_data']['business_attribute_data']
+                                        for x in processor_response_data_list]
+        company_names = []
+        for business_attribute_data in business_attribute_data_list:
+            company_names.extend(
+                [x['text'] for x in business_attribute_data if x['name'] == 'Company Name'])
+        assert set(company_names) == {'Infosys', 'Microsoft'}
+    assert processor_instance_pool.get_stats()['reused'] == reused_count + 2
+    assert processor_instance_pool.get_stats()['idle'] == 1
+    processor_instance_pool.clear()
+
+
+def test_orchestrator_native_in_memory_1(monkeypatch):
+    """Test method"""
+    monkeypatch.setattr(AttributeExtractorV1, '_REUSABLE_INSTANCE', True)
+    processor_instance_pool = ProcessorInstancePool()
+    processor_instance_pool.clear()
+    input_config_data = {
+        "processor_list": [
+            {"enabled": True, "processor_name": "attribute_extractor",
+             "processor_namespace": AttributeExtractorV1.__module__,
+             "processor_class_name": "AttributeExtractorV1",
+             "processor_input_config_name_list": ["AttributeExtractor"]}],
+        "processor_input_config": {
+            "AttributeExtractor": {"required_tokens": [{"name": "Company Name", "position": 0}]}}
+    }
+    dpp_orchestrator = infy_dpp_sdk.orchestrator.OrchestratorNativeInMemory(
+        input_config_data=input_config_data)
+    dpp_orchestrator.warm_up()
+    assert processor_instance_pool.get_stats()['idle'] == 1
+
+    def _get_document_data(text: str):
+        return infy_dpp_sdk.data.DocumentData(document_id='doc-1', text_data=[{'text': text}] if text else [])
+
+    # Config changed per run still reuses the instance, as processor doesn't use `on_load`
+    reused_count = processor_instance_pool.get_stats()['reused']
+    for position, company_name in [(0, 'Infosys'), (2, 'Microsoft')]:
+        run_input_config_data = dpp_orchestrator.get_input_config_data()
+        run_input_config_data['processor_input_config']['AttributeExtractor']['required_tokens'][0][
+            'position'] = position
+        processor_response_data_list = infy_dpp_sdk.orchestrator.OrchestratorNativeInMemory(
+            input_config_data=run_input_config_data).run_batch(
+                [_get_document_data("Infosys and Microsoft")], [{}])
+        assert processor_response_data_list[0].context_data['AttributeExtractor'] == [
+            {'name': 'Company Name', 'text': company_name}]
+    assert processor_instance_pool.get_stats()['reused'] == reused_count + 2
+    # Processor tampers with its config, which doesn't change the orchestrator's config
+    assert dpp_orchestrator.get_input_config_data() == input_config_data
+
+    # Exception is returned as response
+    processor_response_data_list = dpp_orchestrator.run_batch([_get_document_data(None)], [{}])
+    assert [x.message_code for x in processor_response_data_list[0].message_data.messages] == [
+        infy_dpp_sdk.data.MessageCodeEnum.SERVER_ERR_UNHANDLED_EXCEPTION]
+    processor_instance_pool.clear()
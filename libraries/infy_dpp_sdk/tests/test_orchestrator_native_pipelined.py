@@ -0,0 +1,192 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+import os
+import pytest
+import infy_fs_utils
+import infy_dpp_sdk
+from infy_dpp_sdk.common._internal.snapshot_util import SnapshotUtil
+from .use_cases.uc_01.processors.attribute_extractor import AttributeExtractorV1
+
+
+STORAGE_ROOT_PATH = f"C:/temp/unittest/infy_dpp_sdk/{__name__}/STORAGE"
+SERIAL_FLOW_INPUT_CONFIG_FILE_PATH = '/data/config/dpp_pipeline1_input_config.json'
+PARALLEL_FLOW_INPUT_CONFIG_FILE_PATH = '/data/config/dpp_pipeline1p_input_config.json'
+SYS_CONTROLLER_RES_FILE_PATH = "SYS_CONTROLLER_RES_FILE_PATH"
+
+
+@pytest.fixture(scope='module', autouse=True)
+def pre_test(create_root_folders, copy_files_to_root_folder):
+    """Test pre-run method"""
+    # Create data folders
+    create_root_folders([STORAGE_ROOT_PATH])
+    # Copy files to pick up folder
+    SAMPLE_ROOT_PATH = "./data/sample"
+    FILES_TO_COPY = [
+        ['company1.txt', f"{SAMPLE_ROOT_PATH}/input",
+            f"{STORAGE_ROOT_PATH}/data/input"],
+        ['company2.txt', f"{SAMPLE_ROOT_PATH}/input",
+            f"{STORAGE_ROOT_PATH}/data/input"],
+        [os.path.basename(SERIAL_FLOW_INPUT_CONFIG_FILE_PATH), f"{SAMPLE_ROOT_PATH}/config",
+            f"{STORAGE_ROOT_PATH}/data/config"],
+        [os.path.basename(PARALLEL_FLOW_INPUT_CONFIG_FILE_PATH), f"{SAMPLE_ROOT_PATH}/config",
+            f"{STORAGE_ROOT_PATH}/data/config"]
+    ]
+    copy_files_to_root_folder(FILES_TO_COPY)
+
+    storage_config_data = infy_fs_utils.data.StorageConfigData(
+        **{
+            "storage_root_uri": f"file://{STORAGE_ROOT_PATH}",
+            "storage_server_url": "",
+            "storage_access_key": "",
+            "storage_secret_key": ""
+        })
+    file_sys_handler = infy_fs_utils.provider.FileSystemHandler(
+        storage_config_data)
+    infy_fs_utils.manager.FileSystemManager().set_root_handler_name(
+        infy_dpp_sdk.common.Constants.FSH_DPP)
+    infy_fs_utils.manager.FileSystemManager().add_fs_handler(file_sys_handler)
+
+    logging_config_data = infy_fs_utils.data.LoggingConfigData(
+        **{
+            # "logger_group_name": "my_group_1",
+            "logging_level": 10,
+            "logging_format": "",
+            "logging_timestamp_format": "",
+            "log_file_data": {
+                "log_file_dir_path": "/logs",
+                "log_file_name_prefix": "infy_dpp_sdk",
+                # "log_file_name_suffix": "1",
+                "log_file_extension": ".log"
+
+            }})
+    file_sys_logging_handler = infy_fs_utils.provider.FileSystemLoggingHandler(
+        logging_config_data, file_sys_handler)
+    infy_fs_utils.manager.FileSystemLoggingManager(
+    ).set_root_handler_name(infy_dpp_sdk.common.Constants.FSLH_DPP)
+    infy_fs_utils.manager.FileSystemLoggingManager(
+    ).add_fs_logging_handler(file_sys_logging_handler)
+
+    yield  # Run all test methods
+    # Post run cleanup
+    # Delete file system handler so that other test modules don't get duplicate key error
+    infy_fs_utils.manager.FileSystemManager().delete_fs_handler()
+    infy_fs_utils.manager.FileSystemLoggingManager().delete_fs_logging_handler()
+
+
+def test_pipeline_serial_pipelined_1(update_json_file):
+    """Test method"""
+    update_json_file(STORAGE_ROOT_PATH + SERIAL_FLOW_INPUT_CONFIG_FILE_PATH,
+                     'orchestrator', {"scheduler": {"mode": "pipelined", "queue_size": 1,
+                                                    "workers": {"content_extractor": 2}}})
+    dpp_orchestrator = infy_dpp_sdk.orchestrator.OrchestratorNative(
+        input_config_file_path=SERIAL_FLOW_INPUT_CONFIG_FILE_PATH)
+    processor_response_data_list = dpp_orchestrator.run_batch()
+
+    assert len(processor_response_data_list) == 2
+    business_attribute_data_list = [x.dict()['document_data']['business_attribute_data']
+                                    for x in processor_response_data_list]
+    company_names = []
+    for business_attribute_data in business_attribute_data_list:
+        company_names.extend(
+            [x['text'] for x in business_attribute_data if x['name'] == 'Company Name'])
+    assert set(company_names) == {'Infosys', 'Microsoft'}
+
+    message_data_list = [x.dict()['message_data']
+                         for x in processor_response_data_list]
+    for message_data in message_data_list:
+        assert message_data['messages'][0]['message_code'] == infy_dpp_sdk.data.MessageCodeEnum.INFO_SUCCESS
+
+    processor_exec_list, processor_exec_output_dict = dpp_orchestrator.get_run_batch_summary()
+    assert processor_exec_list == [
+        'document_downloader', 'content_extractor',
+        'attribute_extractor', 'document_uploader']
+    assert [x for x in processor_exec_output_dict] == [
+        '001', '002', '003', '004']
+    # Snapshots are flushed at the end
+    assert [x for x, y in processor_exec_output_dict.items()
+            if SYS_CONTROLLER_RES_FILE_PATH in y] == ['004']
+
+    # Metrics are available for every stage after the first one
+    pipeline_metrics = dpp_orchestrator.get_pipeline_metrics()
+    assert [x['stage_name'] for x in pipeline_metrics] == [
+        'content_extractor', 'attribute_extractor', 'document_uploader']
+    assert [x['workers'] for x in pipeline_metrics] == [2, 1, 1]
+    for metrics in pipeline_metrics:
+        assert metrics['processed_count'] == 2
+        assert metrics['max_queue_depth'] <= 1
+
+
+def test_pipeline_parallel_pipelined_1(update_json_file):
+    """Test method"""
+    update_json_file(STORAGE_ROOT_PATH + PARALLEL_FLOW_INPUT_CONFIG_FILE_PATH,
+                     'orchestrator', {"scheduler": {"mode": "pipelined", "default_workers": 2}})
+    dpp_orchestrator = infy_dpp_sdk.orchestrator.OrchestratorNative(
+        input_config_file_path=PARALLEL_FLOW_INPUT_CONFIG_FILE_PATH)
+    processor_response_data_list = dpp_orchestrator.run_batch()
+
+    assert len(processor_response_data_list) == 2
+    business_attribute_data_list = [x.dict()['document_data']['business_attribute_data']
+                                    for x in processor_response_data_list]
+    company_names, company_countries = [], []
+    for business_attribute_data in business_attribute_data_list:
+        company_names.extend(
+            [x['text'] for x in business_attribute_data if x['name'] == 'Company Name'])
+        company_countries.extend(
+            [x['text'] for x in business_attribute_data if x['name'] == 'Country'])
+    assert set(company_names) == {'Infosys', 'Microsoft'}
+    assert set(company_countries) == {'Indian', 'American'}
+
+    processor_exec_list, processor_exec_output_dict = dpp_orchestrator.get_run_batch_summary()
+    assert processor_exec_list == [
+        'document_downloader', 'content_extractor', 'attribute_extractorA',
+        'attribute_extractorB', 'document_uploader']
+    assert [x for x in processor_exec_output_dict] == [
+        '001', '002', '003', '005']
+    pipeline_metrics = dpp_orchestrator.get_pipeline_metrics()
+    assert [x['stage_name'] for x in pipeline_metrics] == [
+        'content_extractor', 'attribute_extractorA,attribute_extractorB', 'document_uploader']
+
+
+def test_pipeline_serial_pipelined_2(update_json_file, monkeypatch):
+    """Test method"""
+    update_json_file(STORAGE_ROOT_PATH + SERIAL_FLOW_INPUT_CONFIG_FILE_PATH,
+                     'orchestrator', {"scheduler": {"mode": "pipelined"}})
+    dpp_orchestrator = infy_dpp_sdk.orchestrator.OrchestratorNative(
+        input_config_file_path=SERIAL_FLOW_INPUT_CONFIG_FILE_PATH)
+    init_count_list = []
+    original_init = AttributeExtractorV1.__init__
+
+    def counting_init(self, *args, **kwargs):
+        init_count_list.append(1)
+        original_init(self, *args, **kwargs)
+    monkeypatch.setattr(AttributeExtractorV1, '__init__', counting_init)
+    processor_response_data_list = dpp_orchestrator.run_batch()
+
+    assert len(processor_response_data_list) == 2
+    # Non-reusable processor is created once by the stage worker, not once per document
+    assert len(init_count_list) == 1
+
+
+def test_pipeline_serial_pipelined_failure_1(update_json_file, monkeypatch):
+    """Test method"""
+    update_json_file(STORAGE_ROOT_PATH + SERIAL_FLOW_INPUT_CONFIG_FILE_PATH,
+                     'orchestrator', {"scheduler": {"mode": "pipelined"},
+                                      "snapshot": {"checkpoint": {"on_end": False, "on_failure": True}}})
+    dpp_orchestrator = infy_dpp_sdk.orchestrator.OrchestratorNative(
+        input_config_file_path=SERIAL_FLOW_INPUT_CONFIG_FILE_PATH)
+
+    def failing_carry_forward(self, *args, **kwargs):
+        raise ValueError("Failed for testing")
+    monkeypatch.setattr(SnapshotUtil, 'carry_forward_processor_response_data',
+                        failing_carry_forward)
+    processor_response_data_list = dpp_orchestrator.run_batch()
+
+    # Documents are returned as they were before the failed stage and flushed on failure
+    assert len(processor_response_data_list) == 2
+    _, processor_exec_output_dict = dpp_orchestrator.get_run_batch_summary()
+    assert [x for x, y in processor_exec_output_dict.items()
+            if SYS_CONTROLLER_RES_FILE_PATH in y] == ['004']
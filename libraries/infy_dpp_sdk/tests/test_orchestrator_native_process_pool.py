@@ -0,0 +1,147 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+import os
+import concurrent.futures
+import pytest
+import infy_fs_utils
+import infy_dpp_sdk
+from infy_dpp_sdk.common._internal.process_pool_manager import ProcessPoolManager
+
+
+STORAGE_ROOT_PATH = f"C:/temp/unittest/infy_dpp_sdk/{__name__}/STORAGE"
+SERIAL_FLOW_INPUT_CONFIG_FILE_PATH = '/data/config/dpp_pipeline1_input_config.json'
+PARALLEL_FLOW_INPUT_CONFIG_FILE_PATH = '/data/config/dpp_pipeline1p_input_config.json'
+SYS_CONTROLLER_RES_FILE_PATH = "SYS_CONTROLLER_RES_FILE_PATH"
+
+
+@pytest.fixture(scope='module', autouse=True)
+def pre_test(create_root_folders, copy_files_to_root_folder):
+    """Test pre-run method"""
+    # Create data folders
+    create_root_folders([STORAGE_ROOT_PATH])
+    # Copy files to pick up folder
+    SAMPLE_ROOT_PATH = "./data/sample"
+    FILES_TO_COPY = [
+        ['company1.txt', f"{SAMPLE_ROOT_PATH}/input",
+            f"{STORAGE_ROOT_PATH}/data/input"],
+        ['company2.txt', f"{SAMPLE_ROOT_PATH}/input",
+            f"{STORAGE_ROOT_PATH}/data/input"],
+        [os.path.basename(SERIAL_FLOW_INPUT_CONFIG_FILE_PATH), f"{SAMPLE_ROOT_PATH}/config",
+            f"{STORAGE_ROOT_PATH}/data/config"],
+        [os.path.basename(PARALLEL_FLOW_INPUT_CONFIG_FILE_PATH), f"{SAMPLE_ROOT_PATH}/config",
+            f"{STORAGE_ROOT_PATH}/data/config"]
+    ]
+    copy_files_to_root_folder(FILES_TO_COPY)
+
+    storage_config_data = infy_fs_utils.data.StorageConfigData(
+        **{
+            "storage_root_uri": f"file://{STORAGE_ROOT_PATH}",
+            "storage_server_url": "",
+            "storage_access_key": "",
+            "storage_secret_key": ""
+        })
+    file_sys_handler = infy_fs_utils.provider.FileSystemHandler(
+        storage_config_data)
+    infy_fs_utils.manager.FileSystemManager().set_root_handler_name(
+        infy_dpp_sdk.common.Constants.FSH_DPP)
+    infy_fs_utils.manager.FileSystemManager().add_fs_handler(file_sys_handler)
+
+    logging_config_data = infy_fs_utils.data.LoggingConfigData(
+        **{
+            # "logger_group_name": "my_group_1",
+            "logging_level": 10,
+            "logging_format": "",
+            "logging_timestamp_format": "",
+            "log_file_data": {
+                "log_file_dir_path": "/logs",
+                "log_file_name_prefix": "infy_dpp_sdk",
+                # "log_file_name_suffix": "1",
+                "log_file_extension": ".log"
+
+            }})
+    file_sys_logging_handler = infy_fs_utils.provider.FileSystemLoggingHandler(
+        logging_config_data, file_sys_handler)
+    infy_fs_utils.manager.FileSystemLoggingManager(
+    ).set_root_handler_name(infy_dpp_sdk.common.Constants.FSLH_DPP)
+    infy_fs_utils.manager.FileSystemLoggingManager(
+    ).add_fs_logging_handler(file_sys_logging_handler)
+
+    yield  # Run all test methods
+    # Post run cleanup
+    # Delete file system handler so that other test modules don't get duplicate key error
+    infy_fs_utils.manager.FileSystemManager().delete_fs_handler()
+    infy_fs_utils.manager.FileSystemLoggingManager().delete_fs_logging_handler()
+
+
+def test_pipeline_serial_process_pool_1(update_json_file):
+    """Test method"""
+    update_json_file(STORAGE_ROOT_PATH + SERIAL_FLOW_INPUT_CONFIG_FILE_PATH,
+                     'orchestrator', {"processor_invocation": {
+                         "process_pool": {"enabled": True, "max_workers": 2, "chunk_size": 1}}})
+    dpp_orchestrator = infy_dpp_sdk.orchestrator.OrchestratorNative(
+        input_config_file_path=SERIAL_FLOW_INPUT_CONFIG_FILE_PATH)
+    processor_response_data_list = dpp_orchestrator.run_batch()
+
+    assert len(processor_response_data_list) == 2
+    business_attribute_data_list = [x.dict()['document_data']['business_attribute_data']
+                                    for x in processor_response_data_list]
+    company_names = []
+    for business_attribute_data in business_attribute_data_list:
+        company_names.extend(
+            [x['text'] for x in business_attribute_data if x['name'] == 'Company Name'])
+    assert set(company_names) == {'Infosys', 'Microsoft'}
+    # Pool is released at the end of run_batch
+    assert ProcessPoolManager().get_executor() is None
+
+
+def test_pipeline_serial_process_pool_2(update_json_file):
+    """Pool is shared by concurrent runs and kept for later runs"""
+    update_json_file(STORAGE_ROOT_PATH + SERIAL_FLOW_INPUT_CONFIG_FILE_PATH,
+                     'orchestrator', {"processor_invocation": {
+                         "process_pool": {"enabled": True, "max_workers": 2, "chunk_size": 1}}})
+
+    def run_batch():
+        dpp_orchestrator = infy_dpp_sdk.orchestrator.OrchestratorNative(
+            input_config_file_path=SERIAL_FLOW_INPUT_CONFIG_FILE_PATH)
+        return dpp_orchestrator.run_batch()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        result_list = list(executor.map(lambda x: run_batch(), range(2)))
+    executor_obj = ProcessPoolManager()._ProcessPoolManager__executor
+    assert executor_obj is not None
+    for processor_response_data_list in result_list:
+        assert len(processor_response_data_list) == 2
+        company_names = [y['text'] for x in processor_response_data_list
+                         for y in x.dict()['document_data']['business_attribute_data']
+                         if y['name'] == 'Company Name']
+        assert set(company_names) == {'Infosys', 'Microsoft'}
+    run_batch()
+    assert ProcessPoolManager()._ProcessPoolManager__executor is executor_obj
+    ProcessPoolManager().shutdown()
+    assert ProcessPoolManager()._ProcessPoolManager__executor is None
+
+
+def test_pipeline_parallel_process_pool_1(update_json_file):
+    """Test method"""
+    update_json_file(STORAGE_ROOT_PATH + PARALLEL_FLOW_INPUT_CONFIG_FILE_PATH,
+                     'orchestrator', {"processor_invocation": {
+                         "process_pool": {"enabled": True, "max_workers": 2, "chunk_size": 2}}})
+    dpp_orchestrator = infy_dpp_sdk.orchestrator.OrchestratorNative(
+        input_config_file_path=PARALLEL_FLOW_INPUT_CONFIG_FILE_PATH)
+    processor_response_data_list = dpp_orchestrator.run_batch()
+
+    assert len(processor_response_data_list) == 2
+    business_attribute_data_list = [x.dict()['document_data']['business_attribute_data']
+                                    for x in processor_response_data_list]
+    company_names, company_countries = [], []
+    for business_attribute_data in business_attribute_data_list:
+        company_names.extend(
+            [x['text'] for x in business_attribute_data if x['name'] == 'Company Name'])
+        company_countries.extend(
+            [x['text'] for x in business_attribute_data if x['name'] == 'Country'])
+    assert set(company_names) == {'Infosys', 'Microsoft'}
+    assert set(company_countries) == {'Indian', 'American'}
@@ -0,0 +1,147 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+import os
+import pytest
+import infy_fs_utils
+import infy_dpp_sdk
+from infy_dpp_sdk.common._internal.snapshot_codec import SnapshotCodecFactory
+from .use_cases.uc_01.processors.attribute_extractor import AttributeExtractorV1
+
+
+STORAGE_ROOT_PATH = f"C:/temp/unittest/infy_dpp_sdk/{__name__}/STORAGE"
+SERIAL_FLOW_INPUT_CONFIG_FILE_PATH = '/data/config/dpp_pipeline1_input_config.json'
+SYS_CONTROLLER_RES_FILE_PATH = "SYS_CONTROLLER_RES_FILE_PATH"
+
+
+@pytest.fixture(scope='module', autouse=True)
+def pre_test(create_root_folders, copy_files_to_root_folder):
+    """Test pre-run method"""
+    # Create data folders
+    create_root_folders([STORAGE_ROOT_PATH])
+    # Copy files to pick up folder
+    SAMPLE_ROOT_PATH = "./data/sample"
+    FILES_TO_COPY = [
+        ['company1.txt', f"{SAMPLE_ROOT_PATH}/input",
+            f"{STORAGE_ROOT_PATH}/data/input"],
+        ['company2.txt', f"{SAMPLE_ROOT_PATH}/input",
+            f"{STORAGE_ROOT_PATH}/data/input"],
+        [os.path.basename(SERIAL_FLOW_INPUT_CONFIG_FILE_PATH), f"{SAMPLE_ROOT_PATH}/config",
+            f"{STORAGE_ROOT_PATH}/data/config"]
+    ]
+    copy_files_to_root_folder(FILES_TO_COPY)
+
+    storage_config_data = infy_fs_utils.data.StorageConfigData(
+        **{
+            "storage_root_uri": f"file://{STORAGE_ROOT_PATH}",
+            "storage_server_url": "",
+            "storage_access_key": "",
+            "storage_secret_key": ""
+        })
+    file_sys_handler = infy_fs_utils.provider.FileSystemHandler(
+        storage_config_data)
+    infy_fs_utils.manager.FileSystemManager().set_root_handler_name(
+        infy_dpp_sdk.common.Constants.FSH_DPP)
+    infy_fs_utils.manager.FileSystemManager().add_fs_handler(file_sys_handler)
+
+    logging_config_data = infy_fs_utils.data.LoggingConfigData(
+        **{
+            # "logger_group_name": "my_group_1",
+            "logging_level": 10,
+            "logging_format": "",
+            "logging_timestamp_format": "",
+            "log_file_data": {
+                "log_file_dir_path": "/logs",
+                "log_file_name_prefix": "infy_dpp_sdk",
+                # "log_file_name_suffix": "1",
+                "log_file_extension": ".log"
+
+            }})
+    file_sys_logging_handler = infy_fs_utils.provider.FileSystemLoggingHandler(
+        logging_config_data, file_sys_handler)
+    infy_fs_utils.manager.FileSystemLoggingManager(
+    ).set_root_handler_name(infy_dpp_sdk.common.Constants.FSLH_DPP)
+    infy_fs_utils.manager.FileSystemLoggingManager(
+    ).add_fs_logging_handler(file_sys_logging_handler)
+
+    yield  # Run all test methods
+    # Post run cleanup
+    # Delete file system handler so that other test modules don't get duplicate key error
+    infy_fs_utils.manager.FileSystemManager().delete_fs_handler()
+    infy_fs_utils.manager.FileSystemLoggingManager().delete_fs_logging_handler()
+
+
+@pytest.mark.parametrize("codec_name", ["json", "json_compact", "msgpack", "zstd_msgpack"])
+def test_snapshot_codec_1(codec_name):
+    """Test method"""
+    if codec_name == "msgpack":
+        pytest.importorskip("msgpack")
+    elif codec_name == "zstd_msgpack":
+        pytest.importorskip("msgpack")
+        pytest.importorskip("zstandard")
+    data = {"document_id": "D-1", "metadata": {"a": [1, 2.5, "x", None, True]},
+            "raw_data": {"table_data": [{"cell": "v" * 100}]}}
+    codec = SnapshotCodecFactory.get_codec(codec_name)
+    encoded_data = codec.encode(data)
+    assert isinstance(encoded_data, bytes)
+    detected_codec = SnapshotCodecFactory.detect_codec(encoded_data)
+    assert detected_codec.decode(encoded_data) == data
+    assert detected_codec.decode(encoded_data, ['document_id', 'metadata']) == {
+        "document_id": "D-1", "metadata": {"a": [1, 2.5, "x", None, True]}}
+
+
+def test_snapshot_codec_2():
+    """Test method"""
+    with pytest.raises(ValueError):
+        SnapshotCodecFactory.get_codec("xml")
+
+
+@pytest.mark.parametrize("codec_name", ["json", "json_compact", "msgpack", "zstd_msgpack"])
+@pytest.mark.parametrize("data", [None, [], "text"])
+def test_snapshot_codec_3(codec_name, data):
+    """Test method"""
+    if codec_name == "msgpack":
+        pytest.importorskip("msgpack")
+    elif codec_name == "zstd_msgpack":
+        pytest.importorskip("msgpack")
+        pytest.importorskip("zstandard")
+    # E.g. context data which is null
+    encoded_data = SnapshotCodecFactory.get_codec(codec_name).encode(data)
+    detected_codec = SnapshotCodecFactory.detect_codec(encoded_data)
+    assert detected_codec.name in [codec_name, "json"]
+    assert detected_codec.decode(encoded_data) == data
+    assert detected_codec.decode(encoded_data, ['document_id']) == data
+
+
+@pytest.mark.parametrize("codec_name", ["json_compact", "msgpack"])
+def test_pipeline_serial_codec_1(update_json_file, monkeypatch, codec_name):
+    """Test method"""
+    if codec_name == "msgpack":
+        pytest.importorskip("msgpack")
+    update_json_file(STORAGE_ROOT_PATH + SERIAL_FLOW_INPUT_CONFIG_FILE_PATH,
+                     'orchestrator', {"snapshot": {"codec": codec_name}})
+    # Processor loads only what it needs. Rest (e.g. metadata) must be carried over.
+    monkeypatch.setattr(AttributeExtractorV1, '_SNAPSHOT_DOCUMENT_DATA_FIELDS',
+                        ['text_data', 'business_attribute_data'])
+    dpp_orchestrator = infy_dpp_sdk.orchestrator.OrchestratorNative(
+        input_config_file_path=SERIAL_FLOW_INPUT_CONFIG_FILE_PATH)
+    processor_response_data_list = dpp_orchestrator.run_batch()
+
+    assert len(processor_response_data_list) == 2
+    company_names = []
+    for processor_response_data in processor_response_data_list:
+        document_data = processor_response_data.document_data
+        assert document_data.metadata.standard_data.filepath.value
+        company_names.extend([x['text'] for x in document_data.business_attribute_data
+                              if x['name'] == 'Company Name'])
+    assert set(company_names) == {'Infosys', 'Microsoft'}
+
+    _, processor_exec_output_dict = dpp_orchestrator.get_run_batch_summary()
+    controller_response_data = infy_dpp_sdk.common._internal.snapshot_util.SnapshotUtil(
+    ).read_controller_response_data(
+        processor_exec_output_dict['004'][SYS_CONTROLLER_RES_FILE_PATH])
+    assert controller_response_data.records[0].snapshot.document_data_file_path.endswith(
+        SnapshotCodecFactory.get_codec(codec_name).file_extension)
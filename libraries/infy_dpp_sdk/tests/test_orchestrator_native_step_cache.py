@@ -0,0 +1,202 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+import os
+import threading
+import pytest
+import infy_fs_utils
+import infy_dpp_sdk
+from infy_dpp_sdk.common._internal.step_cache import StepCache
+
+
+STORAGE_ROOT_PATH = f"C:/temp/unittest/infy_dpp_sdk/{__name__}/STORAGE"
+SERIAL_FLOW_INPUT_CONFIG_FILE_PATH = '/data/config/dpp_pipeline1_input_config.json'
+
+
+@pytest.fixture(scope='module', autouse=True)
+def pre_test(create_root_folders, copy_files_to_root_folder):
+    """Test pre-run method"""
+    # Create data folders
+    create_root_folders([STORAGE_ROOT_PATH])
+    # Copy files to pick up folder
+    SAMPLE_ROOT_PATH = "./data/sample"
+    FILES_TO_COPY = [
+        ['company1.txt', f"{SAMPLE_ROOT_PATH}/input",
+            f"{STORAGE_ROOT_PATH}/data/input"],
+        ['company2.txt', f"{SAMPLE_ROOT_PATH}/input",
+            f"{STORAGE_ROOT_PATH}/data/input"],
+        [os.path.basename(SERIAL_FLOW_INPUT_CONFIG_FILE_PATH), f"{SAMPLE_ROOT_PATH}/config",
+            f"{STORAGE_ROOT_PATH}/data/config"]
+    ]
+    copy_files_to_root_folder(FILES_TO_COPY)
+
+    storage_config_data = infy_fs_utils.data.StorageConfigData(
+        **{
+            "storage_root_uri": f"file://{STORAGE_ROOT_PATH}",
+            "storage_server_url": "",
+            "storage_access_key": "",
+            "storage_secret_key": ""
+        })
+    file_sys_handler = infy_fs_utils.provider.FileSystemHandler(
+        storage_config_data)
+    infy_fs_utils.manager.FileSystemManager().set_root_handler_name(
+        infy_dpp_sdk.common.Constants.FSH_DPP)
+    infy_fs_utils.manager.FileSystemManager().add_fs_handler(file_sys_handler)
+
+    logging_config_data = infy_fs_utils.data.LoggingConfigData(
+        **{
+            # "logger_group_name": "my_group_1",
+            "logging_level": 10,
+            "logging_format": "",
+            "logging_timestamp_format": "",
+            "log_file_data": {
+                "log_file_dir_path": "/logs",
+                "log_file_name_prefix": "infy_dpp_sdk",
+                # "log_file_name_suffix": "1",
+                "log_file_extension": ".log"
+
+            }})
+    file_sys_logging_handler = infy_fs_utils.provider.FileSystemLoggingHandler(
+        logging_config_data, file_sys_handler)
+    infy_fs_utils.manager.FileSystemLoggingManager(
+    ).set_root_handler_name(infy_dpp_sdk.common.Constants.FSLH_DPP)
+    infy_fs_utils.manager.FileSystemLoggingManager(
+    ).add_fs_logging_handler(file_sys_logging_handler)
+
+    yield  # Run all test methods
+    # Post run cleanup
+    # Delete file system handler so that other test modules don't get duplicate key error
+    infy_fs_utils.manager.FileSystemManager().delete_fs_handler()
+    infy_fs_utils.manager.FileSystemLoggingManager().delete_fs_logging_handler()
+
+
+def __run_batch() -> list:
+    dpp_orchestrator = infy_dpp_sdk.orchestrator.OrchestratorNative(
+        input_config_file_path=SERIAL_FLOW_INPUT_CONFIG_FILE_PATH)
+    processor_response_data_list = dpp_orchestrator.run_batch()
+    assert len(processor_response_data_list) == 2
+    company_names = []
+    for processor_response_data in processor_response_data_list:
+        business_attribute_data = processor_response_data.dict()[
+            'document_data']['business_attribute_data']
+        company_names.extend([x['text'] for x in business_attribute_data
+                              if x['name'] == 'Company Name'])
+    assert set(company_names) == {'Infosys', 'Microsoft'}
+    return processor_response_data_list
+
+
+def __get_run_ids(processor_response_data_list: list) -> set:
+    """Document ids and work file paths, which are new on every run"""
+    return {x.document_data.document_id for x in processor_response_data_list} | \
+        {x.context_data['DocumentDownloader']['work_file_path'] for x in processor_response_data_list}
+
+
+def test_pipeline_serial_step_cache_1(update_json_file):
+    """Test method"""
+    config_file_path = STORAGE_ROOT_PATH + SERIAL_FLOW_INPUT_CONFIG_FILE_PATH
+    update_json_file(config_file_path, 'orchestrator', {"step_cache": {
+        "enabled": True, "processor_names": ["document_downloader", "content_extractor",
+                                             "attribute_extractor"]}})
+    step_cache = StepCache()
+    step_cache.clear()
+    stats = step_cache.get_stats()
+
+    # First run fills the cache i.e. 2 processors x 2 documents. Downloader has no incoming
+    # documents so it's always run, and uploader isn't opted in.
+    first_response_data_list = __run_batch()
+    new_stats = step_cache.get_stats()
+    assert new_stats['misses'] - stats['misses'] == 4
+    assert new_stats['puts'] - stats['puts'] == 4
+
+    # Same input and config is served from cache though the run has new document ids
+    stats = new_stats
+    second_response_data_list = __run_batch()
+    new_stats = step_cache.get_stats()
+    assert new_stats['hits'] - stats['hits'] == 4
+    assert new_stats['misses'] == stats['misses']
+    # Cached results have ids of the run using them
+    first_run_ids = __get_run_ids(first_response_data_list)
+    second_run_ids = __get_run_ids(second_response_data_list)
+    assert len(second_run_ids) == 4
+    assert not first_run_ids & second_run_ids
+
+    # Config change of a later processor only re-runs that processor
+    stats = new_stats
+    update_json_file(config_file_path, 'processor_input_config.AttributeExtractor.required_tokens',
+                     [{"name": "Company Name", "position": 5}])
+    __run_batch()
+    new_stats = step_cache.get_stats()
+    assert new_stats['hits'] - stats['hits'] == 2
+    assert new_stats['misses'] - stats['misses'] == 2
+    assert not step_cache.is_enabled()
+
+
+def test_step_cache_is_enabled_1():
+    """Test method"""
+    step_cache = StepCache()
+    token = step_cache.start({"processor_names": ["processor_a"],
+                              "exclude_processor_names": ["processor_c"]})
+    try:
+        assert step_cache.is_enabled('processor_a')
+        # Processors are cached only if listed or marked cacheable
+        assert not step_cache.is_enabled('processor_b')
+        assert step_cache.is_enabled('processor_b', cacheable=True)
+        assert not step_cache.is_enabled('processor_c', cacheable=True)
+        # Not enabled for other runs, e.g. on a new thread
+        result_list = []
+        thread = threading.Thread(target=lambda: result_list.append(
+            step_cache.is_enabled('processor_a')))
+        thread.start()
+        thread.join()
+        assert result_list == [False]
+    finally:
+        step_cache.stop(token)
+    assert not step_cache.is_enabled('processor_a')
+
+
+def test_step_cache_eviction_1():
+    """Test method"""
+    step_cache = StepCache()
+    step_cache.clear()
+    token = step_cache.start({"max_entries": 2})
+    try:
+        stats = step_cache.get_stats()
+        for idx in range(3):
+            step_cache.put(f"key{idx}", {"idx": idx})
+        # key0 is least recently used
+        assert step_cache.get("key0") is None
+        assert step_cache.get("key2") == {"idx": 2}
+        new_stats = step_cache.get_stats()
+        assert new_stats['evictions'] - stats['evictions'] == 1
+        assert new_stats['entries'] == 2
+    finally:
+        step_cache.stop(token)
+        step_cache.clear()
+
+
+def test_step_cache_run_ids_1():
+    """Test method"""
+    step_cache = StepCache()
+    step_cache.clear()
+    token = step_cache.start({})
+    try:
+        keys, run_id_lists = [], []
+        for document_id, work_id in [('D-1', '0b8e4a2c-3f41-4d4e-9b1a-5c7e2f9d1a01'),
+                                     ('D-2', '6d2f9c1e-8a37-4b52-a0c4-1e9f3b7d5c02')]:
+            document_data_dict = {'document_id': document_id, 'text': 'hello D-1'}
+            context_data = {'work_file_path': f"/work/W-{work_id}/a.txt"}
+            run_id_list = step_cache.get_run_id_list(document_data_dict, context_data)
+            assert run_id_list == [document_id, work_id]
+            keys.append(step_cache.get_key('ns', 'cls', {}, document_data_dict, context_data, run_id_list))
+            run_id_lists.append(run_id_list)
+        assert keys[0] == keys[1]
+        step_cache.put(keys[0], {'document_id': 'D-1', 'text': 'hello D-1',
+                                 'path': f"/work/W-{run_id_lists[0][1]}/a.txt_files"}, run_id_lists[0])
+        assert step_cache.get(keys[1], run_id_lists[1]) == {
+            'document_id': 'D-2', 'text': 'hello D-1', 'path': f"/work/W-{run_id_lists[1][1]}/a.txt_files"}
+    finally:
+        step_cache.stop(token)
+        step_cache.clear()
@@ -0,0 +1,163 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+import os
+import json
+import time
+import threading
+import pytest
+import infy_fs_utils
+import infy_dpp_sdk
+from infy_dpp_sdk.common._internal.tracer import Tracer
+
+
+STORAGE_ROOT_PATH = f"C:/temp/unittest/infy_dpp_sdk/{__name__}/STORAGE"
+SERIAL_FLOW_INPUT_CONFIG_FILE_PATH = '/data/config/dpp_pipeline1_input_config.json'
+
+
+@pytest.fixture(scope='module', autouse=True)
+def pre_test(create_root_folders, copy_files_to_root_folder):
+    """Test pre-run method"""
+    # Create data folders
+    create_root_folders([STORAGE_ROOT_PATH])
+    # Copy files to pick up folder
+    SAMPLE_ROOT_PATH = "./data/sample"
+    FILES_TO_COPY = [
+        ['company1.txt', f"{SAMPLE_ROOT_PATH}/input",
+            f"{STORAGE_ROOT_PATH}/data/input"],
+        ['company2.txt', f"{SAMPLE_ROOT_PATH}/input",
+            f"{STORAGE_ROOT_PATH}/data/input"],
+        [os.path.basename(SERIAL_FLOW_INPUT_CONFIG_FILE_PATH), f"{SAMPLE_ROOT_PATH}/config",
+            f"{STORAGE_ROOT_PATH}/data/config"]
+    ]
+    copy_files_to_root_folder(FILES_TO_COPY)
+
+    storage_config_data = infy_fs_utils.data.StorageConfigData(
+        **{
+            "storage_root_uri": f"file://{STORAGE_ROOT_PATH}",
+            "storage_server_url": "",
+            "storage_access_key": "",
+            "storage_secret_key": ""
+        })
+    file_sys_handler = infy_fs_utils.provider.FileSystemHandler(
+        storage_config_data)
+    infy_fs_utils.manager.FileSystemManager().set_root_handler_name(
+        infy_dpp_sdk.common.Constants.FSH_DPP)
+    infy_fs_utils.manager.FileSystemManager().add_fs_handler(file_sys_handler)
+
+    logging_config_data = infy_fs_utils.data.LoggingConfigData(
+        **{
+            # "logger_group_name": "my_group_1",
+            "logging_level": 10,
+            "logging_format": "",
+            "logging_timestamp_format": "",
+            "log_file_data": {
+                "log_file_dir_path": "/logs",
+                "log_file_name_prefix": "infy_dpp_sdk",
+                # "log_file_name_suffix": "1",
+                "log_file_extension": ".log"
+
+            }})
+    file_sys_logging_handler = infy_fs_utils.provider.FileSystemLoggingHandler(
+        logging_config_data, file_sys_handler)
+    infy_fs_utils.manager.FileSystemLoggingManager(
+    ).set_root_handler_name(infy_dpp_sdk.common.Constants.FSLH_DPP)
+    infy_fs_utils.manager.FileSystemLoggingManager(
+    ).add_fs_logging_handler(file_sys_logging_handler)
+
+    yield  # Run all test methods
+    # Post run cleanup
+    # Delete file system handler so that other test modules don't get duplicate key error
+    infy_fs_utils.manager.FileSystemManager().delete_fs_handler()
+    infy_fs_utils.manager.FileSystemLoggingManager().delete_fs_logging_handler()
+
+
+def test_tracer_1():
+    """Test method"""
+    # No-op tracer when tracing is not enabled
+    assert not Tracer.get_current().is_enabled()
+    with Tracer.get_current().span('noop'):
+        pass
+
+    tracer = Tracer("T-test", {"cprofile": True, "tracemalloc": True})
+    token = Tracer.set_current(tracer)
+    try:
+        with Tracer.get_current().span('outer', category='test', key='value'):
+            with tracer.profile('my_processor'):
+                _ = [str(x) for x in range(10000)]
+            thread = threading.Thread(target=lambda: time.sleep(0.01))
+            thread.start()
+            thread.join()
+        Tracer.get_current().add_counter('documents', 2)
+        Tracer.get_current().add_counter('documents')
+    finally:
+        Tracer.reset_current(token)
+    assert not Tracer.get_current().is_enabled()
+
+    trace_data = tracer.get_trace_data()
+    assert [x['name'] for x in trace_data['spans']] == ['outer']
+    assert trace_data['spans'][0]['args'] == {'key': 'value'}
+    assert trace_data['counters'] == {'documents': 3}
+    profile_data = trace_data['profiles'][0]
+    assert profile_data['name'] == 'my_processor'
+    assert profile_data['cprofile']
+    assert profile_data['tracemalloc']['peak_bytes'] > 0
+
+    chrome_trace_data = tracer.get_chrome_trace_data()
+    event_phases = [x['ph'] for x in chrome_trace_data['traceEvents']]
+    assert event_phases == ['X', 'C']
+    assert chrome_trace_data['traceEvents'][0]['dur'] >= 10000
+
+    # Profiles from parallel threads (e.g. sub-processors) don't overlap
+    tracer = Tracer("T-test", {"tracemalloc": True})
+    interval_list = []
+
+    def profile_block(name):
+        with tracer.profile(name):
+            start_time = time.time()
+            _ = [str(x) for x in range(10000)]
+            time.sleep(0.05)
+            interval_list.append((start_time, time.time()))
+    threads = [threading.Thread(target=profile_block, args=(f"p{x}",)) for x in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    interval_list.sort()
+    assert all(x[1] <= y[0] for x, y in zip(interval_list, interval_list[1:]))
+    assert len(tracer.get_trace_data()['profiles']) == 3
+
+
+def test_pipeline_serial_tracing_1(update_json_file):
+    """Test method"""
+    update_json_file(STORAGE_ROOT_PATH + SERIAL_FLOW_INPUT_CONFIG_FILE_PATH,
+                     'orchestrator', {"tracing": {
+                         "enabled": True,
+                         "profile": {"cprofile": True, "processor_names": ["attribute_extractor"]}}})
+    dpp_orchestrator = infy_dpp_sdk.orchestrator.OrchestratorNative(
+        input_config_file_path=SERIAL_FLOW_INPUT_CONFIG_FILE_PATH)
+    processor_response_data_list = dpp_orchestrator.run_batch()
+    assert len(processor_response_data_list) == 2
+
+    trace_data = dpp_orchestrator.get_trace_data()
+    span_names = {x['name'] for x in trace_data['spans']}
+    assert {'run_batch', 'processor', 'do_execute', 'snapshot_load', 'snapshot_save',
+            'controller_file_read', 'controller_file_write'} <= span_names
+    do_execute_spans = [x for x in trace_data['spans'] if x['name'] == 'do_execute' and
+                        x['args']['processor_name'] == 'attribute_extractor']
+    assert len(do_execute_spans) == 2
+    counters = trace_data['counters']
+    assert counters['documents_saved'] >= 2
+    assert counters['bytes_read'] > 0
+    assert counters['bytes_written'] > 0
+    assert [x['name'] for x in trace_data['profiles']] == ['attribute_extractor']
+
+    # Exported next to snapshots folder
+    trace_folder_path = STORAGE_ROOT_PATH + '/data/temp/work/dpp_orchestrator/traces'
+    trace_name = trace_data['trace_name']
+    with open(f"{trace_folder_path}/{trace_name}_chrome_trace.json", encoding='utf-8') as file:
+        assert json.load(file)['traceEvents']
+    assert os.path.exists(f"{trace_folder_path}/{trace_name}_trace.json")
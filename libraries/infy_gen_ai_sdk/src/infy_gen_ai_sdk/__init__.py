@@ -4,7 +4,7 @@
 # http://www.apache.org/licenses/                                                                                #
 # ===============================================================================================================#
 
-from . import (embedding, llm, sparsedb, vectordb, schema, common)
+from . import (embedding, llm, sparsedb, vectordb, retriever, schema, common)
 from .configuration import (ClientConfigManager,
                             ClientConfigData,
                             ContainerData)
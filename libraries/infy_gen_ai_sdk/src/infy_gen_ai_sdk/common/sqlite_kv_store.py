@@ -0,0 +1,188 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+"""Module for SqliteKvStore class"""
+
+import os
+import time
+import logging
+import sqlite3
+import threading
+from typing import Dict, List, Tuple, Union
+import infy_fs_utils
+
+
+class SqliteKvStore():
+    """Key value store in a local SQLite file, so that entries survive restarts and are shared by
+    processes using the same file. Values are text or bytes with optional `info` text.
+    Read time of entries is updated on every read. When the file grows beyond `max_size_mb`,
+    expired and then least recently read entries are deleted.
+    If the file can't be used, nothing is stored and every lookup is a miss."""
+
+    __MAX_SQL_VARIABLES = 900
+    # Size to which file is reduced once it's over the limit, to avoid evicting on every write
+    __EVICTION_TARGET_RATIO = 0.9
+    __COLUMN_NAMES = ['key', 'value', 'info', 'size', 'created_time', 'last_access']
+
+    def __init__(self, file_path: str, table_name: str, max_size_mb: float, ttl_seconds: float = 0,
+                 store_name: str = 'Cache'):
+        if infy_fs_utils.manager.FileSystemLoggingManager().has_fs_logging_handler():
+            self.__logger = infy_fs_utils.manager.FileSystemLoggingManager(
+            ).get_fs_logging_handler().get_logger()
+        else:
+            self.__logger = logging.getLogger(__name__)
+        self.__file_path = file_path
+        self.__table_name = table_name
+        self.__max_size_bytes = int(max_size_mb * 1024 * 1024)
+        # Entries older than this are not returned. 0 to keep till evicted.
+        self.__ttl_seconds = ttl_seconds
+        self.__store_name = store_name
+        self.__lock = threading.Lock()
+        self.__stats = {'disk_evictions': 0}
+        self.__connection = self.__connect()
+        self.__size_bytes = self.__get_size_bytes()
+
+    def get_many(self, keys: List[str]) -> Dict[str, Tuple[Union[str, bytes], str, float]]:
+        """Get key -> (value, info, created time) for the keys present and not expired"""
+        entry_dict = {}
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return entry_dict
+        with self.__lock:
+            if not self.__connection:
+                return entry_dict
+            try:
+                for start_idx in range(0, len(keys), self.__MAX_SQL_VARIABLES):
+                    batch_keys = keys[start_idx:start_idx +
+                                      self.__MAX_SQL_VARIABLES]
+                    cursor = self.__connection.execute(
+                        f"SELECT key, value, info, created_time FROM {self.__table_name} "
+                        f"WHERE key IN ({','.join('?' * len(batch_keys))})", batch_keys)
+                    for key, value, info, created_time in cursor:
+                        if not self.__is_expired(created_time):
+                            entry_dict[key] = (value, info, created_time)
+                if entry_dict:
+                    now = time.time()
+                    with self.__connection:
+                        self.__connection.executemany(
+                            f"UPDATE {self.__table_name} SET last_access = ? WHERE key = ?",
+                            [(now, key) for key in entry_dict])
+            except sqlite3.Error as e:
+                self.__logger.warning(
+                    "Error reading %s %s. %s", self.__store_name, self.__file_path, e)
+        return entry_dict
+
+    def put_many(self, entry_dict: Dict[str, Tuple[Union[str, bytes], str]], created_time: float = None):
+        """Add key -> (value, info) entries, replacing existing ones"""
+        if not entry_dict:
+            return
+        created_time = created_time or time.time()
+        row_list = [(key, value, info, self.__get_size(value), created_time, created_time)
+                    for key, (value, info) in entry_dict.items()]
+        with self.__lock:
+            if not self.__connection:
+                return
+            try:
+                with self.__connection:
+                    self.__connection.executemany(
+                        f"INSERT OR REPLACE INTO {self.__table_name} VALUES (?, ?, ?, ?, ?, ?)", row_list)
+                self.__size_bytes += sum(x[3] for x in row_list)
+                if self.__size_bytes > self.__max_size_bytes:
+                    # Other processes may have written to the file too
+                    self.__size_bytes = self.__get_size_bytes()
+                    if self.__size_bytes > self.__max_size_bytes:
+                        self.__evict()
+            except sqlite3.Error as e:
+                self.__logger.warning(
+                    "Error writing %s %s. %s", self.__store_name, self.__file_path, e)
+
+    def clear(self):
+        """Remove all entries"""
+        with self.__lock:
+            if self.__connection:
+                with self.__connection:
+                    self.__connection.execute(
+                        f"DELETE FROM {self.__table_name}")
+                self.__size_bytes = 0
+
+    def get_stats(self) -> dict:
+        """Get eviction count and current size"""
+        with self.__lock:
+            stats = dict(self.__stats)
+            stats['size_bytes'] = self.__size_bytes
+        return stats
+
+    # ---------- Private Methods ---------
+    def __connect(self) -> sqlite3.Connection:
+        """Returns None if file can't be opened"""
+        table_name = self.__table_name
+        try:
+            folder_path = os.path.dirname(os.path.abspath(self.__file_path))
+            os.makedirs(folder_path, exist_ok=True)
+            # Connection is shared by threads, access is serialized by lock
+            connection = sqlite3.connect(
+                self.__file_path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            column_names = [x[1] for x in connection.execute(
+                f"PRAGMA table_info({table_name})")]
+            if column_names and column_names != self.__COLUMN_NAMES:
+                # Table of an earlier version, entries are dropped
+                connection.execute(f"DROP TABLE {table_name}")
+            connection.execute(f"CREATE TABLE IF NOT EXISTS {table_name} (key TEXT PRIMARY KEY, value NOT NULL, "
+                               "info TEXT, size INTEGER NOT NULL, created_time REAL NOT NULL, "
+                               "last_access REAL NOT NULL)")
+            connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {table_name}_last_access ON {table_name} (last_access)")
+            connection.commit()
+            return connection
+        except (OSError, sqlite3.Error) as e:
+            self.__logger.warning(
+                "%s file %s can't be used. %s", self.__store_name, self.__file_path, e)
+            return None
+
+    def __get_size_bytes(self) -> int:
+        if not self.__connection:
+            return 0
+        return self.__connection.execute(
+            f"SELECT COALESCE(SUM(size), 0) FROM {self.__table_name}").fetchone()[0]
+
+    def __get_size(self, value: Union[str, bytes]) -> int:
+        return len(value.encode('utf-8')) if isinstance(value, str) else len(value)
+
+    def __is_expired(self, created_time: float) -> bool:
+        return bool(self.__ttl_seconds) and time.time() - created_time > self.__ttl_seconds
+
+    def __evict(self):
+        """To be called with lock held. Deletes expired and then least recently read rows."""
+        table_name = self.__table_name
+        if self.__ttl_seconds:
+            with self.__connection:
+                self.__connection.execute(f"DELETE FROM {table_name} WHERE created_time < ?",
+                                          (time.time() - self.__ttl_seconds,))
+            self.__size_bytes = self.__get_size_bytes()
+        bytes_to_free = self.__size_bytes - \
+            int(self.__max_size_bytes * self.__EVICTION_TARGET_RATIO)
+        row_ids, freed_bytes = [], 0
+        if bytes_to_free > 0:
+            cursor = self.__connection.execute(
+                f"SELECT rowid, size FROM {table_name} ORDER BY last_access")
+            for row_id, size in cursor:
+                if freed_bytes >= bytes_to_free:
+                    break
+                row_ids.append(row_id)
+                freed_bytes += size
+            cursor.close()
+        with self.__connection:
+            for start_idx in range(0, len(row_ids), self.__MAX_SQL_VARIABLES):
+                batch_row_ids = row_ids[start_idx:start_idx +
+                                        self.__MAX_SQL_VARIABLES]
+                self.__connection.execute(
+                    f"DELETE FROM {table_name} WHERE rowid IN ({','.join('?' * len(batch_row_ids))})",
+                    batch_row_ids)
+        self.__size_bytes -= freed_bytes
+        self.__stats['disk_evictions'] += len(row_ids)
+        self.__logger.debug("Evicted %s entries from %s %s",
+                            len(row_ids), self.__store_name, self.__file_path)
@@ -7,6 +7,7 @@
 """Module for embedding provider interface class"""
 
 import abc
+from typing import List
 import numpy as np
 from ...schema.embedding_data import BaseEmbeddingData
 
@@ -19,6 +20,20 @@ class IEmbeddingProvider(metaclass=abc.ABCMeta):
         """Generate embedding for given text"""
         raise NotImplementedError
 
+    def generate_embeddings(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """Generate embeddings for given texts as (n, d) float32 matrix, row i being
+        embedding of texts[i]. Providers override this to send `batch_size` texts per call."""
+        vector_list = []
+        for text in texts:
+            embedding_data = self.generate_embedding(text)
+            if embedding_data.error_message:
+                raise ValueError(embedding_data.error_message)
+            vector_list.append(self.convert_to_numpy_array(
+                embedding_data.vector).reshape(1, -1))
+        if not vector_list:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack(vector_list).astype(np.float32)
+
     def convert_to_numpy_array(self, text_embeddings):
         """Convert embeddings to numpy array"""
         # If the embeddings are in list format, convert them to numpy array of shape (1, n)
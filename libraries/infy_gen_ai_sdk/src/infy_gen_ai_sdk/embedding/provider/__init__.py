@@ -10,6 +10,7 @@ from .openai.openai_format_embedding_provider import (
     OpenAIFormatEmbeddingProvider)
 from .st.st_embedding_provider import (StEmbeddingProvider)
 from .custom.custom_embedding_provider import (CustomEmbeddingProvider)
+from .cache.cached_embedding_provider import (CachedEmbeddingProvider)
 # Config Data
 from .openai.openai_embedding_provider import (
     OpenAIEmbeddingProviderConfigData)
@@ -18,4 +19,6 @@ from .openai.openai_format_embedding_provider import (
 from .st.st_embedding_provider import (StEmbeddingProviderConfigData)
 from .custom.custom_embedding_provider import (
     CustomEmbeddingProviderConfigData)
+from .cache.cached_embedding_provider import (
+    CachedEmbeddingProviderConfigData)
 # Domain Data
@@ -0,0 +1,117 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+"""Module for cached embedding provider class"""
+
+import os
+import hashlib
+import threading
+from typing import List
+import numpy as np
+from ....common.app_config_manager import AppConfigManager
+from ....embedding.interface.i_embedding_provider import IEmbeddingProvider
+from ....schema.config_data import BaseEmbeddingProviderConfigData
+from ....schema.embedding_data import EmbeddingData
+from .embedding_cache_store import EmbeddingCacheStore
+
+
+class CachedEmbeddingProviderConfigData(BaseEmbeddingProviderConfigData):
+    """Domain class. `model_name` identifies the embedding model in cache keys and should be
+    given when the wrapped provider doesn't have a `model_name` attribute.
+    Unset values are taken from `[EMBEDDING]` section of config.ini."""
+    cache_file_path: str = None
+    max_memory_entries: int = None
+    max_size_mb: float = None
+
+
+class CachedEmbeddingProvider(IEmbeddingProvider):
+    """Embedding provider wrapping another provider so that embedding of a text is generated only
+    once per model. Cache is shared by all instances using the same cache file.
+    The model name reported by the wrapped provider is cached with each vector from
+    `generate_embedding`, so that cached results are returned with the same model name.
+    Vectors from `generate_embeddings` don't have it, so `generate_embedding` of such a text calls
+    the wrapped provider once."""
+
+    # Cache file path -> EmbeddingCacheStore
+    __store_dict = {}
+    __store_lock = threading.Lock()
+
+    def __init__(self, embedding_provider: IEmbeddingProvider,
+                 config_data: CachedEmbeddingProviderConfigData = None) -> None:
+        config_data = config_data or CachedEmbeddingProviderConfigData()
+        app_config = AppConfigManager().get_app_config()
+        cache_file_path = config_data.cache_file_path or app_config.get(
+            'EMBEDDING', 'embedding_cache_file_path', fallback='') or \
+            f"{app_config['CONTAINER']['APP_DIR_DATA_PATH']}/embedding_cache/embedding_cache.db"
+        max_memory_entries = config_data.max_memory_entries
+        if max_memory_entries is None:
+            max_memory_entries = app_config.getint(
+                'EMBEDDING', 'embedding_cache_max_memory_entries', fallback=10000)
+        max_size_mb = config_data.max_size_mb
+        if max_size_mb is None:
+            max_size_mb = app_config.getfloat(
+                'EMBEDDING', 'embedding_cache_max_size_mb', fallback=1024)
+        self.__embedding_provider = embedding_provider
+        self.__provider_name = type(embedding_provider).__name__
+        self.__model_name = config_data.model_name or getattr(embedding_provider, 'model_name', None) or \
+            getattr(embedding_provider, 'base_url', None) or ''
+        self.__store = self.__get_store(
+            cache_file_path, max_memory_entries, max_size_mb)
+        super().__init__()
+
+    def generate_embedding(self, text: str) -> EmbeddingData:
+        key = self.__get_key(text)
+        entry = self.__store.get_many([key], with_model_name=True).get(key)
+        # Model name as reported by wrapped provider, e.g. stored with records by vector DB providers
+        if entry is not None and entry[1] is not None:
+            vector, reported_model_name = entry
+            return EmbeddingData(vector=vector.reshape(1, -1).copy(),
+                                 vector_dimension=len(vector),
+                                 error_message=None,
+                                 model_name=reported_model_name or None)
+        embedding_data = self.__embedding_provider.generate_embedding(text)
+        if not embedding_data.error_message and embedding_data.vector is not None:
+            # Empty name tells apart a provider not reporting a name from a name not being known
+            self.__store.put_many(
+                {key: self.convert_to_numpy_array(embedding_data.vector)},
+                embedding_data.model_name or '')
+        return embedding_data
+
+    def generate_embeddings(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        keys = [self.__get_key(x) for x in texts]
+        vector_dict = self.__store.get_many(keys)
+        # Each text not in cache is sent once even if repeated
+        missing_text_dict = {}
+        for key, text in zip(keys, texts):
+            if key not in vector_dict:
+                missing_text_dict.setdefault(key, text)
+        if missing_text_dict:
+            vectors = self.__embedding_provider.generate_embeddings(
+                list(missing_text_dict.values()), batch_size)
+            new_vector_dict = dict(zip(missing_text_dict.keys(), vectors))
+            self.__store.put_many(new_vector_dict)
+            vector_dict.update(new_vector_dict)
+        if not keys:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack([vector_dict[x] for x in keys]).astype(np.float32)
+
+    def get_stats(self) -> dict:
+        """Get hit/miss/eviction counts of the cache"""
+        return self.__store.get_stats()
+
+    # ---------- Private Methods ---------
+    def __get_key(self, text: str) -> tuple:
+        return (self.__provider_name, self.__model_name,
+                hashlib.sha256(text.encode('utf-8')).hexdigest())
+
+    @classmethod
+    def __get_store(cls, cache_file_path: str, max_memory_entries: int, max_size_mb: float) -> EmbeddingCacheStore:
+        store_key = os.path.abspath(cache_file_path)
+        with cls.__store_lock:
+            if store_key not in cls.__store_dict:
+                cls.__store_dict[store_key] = EmbeddingCacheStore(
+                    cache_file_path, max_memory_entries, max_size_mb)
+            return cls.__store_dict[store_key]
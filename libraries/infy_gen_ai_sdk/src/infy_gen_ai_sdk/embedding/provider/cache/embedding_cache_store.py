@@ -0,0 +1,105 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+"""Module for EmbeddingCacheStore class"""
+
+import json
+import threading
+import collections
+from typing import Dict, List, Tuple
+import numpy as np
+from ....common.sqlite_kv_store import SqliteKvStore
+
+
+class EmbeddingCacheStore():
+    """Store of embeddings keyed by (provider, model name, text hash). Each vector may have the model
+    name reported by the provider which generated it. Vectors are kept as float32
+    blobs in a `SqliteKvStore` file so that they survive restarts and are shared by processes using
+    the same file, with a least recently used in-memory front for repeated lookups.
+    When the file grows beyond `max_size_mb`, least recently read rows are deleted. Reads served
+    from memory don't update the file, so the order on disk is approximate."""
+
+    __TABLE_NAME = 'embeddings'
+
+    def __init__(self, file_path: str, max_memory_entries: int = 10000, max_size_mb: float = 1024):
+        self.__max_memory_entries = max_memory_entries
+        self.__lock = threading.Lock()
+        # key -> (1-D float32 vector, reported model name), in LRU order
+        self.__memory_dict = collections.OrderedDict()
+        self.__stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0,
+                        'memory_evictions': 0}
+        self.__kv_store = SqliteKvStore(
+            file_path, self.__TABLE_NAME, max_size_mb, store_name='Embedding cache')
+
+    def get_many(self, keys: List[Tuple[str, str, str]],
+                 with_model_name: bool = False) -> Dict[Tuple[str, str, str], np.ndarray]:
+        """Get key -> vector for the keys present in cache. If `with_model_name` is True, values are
+        (vector, reported model name) where model name is None if it wasn't given to `put_many`."""
+        entry_dict = {}
+        disk_key_set = set()
+        with self.__lock:
+            for key in keys:
+                if key in entry_dict or key in disk_key_set:
+                    continue
+                entry = self.__memory_dict.get(key)
+                if entry is None:
+                    disk_key_set.add(key)
+                    continue
+                self.__memory_dict.move_to_end(key)
+                entry_dict[key] = entry
+                self.__stats['memory_hits'] += 1
+        kv_entry_dict = self.__kv_store.get_many(
+            [self.__encode_key(x) for x in disk_key_set])
+        disk_entry_dict = {tuple(json.loads(kv_key)): (np.frombuffer(value, dtype='<f4').astype(np.float32), info)
+                           for kv_key, (value, info, _) in kv_entry_dict.items()}
+        with self.__lock:
+            for key, entry in disk_entry_dict.items():
+                self.__put_in_memory(key, entry)
+            self.__stats['disk_hits'] += len(disk_entry_dict)
+            self.__stats['misses'] += len(disk_key_set) - len(disk_entry_dict)
+        entry_dict.update(disk_entry_dict)
+        if with_model_name:
+            return entry_dict
+        return {key: entry[0] for key, entry in entry_dict.items()}
+
+    def put_many(self, vector_dict: Dict[Tuple[str, str, str], np.ndarray], model_name: str = None):
+        """Add vectors to cache, replacing existing ones. `model_name` is the model name reported
+        by the provider which generated the vectors, if known."""
+        if not vector_dict:
+            return
+        entry_dict = {key: (np.asarray(vector, dtype=np.float32).reshape(-1), model_name)
+                      for key, vector in vector_dict.items()}
+        with self.__lock:
+            for key, entry in entry_dict.items():
+                self.__put_in_memory(key, entry)
+        self.__kv_store.put_many({self.__encode_key(key): (vector.astype('<f4').tobytes(), model_name)
+                                  for key, (vector, model_name) in entry_dict.items()})
+
+    def clear(self):
+        """Remove all entries from memory and file"""
+        with self.__lock:
+            self.__memory_dict.clear()
+        self.__kv_store.clear()
+
+    def get_stats(self) -> dict:
+        """Get hit/miss/eviction counts and current size"""
+        with self.__lock:
+            stats = dict(self.__stats)
+            stats['memory_entries'] = len(self.__memory_dict)
+        stats.update(self.__kv_store.get_stats())
+        return stats
+
+    # ---------- Private Methods ---------
+    def __encode_key(self, key: Tuple[str, str, str]) -> str:
+        return json.dumps(list(key), ensure_ascii=False)
+
+    def __put_in_memory(self, key: tuple, entry: tuple):
+        """To be called with lock held"""
+        self.__memory_dict[key] = entry
+        self.__memory_dict.move_to_end(key)
+        while len(self.__memory_dict) > max(self.__max_memory_entries, 0):
+            self.__memory_dict.popitem(last=False)
+            self.__stats['memory_evictions'] += 1
@@ -6,6 +6,8 @@
 
 """Module for Custom embedding provider class"""
 
+from typing import List
+import numpy as np
 from ....schema.config_data import BaseEmbeddingProviderConfigData
 from ....embedding.interface.i_embedding_provider import IEmbeddingProvider
 from .custom_embedding_service import CustomEmbeddingService
@@ -34,3 +36,15 @@ class CustomEmbeddingProvider(IEmbeddingProvider):
                                        vector_dimension=len(text_embeddings),
                                        error_message=None)
         return embedding_data
+
+    def generate_embeddings(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        vector_list = []
+        for start_idx in range(0, len(texts), batch_size):
+            embedding_dict = self.__embeddings.generate_embeddings(
+                texts[start_idx:start_idx + batch_size])
+            if embedding_dict['error_message']:
+                raise ValueError(embedding_dict['error_message'])
+            vector_list.append(np.array(embedding_dict['embedding'], dtype=np.float32))
+        if not vector_list:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack(vector_list)
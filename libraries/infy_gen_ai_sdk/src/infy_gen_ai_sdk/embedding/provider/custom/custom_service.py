@@ -8,6 +8,7 @@ import json
 import logging
 from typing import List
 import requests
+from requests.adapters import HTTPAdapter
 
 import infy_fs_utils
 from ....common.singleton import Singleton
@@ -23,14 +24,24 @@ class CustomService(metaclass=Singleton):
                 'Endpoint should be provided')
         self.__api_key = api_key
         self.__endpoint = endpoint
+        self.__session = requests.Session()
+        self.__session.mount('http://', HTTPAdapter(pool_maxsize=32))
+        self.__session.mount('https://', HTTPAdapter(pool_maxsize=32))
 
     def generate_embedding(self, text) -> dict:
         """Generate embedding for given text using Custom Embedding Provider"""
         if self.__endpoint:
-            result = self.__call_remote(text)
+            result = self.__call_remote([text])
+            if result['embedding']:
+                result['embedding'] = result['embedding'][0]
+                result['size'] = len(result['embedding'])
         return result
 
-    def __call_remote(self, text: str) -> List[float]:
+    def generate_embeddings(self, texts: List[str]) -> dict:
+        """Generate embeddings for given texts in one call, `embedding` being list of vectors"""
+        return self.__call_remote(texts)
+
+    def __call_remote(self, texts: List[str]) -> dict:
         if infy_fs_utils.manager.FileSystemLoggingManager().has_fs_logging_handler():
             __logger = infy_fs_utils.manager.FileSystemLoggingManager(
             ).get_fs_logging_handler().get_logger()
@@ -48,15 +59,15 @@ class CustomService(metaclass=Singleton):
         }
 
         data_raw = {
-            'inputs': [text]
+            'inputs': texts
         }
         try:
-            response = requests.post(
+            response = self.__session.post(
                 self.__endpoint, headers=headers, json=data_raw, timeout=120, verify=False)
             if response.status_code == 200:
                 content = json.loads(response.content.decode("utf-8"))
-                result['embedding'] = content[0]
-                result['size'] = len(content[0])
+                result['embedding'] = content
+                result['size'] = len(content[0]) if content else 0
             else:
                 message = f'Error in calling API {response.status_code}'
                 result['error_message'] = message
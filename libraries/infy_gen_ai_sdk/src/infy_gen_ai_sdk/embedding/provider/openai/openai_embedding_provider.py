@@ -6,6 +6,8 @@
 
 """Module for OpenAI embedding provider class"""
 
+from typing import List
+import numpy as np
 from deprecated import deprecated
 from ....schema.config_data import BaseEmbeddingProviderConfigData
 from ....embedding.interface.i_embedding_provider import IEmbeddingProvider
@@ -44,3 +46,8 @@ class OpenAIEmbeddingProvider(IEmbeddingProvider):
                                        error_message=None,
                                        model_name=self.__config_data.model_name)
         return embedding_data
+
+    def generate_embeddings(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.array(self.__embeddings.embed_documents(texts, batch_size), dtype=np.float32)
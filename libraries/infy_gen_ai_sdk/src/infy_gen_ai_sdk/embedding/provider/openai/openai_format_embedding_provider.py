@@ -7,6 +7,8 @@
 """Module for OpenAI embedding provider class"""
 
 import os
+from typing import List
+import numpy as np
 import litellm
 from ....schema.config_data import BaseEmbeddingProviderConfigData
 from ....embedding.interface.i_embedding_provider import IEmbeddingProvider
@@ -51,3 +53,20 @@ class OpenAIFormatEmbeddingProvider(IEmbeddingProvider):
                                        error_message=None,
                                        model_name=self.config_data.model_name)
         return embedding_data
+
+    def generate_embeddings(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        os.environ["AZURE_API_KEY"] = self.api_key
+        vector_list = []
+        for start_idx in range(0, len(texts), batch_size):
+            response = litellm.embedding(
+                api_base=self.api_base,
+                api_key=self.api_key,
+                model=self.model_name,
+                api_version=self.api_version,
+                input=texts[start_idx:start_idx + batch_size],
+                timeout=120)
+            data_list = sorted(response.json()['data'], key=lambda x: x.get('index', 0))
+            vector_list.append(np.array([x.get('embedding') for x in data_list], dtype=np.float32))
+        if not vector_list:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack(vector_list)
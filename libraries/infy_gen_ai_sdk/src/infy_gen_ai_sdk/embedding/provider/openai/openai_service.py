@@ -23,46 +23,51 @@ class OpenAIService(metaclass=Singleton):
         self.openai_api_version = api_version
         self.openai_api_base = api_base
         self.model = model_name
+        # Created on first use and reused for connection pooling
+        self.__client = None
 
-    def _create_embeddings(self, input) -> List[float]:
+    def _create_embeddings(self, input: List[str]) -> List[List[float]]:
         if infy_fs_utils.manager.FileSystemLoggingManager().has_fs_logging_handler():
             __logger = infy_fs_utils.manager.FileSystemLoggingManager(
             ).get_fs_logging_handler().get_logger()
         else:
             __logger = logging.getLogger(__name__)
         try:
-            response_list: List[float] = []
-            client = AzureOpenAI(
-                api_key=self.openai_api_key,
-                api_version=self.openai_api_version,
-                azure_endpoint=self.openai_api_base
-            )
-            embeddings = client.embeddings.create(
-                input=[input], model=self.model)
-            response_list = embeddings.data[0].embedding
+            response_list: List[List[float]] = []
+            if self.__client is None:
+                self.__client = AzureOpenAI(
+                    api_key=self.openai_api_key,
+                    api_version=self.openai_api_version,
+                    azure_endpoint=self.openai_api_base
+                )
+            embeddings = self.__client.embeddings.create(
+                input=input, model=self.model)
+            response_list = [x.embedding for x in sorted(
+                embeddings.data, key=lambda x: x.index)]
         except Exception as ex:
             message = 'Error occurred while creating embedddings'
             __logger.exception(message)
             raise IOError(message) from ex
         return response_list
 
-    def _embed(self, input: List[str]) -> List[List[float]]:
+    def _embed(self, input: List[str], batch_size: int = 32) -> List[List[float]]:
         embeddings_list: List[List[float]] = []
-        for prompt in input:
-            embeddings = self._create_embeddings(prompt)
-            embeddings_list.append(embeddings)
+        for start_idx in range(0, len(input), batch_size):
+            embeddings_list.extend(self._create_embeddings(
+                input[start_idx:start_idx + batch_size]))
         return embeddings_list
 
-    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+    def embed_documents(self, texts: List[str], batch_size: int = 32) -> List[List[float]]:
         """Embed documents using a Ollama deployed embedding model.
 
         Args:
             texts: The list of texts to embed.
+            batch_size: Number of texts sent in one API call.
 
         Returns:
             List of embeddings, one for each text.
         """
-        embeddings = self._embed(texts)
+        embeddings = self._embed(texts, batch_size)
         return embeddings
 
     def embed_query(self, text: str) -> List[float]:
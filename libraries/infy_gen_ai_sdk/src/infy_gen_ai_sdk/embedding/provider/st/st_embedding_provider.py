@@ -6,7 +6,10 @@
 
 """Module for Sentence Transformer embedding provider class"""
 
+from typing import List
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
 from ....embedding.interface.i_embedding_provider import IEmbeddingProvider
 from ....schema.config_data import BaseEmbeddingProviderConfigData
 from ....schema.embedding_data import EmbeddingData
@@ -19,14 +22,22 @@ class StEmbeddingProviderConfigData(BaseEmbeddingProviderConfigData):
 class StEmbeddingProvider(IEmbeddingProvider):
     """Sentence Transformer embedding provider"""
 
+    # Shared by all instances so that connections to model service are reused
+    __session = None
+
     def __init__(self, config_data: StEmbeddingProviderConfigData) -> None:
         base_url = config_data.api_url.rstrip('/')
         self.base_url = f"{base_url}/api/v1/model/embedding/generate"
         # self.model_name = config_data.model_name
+        if StEmbeddingProvider.__session is None:
+            session = requests.Session()
+            session.mount('http://', HTTPAdapter(pool_maxsize=32))
+            session.mount('https://', HTTPAdapter(pool_maxsize=32))
+            StEmbeddingProvider.__session = session
 
     def generate_embedding(self, text: str) -> EmbeddingData:
         payload = {"text": text}
-        response_obj = requests.post(
+        response_obj = self.__session.post(
             self.base_url,
             json=payload,
             timeout=300
@@ -43,3 +54,22 @@ class StEmbeddingProvider(IEmbeddingProvider):
                                            'model_name')
                                        )
         return embedding_data
+
+    def generate_embeddings(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        vector_list = []
+        for start_idx in range(0, len(texts), batch_size):
+            response_obj = self.__session.post(
+                self.base_url,
+                json={"texts": texts[start_idx:start_idx + batch_size]},
+                timeout=300
+            )
+            if response_obj.status_code == 422:
+                # Model service not supporting `texts`
+                return super().generate_embeddings(texts, batch_size)
+            embedding_dict = response_obj.json()
+            if embedding_dict.get('error_message'):
+                raise ValueError(embedding_dict['error_message'])
+            vector_list.append(np.array(embedding_dict['vector'], dtype=np.float32))
+        if not vector_list:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack(vector_list)
@@ -5,4 +5,4 @@
 # ===============================================================================================================#
 
 
-from . import (interface, provider)
+from . import (interface, provider, scheduler, cache)
@@ -0,0 +1,11 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+# Main class
+from .memory_llm_response_cache import (MemoryLlmResponseCache)
+from .sqlite_llm_response_cache import (SqliteLlmResponseCache)
+# Config Data
+from .sqlite_llm_response_cache import (SqliteLlmResponseCacheConfigData)
@@ -0,0 +1,64 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+"""Module for in-memory LLM response cache class"""
+
+import time
+import threading
+import collections
+from typing import Optional
+from ..interface.i_llm_response_cache import ILlmResponseCache
+
+
+class MemoryLlmResponseCache(ILlmResponseCache):
+    """Least recently used cache of responses in process memory. Responses older than
+    `ttl_seconds` are treated as absent."""
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = None) -> None:
+        self.__max_entries = max_entries
+        self.__ttl_seconds = ttl_seconds
+        self.__lock = threading.Lock()
+        # key -> (response, created time), in LRU order
+        self.__entry_dict = collections.OrderedDict()
+        self.__stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+
+    def get(self, key: str) -> Optional[str]:
+        with self.__lock:
+            entry = self.__entry_dict.get(key)
+            if entry is not None and self.__is_expired(entry[1]):
+                del self.__entry_dict[key]
+                self.__stats['expirations'] += 1
+                entry = None
+            if entry is None:
+                self.__stats['misses'] += 1
+                return None
+            self.__entry_dict.move_to_end(key)
+            self.__stats['hits'] += 1
+            return entry[0]
+
+    def put(self, key: str, response: str, created_time: float = None):
+        """Add response. `created_time` is given when response was created earlier, e.g. when
+        read from another cache, so that it expires at the same time."""
+        with self.__lock:
+            self.__entry_dict[key] = (response, created_time or time.time())
+            self.__entry_dict.move_to_end(key)
+            while len(self.__entry_dict) > max(self.__max_entries, 0):
+                self.__entry_dict.popitem(last=False)
+                self.__stats['evictions'] += 1
+
+    def clear(self):
+        with self.__lock:
+            self.__entry_dict.clear()
+
+    def get_stats(self) -> dict:
+        with self.__lock:
+            stats = dict(self.__stats)
+            stats['entries'] = len(self.__entry_dict)
+        return stats
+
+    # ---------- Private Methods ---------
+    def __is_expired(self, created_time: float) -> bool:
+        return bool(self.__ttl_seconds) and time.time() - created_time > self.__ttl_seconds
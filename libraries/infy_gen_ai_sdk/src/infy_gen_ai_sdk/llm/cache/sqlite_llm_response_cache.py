@@ -0,0 +1,94 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+"""Module for SQLite LLM response cache class"""
+
+import time
+import threading
+from typing import Optional
+try:
+    from pydantic.v1 import BaseModel
+except ImportError:
+    from pydantic import BaseModel
+from ...common.app_config_manager import AppConfigManager
+from ...common.sqlite_kv_store import SqliteKvStore
+from ..interface.i_llm_response_cache import ILlmResponseCache
+from .memory_llm_response_cache import MemoryLlmResponseCache
+
+
+class SqliteLlmResponseCacheConfigData(BaseModel):
+    """Domain class. Unset values are taken from `[LLM]` section of config.ini."""
+    cache_file_path: str = None
+    max_memory_entries: int = None
+    max_size_mb: float = None
+    # Responses older than this are not returned. 0 to keep till evicted.
+    ttl_seconds: float = None
+
+
+class SqliteLlmResponseCache(ILlmResponseCache):
+    """Cache of responses in a local `SqliteKvStore` file, so that they survive restarts and are
+    shared by processes using the same file, with a `MemoryLlmResponseCache` in front for repeated
+    lookups. When the file grows beyond `max_size_mb`, expired and then least recently read
+    responses are deleted. If the file can't be used, responses are cached in memory only."""
+
+    __TABLE_NAME = 'llm_responses'
+
+    def __init__(self, config_data: SqliteLlmResponseCacheConfigData = None) -> None:
+        config_data = config_data or SqliteLlmResponseCacheConfigData()
+        app_config = AppConfigManager().get_app_config()
+        file_path = config_data.cache_file_path or app_config.get(
+            'LLM', 'llm_response_cache_file_path', fallback='') or \
+            f"{app_config['CONTAINER']['APP_DIR_DATA_PATH']}/llm_cache/llm_response_cache.db"
+        max_memory_entries = config_data.max_memory_entries
+        if max_memory_entries is None:
+            max_memory_entries = app_config.getint(
+                'LLM', 'llm_response_cache_max_memory_entries', fallback=1000)
+        max_size_mb = config_data.max_size_mb
+        if max_size_mb is None:
+            max_size_mb = app_config.getfloat(
+                'LLM', 'llm_response_cache_max_size_mb', fallback=256)
+        ttl_seconds = config_data.ttl_seconds
+        if ttl_seconds is None:
+            ttl_seconds = app_config.getfloat(
+                'LLM', 'llm_response_cache_ttl_seconds', fallback=0)
+        self.__memory_cache = MemoryLlmResponseCache(
+            max_memory_entries, ttl_seconds)
+        self.__kv_store = SqliteKvStore(
+            file_path, self.__TABLE_NAME, max_size_mb, ttl_seconds, store_name='LLM response cache')
+        self.__lock = threading.Lock()
+        self.__stats = {'disk_hits': 0, 'misses': 0}
+
+    def get(self, key: str) -> Optional[str]:
+        response = self.__memory_cache.get(key)
+        if response is not None:
+            return response
+        entry = self.__kv_store.get_many([key]).get(key)
+        with self.__lock:
+            self.__stats['misses' if entry is None else 'disk_hits'] += 1
+        if entry is None:
+            return None
+        response, _, created_time = entry
+        self.__memory_cache.put(key, response, created_time)
+        return response
+
+    def put(self, key: str, response: str):
+        created_time = time.time()
+        self.__memory_cache.put(key, response, created_time)
+        self.__kv_store.put_many({key: (response, None)}, created_time)
+
+    def clear(self):
+        self.__memory_cache.clear()
+        self.__kv_store.clear()
+
+    def get_stats(self) -> dict:
+        memory_stats = self.__memory_cache.get_stats()
+        with self.__lock:
+            stats = dict(self.__stats)
+        stats.update(self.__kv_store.get_stats())
+        stats['memory_hits'] = memory_stats['hits']
+        stats['memory_entries'] = memory_stats['entries']
+        stats['memory_evictions'] = memory_stats['evictions']
+        return stats
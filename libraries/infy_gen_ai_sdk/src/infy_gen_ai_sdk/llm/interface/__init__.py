@@ -5,3 +5,4 @@
 # ===============================================================================================================#
 
 from .i_llm_provider import ILlmProvider
+from .i_llm_response_cache import ILlmResponseCache
@@ -0,0 +1,43 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+"""Module for LLM response cache interface class"""
+
+import abc
+import json
+import hashlib
+from typing import Optional
+
+
+class ILlmResponseCache(metaclass=abc.ABCMeta):
+    """Interface class for LLM response cache"""
+
+    @staticmethod
+    def get_key(model_name: str, params: dict, prompt: str) -> str:
+        """Key of a response, i.e. hash of model name, decoding params (e.g. temperature) and prompt"""
+        key_str = json.dumps({'model_name': model_name, 'params': params or {}, 'prompt': prompt},
+                             sort_keys=True, default=str)
+        return hashlib.sha256(key_str.encode('utf-8')).hexdigest()
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Get response, None if absent or expired"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def put(self, key: str, response: str):
+        """Add response, replacing existing one"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def clear(self):
+        """Remove all responses"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_stats(self) -> dict:
+        """Get hit/miss/eviction counts"""
+        raise NotImplementedError
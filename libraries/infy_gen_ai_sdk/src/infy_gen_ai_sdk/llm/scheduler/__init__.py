@@ -0,0 +1,10 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+# Main class
+from .llm_request_scheduler import (LlmRequestScheduler, TokenBucket)
+# Config Data
+from .llm_request_scheduler import (LlmRequestSchedulerConfigData)
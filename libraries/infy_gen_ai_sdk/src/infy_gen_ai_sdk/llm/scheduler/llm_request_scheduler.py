@@ -0,0 +1,186 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+"""Module for LLM request scheduler class"""
+
+import time
+import random
+import logging
+import threading
+import concurrent.futures
+from typing import Callable, List, Optional
+import infy_fs_utils
+try:
+    from pydantic.v1 import BaseModel
+except ImportError:
+    from pydantic import BaseModel
+
+
+class LlmRequestSchedulerConfigData(BaseModel):
+    """Domain class"""
+    max_workers: int = 8
+    # Limits shared by all schedulers having the same `limiter_key`. None for no limit.
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
+    # Requests or tokens that can be sent at once, as seconds worth of the per minute limit
+    burst_seconds: float = 10
+    max_retries: int = 5
+    initial_retry_delay: float = 1.0
+    max_retry_delay: float = 60.0
+    retry_status_codes: List[int] = [408, 429, 500, 502, 503, 504]
+
+
+class TokenBucket():
+    """Token bucket refilled at `rate_per_minute` up to `capacity`. An amount larger than the
+    capacity waits for a full bucket and leaves it in debt, so the long run rate is kept."""
+
+    def __init__(self, rate_per_minute: float, capacity: float = None) -> None:
+        self.__rate_per_second = rate_per_minute / 60
+        self.__capacity = max(capacity or rate_per_minute, 1)
+        self.__tokens = self.__capacity
+        self.__updated_time = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def acquire(self, amount: float = 1) -> float:
+        """Wait till `amount` is available and take it. Returns seconds waited."""
+        wait_time = 0.0
+        while True:
+            with self.__lock:
+                now = time.monotonic()
+                self.__tokens = min(self.__capacity, self.__tokens +
+                                    (now - self.__updated_time) * self.__rate_per_second)
+                self.__updated_time = now
+                required_tokens = min(amount, self.__capacity)
+                if self.__tokens >= required_tokens:
+                    self.__tokens -= amount
+                    return wait_time
+                sleep_time = (required_tokens - self.__tokens) / \
+                    self.__rate_per_second
+            time.sleep(sleep_time)
+            wait_time += sleep_time
+
+    def get_rate(self) -> float:
+        """Get current refill rate per minute"""
+        return self.__rate_per_second * 60
+
+    def set_rate(self, rate_per_minute: float):
+        """Change refill rate, e.g. to back off when the server is throttling. Capacity is
+        unchanged."""
+        with self.__lock:
+            now = time.monotonic()
+            self.__tokens = min(self.__capacity, self.__tokens +
+                                (now - self.__updated_time) * self.__rate_per_second)
+            self.__updated_time = now
+            self.__rate_per_second = rate_per_minute / 60
+
+
+class LlmRequestScheduler():
+    """Scheduler running LLM requests concurrently on a bounded pool of workers.
+    `call` sends one request within the requests/min and tokens/min limits, retrying with jittered
+    exponential backoff when it fails with a retryable status code (e.g. 429 or 5xx).
+    Limits are shared by all schedulers having the same `limiter_key`, e.g. the model deployment,
+    so that concurrent documents don't exceed the quota together."""
+
+    # (limiter key, rate per minute, capacity) -> TokenBucket
+    __bucket_dict = {}
+    __bucket_lock = threading.Lock()
+
+    def __init__(self, config_data: LlmRequestSchedulerConfigData = None, limiter_key: str = '') -> None:
+        if infy_fs_utils.manager.FileSystemLoggingManager().has_fs_logging_handler():
+            self.__logger = infy_fs_utils.manager.FileSystemLoggingManager(
+            ).get_fs_logging_handler().get_logger()
+        else:
+            self.__logger = logging.getLogger(__name__)
+        self.__config_data = config_data or LlmRequestSchedulerConfigData()
+        config_data = self.__config_data
+        self.__request_bucket = self.__get_bucket(
+            f'{limiter_key}/requests', config_data.requests_per_minute, config_data.burst_seconds)
+        self.__token_bucket = self.__get_bucket(
+            f'{limiter_key}/tokens', config_data.tokens_per_minute, config_data.burst_seconds)
+        self.__stats = {'requests': 0, 'retries': 0, 'failures': 0, 'throttle_seconds': 0.0}
+        self.__stats_lock = threading.Lock()
+        # Threads are started on first use
+        self.__executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(config_data.max_workers, 1), thread_name_prefix='llm_request_scheduler')
+
+    def map(self, func: Callable, items: list) -> list:
+        """Run `func` for each item on the workers and return results in the order of items.
+        Exception of the first failed item is raised after all items are done."""
+        future_list = [self.__executor.submit(func, x) for x in items]
+        concurrent.futures.wait(future_list)
+        return [x.result() for x in future_list]
+
+    def call(self, func: Callable, *args, tokens: int = 0, **kwargs):
+        """Call `func`, which sends one request of about `tokens` tokens, within rate limits and
+        with retries"""
+        config_data = self.__config_data
+        attempt = 0
+        while True:
+            throttle_time = 0.0
+            if self.__request_bucket:
+                throttle_time += self.__request_bucket.acquire(1)
+            if self.__token_bucket and tokens:
+                throttle_time += self.__token_bucket.acquire(tokens)
+            self.__add_stats(requests=1, throttle_seconds=throttle_time)
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                status_code = self.__get_status_code(e)
+                if status_code not in config_data.retry_status_codes or attempt >= config_data.max_retries:
+                    self.__add_stats(failures=1)
+                    raise
+                # Full jitter, so that workers throttled together don't retry together
+                delay = random.uniform(0, min(config_data.max_retry_delay,
+                                              config_data.initial_retry_delay * 2 ** attempt))
+                delay = max(delay, self.__get_retry_after(e))
+                attempt += 1
+                self.__add_stats(retries=1)
+                self.__logger.warning("LLM request failed with status %s, retry %s of %s in %.2f seconds",
+                                      status_code, attempt, config_data.max_retries, delay)
+                time.sleep(delay)
+
+    def get_stats(self) -> dict:
+        """Get count of requests sent, retries and failures, and time spent waiting for limits"""
+        with self.__stats_lock:
+            return dict(self.__stats)
+
+    def close(self):
+        """Stop workers"""
+        self.__executor.shutdown(wait=True)
+
+    # ---------- Private Methods ---------
+    @classmethod
+    def __get_bucket(cls, key: str, rate_per_minute: int, burst_seconds: float) -> TokenBucket:
+        if not rate_per_minute:
+            return None
+        capacity = rate_per_minute * burst_seconds / 60
+        bucket_key = (key, rate_per_minute, capacity)
+        with cls.__bucket_lock:
+            if bucket_key not in cls.__bucket_dict:
+                cls.__bucket_dict[bucket_key] = TokenBucket(rate_per_minute, capacity)
+            return cls.__bucket_dict[bucket_key]
+
+    def __add_stats(self, **kwargs):
+        with self.__stats_lock:
+            for key, value in kwargs.items():
+                self.__stats[key] += value
+
+    def __get_status_code(self, e: Exception) -> Optional[int]:
+        """Status code of litellm/openai errors or of `requests` HTTP errors"""
+        status_code = getattr(e, 'status_code', None)
+        if status_code is None:
+            status_code = getattr(getattr(e, 'response', None), 'status_code', None)
+        try:
+            return int(status_code)
+        except (TypeError, ValueError):
+            return None
+
+    def __get_retry_after(self, e: Exception) -> float:
+        headers = getattr(getattr(e, 'response', None), 'headers', None) or {}
+        try:
+            return min(float(headers.get('retry-after', 0)), self.__config_data.max_retry_delay)
+        except (TypeError, ValueError):
+            return 0.0
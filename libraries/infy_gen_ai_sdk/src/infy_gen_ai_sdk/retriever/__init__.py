@@ -0,0 +1,14 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+# Main class
+from .hybrid_retriever import (HybridRetriever)
+# Config Data
+from .hybrid_retriever import (HybridRetrieverConfigData)
+# Domain Data
+from .hybrid_retriever import (HybridQueryParamsData,
+                               HybridMatchData,
+                               HybridSearchResultData)
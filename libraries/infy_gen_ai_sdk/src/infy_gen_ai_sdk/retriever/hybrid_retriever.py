@@ -0,0 +1,266 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+"""Module for hybrid retriever class"""
+
+import time
+import logging
+import concurrent.futures
+from typing import List, Optional
+import infy_fs_utils
+try:
+    from pydantic.v1 import BaseModel
+except ImportError:
+    from pydantic import BaseModel
+from ..sparsedb.interface.i_sparse_db_provider import ISparseDbProvider
+from ..sparsedb.provider.bm25s import SparseDbQueryParamsData
+from ..vectordb.interface.i_vector_db_provider import IVectorDbProvider
+from ..vectordb.provider.faiss import VectorDbQueryParamsData
+
+
+class HybridRetrieverConfigData(BaseModel):
+    """Domain class"""
+    # One of rrf, weighted, convex. See `HybridRetriever`.
+    fusion_method: str = 'rrf'
+    rrf_k: int = 60
+    # Weights of the two result lists for rrf and weighted fusion
+    sparse_weight: float = 1.0
+    dense_weight: float = 1.0
+    # Weight of dense score for convex fusion, sparse score gets (1 - alpha)
+    alpha: float = 0.5
+    # `distance` if lower dense score is better (e.g. FAISS L2 distance of normalized vectors), else `similarity`
+    dense_score_type: str = 'distance'
+    # Number of matches fetched from each DB before fusion. Defaults to `top_k` of query.
+    fetch_k: Optional[int] = None
+    # Metadata key identifying a chunk, to find the same chunk in both result lists. Content is used if absent.
+    id_key: str = 'chunk_id'
+    max_workers: int = 8
+
+
+class HybridQueryParamsData(BaseModel):
+    """Domain class"""
+    query: str
+    top_k: int
+    pre_filter_fetch_k: Optional[int] = None
+    filter_metadata: dict = None
+
+
+class HybridMatchData(BaseModel):
+    """Domain class. Ranks are 1 based position in each result list, None if not found there."""
+    content: str = None
+    metadata: dict = None
+    score: float = None
+    sparse_score: Optional[float] = None
+    dense_score: Optional[float] = None
+    sparse_rank: Optional[int] = None
+    dense_rank: Optional[int] = None
+    methods: List[str] = []
+
+
+class HybridSearchResultData(BaseModel):
+    """Domain class. Timings are in seconds. In batch search, DB search timings are of the whole batch."""
+    query: str = None
+    matches: List[HybridMatchData] = []
+    timings: dict = {}
+    # Method (sparse or dense) -> error message, when that search failed
+    errors: dict = {}
+
+
+class HybridRetriever():
+    """Retriever searching a sparse DB and a vector DB concurrently and fusing the two result lists
+    into a single top k. Either provider may be None, in which case only the other is used.
+    Fusion methods:
+    - rrf: Sum of weight / (rrf_k + rank) over the lists a chunk is in
+    - weighted: Weighted sum of scores min-max normalized within each list
+    - convex: alpha * dense similarity + (1 - alpha) * sparse score / max sparse score. Dense
+      distance is converted using bounds of squared L2 distance of normalized vectors, so the
+      score of a chunk doesn't depend on the other chunks fetched.
+    Providers are expected to keep their indexes loaded (e.g. FAISS and BM25S index registries)
+    and be safe to call from multiple threads."""
+
+    FUSION_METHOD_RRF = 'rrf'
+    FUSION_METHOD_WEIGHTED = 'weighted'
+    FUSION_METHOD_CONVEX = 'convex'
+    METHOD_SPARSE = 'sparse'
+    METHOD_DENSE = 'dense'
+
+    def __init__(self, config_data: HybridRetrieverConfigData = None,
+                 sparse_db_provider: ISparseDbProvider = None, vector_db_provider: IVectorDbProvider = None) -> None:
+        if infy_fs_utils.manager.FileSystemLoggingManager().has_fs_logging_handler():
+            self.__logger = infy_fs_utils.manager.FileSystemLoggingManager(
+            ).get_fs_logging_handler().get_logger()
+        else:
+            self.__logger = logging.getLogger(__name__)
+        self.__config_data = config_data or HybridRetrieverConfigData()
+        if self.__config_data.fusion_method not in [self.FUSION_METHOD_RRF, self.FUSION_METHOD_WEIGHTED,
+                                                    self.FUSION_METHOD_CONVEX]:
+            raise ValueError(
+                f"Unsupported fusion method: {self.__config_data.fusion_method}")
+        self.__sparse_db_provider = sparse_db_provider
+        self.__vector_db_provider = vector_db_provider
+        # Threads are started on first use
+        self.__executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.__config_data.max_workers, thread_name_prefix='hybrid_retriever')
+
+    def search(self, query_params_data: HybridQueryParamsData) -> HybridSearchResultData:
+        """Search both DBs concurrently and return fused top k matches"""
+        return self.search_batch([query_params_data])[0]
+
+    def search_batch(self, query_params_data_list: List[HybridQueryParamsData]) -> List[HybridSearchResultData]:
+        """Search multiple queries. Sparse searches run concurrently per query, dense search runs
+        as one batch so that query embeddings are generated in one call."""
+        start_time = time.time()
+        sparse_future_list = []
+        if self.__sparse_db_provider:
+            sparse_future_list = [self.__executor.submit(self.__timed, self.__search_sparse, x)
+                                  for x in query_params_data_list]
+        dense_future = None
+        if self.__vector_db_provider and query_params_data_list:
+            dense_future = self.__executor.submit(
+                self.__timed, self.__search_dense, query_params_data_list)
+
+        dense_matches_list = [[]] * len(query_params_data_list)
+        dense_error, dense_time = None, None
+        if dense_future:
+            dense_matches_list, dense_error, dense_time = dense_future.result()
+            if dense_error:
+                dense_matches_list = [[]] * len(query_params_data_list)
+
+        result_list = []
+        for idx, query_params_data in enumerate(query_params_data_list):
+            timings, errors = {}, {}
+            sparse_matches = []
+            if sparse_future_list:
+                sparse_matches, sparse_error, sparse_time = sparse_future_list[idx].result()
+                timings['sparse_search'] = sparse_time
+                if sparse_error:
+                    errors[self.METHOD_SPARSE] = sparse_error
+                    sparse_matches = []
+            if dense_future:
+                timings['dense_search'] = dense_time
+                if dense_error:
+                    errors[self.METHOD_DENSE] = dense_error
+            fusion_start_time = time.time()
+            match_list = self.fuse_matches(
+                sparse_matches or [], dense_matches_list[idx], query_params_data.top_k)
+            timings['fusion'] = time.time() - fusion_start_time
+            timings['total'] = time.time() - start_time
+            result_list.append(HybridSearchResultData(query=query_params_data.query, matches=match_list,
+                                                      timings=timings, errors=errors))
+        self.__logger.debug("Hybrid search of %s queries took %.3f seconds",
+                            len(query_params_data_list), time.time() - start_time)
+        return result_list
+
+    def fuse_matches(self, sparse_matches: list, dense_matches: list, top_k: int) -> List[HybridMatchData]:
+        """Fuse sparse and dense matches, each having `content`, `metadata` and `score` and
+        ordered best first, into top k matches"""
+        config_data = self.__config_data
+        match_dict = {}
+        for method, matches in [(self.METHOD_SPARSE, sparse_matches), (self.METHOD_DENSE, dense_matches)]:
+            for rank, match in enumerate(matches, start=1):
+                key = self.__get_key(match)
+                hybrid_match_data = match_dict.get(key)
+                if hybrid_match_data is None:
+                    hybrid_match_data = HybridMatchData(
+                        content=match.content, metadata=match.metadata)
+                    match_dict[key] = hybrid_match_data
+                elif getattr(hybrid_match_data, f'{method}_rank') is not None:
+                    # Already found at a better rank
+                    continue
+                setattr(hybrid_match_data, f'{method}_rank', rank)
+                setattr(hybrid_match_data, f'{method}_score', match.score)
+                hybrid_match_data.methods.append(method)
+
+        hybrid_match_data_list = list(match_dict.values())
+        if config_data.fusion_method == self.FUSION_METHOD_RRF:
+            for x in hybrid_match_data_list:
+                x.score = sum(weight / (config_data.rrf_k + rank) for weight, rank in [
+                    (config_data.sparse_weight, x.sparse_rank), (config_data.dense_weight, x.dense_rank)]
+                    if rank is not None)
+        elif config_data.fusion_method == self.FUSION_METHOD_WEIGHTED:
+            sparse_norm_dict = self.__get_min_max_normalized(
+                hybrid_match_data_list, self.METHOD_SPARSE, higher_is_better=True)
+            dense_norm_dict = self.__get_min_max_normalized(
+                hybrid_match_data_list, self.METHOD_DENSE,
+                higher_is_better=config_data.dense_score_type != 'distance')
+            for idx, x in enumerate(hybrid_match_data_list):
+                x.score = config_data.sparse_weight * sparse_norm_dict.get(idx, 0.0) + \
+                    config_data.dense_weight * dense_norm_dict.get(idx, 0.0)
+        else:
+            max_sparse_score = max([x.sparse_score for x in hybrid_match_data_list
+                                    if x.sparse_score is not None] or [0.0])
+            for x in hybrid_match_data_list:
+                sparse_score = x.sparse_score / \
+                    max_sparse_score if x.sparse_score and max_sparse_score > 0 else 0.0
+                dense_score = self.__get_dense_similarity(
+                    x.dense_score) if x.dense_score is not None else 0.0
+                x.score = config_data.alpha * dense_score + \
+                    (1 - config_data.alpha) * sparse_score
+
+        # Stable sort keeps list order for equal scores
+        hybrid_match_data_list.sort(key=lambda x: x.score, reverse=True)
+        return hybrid_match_data_list[:top_k]
+
+    def close(self):
+        """Stop threads of the retriever"""
+        self.__executor.shutdown(wait=True)
+
+    # ---------- Private Methods ---------
+    def __timed(self, func, *args) -> tuple:
+        """Returns (result, error message, time taken)"""
+        start_time = time.time()
+        try:
+            return func(*args), None, time.time() - start_time
+        except Exception as e:
+            self.__logger.exception(e)
+            return None, str(e), time.time() - start_time
+
+    def __search_sparse(self, query_params_data: HybridQueryParamsData) -> list:
+        fetch_k = self.__get_fetch_k(query_params_data)
+        return self.__sparse_db_provider.get_matches(SparseDbQueryParamsData(
+            query=query_params_data.query, top_k=fetch_k,
+            pre_filter_fetch_k=max(query_params_data.pre_filter_fetch_k or fetch_k, fetch_k),
+            filter_metadata=query_params_data.filter_metadata))
+
+    def __search_dense(self, query_params_data_list: List[HybridQueryParamsData]) -> List[list]:
+        vector_query_params_data_list = []
+        for query_params_data in query_params_data_list:
+            fetch_k = self.__get_fetch_k(query_params_data)
+            vector_query_params_data_list.append(VectorDbQueryParamsData(
+                query=query_params_data.query, top_k=fetch_k,
+                pre_filter_fetch_k=max(query_params_data.pre_filter_fetch_k or fetch_k, fetch_k),
+                filter_metadata=query_params_data.filter_metadata))
+        return self.__vector_db_provider.get_matches_batch(vector_query_params_data_list)
+
+    def __get_fetch_k(self, query_params_data: HybridQueryParamsData) -> int:
+        return max(self.__config_data.fetch_k or 0, query_params_data.top_k)
+
+    def __get_key(self, match) -> tuple:
+        chunk_id = (match.metadata or {}).get(self.__config_data.id_key)
+        if chunk_id not in [None, '']:
+            return ('id', chunk_id)
+        return ('content', match.content)
+
+    def __get_dense_similarity(self, dense_score: float) -> float:
+        if self.__config_data.dense_score_type == 'distance':
+            # Squared L2 distance of normalized vectors is between 0 and 4
+            return min(max(1 - dense_score / 4, 0.0), 1.0)
+        return dense_score
+
+    @classmethod
+    def __get_min_max_normalized(cls, hybrid_match_data_list: List[HybridMatchData], method: str,
+                                 higher_is_better: bool) -> dict:
+        """Returns index -> score normalized to [0, 1], for matches found by the method"""
+        score_dict = {idx: getattr(x, f'{method}_score') for idx, x in enumerate(hybrid_match_data_list)
+                      if getattr(x, f'{method}_score') is not None}
+        if not score_dict:
+            return {}
+        min_score, max_score = min(score_dict.values()), max(score_dict.values())
+        if max_score == min_score:
+            return {idx: 1.0 for idx in score_dict}
+        return {idx: (score - min_score) / (max_score - min_score) if higher_is_better
+                else (max_score - score) / (max_score - min_score)
+                for idx, score in score_dict.items()}
@@ -7,6 +7,7 @@
 """Module for Sparse Db provider interface"""
 
 import abc
+from typing import List
 from ...schema.sparse_db_data import BaseSparseDbConfigData, BaseSparseDbSaveRecordData, BaseSparseDbQueryParamsData
 
 
@@ -22,6 +23,13 @@ class ISparseDbProvider(metaclass=abc.ABCMeta):
         """Saves a record to sparse Db"""
         raise NotImplementedError
 
+    def save_records(self, sparse_record_config_dict_list: List[BaseSparseDbSaveRecordData]):
+        """Saves records to sparse Db. Providers override this to save in bulk."""
+        result = None
+        for sparse_record_config_dict in sparse_record_config_dict_list:
+            result = self.save_record(sparse_record_config_dict)
+        return result
+
     @abc.abstractmethod
     def get_records(self):
         """get specific records from sparse dB"""
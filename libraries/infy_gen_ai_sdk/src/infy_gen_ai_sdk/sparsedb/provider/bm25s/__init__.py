@@ -6,6 +6,7 @@
 
 # Main class
 from .bm25s_sparse_db_provider import (Bm25sSparseDbProvider)
+from .bm25s_index_registry import (Bm25sIndexRegistry)
 # Config data
 from .bm25s_sparse_db_provider import (SparseDbProviderConfigData,
                                        SparseDbRecordConfigData,
@@ -0,0 +1,180 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+"""Module for Bm25sIndexRegistry class"""
+
+import os
+import logging
+import threading
+import contextlib
+import collections
+import infy_fs_utils
+from .bm25s_service import Bm25sService
+from ....common.app_config_manager import AppConfigManager
+from ....common.singleton import Singleton
+
+
+class Bm25sIndexRegistry(metaclass=Singleton):
+    """Process wide registry of loaded BM25S indexes so that queries don't read the index from disk
+    every time. Score arrays and corpus are memory mapped unless disabled in config.ini.
+    Entries are keyed by DB folder path and index name, and are reloaded when the files on disk
+    change (checked using modified time and size). Least recently used entries are evicted when
+    `max_entries` is exceeded. Indexes returned are shared and must only be used for reading."""
+
+    __DEFAULT_MAX_ENTRIES = 16
+    __MAX_LOAD_ATTEMPTS = 3
+    __INDEX_FILE_NAMES = ['params.index.json', 'vocab.index.json', 'data.csc.index.npy',
+                          'indices.csc.index.npy', 'indptr.csc.index.npy', 'corpus.jsonl']
+
+    def __init__(self):
+        if infy_fs_utils.manager.FileSystemLoggingManager().has_fs_logging_handler():
+            self.__logger = infy_fs_utils.manager.FileSystemLoggingManager(
+            ).get_fs_logging_handler().get_logger()
+        else:
+            self.__logger = logging.getLogger(__name__)
+        app_config = AppConfigManager().get_app_config()
+        self.__max_entries = app_config.getint(
+            'SPARSEDB', 'bm25s_index_cache_max_entries', fallback=self.__DEFAULT_MAX_ENTRIES)
+        self.__mmap = app_config.getboolean(
+            'SPARSEDB', 'bm25s_index_cache_mmap', fallback=True)
+        self.__lock = threading.Lock()
+        # key -> {'retriever', 'secret_key', 'stamp'}, in LRU order
+        self.__entry_dict = collections.OrderedDict()
+        # key -> [lock, no. of threads using it], removed when unused
+        self.__load_lock_dict = {}
+        self.__stats = {'hits': 0, 'loads': 0, 'evictions': 0}
+
+    def configure(self, max_entries: int = None):
+        """Change limits. Defaults are taken from `[SPARSEDB]` section of config.ini."""
+        with self.__lock:
+            if max_entries is not None:
+                self.__max_entries = max_entries
+            self.__evict()
+
+    def get(self, local_db_folder_path: str, index_name: str, index_secret_key: str = None):
+        """Get loaded BM25S retriever, loading it from disk if not present or changed on disk"""
+        key = (os.path.abspath(local_db_folder_path), index_name)
+        index_secret_key = index_secret_key or ''
+        stamp = self.__get_stamp(*key)
+        entry = self.__get_entry(key, stamp)
+        if entry is None:
+            with self.__load_lock(key):
+                # Another thread may have loaded it while waiting
+                stamp = self.__get_stamp(*key)
+                entry = self.__get_entry(key, stamp)
+                if entry is None:
+                    entry = self.__load(key, index_secret_key)
+                    return entry['retriever']
+        if entry['secret_key'] != index_secret_key:
+            Bm25sService(None, '', local_db_folder_path, index_name,
+                         index_secret_key).check_secret_key()
+        return entry['retriever']
+
+    def invalidate(self, local_db_folder_path: str, index_name: str):
+        """Remove index from registry e.g. after it is updated or deleted"""
+        key = (os.path.abspath(local_db_folder_path), index_name)
+        with self.__lock:
+            self.__entry_dict.pop(key, None)
+
+    def clear(self):
+        """Remove all indexes from registry"""
+        with self.__lock:
+            self.__entry_dict.clear()
+
+    def get_stats(self) -> dict:
+        """Get hit/load statistics and current size"""
+        with self.__lock:
+            stats = dict(self.__stats)
+            stats['entries'] = len(self.__entry_dict)
+            stats['load_locks'] = len(self.__load_lock_dict)
+        return stats
+
+    # ---------- Private Methods ---------
+    def __get_entry(self, key: tuple, stamp: tuple) -> dict:
+        with self.__lock:
+            entry = self.__entry_dict.get(key)
+            if entry is None or entry['stamp'] != stamp:
+                return None
+            self.__entry_dict.move_to_end(key)
+            self.__stats['hits'] += 1
+            return entry
+
+    @contextlib.contextmanager
+    def __load_lock(self, key: tuple):
+        """Lock loading of the key. Lock is dropped once no thread is using it, so keys that are
+        invalidated or evicted don't leave locks behind."""
+        with self.__lock:
+            load_lock = self.__load_lock_dict.setdefault(
+                key, [threading.Lock(), 0])
+            load_lock[1] += 1
+        try:
+            with load_lock[0]:
+                yield
+        finally:
+            with self.__lock:
+                load_lock[1] -= 1
+                if load_lock[1] == 0:
+                    del self.__load_lock_dict[key]
+
+    def __load(self, key: tuple, index_secret_key: str) -> dict:
+        """To be called with load lock of the key held"""
+        local_db_folder_path, index_name = key
+        for attempt in range(self.__MAX_LOAD_ATTEMPTS):
+            stamp = self.__get_stamp(*key)
+            retriever = Bm25sService(None, '', local_db_folder_path, index_name,
+                                     index_secret_key).load_local(mmap=self.__mmap)
+            # Files written while loading give a mix of old and new data, so load again
+            if self.__get_stamp(*key) == stamp:
+                break
+            self.__logger.warning("Index %s/%s changed while loading. Attempt %s of %s",
+                                  local_db_folder_path, index_name, attempt + 1, self.__MAX_LOAD_ATTEMPTS)
+        if self.__mmap:
+            retriever.corpus = _SharedCorpus(retriever.corpus)
+        entry = {'retriever': retriever,
+                 'secret_key': index_secret_key, 'stamp': stamp}
+        with self.__lock:
+            self.__entry_dict.pop(key, None)
+            self.__entry_dict[key] = entry
+            self.__stats['loads'] += 1
+            self.__evict()
+        self.__logger.debug("Loaded index %s/%s (%s records)",
+                            local_db_folder_path, index_name, retriever.scores['num_docs'])
+        return entry
+
+    def __evict(self):
+        """To be called with lock held. Most recently used entry is always kept."""
+        while len(self.__entry_dict) > max(self.__max_entries, 1):
+            self.__entry_dict.popitem(last=False)
+            self.__stats['evictions'] += 1
+
+    def __get_stamp(self, local_db_folder_path: str, index_name: str) -> tuple:
+        """Returns (modified time, size) of each DB file, None for missing file"""
+        stamp = []
+        file_path_list = [f"{local_db_folder_path}/{index_name}/{x}" for x in self.__INDEX_FILE_NAMES] + \
+            [f"{local_db_folder_path}/{index_name}.metadata.json"]
+        for file_path in file_path_list:
+            try:
+                stat = os.stat(file_path)
+                stamp.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+
+class _SharedCorpus():
+    """Memory mapped corpus of BM25S reads a line by seeking the shared mmap object, so reads
+    are serialized to allow concurrent queries"""
+
+    def __init__(self, corpus):
+        self.__corpus = corpus
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__corpus)
+
+    def __getitem__(self, index):
+        with self.__lock:
+            return self.__corpus[index]
@@ -7,14 +7,29 @@
 """Wrapper for BM25S"""
 
 import os
+import re
 import json
+import shutil
+import threading
+from typing import List
+import numpy as np
 import bm25s
 import nltk
 from nltk.corpus import stopwords
 
 
 class Bm25sService():
-    """Wrapper for BM25S"""
+    """Wrapper for BM25S.
+    Postings i.e. length of each document and (document, token, term frequency) triples are saved
+    next to the BM25S index, so that adding records tokenizes only the new chunks. Scores of all
+    documents are then recomputed from the postings, as IDF and average document length change."""
+
+    POSTINGS_FILE_NAME = 'postings.npz'
+    # Same as default of BM25S tokenizer
+    __TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+    # nltk_data_dir -> stop words, loaded once per process
+    __stop_words_dict = {}
+    __stop_words_lock = threading.Lock()
 
     def __init__(self, fs_handler_obj, db_folder_path: str = '', local_db_folder_path: str = '', index_name: str = '', index_secret_key: str = ''):
         self.__fs_handler = fs_handler_obj
@@ -31,15 +46,14 @@ class Bm25sService():
         self.__secret_key_file_name = f"{index_name}.metadata.json"
         self.__local_secret_key_file_path = f"{self.__local_db_folder_path}/{self.__secret_key_file_name}"
         self.__secret_key_file_path = f"{self.__db_folder_path}/{self.__secret_key_file_name}"
+        self.__local_postings_file_path = f"{self.__local_index_folder_path}/{self.POSTINGS_FILE_NAME}"
+        self.__postings_dict = None
 
     def create_new(self, nltk_data_dir: str, chunk_list: list, corpus: list):
         """Create a new sparse DB"""
-        nltk.data.path.append(nltk_data_dir)
-        stop_words = set(stopwords.words('english'))
-        chunk_tokens = bm25s.tokenize(
-            chunk_list, lower=True, stopwords=stop_words)
         retriever = bm25s.BM25(corpus=corpus)
-        retriever.index(chunk_tokens)
+        self.__postings_dict = self.__get_empty_postings()
+        self.__add_to_index(retriever, {}, nltk_data_dir, chunk_list)
         return retriever
 
     def save_local(self, retriever):
@@ -48,8 +62,8 @@ class Bm25sService():
             if not os.path.exists(self.__local_index_folder_path):
                 db_folder_path = self.__index_folder_path
                 self.__fs_handler.create_folders(db_folder_path)
-                local_folder_path = self.__local_index_folder_path
-                retriever.save(local_folder_path)
+                self.__save_retriever(retriever)
+                self.__save_postings()
                 if self.__secret_key_dict is not None and self.__secret_key_dict:
                     if not os.path.exists(self.__local_secret_key_file_path):
                         with open(self.__local_secret_key_file_path, 'w', encoding='utf-8') as file:
@@ -57,51 +71,48 @@ class Bm25sService():
             else:
                 db_folder_path = self.__index_folder_path
                 self.__fs_handler.create_folders(db_folder_path)
-                local_folder_path = self.__local_index_folder_path
-                retriever.save(local_folder_path)
+                self.__save_retriever(retriever)
+                self.__save_postings()
         else:
             raise ValueError("Please provide collection_name")
 
-    def load_local(self):
-        """Load the sparse DB from local file system"""
-        if os.path.exists(self.__local_secret_key_file_path):
-            with open(self.__local_secret_key_file_path, 'r', encoding='utf-8') as file:
-                secret_key_dict = json.load(file)
-                stored_secret_key = secret_key_dict.get("secret_key")
-                if self.__secret_key_dict is not None and stored_secret_key == self.__secret_key_dict.get("secret_key", ""):
-                    load_retriever = bm25s.BM25.load(
-                        save_dir=self.__local_index_folder_path, load_corpus=True, allow_pickle=True)
-                else:
-                    raise ValueError(
-                        "Secret key provided does not match the collection, please provide correct secret key.")
-        else:
-            load_retriever = bm25s.BM25.load(
-                save_dir=self.__local_index_folder_path, load_corpus=True)
+    def check_secret_key(self) -> bool:
+        """Raise error if secret key doesn't match the stored one. Returns True if DB has a secret key."""
+        if not os.path.exists(self.__local_secret_key_file_path):
+            return False
+        with open(self.__local_secret_key_file_path, 'r', encoding='utf-8') as file:
+            stored_secret_key = json.load(file).get("secret_key")
+        if self.__secret_key_dict is None or stored_secret_key != self.__secret_key_dict.get("secret_key", ""):
+            raise ValueError(
+                "Secret key provided does not match the collection, please provide correct secret key.")
+        return True
 
-        return load_retriever
+    def load_local(self, mmap: bool = False):
+        """Load the sparse DB from local file system. With `mmap`, score arrays and corpus are
+        memory mapped instead of read into memory."""
+        has_secret_key = self.check_secret_key()
+        return bm25s.BM25.load(save_dir=self.__local_index_folder_path, load_corpus=True,
+                               allow_pickle=has_secret_key, mmap=mmap)
 
     def add_record(self, retriever, nltk_data_dir, chunk_list, corpus):
-        """Add a record to sparse DB"""
-        nltk.data.path.append(nltk_data_dir)
-        stop_words = set(stopwords.words('english'))
-        combined_corpus = []
-        chunk_list = []
-        for doc in retriever.corpus:
-            combined_corpus.append(doc)
-        combined_corpus = retriever.corpus + corpus
-        for doc in combined_corpus:
-            chunk_list.append(doc['text'])
-        chunk_tokens = bm25s.tokenize(
-            chunk_list, lower=True, stopwords=stop_words)
-        retriever = bm25s.BM25(corpus=combined_corpus)
-        retriever.index(chunk_tokens)
+        """Add record(s) to sparse DB. Only `chunk_list` is tokenized, if postings of the
+        loaded DB are present."""
+        vocab_dict = self.__load_postings(retriever)
+        if vocab_dict is None:
+            # DB saved by earlier version, build postings from its corpus once
+            self.__postings_dict = self.__get_empty_postings()
+            vocab_dict = {}
+            chunk_list = [doc['text'] for doc in retriever.corpus] + list(chunk_list)
+        retriever.corpus = list(retriever.corpus) + list(corpus)
+        self.__add_to_index(retriever, vocab_dict, nltk_data_dir, chunk_list)
         return retriever
 
     def get_records(self, retriever) -> list:
         """Get records from sparse DB"""
         records = []
         corpus_list = retriever.corpus
-        for doc in corpus_list:
+        for idx in range(len(corpus_list)):
+            doc = corpus_list[idx]
             records.append({
                 'content': doc['text'],
                 'metadata': doc['metadata'],
@@ -109,25 +120,13 @@ class Bm25sService():
         return records
 
     def search_records(self, retriever, nltk_data_dir, query, top_k, pre_filter_fetch_k) -> list:
-        """Get matches from sparse DB"""
-        sparse_retriever = retriever
-        nltk.data.path.append(nltk_data_dir)
-        stop_words = set(stopwords.words('english'))
-        query_tokens = bm25s.tokenize(
-            [query], lower=True, stopwords=stop_words)
-        records = []
-        k = pre_filter_fetch_k
-        while k > 0:
-            try:
-                records = sparse_retriever.retrieve(
-                    query_tokens, k=k, sorted=True, return_as="tuple")
-                return records
-            except ValueError:
-                if k == pre_filter_fetch_k:
-                    k = top_k*2 if top_k*2 < pre_filter_fetch_k else pre_filter_fetch_k-1
-                else:
-                    k -= 1
-        return records
+        """Get matches from sparse DB as (documents, scores) of the query.
+        At most `pre_filter_fetch_k` records are fetched, fewer if the DB is smaller."""
+        query_tokens = self.__tokenize(nltk_data_dir, [query])
+        k = min(pre_filter_fetch_k or top_k, retriever.scores['num_docs'])
+        if k <= 0:
+            return [[]], [[]]
+        return retriever.retrieve(query_tokens, k=k, sorted=True, return_as="tuple", show_progress=False)
 
     def delete_local(self):
         """Delete the sparse DB collection from local file system"""
@@ -146,3 +145,116 @@ class Bm25sService():
             records_dict['folder_path'] = self.__local_index_folder_path
 
         return records_dict
+
+    # ---------- Private Methods ---------
+    def __get_empty_postings(self) -> dict:
+        return {'doc_lengths': np.zeros(0, dtype=np.int32), 'doc_ids': np.zeros(0, dtype=np.int32),
+                'token_ids': np.zeros(0, dtype=np.int32), 'tfs': np.zeros(0, dtype=np.float32)}
+
+    def __load_postings(self, retriever) -> dict:
+        """Load postings of the DB. Returns vocab or None if postings are missing or don't match the index."""
+        if not os.path.exists(self.__local_postings_file_path):
+            return None
+        with np.load(self.__local_postings_file_path) as postings_file:
+            postings_dict = {key: postings_file[key] for key in postings_file.files}
+        vocab_dict = {token: token_id for token, token_id in retriever.vocab_dict.items() if token != ''}
+        token_ids = postings_dict['token_ids']
+        if len(postings_dict['doc_lengths']) != len(retriever.corpus) or \
+                (len(token_ids) and token_ids.max() >= len(vocab_dict)):
+            return None
+        self.__postings_dict = postings_dict
+        return vocab_dict
+
+    def __save_postings(self):
+        if self.__postings_dict is None:
+            return
+        temp_file_path = f"{self.__local_postings_file_path}.tmp.npz"
+        np.savez(temp_file_path, **self.__postings_dict)
+        os.replace(temp_file_path, self.__local_postings_file_path)
+
+    def __save_retriever(self, retriever):
+        """Save to a temp folder and move the files in, so that readers which memory map the
+        files never see them partly written"""
+        temp_folder_path = f"{self.__local_index_folder_path}.tmp"
+        if os.path.exists(temp_folder_path):
+            shutil.rmtree(temp_folder_path)
+        retriever.save(temp_folder_path)
+        os.makedirs(self.__local_index_folder_path, exist_ok=True)
+        for file_name in os.listdir(temp_folder_path):
+            os.replace(f"{temp_folder_path}/{file_name}",
+                       f"{self.__local_index_folder_path}/{file_name}")
+        shutil.rmtree(temp_folder_path)
+
+    @classmethod
+    def __tokenize(cls, nltk_data_dir: str, text_list: List[str]) -> List[List[str]]:
+        """Same as `bm25s.tokenize` with lower case and NLTK English stop words, returning tokens"""
+        stop_words = cls.__get_stop_words(nltk_data_dir)
+        split_fn = re.compile(cls.__TOKEN_PATTERN).findall
+        return [[token for token in split_fn(text.lower()) if token not in stop_words]
+                for text in text_list]
+
+    @classmethod
+    def __get_stop_words(cls, nltk_data_dir: str) -> frozenset:
+        stop_words = cls.__stop_words_dict.get(nltk_data_dir)
+        if stop_words is None:
+            with cls.__stop_words_lock:
+                if nltk_data_dir not in nltk.data.path:
+                    nltk.data.path.append(nltk_data_dir)
+                stop_words = frozenset(stopwords.words('english'))
+                cls.__stop_words_dict[nltk_data_dir] = stop_words
+        return stop_words
+
+    def __add_to_index(self, retriever, vocab_dict: dict, nltk_data_dir: str, chunk_list: list):
+        """Append postings of `chunk_list` and update scores of retriever"""
+        chunk_tokens = self.__tokenize(nltk_data_dir, chunk_list)
+        postings_dict = self.__postings_dict
+        doc_start = len(postings_dict['doc_lengths'])
+        doc_id_list, token_id_list = [], []
+        for doc_id, tokens in enumerate(chunk_tokens, start=doc_start):
+            doc_id_list.extend([doc_id] * len(tokens))
+            token_id_list.extend(vocab_dict.setdefault(token, len(vocab_dict)) for token in tokens)
+        # Count each (document, token) pair once with its term frequency
+        pair_keys = np.array(doc_id_list, dtype=np.int64) * max(len(vocab_dict), 1) + \
+            np.array(token_id_list, dtype=np.int64)
+        pair_keys, tfs = np.unique(pair_keys, return_counts=True)
+        postings_dict['doc_lengths'] = np.concatenate(
+            [postings_dict['doc_lengths'], np.array([len(x) for x in chunk_tokens], dtype=np.int32)])
+        postings_dict['doc_ids'] = np.concatenate(
+            [postings_dict['doc_ids'], (pair_keys // max(len(vocab_dict), 1)).astype(np.int32)])
+        postings_dict['token_ids'] = np.concatenate(
+            [postings_dict['token_ids'], (pair_keys % max(len(vocab_dict), 1)).astype(np.int32)])
+        postings_dict['tfs'] = np.concatenate([postings_dict['tfs'], tfs.astype(np.float32)])
+        self.__update_scores(retriever, vocab_dict)
+
+    def __update_scores(self, retriever, vocab_dict: dict):
+        """Compute BM25 score matrix from postings, in the CSC format used by BM25S"""
+        postings_dict = self.__postings_dict
+        doc_lengths, doc_ids = postings_dict['doc_lengths'], postings_dict['doc_ids']
+        token_ids, tfs = postings_dict['token_ids'], postings_dict['tfs']
+        num_docs, num_tokens = len(doc_lengths), len(vocab_dict)
+        if retriever.method != 'lucene' or retriever.idf_method != 'lucene':
+            # Other variants are left to BM25S
+            corpus_token_ids = [[] for _ in range(num_docs)]
+            for doc_id, token_id, tf in zip(doc_ids.tolist(), token_ids.tolist(), tfs.tolist()):
+                corpus_token_ids[doc_id].extend([token_id] * int(tf))
+            retriever.index(bm25s.tokenization.Tokenized(ids=corpus_token_ids, vocab=vocab_dict),
+                            show_progress=False)
+            return
+        doc_freqs = np.bincount(token_ids, minlength=num_tokens)
+        avg_doc_len = doc_lengths.mean() if num_docs and doc_lengths.mean() > 0 else 1.0
+        idf_array = np.log(1 + (num_docs - doc_freqs + 0.5) / (doc_freqs + 0.5))
+        norm_doc_lengths = retriever.k1 * \
+            ((1 - retriever.b) + retriever.b * doc_lengths / avg_doc_len)
+        scores = idf_array[token_ids] * tfs / (norm_doc_lengths[doc_ids] + tfs)
+        # Column (token) major with documents in order within a column
+        order = np.lexsort((doc_ids, token_ids))
+        retriever.scores = {
+            'data': scores[order].astype(retriever.dtype),
+            'indices': doc_ids[order].astype(retriever.int_dtype),
+            'indptr': np.concatenate([[0], np.cumsum(doc_freqs)]).astype(np.int64),
+            'num_docs': num_docs
+        }
+        retriever.nonoccurrence_array = None
+        vocab_dict[''] = num_tokens
+        retriever.vocab_dict = vocab_dict
+        retriever.unique_token_ids_set = set(vocab_dict.values())
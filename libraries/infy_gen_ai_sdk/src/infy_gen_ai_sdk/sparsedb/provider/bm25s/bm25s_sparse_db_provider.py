@@ -10,10 +10,11 @@ import os
 import json
 import logging
 import shutil
-from typing import Optional
+from typing import List, Optional
 import infy_fs_utils
 import numpy as np
 from .bm25s_service import Bm25sService
+from .bm25s_index_registry import Bm25sIndexRegistry
 from ....common.app_config_manager import AppConfigManager
 from ....common.file_util import FileUtil
 from ....schema.sparse_db_data import BaseSparseDbConfigData, BaseSparseDbSaveRecordData, BaseSparseDbRecordData, BaseSparseDbQueryParamsData, BaseSparseDbMacthesData
@@ -68,28 +69,34 @@ class Bm25sSparseDbProvider(ISparseDbProvider):
             FileUtil.create_dirs_if_absent(app_container_folder)
 
     def save_record(self, sparse_record_config_dict: SparseDbRecordConfigData):
+        self.save_records([sparse_record_config_dict])
+
+    def save_records(self, sparse_record_config_dict_list: List[SparseDbRecordConfigData]):
+        """Saves records to sparse DB with a single load, index update and save of the DB.
+        Used to add all chunks of a document at once."""
         try:
             config_data = self.__config_data
             db_folder_path = config_data.get('db_folder_path', '')
             db_index_name = config_data.get('db_index_name', '')
             db_index_secret_key = config_data.get('db_index_secret_key', None)
-            sparse_record_config_dict = sparse_record_config_dict.dict()
+            if not sparse_record_config_dict_list:
+                return
             if os.environ.get("NLTK_DATA_DIR"):
                 nltk_data_dir = os.environ.get("NLTK_DATA_DIR")
             else:
                 raise ValueError("Please set NLTK_DATA_DIR path.")
 
-            content_file_path = sparse_record_config_dict.get(
-                'content_file_path', '')
-            metadata = sparse_record_config_dict.get('metadata', '')
-            metadata['source'] = content_file_path
-
             chunk_list = []
-            chunk = self.__fs_handler.read_file(content_file_path)
-            chunk_list.append(chunk)
-
             metadata_list = []
-            metadata_list.append(metadata)
+            for sparse_record_config_dict in sparse_record_config_dict_list:
+                sparse_record_config_dict = sparse_record_config_dict.dict()
+                content_file_path = sparse_record_config_dict.get(
+                    'content_file_path', '')
+                metadata = sparse_record_config_dict.get('metadata', '')
+                metadata['source'] = content_file_path
+                chunk_list.append(
+                    self.__fs_handler.read_file(content_file_path))
+                metadata_list.append(metadata)
 
             corpus = []
             for chunk, metadata in zip(chunk_list, metadata_list):
@@ -114,11 +121,12 @@ class Bm25sSparseDbProvider(ISparseDbProvider):
                 retriever = bm25s_service_obj.create_new(
                     nltk_data_dir, chunk_list, corpus)
 
+            # Release memory mapped files of loaded index before they are replaced
+            Bm25sIndexRegistry().invalidate(local_db_folder_path, db_index_name)
             bm25s_service_obj.save_local(retriever)
 
-            records = bm25s_service_obj.get_records(retriever)
             self.__logger.info(
-                'Total # of records in DB: %s', len(records))
+                'Total # of records in DB: %s', len(retriever.corpus))
 
         except Exception as e:
             self.__logger.exception(e)
@@ -140,7 +148,8 @@ class Bm25sSparseDbProvider(ISparseDbProvider):
                 bm25s_service_obj = Bm25sService(
                     self.__fs_handler, db_folder_path, local_db_folder_path, db_index_name, db_index_secret_key)
 
-                retriever = bm25s_service_obj.load_local()
+                retriever = Bm25sIndexRegistry().get(
+                    local_db_folder_path, db_index_name, db_index_secret_key)
                 records = bm25s_service_obj.get_records(retriever)
 
                 record_list = []
@@ -184,7 +193,8 @@ class Bm25sSparseDbProvider(ISparseDbProvider):
                 bm25s_service_obj = Bm25sService(
                     self.__fs_handler, db_folder_path, local_db_folder_path, db_index_name, db_index_secret_key)
 
-                retriever = bm25s_service_obj.load_local()
+                retriever = Bm25sIndexRegistry().get(
+                    local_db_folder_path, db_index_name, db_index_secret_key)
                 records = bm25s_service_obj.search_records(
                     retriever, nltk_data_dir, query, top_k, pre_filter_fetch_k)
                 record_list = []
@@ -251,6 +261,7 @@ class Bm25sSparseDbProvider(ISparseDbProvider):
                     self.__fs_handler, db_folder_path, local_db_folder_path, db_index_name, db_index_secret_key)
 
                 records_dict = bm25s_service_obj.delete_local()
+                Bm25sIndexRegistry().invalidate(local_db_folder_path, db_index_name)
                 if records_dict:
                     folder_path = records_dict.get('folder_path', '')
                     secret_key_path = records_dict.get('secret_key_path', '')
@@ -7,6 +7,7 @@
 """Module for Online Vector Db provider interface"""
 
 import abc
+from typing import List
 from ...schema.vector_db_data import OnlineVectorDbConfigData , BaseVectorDbRecordData, BaseVectorDbQueryParamsData
 
 
@@ -26,6 +27,13 @@ class IOnlineVectorDbProvider(metaclass=abc.ABCMeta):
         """Saves a record to vector Db"""
         raise NotImplementedError
 
+    def save_records(self, db_record_data_list: List[BaseVectorDbRecordData]):
+        """Saves records to vector Db. Providers override this to save in bulk."""
+        result = None
+        for db_record_data in db_record_data_list:
+            result = self.save_record(db_record_data)
+        return result
+
     @abc.abstractmethod
     def get_records(self):
         """Get all records from vector dB"""
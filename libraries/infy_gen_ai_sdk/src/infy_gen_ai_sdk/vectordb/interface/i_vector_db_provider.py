@@ -29,11 +29,23 @@ class IVectorDbProvider(metaclass=abc.ABCMeta):
         """Returns matches for given `query` from vector Db"""
         raise NotImplementedError
 
+    def get_matches_batch(self, query_params_data_list: List[BaseVectorDbQueryParamsData]
+                          ) -> List[List[BaseVectorDbRecordData]]:
+        """Returns matches for each query. Providers override this to embed queries in one call."""
+        return [self.get_matches(x) for x in query_params_data_list]
+
     @abc.abstractmethod
     def save_record(self, db_record_data: BaseVectorDbRecordData):
         """Saves a record to vector Db"""
         raise NotImplementedError
 
+    def save_records(self, db_record_data_list: List[BaseVectorDbRecordData]):
+        """Saves records to vector Db. Providers override this to save in bulk."""
+        result = None
+        for db_record_data in db_record_data_list:
+            result = self.save_record(db_record_data)
+        return result
+
     @abc.abstractmethod
     def get_records(self, count: int = -1) -> List[BaseVectorDbRecordData]:
         """Get all records from vector dB"""
@@ -6,13 +6,30 @@
 
 """Wrapper for ELASTIC SEARCH"""
 
-from elasticsearch import Elasticsearch
+import threading
+from typing import Iterator, List, Tuple
+from elasticsearch import Elasticsearch, NotFoundError
+from elasticsearch import helpers
 
 
 class ElasticSearchService():
-    '''Class for making CRUD operations on elasticsearch'''
+    '''Class for making CRUD operations on elasticsearch.
+    Clients are shared by services having the same connection settings. Existence and mapping
+    of indexes are cached once found, so queries don't check them every time.'''
 
-    def __init__(self, db_server_url: str = '', authenticate: bool = True, username: str = '', password: str = '', verify_certs: bool = True, cert_fingerprint: str = '', ca_certs_path: str = '', index_id: str = '') -> None:
+    DEFAULT_BULK_CHUNK_SIZE = 500
+    DEFAULT_BULK_MAX_CHUNK_BYTES = 10 * 1024 * 1024
+    # Max value allowed by elasticsearch for knn num_candidates
+    __MAX_NUM_CANDIDATES = 10000
+    # Bulk errors on which index is checked again, as cached details of it are stale
+    __INDEX_ERROR_TYPES = ['index_not_found_exception', 'mapper_parsing_exception',
+                           'document_parsing_exception', 'strict_dynamic_mapping_exception']
+    __client_dict = {}
+    # (client id, index name) -> True if index can be searched using knn
+    __index_knn_dict = {}
+    __lock = threading.Lock()
+
+    def __init__(self, db_server_url: str = '', authenticate: bool = True, username: str = '', password: str = '', verify_certs: bool = True, cert_fingerprint: str = '', ca_certs_path: str = '', index_id: str = '', es_client: Elasticsearch = None) -> None:
         self.__db_server_url = db_server_url
         self.__username = username
         self.__password = password
@@ -22,31 +39,29 @@ class ElasticSearchService():
         self.__index_id = index_id
         self.__es_index = "idx-del-"+index_id
 
-        if authenticate:
-            self.es_client = Elasticsearch(
-                [self.__db_server_url],
-                http_auth=(self.__username, self.__password),
-                verify_certs=self.__verify_certs,
-                ca_certs=self.__ca_certs_path,
-                ssl_show_warn=False,
-                ssl_assert_fingerprint=self.__cert_fingerprint
-            )
+        if es_client is not None:
+            self.es_client = es_client
         else:
-            self.es_client = Elasticsearch(
-                [self.__db_server_url]
-            )
+            client_key = (db_server_url, authenticate, username, password, verify_certs,
+                          cert_fingerprint, ca_certs_path)
+            with self.__lock:
+                if client_key not in self.__client_dict:
+                    self.__client_dict[client_key] = self.__create_client(
+                        authenticate)
+                self.es_client = self.__client_dict[client_key]
         self.utils = ElasticSearchUtils()
 
     def check_index_exists(self):
         '''Check if index exists in elasticsearch'''
-        response = self.es_client.indices.exists(index=self.__es_index)
-        return response
+        return self.__get_index_knn() is not None
 
-    def create_new_index(self, vector_dimension: int):
+    def create_new_index(self, vector_dimension: int, index_params: dict = None):
         '''Create a new index in elasticsearch'''
-        query = self.utils.get_query_create_schema(vector_dimension)
+        query = self.utils.get_query_create_schema(
+            vector_dimension, index_params)
         response = self.es_client.indices.create(
             index=self.__es_index, body=query)
+        self.__set_index_knn(True)
         return response
 
     def add_record(self, model_name: str, embedding: list, content: str, metadata: dict):
@@ -56,6 +71,34 @@ class ElasticSearchService():
         response = self.es_client.index(index=self.__es_index, body=query)
         return response
 
+    def add_records(self, model_name: str, records: Iterator[Tuple[list, str, dict]],
+                    chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+                    max_chunk_bytes: int = DEFAULT_BULK_MAX_CHUNK_BYTES,
+                    index_params: dict = None) -> List[str]:
+        '''Add (embedding, content, metadata) records using bulk requests of `chunk_size` records
+        or `max_chunk_bytes` bytes, whichever is reached first. Returns ids of the records.
+        If no record could be added because the index is missing or its mapping doesn't match,
+        e.g. index deleted by another process after it was cached, cached details of the index
+        are cleared, the index is created using `index_params` if missing and records are added
+        again once.'''
+        record_list = list(records)
+        id_list = []
+        try:
+            self.__bulk_add(model_name, record_list, chunk_size, max_chunk_bytes, id_list)
+            return id_list
+        except helpers.BulkIndexError as ex:
+            if id_list or not self.__is_index_error(ex):
+                raise
+        self.__set_index_knn(None)
+        if not self.check_index_exists():
+            self.create_new_index(len(record_list[0][0]), index_params)
+        self.__bulk_add(model_name, record_list, chunk_size, max_chunk_bytes, id_list)
+        return id_list
+
+    def get_record_path(self, record_id: str) -> str:
+        '''Path of a record, same as `Location` header of the response of `add_record`'''
+        return f'/{self.__es_index}/_doc/{record_id}'
+
     def get_records(self):
         '''Retrieve all records form the index'''
         query = self.utils.get_query_get_records()
@@ -65,6 +108,7 @@ class ElasticSearchService():
     def delete_index(self):
         '''Delete the index'''
         response = self.es_client.indices.delete(index=self.__es_index)
+        self.__set_index_knn(None)
         # Below code is for get_query_delete_record_by_id | Not Used
         # query = self.utils.get_query_delete_record_by_id()
         # response = self.es_client.delete_by_query(
@@ -72,11 +116,29 @@ class ElasticSearchService():
         return response
 
     def get_matches(self, model_name: str, embedding: list, filter_metadata: dict, top_k: int, pre_filter_fetch_k: int):
-        '''Retrieve top matches for a query from the index'''
-        query = self.utils.get_query_get_matches(
-            model_name, self.__index_id, embedding, filter_metadata, top_k)
-        response = self.es_client.search(index=self.__es_index, body=query)
-        return response['hits']['hits']
+        '''Retrieve top matches for a query from the index. Score of a match is its L2 distance
+        from the query.'''
+        if self.__get_index_knn():
+            num_candidates = min(
+                max(pre_filter_fetch_k or 0, top_k), self.__MAX_NUM_CANDIDATES)
+            query = self.utils.get_query_get_knn_matches(
+                model_name, self.__index_id, embedding, filter_metadata, top_k, num_candidates)
+        else:
+            # Vectors of index created by earlier version aren't indexed for knn search
+            query = self.utils.get_query_get_matches(
+                model_name, self.__index_id, embedding, filter_metadata, top_k)
+        try:
+            response = self.es_client.search(
+                index=self.__es_index, body=query)
+        except NotFoundError:
+            # Deleted by another process
+            self.__set_index_knn(None)
+            raise
+        hits = response['hits']['hits']
+        if 'knn' in query:
+            for hit in hits:
+                hit['_score'] = self.utils.get_l2_distance(hit['_score'])
+        return hits
 
     def get_custom_metadata_schema(self):
         '''Retrieve the schema for custom metadata'''
@@ -94,6 +156,68 @@ class ElasticSearchService():
             return schema
         return {}
 
+    # ---------- Private Methods ---------
+    def __create_client(self, authenticate: bool) -> Elasticsearch:
+        if authenticate:
+            return Elasticsearch(
+                [self.__db_server_url],
+                http_auth=(self.__username, self.__password),
+                verify_certs=self.__verify_certs,
+                ca_certs=self.__ca_certs_path,
+                ssl_show_warn=False,
+                ssl_assert_fingerprint=self.__cert_fingerprint
+            )
+        return Elasticsearch(
+            [self.__db_server_url]
+        )
+
+    def __bulk_add(self, model_name: str, record_list: list, chunk_size: int,
+                   max_chunk_bytes: int, id_list: list):
+        '''Ids of added records are appended to `id_list`, so that they are known on error'''
+        actions = ({'_index': self.__es_index,
+                    '_source': self.utils.get_query_add_record(
+                        self.__index_id, model_name, embedding, content, metadata)}
+                   for embedding, content, metadata in record_list)
+        for _, item in helpers.streaming_bulk(self.es_client, actions, chunk_size=chunk_size,
+                                              max_chunk_bytes=max_chunk_bytes, max_retries=3):
+            id_list.append(item['index']['_id'])
+
+    def __is_index_error(self, ex: helpers.BulkIndexError) -> bool:
+        '''True if records failed because index is missing or its mapping doesn't match'''
+        for error in ex.errors:
+            for item in error.values():
+                error_data = item.get('error')
+                if not isinstance(error_data, dict) or \
+                        error_data.get('type') not in self.__INDEX_ERROR_TYPES:
+                    return False
+        return True
+
+    def __get_index_knn(self):
+        '''Returns None if index doesn't exist, else True if it can be searched using knn'''
+        key = (id(self.es_client), self.__es_index)
+        with self.__lock:
+            if key in self.__index_knn_dict:
+                return self.__index_knn_dict[key]
+        try:
+            response = self.es_client.indices.get_mapping(
+                index=self.__es_index)
+        except NotFoundError:
+            return None
+        embedding_mapping = response[self.__es_index]['mappings'].get(
+            'properties', {}).get('embedding', {})
+        is_knn = embedding_mapping.get('index') is True and \
+            embedding_mapping.get('similarity') == 'l2_norm'
+        self.__set_index_knn(is_knn)
+        return is_knn
+
+    def __set_index_knn(self, is_knn):
+        key = (id(self.es_client), self.__es_index)
+        with self.__lock:
+            if is_knn is None:
+                self.__index_knn_dict.pop(key, None)
+            else:
+                self.__index_knn_dict[key] = is_knn
+
 
 class ElasticSearchUtils():
     '''Class for making elastic search queries'''
@@ -101,8 +225,65 @@ class ElasticSearchUtils():
     def __init__(self) -> None:
         pass
 
+    def get_query_get_knn_matches(self, model_name: str, index_id: str, embedding: list, filter_metadata: dict,
+                                  top_k: int, num_candidates: int):
+        '''Query for getting approximate nearest matches using HNSW index of embedding field.
+        Filters are applied while searching, so `top_k` matches are returned if present.'''
+        return {
+            "_source": [
+                "content",
+                "metadata"
+            ],
+            "knn": {
+                "field": "embedding",
+                "query_vector": embedding,
+                "k": top_k,
+                "num_candidates": num_candidates,
+                "filter": self.get_filters(model_name, index_id, filter_metadata)
+            },
+            "size": top_k
+        }
+
     def get_query_get_matches(self, model_name: str, index_id: str, embedding: list, filter_metadata: dict, top_k: int):
-        '''Query for getting matches from elasticsearch index'''
+        '''Query for getting matches from elasticsearch index by comparing with every document'''
+        return {
+            "_source": [
+                "content",
+                "metadata"
+            ],
+            "query": {
+                "bool": {
+                    "filter": self.get_filters(model_name, index_id, filter_metadata),
+                    "must": [
+                        {
+                            "script_score": {
+                                "query": {
+                                    "match_all": {}
+                                },
+                                "script": {
+                                    "source": "l2norm(params.query_vector, 'embedding')",
+                                    "params": {
+                                        "query_vector": embedding
+                                    }
+                                }
+                            }
+                        }
+                    ]
+                }
+            },
+            "sort": [
+                {
+                    "_score": {
+                        "order": "asc"
+                    }
+                }
+            ],
+            "size": top_k
+        }
+
+    def get_filters(self, model_name: str, index_id: str, filter_metadata: dict):
+        '''Term filters for model, index and metadata'''
+        filter_metadata = filter_metadata or {}
         filters = [
             {
                 "term": {
@@ -138,44 +319,16 @@ class ElasticSearchUtils():
                     f"metadata.custom_metadata.{key}": value
                 }
             })
+        return filters
 
-        return {
-            "_source": [
-                "content",
-                "metadata"
-            ],
-            "query": {
-                "bool": {
-                    "filter": filters,
-                    "must": [
-                        {
-                            "script_score": {
-                                "query": {
-                                    "match_all": {}
-                                },
-                                "script": {
-                                    "source": "l2norm(params.query_vector, 'embedding')",
-                                    "params": {
-                                        "query_vector": embedding
-                                    }
-                                }
-                            }
-                        }
-                    ]
-                }
-            },
-            "sort": [
-                {
-                    "_score": {
-                        "order": "asc"
-                    }
-                }
-            ],
-            "size": top_k
-        }
+    def get_l2_distance(self, knn_score: float) -> float:
+        '''Convert knn score of l2_norm similarity i.e. 1 / (1 + distance^2) to distance'''
+        return max(1 / knn_score - 1, 0.0) ** 0.5 if knn_score else float('inf')
 
-    def get_query_create_schema(self, vector_dimension: int):
-        '''Query for elasticsearch index(schema/mapping) creation'''
+    def get_query_create_schema(self, vector_dimension: int, index_params: dict = None):
+        '''Query for elasticsearch index(schema/mapping) creation. Embedding is indexed using HNSW,
+        `index_params` may have `m` and `ef_construction`.'''
+        index_params = index_params or {}
         return {
             "settings": {
                 "number_of_replicas": 0,
@@ -192,7 +345,14 @@ class ElasticSearchUtils():
                     },
                     "embedding": {
                         "type": "dense_vector",
-                        "dims": vector_dimension
+                        "dims": vector_dimension,
+                        "index": True,
+                        "similarity": "l2_norm",
+                        "index_options": {
+                            "type": "hnsw",
+                            "m": index_params.get("m", 16),
+                            "ef_construction": index_params.get("ef_construction", 100)
+                        }
                     },
                     "content": {
                         "type": "text"
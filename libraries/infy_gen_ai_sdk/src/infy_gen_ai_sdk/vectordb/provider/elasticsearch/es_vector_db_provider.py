@@ -8,8 +8,10 @@
 
 import os
 import logging
-from typing import List
+from typing import List, Optional
+import numpy as np
 import infy_fs_utils
+from elasticsearch import Elasticsearch
 from .es_service import ElasticSearchService
 from ....common.app_config_manager import AppConfigManager
 from ....common.file_util import FileUtil
@@ -30,6 +32,10 @@ class VectorDbProviderConfigData(BaseVectorDbProviderConfigData):
     verify_certs: bool
     cert_fingerprint: str
     index_id: str
+    # Used when a new index is created, e.g. {"m": 16, "ef_construction": 100} for HNSW
+    index_params: Optional[dict] = None
+    # Max number of records per bulk request
+    bulk_chunk_size: int = ElasticSearchService.DEFAULT_BULK_CHUNK_SIZE
 
 
 class InsertVectorDbRecordData(BaseVectorDbRecordData):
@@ -58,8 +64,11 @@ class ESVectorDbProvider(IVectorDbProvider):
     """ELASTICSEARCH vector DB provider"""
 
     __DB_TYPE = "ELASTICSEARCH"
+    __DEFAULT_BATCH_SIZE = 64
 
-    def __init__(self, config_data: VectorDbProviderConfigData, embedding_provider: IEmbeddingProvider) -> None:
+    def __init__(self, config_data: VectorDbProviderConfigData, embedding_provider: IEmbeddingProvider,
+                 es_client: Elasticsearch = None) -> None:
+        """`es_client` is used instead of creating a client from config data, e.g. for testing"""
         if infy_fs_utils.manager.FileSystemLoggingManager().has_fs_logging_handler():
             self.__logger = infy_fs_utils.manager.FileSystemLoggingManager(
             ).get_fs_logging_handler().get_logger()
@@ -72,6 +81,11 @@ class ESVectorDbProvider(IVectorDbProvider):
         super().__init__(db_type=self.__DB_TYPE, embedding_provider=embedding_provider)
         # Convert pydantic to dict for flexibility
         self.__internal_config_data = dict(config_data)
+        config_data = self.__internal_config_data
+        self.__es_service_obj = ElasticSearchService(
+            config_data['db_server_url'], config_data['authenticate'], config_data['username'],
+            config_data['password'], config_data['verify_certs'], config_data['cert_fingerprint'],
+            os.environ.get('CA_CERTS_PATH'), config_data['index_id'], es_client=es_client)
         # Create container folders if not present
         app_container_folders = [self.__app_config["CONTAINER"]["APP_DIR_DATA_PATH"],
                                  self.__app_config["CONTAINER"]["APP_DIR_TEMP_PATH"]]
@@ -84,29 +98,20 @@ class ESVectorDbProvider(IVectorDbProvider):
             scores_list = []
             sorted_scores_list = []
             config_data = self.__internal_config_data
-            db_server_url = config_data['db_server_url']
-            authenticate = config_data['authenticate']
-            username = config_data['username']
-            password = config_data['password']
-            verify_certs = config_data['verify_certs']
-            cert_fingerprint = config_data['cert_fingerprint']
             index_id = config_data['index_id']
-            ca_certs_path = os.environ.get('CA_CERTS_PATH')
+            es_service_obj = self.__es_service_obj
 
             query = query_params_data.query
             filter_metadata = query_params_data.filter_metadata
             top_k = query_params_data.top_k
             pre_filter_fetch_k = query_params_data.pre_filter_fetch_k
 
-            es_service_obj = ElasticSearchService(
-                db_server_url, authenticate, username, password, verify_certs, cert_fingerprint, ca_certs_path, index_id)
-
             embedding_data: EmbeddingData = self._embedding_provider.generate_embedding(
                 query)
             embedding_list = (embedding_data.vector[0]).tolist()
             model_name = embedding_data.model_name
 
-            # Check if index exists
+            # Existence is checked only until index is found
             index_exists = es_service_obj.check_index_exists()
             # Get all recorda if index exists else throw error
             if index_exists:
@@ -135,55 +140,46 @@ class ESVectorDbProvider(IVectorDbProvider):
 
     def save_record(self, db_record_data: InsertVectorDbRecordData):
         '''Save record to elasticsearch index'''
+        return self.save_records([db_record_data])
+
+    def save_records(self, db_record_data_list: List[InsertVectorDbRecordData],
+                     batch_size: int = __DEFAULT_BATCH_SIZE):
+        '''Save records to elasticsearch index using bulk requests. For every `batch_size` records
+        embeddings are generated in one call. Index is created if not present.
+        Returns path of the last record added.'''
+        if not db_record_data_list:
+            return ''
         try:
             encoded_path = ''
             config_data = self.__internal_config_data
-            db_server_url = config_data['db_server_url']
-            authenticate = config_data['authenticate']
-            username = config_data['username']
-            password = config_data['password']
-            verify_certs = config_data['verify_certs']
-            cert_fingerprint = config_data['cert_fingerprint']
-            index_id = config_data['index_id']
-            ca_certs_path = os.environ.get('CA_CERTS_PATH')
-
-            content_file_path = db_record_data.content_file_path
-            metadata = db_record_data.metadata
-            metadata['source'] = content_file_path
-
-            es_service_obj = ElasticSearchService(
-                db_server_url, authenticate, username, password, verify_certs, cert_fingerprint, ca_certs_path, index_id)
-
-            local_content_file_path = f'{self.__app_config["CONTAINER"]["APP_DIR_TEMP_PATH"]}/{FileUtil.get_uuid()}'
-            with self.__fs_handler.get_file_object(content_file_path) as file:
-                with open(local_content_file_path, "wb") as output:
-                    output.write(file.read())
-            with open(local_content_file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-
-            # Generate embedding, convert that to list and get model name
-            embedding_data: EmbeddingData = self._embedding_provider.generate_embedding(
-                content)
-            embedding_list = (embedding_data.vector[0]).tolist()
-            model_name = embedding_data.model_name
-
-            # Check if index exists
+            es_service_obj = self.__es_service_obj
             index_exists = es_service_obj.check_index_exists()
-            # Add record if index exists else create new index and add record
-            if index_exists:
-                response = es_service_obj.add_record(
-                    model_name, embedding_list, content, metadata)
-            else:
-                es_service_obj.create_new_index(
-                    embedding_data.vector_dimension)
-                response = es_service_obj.add_record(
-                    model_name, embedding_list, content, metadata)
+            total_count = 0
+            for start_idx in range(0, len(db_record_data_list), batch_size):
+                batch_record_data_list = db_record_data_list[start_idx:start_idx + batch_size]
+                contents = [self.__get_content(x)
+                            for x in batch_record_data_list]
+                vectors, model_name = self.__get_embeddings(contents, batch_size)
+                if not index_exists:
+                    es_service_obj.create_new_index(
+                        vectors.shape[1], config_data.get('index_params'))
+                    index_exists = True
+                metadatas = []
+                for db_record_data in batch_record_data_list:
+                    metadata = db_record_data.metadata if db_record_data.metadata is not None else {}
+                    metadata['source'] = db_record_data.content_file_path
+                    metadatas.append(metadata)
+                id_list = es_service_obj.add_records(
+                    model_name, zip(vectors.tolist(), contents, metadatas),
+                    chunk_size=config_data.get('bulk_chunk_size') or ElasticSearchService.DEFAULT_BULK_CHUNK_SIZE,
+                    index_params=config_data.get('index_params'))
+                total_count += len(id_list)
+                if id_list:
+                    encoded_path = es_service_obj.get_record_path(id_list[-1])
 
             # Log index location where data is indexed
-            self.__logger.info(
-                'Record added to index %s', response.meta.headers['Location'])
-
-            encoded_path = response.meta.headers['Location'] if response.meta.headers['Location'] else ''
+            self.__logger.info('%s records added to index %s',
+                               total_count, encoded_path)
             return encoded_path
 
         except Exception as e:
@@ -195,17 +191,8 @@ class ESVectorDbProvider(IVectorDbProvider):
         try:
             record_list = []
             config_data = self.__internal_config_data
-            db_server_url = config_data['db_server_url']
-            authenticate = config_data['authenticate']
-            username = config_data['username']
-            password = config_data['password']
-            verify_certs = config_data['verify_certs']
-            cert_fingerprint = config_data['cert_fingerprint']
             index_id = config_data['index_id']
-            ca_certs_path = os.environ.get('CA_CERTS_PATH')
-
-            es_service_obj = ElasticSearchService(
-                db_server_url, authenticate, username, password, verify_certs, cert_fingerprint, ca_certs_path, index_id)
+            es_service_obj = self.__es_service_obj
 
             # Check if index exists
             index_exists = es_service_obj.check_index_exists()
@@ -239,17 +226,8 @@ class ESVectorDbProvider(IVectorDbProvider):
         '''Delete an elasticsearch index'''
         try:
             config_data = self.__internal_config_data
-            db_server_url = config_data['db_server_url']
-            authenticate = config_data['authenticate']
-            username = config_data['username']
-            password = config_data['password']
-            verify_certs = config_data['verify_certs']
-            cert_fingerprint = config_data['cert_fingerprint']
             index_id = config_data['index_id']
-            ca_certs_path = os.environ.get('CA_CERTS_PATH')
-
-            es_service_obj = ElasticSearchService(
-                db_server_url, authenticate, username, password, verify_certs, cert_fingerprint, ca_certs_path, index_id)
+            es_service_obj = self.__es_service_obj
 
             # Check if index exists
             index_exists = es_service_obj.check_index_exists()
@@ -272,19 +250,9 @@ class ESVectorDbProvider(IVectorDbProvider):
     def get_custom_metadata(self):
         """Return custom metadata schema"""
         try:
-            record_list = []
             config_data = self.__internal_config_data
-            db_server_url = config_data['db_server_url']
-            authenticate = config_data['authenticate']
-            username = config_data['username']
-            password = config_data['password']
-            verify_certs = config_data['verify_certs']
-            cert_fingerprint = config_data['cert_fingerprint']
             index_id = config_data['index_id']
-            ca_certs_path = os.environ.get('CA_CERTS_PATH')
-
-            es_service_obj = ElasticSearchService(
-                db_server_url, authenticate, username, password, verify_certs, cert_fingerprint, ca_certs_path, index_id)
+            es_service_obj = self.__es_service_obj
 
             # Check if index exists
             index_exists = es_service_obj.check_index_exists()
@@ -300,3 +268,23 @@ class ESVectorDbProvider(IVectorDbProvider):
         except Exception as e:
             self.__logger.exception(e)
             raise e
+
+    ######## Private Methods #############
+
+    def __get_content(self, db_record_data: InsertVectorDbRecordData) -> str:
+        if db_record_data.content is not None:
+            return db_record_data.content
+        return self.__fs_handler.read_file(db_record_data.content_file_path, encoding='utf-8')
+
+    def __get_embeddings(self, contents: List[str], batch_size: int) -> tuple:
+        """Returns (vectors, model name). Model name is known only from a single embedding, so
+        first embedding is generated separately."""
+        embedding_data: EmbeddingData = self._embedding_provider.generate_embedding(
+            contents[0])
+        if embedding_data.error_message:
+            raise ValueError(embedding_data.error_message)
+        vector = np.asarray(embedding_data.vector, dtype=np.float32).reshape(1, -1)
+        if len(contents) > 1:
+            vector = np.vstack([vector, self._embedding_provider.generate_embeddings(
+                contents[1:], batch_size)])
+        return vector, embedding_data.model_name
@@ -6,6 +6,7 @@
 
 # Main class
 from .faiss_vector_db_provider import (FaissVectorDbProvider)
+from .faiss_index_registry import (FaissIndexRegistry)
 # Config data
 from .faiss_vector_db_provider import (VectorDbProviderConfigData)
 # Domain data
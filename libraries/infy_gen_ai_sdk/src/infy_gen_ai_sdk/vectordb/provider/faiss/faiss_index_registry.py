@@ -0,0 +1,182 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+"""Module for FaissIndexRegistry class"""
+
+import os
+import logging
+import threading
+import contextlib
+import collections
+import infy_fs_utils
+from .faiss_service import FaissService
+from ....common.app_config_manager import AppConfigManager
+from ....common.singleton import Singleton
+
+
+class FaissIndexRegistry(metaclass=Singleton):
+    """Process wide registry of loaded FAISS indexes so that queries don't read the index from disk
+    every time. Entries are keyed by DB folder path and index name, and are reloaded when the files
+    on disk change (checked using modified time and size). Least recently used entries are evicted
+    when `max_entries` or `max_size_bytes` (estimated from file sizes) is exceeded.
+    Indexes returned are shared and must only be used for reading."""
+
+    __DEFAULT_MAX_ENTRIES = 16
+    __DEFAULT_MAX_SIZE_MB = 2048
+    __MAX_LOAD_ATTEMPTS = 3
+
+    def __init__(self):
+        if infy_fs_utils.manager.FileSystemLoggingManager().has_fs_logging_handler():
+            self.__logger = infy_fs_utils.manager.FileSystemLoggingManager(
+            ).get_fs_logging_handler().get_logger()
+        else:
+            self.__logger = logging.getLogger(__name__)
+        app_config = AppConfigManager().get_app_config()
+        self.__max_entries = app_config.getint(
+            'VECTORDB', 'faiss_index_cache_max_entries', fallback=self.__DEFAULT_MAX_ENTRIES)
+        self.__max_size_bytes = app_config.getint(
+            'VECTORDB', 'faiss_index_cache_max_size_mb', fallback=self.__DEFAULT_MAX_SIZE_MB) * 1024 * 1024
+        self.__lock = threading.Lock()
+        # key -> {'faiss_service_obj', 'secret_key', 'stamp', 'size'}, in LRU order
+        self.__entry_dict = collections.OrderedDict()
+        # key -> [lock, no. of threads using it], removed when unused
+        self.__load_lock_dict = {}
+        self.__total_size = 0
+        self.__stats = {'hits': 0, 'loads': 0, 'evictions': 0}
+
+    def configure(self, max_entries: int = None, max_size_bytes: int = None):
+        """Change limits. Defaults are taken from `[VECTORDB]` section of config.ini."""
+        with self.__lock:
+            if max_entries is not None:
+                self.__max_entries = max_entries
+            if max_size_bytes is not None:
+                self.__max_size_bytes = max_size_bytes
+            self.__evict()
+
+    def get(self, db_folder_path: str, index_name: str, index_secret_key: str = None) -> FaissService:
+        """Get loaded index, loading it from disk if not present or changed on disk"""
+        key = (os.path.abspath(db_folder_path), index_name)
+        index_secret_key = index_secret_key or ''
+        stamp = self.__get_stamp(*key)
+        entry = self.__get_entry(key, stamp)
+        if entry is None:
+            with self.__load_lock(key):
+                # Another thread may have loaded it while waiting
+                stamp = self.__get_stamp(*key)
+                entry = self.__get_entry(key, stamp)
+                if entry is None:
+                    entry = self.__load(key, index_secret_key)
+                    return entry['faiss_service_obj']
+        if entry['secret_key'] != index_secret_key:
+            FaissService(db_folder_path, index_name,
+                         index_secret_key).check_secret_key()
+        return entry['faiss_service_obj']
+
+    def lock(self, db_folder_path: str, index_name: str):
+        """Context manager to hold off loading of the index while it's saved"""
+        return self.__load_lock((os.path.abspath(db_folder_path), index_name))
+
+    def contains(self, db_folder_path: str, index_name: str) -> bool:
+        """Check if index is loaded, without checking files on disk"""
+        key = (os.path.abspath(db_folder_path), index_name)
+        with self.__lock:
+            return key in self.__entry_dict
+
+    def invalidate(self, db_folder_path: str, index_name: str):
+        """Remove index from registry e.g. after it is updated or deleted"""
+        key = (os.path.abspath(db_folder_path), index_name)
+        with self.__lock:
+            entry = self.__entry_dict.pop(key, None)
+            if entry:
+                self.__total_size -= entry['size']
+
+    def clear(self):
+        """Remove all indexes from registry"""
+        with self.__lock:
+            self.__entry_dict.clear()
+            self.__total_size = 0
+
+    def get_stats(self) -> dict:
+        """Get hit/load statistics and current size"""
+        with self.__lock:
+            stats = dict(self.__stats)
+            stats['entries'] = len(self.__entry_dict)
+            stats['load_locks'] = len(self.__load_lock_dict)
+            stats['size_bytes'] = self.__total_size
+        return stats
+
+    # ---------- Private Methods ---------
+    def __get_entry(self, key: tuple, stamp: tuple) -> dict:
+        with self.__lock:
+            entry = self.__entry_dict.get(key)
+            if entry is None or entry['stamp'] != stamp:
+                return None
+            self.__entry_dict.move_to_end(key)
+            self.__stats['hits'] += 1
+            return entry
+
+    @contextlib.contextmanager
+    def __load_lock(self, key: tuple):
+        """Lock loading of the key. Lock is dropped once no thread is using it, so keys that are
+        invalidated or evicted don't leave locks behind."""
+        with self.__lock:
+            load_lock = self.__load_lock_dict.setdefault(
+                key, [threading.Lock(), 0])
+            load_lock[1] += 1
+        try:
+            with load_lock[0]:
+                yield
+        finally:
+            with self.__lock:
+                load_lock[1] -= 1
+                if load_lock[1] == 0:
+                    del self.__load_lock_dict[key]
+
+    def __load(self, key: tuple, index_secret_key: str) -> dict:
+        """To be called with load lock of the key held"""
+        db_folder_path, index_name = key
+        for attempt in range(self.__MAX_LOAD_ATTEMPTS):
+            stamp = self.__get_stamp(*key)
+            faiss_service_obj = FaissService(
+                db_folder_path, index_name, index_secret_key)
+            faiss_service_obj.load_local()
+            # Files written while loading give a mix of old and new data, so load again
+            if self.__get_stamp(*key) == stamp:
+                break
+            self.__logger.warning("Index %s/%s changed while loading. Attempt %s of %s",
+                                  db_folder_path, index_name, attempt + 1, self.__MAX_LOAD_ATTEMPTS)
+        entry = {'faiss_service_obj': faiss_service_obj, 'secret_key': index_secret_key,
+                 'stamp': stamp, 'size': sum(x[1] for x in stamp if x)}
+        with self.__lock:
+            old_entry = self.__entry_dict.pop(key, None)
+            if old_entry:
+                self.__total_size -= old_entry['size']
+            self.__entry_dict[key] = entry
+            self.__total_size += entry['size']
+            self.__stats['loads'] += 1
+            self.__evict()
+        self.__logger.debug("Loaded index %s/%s (%s bytes)",
+                            db_folder_path, index_name, entry['size'])
+        return entry
+
+    def __evict(self):
+        """To be called with lock held. Most recently used entry is always kept."""
+        while len(self.__entry_dict) > 1 and (len(self.__entry_dict) > self.__max_entries or
+                                              self.__total_size > self.__max_size_bytes):
+            _, entry = self.__entry_dict.popitem(last=False)
+            self.__total_size -= entry['size']
+            self.__stats['evictions'] += 1
+
+    def __get_stamp(self, db_folder_path: str, index_name: str) -> tuple:
+        """Returns (modified time, size) of each DB file, None for missing file"""
+        stamp = []
+        for suffix in ['faiss', 'data.db', 'data.json', 'map.json', 'metadata.json']:
+            try:
+                stat = os.stat(f"{db_folder_path}/{index_name}.{suffix}")
+                stamp.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
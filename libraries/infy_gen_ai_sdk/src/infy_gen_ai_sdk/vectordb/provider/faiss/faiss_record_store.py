@@ -0,0 +1,232 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+"""Module for FaissRecordStore class"""
+
+import os
+import json
+import sqlite3
+import tempfile
+import threading
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+
+class FaissRecordStore():
+    """Store of record content and metadata in a SQLite file kept next to the FAISS index.
+    Rows are addressed by their id in the FAISS index, so search hits are looked up directly and
+    content is read only for the records returned. Added rows are visible immediately but are
+    written to the file only on `commit`.
+    An inverted index of metadata values to row ids is kept alongside, to find rows matching a
+    filter before searching. Keys are top level metadata keys with scalar values and
+    `custom_metadata.<key>` for each word of custom metadata string values."""
+
+    __MAX_SQL_VARIABLES = 900
+    # Stored as SQLite user_version
+    __SCHEMA_VERSION = 1
+
+    def __init__(self, file_path: str):
+        self.__file_path = file_path
+        self.__lock = threading.Lock()
+        self.__connection: sqlite3.Connection = None
+        self.__is_in_memory = False
+        self.__has_metadata_index = False
+
+    def exists(self) -> bool:
+        """Returns True if store file is present"""
+        return os.path.exists(self.__file_path)
+
+    def create_new(self):
+        """Start an empty store. It's kept in memory until `commit` so that an existing file
+        isn't changed before then."""
+        self.__connection = self.__connect(':memory:')
+        self.__connection.execute(
+            f"PRAGMA user_version = {self.__SCHEMA_VERSION}")
+        self.__is_in_memory = True
+        self.__has_metadata_index = True
+
+    def open(self):
+        """Open existing store file. Metadata index is built if the file is from an earlier version."""
+        self.__connection = self.__connect(self.__file_path)
+        self.__is_in_memory = False
+        self.__has_metadata_index = self.__build_metadata_index()
+
+    def load_from_json(self, data_file_path: str, map_file_path: str):
+        """Load store from `*.data.json` and `*.map.json` files of earlier versions. It's kept in
+        memory, so loading doesn't write any file. Store file is written on `commit` i.e. when
+        the DB is saved, and the JSON files are left as is."""
+        with open(data_file_path, 'r', encoding='utf-8') as file:
+            data_dict = json.load(file)
+        with open(map_file_path, 'r', encoding='utf-8') as file:
+            map_dict = json.load(file)
+        row_list = [(int(index_id), data_id, data_dict[data_id]['content'], data_dict[data_id]['metadata'])
+                    for index_id, data_id in map_dict.items()]
+        del data_dict, map_dict
+        self.create_new()
+        with self.__connection:
+            self.__insert_rows(self.__connection, row_list)
+
+    def add_records(self, start_row_id: int, data_ids: List[str], contents: List[str], metadatas: List[dict]):
+        """Add rows starting at `start_row_id`"""
+        row_list = [(start_row_id + idx, data_id, content, metadata)
+                    for idx, (data_id, content, metadata) in enumerate(zip(data_ids, contents, metadatas))]
+        with self.__lock:
+            self.__insert_rows(self.__connection, row_list)
+
+    def commit(self):
+        """Write added rows to the store file"""
+        with self.__lock:
+            if self.__connection.in_transaction:
+                self.__connection.commit()
+            if self.__is_in_memory:
+                # New store replaces any existing file. It's written to a temp file first so
+                # that readers never see a partly written store.
+                file_descriptor, temp_file_path = tempfile.mkstemp(
+                    suffix='.tmp', dir=os.path.dirname(os.path.abspath(self.__file_path)))
+                os.close(file_descriptor)
+                try:
+                    file_connection = self.__connect(temp_file_path)
+                    self.__connection.backup(file_connection)
+                    file_connection.close()
+                    os.replace(temp_file_path, self.__file_path)
+                except BaseException:
+                    if os.path.exists(temp_file_path):
+                        os.remove(temp_file_path)
+                    raise
+                self.__connection.close()
+                self.__connection = self.__connect(self.__file_path)
+                self.__is_in_memory = False
+
+    def get_records(self, row_ids: List[int], include_content: bool = True) -> Dict[int, Tuple[str, str, dict]]:
+        """Get row id -> (data id, content, metadata). Content is None if not included."""
+        columns = "id, data_id, content, metadata" if include_content else "id, data_id, NULL, metadata"
+        record_dict = {}
+        row_ids = [int(x) for x in row_ids]
+        with self.__lock:
+            for start_idx in range(0, len(row_ids), self.__MAX_SQL_VARIABLES):
+                batch_row_ids = row_ids[start_idx:start_idx +
+                                        self.__MAX_SQL_VARIABLES]
+                cursor = self.__connection.execute(
+                    f"SELECT {columns} FROM records WHERE id IN ({','.join('?' * len(batch_row_ids))})",
+                    batch_row_ids)
+                for row_id, data_id, content, metadata in cursor:
+                    record_dict[row_id] = (data_id, content, json.loads(metadata))
+        return record_dict
+
+    def get_contents(self, row_ids: List[int]) -> Dict[int, str]:
+        """Get row id -> content"""
+        return {row_id: content for row_id, (_, content, _) in self.get_records(row_ids).items()}
+
+    def get_filtered_row_ids(self, filter_metadata: dict) -> Optional[Set[int]]:
+        """Get ids of rows matching filter i.e. equal to each top level key's value and having
+        at least one of the words given for each `custom_metadata.<key>`.
+        Keys that can't be looked up in the index (e.g. list values) are ignored, so caller must
+        still check the rows. Returns None if no key could be looked up."""
+        if not self.__has_metadata_index:
+            return None
+        row_ids = None
+        with self.__lock:
+            for key, value in filter_metadata.items():
+                if key.startswith('custom_metadata.'):
+                    values = value if isinstance(value, list) else [value]
+                    values = [x for x in values if isinstance(x, str)]
+                    if len(values) > self.__MAX_SQL_VARIABLES:
+                        continue
+                    if not values:
+                        # Only words are matched
+                        return set()
+                else:
+                    encoded_value = self.__encode_value(value)
+                    if encoded_value is None:
+                        continue
+                    values = [encoded_value]
+                cursor = self.__connection.execute(
+                    f"SELECT id FROM metadata_index WHERE key = ? AND value IN ({','.join('?' * len(values))})",
+                    [key] + values)
+                key_row_ids = {x for (x,) in cursor}
+                row_ids = key_row_ids if row_ids is None else row_ids & key_row_ids
+                if not row_ids:
+                    break
+        return row_ids
+
+    def iter_records(self, start: int, end: int) -> Iterator[Tuple[int, str, str, dict]]:
+        """Iterate over (row id, data id, content, metadata) for start <= row id < end"""
+        with self.__lock:
+            row_list = self.__connection.execute(
+                "SELECT id, data_id, content, metadata FROM records WHERE id >= ? AND id < ? ORDER BY id",
+                (start, end)).fetchall()
+        for row_id, data_id, content, metadata in row_list:
+            yield row_id, data_id, content, json.loads(metadata)
+
+    def iter_metadata(self) -> Iterator[dict]:
+        """Iterate over metadata of all rows"""
+        with self.__lock:
+            row_list = self.__connection.execute(
+                "SELECT metadata FROM records").fetchall()
+        for (metadata,) in row_list:
+            yield json.loads(metadata)
+
+    # ----------- Private Methods ------------
+
+    def __connect(self, file_path: str) -> sqlite3.Connection:
+        # Connection is shared by threads reading a loaded index, access is serialized by lock
+        connection = sqlite3.connect(file_path, check_same_thread=False)
+        connection.execute("CREATE TABLE IF NOT EXISTS records (id INTEGER PRIMARY KEY, data_id TEXT NOT NULL, "
+                           "content TEXT, metadata TEXT)")
+        connection.execute("CREATE TABLE IF NOT EXISTS metadata_index (key TEXT NOT NULL, value TEXT NOT NULL, "
+                           "id INTEGER NOT NULL)")
+        connection.execute("CREATE INDEX IF NOT EXISTS metadata_index_key_value ON metadata_index (key, value)")
+        connection.commit()
+        return connection
+
+    def __build_metadata_index(self) -> bool:
+        """Build metadata index for rows added by earlier version. Returns False if the file isn't writable."""
+        connection = self.__connection
+        if connection.execute("PRAGMA user_version").fetchone()[0] >= self.__SCHEMA_VERSION:
+            return True
+        try:
+            with connection:
+                connection.execute("DELETE FROM metadata_index")
+                row_list = connection.execute(
+                    "SELECT id, metadata FROM records").fetchall()
+                connection.executemany("INSERT INTO metadata_index VALUES (?, ?, ?)",
+                                       [x for row_id, metadata in row_list
+                                        for x in self.__get_metadata_index_rows(row_id, json.loads(metadata))])
+                connection.execute(
+                    f"PRAGMA user_version = {self.__SCHEMA_VERSION}")
+        except sqlite3.Error:
+            return False
+        return True
+
+    def __insert_rows(self, connection: sqlite3.Connection, row_list: list):
+        """Insert (row id, data id, content, metadata) rows and their metadata index entries"""
+        connection.executemany("INSERT INTO records VALUES (?, ?, ?, ?)",
+                               [(row_id, data_id, content, json.dumps(metadata, ensure_ascii=False))
+                                for row_id, data_id, content, metadata in row_list])
+        connection.executemany("INSERT INTO metadata_index VALUES (?, ?, ?)",
+                               [x for row_id, _, _, metadata in row_list
+                                for x in self.__get_metadata_index_rows(row_id, metadata)])
+
+    @classmethod
+    def __get_metadata_index_rows(cls, row_id: int, metadata: dict) -> Iterator[Tuple[str, str, int]]:
+        for key, value in (metadata or {}).items():
+            if key == 'custom_metadata' and isinstance(value, dict):
+                for custom_key, custom_value in value.items():
+                    if isinstance(custom_value, str):
+                        for word in set(custom_value.split()):
+                            yield f'custom_metadata.{custom_key}', word, row_id
+            else:
+                encoded_value = cls.__encode_value(value)
+                if encoded_value is not None:
+                    yield key, encoded_value, row_id
+
+    @classmethod
+    def __encode_value(cls, value) -> Optional[str]:
+        """Encode scalar value so that values equal in Python are equal in index e.g. 1, 1.0 and True"""
+        if value is None or isinstance(value, str):
+            return json.dumps(value, ensure_ascii=False)
+        if isinstance(value, (bool, int, float)):
+            return json.dumps(float(value))
+        return None
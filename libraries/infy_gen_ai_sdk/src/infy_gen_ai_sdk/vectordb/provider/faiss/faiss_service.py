@@ -8,50 +8,105 @@
 
 import os
 import json
+import math
 import uuid
+import tempfile
+from typing import List
 import numpy
 import faiss
+from .faiss_record_store import FaissRecordStore
 
 
 class FaissService():
     """Wrapper for FAISS"""
+    INDEX_TYPE_FLAT = 'flat'
+    INDEX_TYPE_IVF_FLAT = 'ivf_flat'
+    INDEX_TYPE_IVF_PQ = 'ivf_pq'
+    INDEX_TYPE_HNSW = 'hnsw'
+    # Filtered rows up to this count are searched exactly instead of searching the index
+    __EXACT_SEARCH_MAX_ROWS = 10000
 
     def __init__(self, db_folder_path: str = '', index_name: str = '', index_secret_key: str = ''):
         self.__index = None
-        self.__data_dict = None
-        self.__map_dict = None  # Store relationship between index and data
+        self.__index_type, self.__index_params = self.INDEX_TYPE_FLAT, {}
         self.__secret_key_dict = {
             "secret_key": index_secret_key} if index_secret_key else {}
         # DB folder path
         self.__db_folder_path = db_folder_path
         # DB file names
         self.__index_file_name = f"{index_name}.faiss"
+        self.__record_store_file_name = f"{index_name}.data.db"
+        self.__secret_key_file_name = f"{index_name}.metadata.json"
+        # Files of earlier versions, migrated to record store on save
         self.__data_file_name = f"{index_name}.data.json"
         self.__map_file_name = f"{index_name}.map.json"
-        self.__secret_key_file_name = f"{index_name}.metadata.json"
         # DB file paths
         self.__index_file_path = f"{self.__db_folder_path}/{self.__index_file_name}"
+        self.__record_store_file_path = f"{self.__db_folder_path}/{self.__record_store_file_name}"
         self.__data_file_path = f"{self.__db_folder_path}/{self.__data_file_name}"
         self.__map_file_path = f"{self.__db_folder_path}/{self.__map_file_name}"
         self.__secret_key_file_path = f"{self.__db_folder_path}/{self.__secret_key_file_name}"
+        # Content and metadata of records, row aligned with index
+        self.__record_store = FaissRecordStore(self.__record_store_file_path)
 
-    def create_new(self, vector_dimension: int):
-        """Create a new vector DB"""
-        index = faiss.IndexFlatL2(vector_dimension)
-        self.__index = index
-        self.__data_dict, self.__map_dict = {}, {}
+    def create_new(self, vector_dimension: int, index_type: str = INDEX_TYPE_FLAT, index_params: dict = None):
+        """Create a new vector DB
+        Args:
+            vector_dimension: Size of vectors
+            index_type: One of flat (exact search), ivf_flat, ivf_pq or hnsw (approximate search).
+                IVF types must be trained using `train` before records are added.
+            index_params: Optional. For IVF types: nlist (1024), nprobe (8) and for ivf_pq also
+                pq_m (16, must divide vector_dimension), pq_nbits (8).
+                For hnsw: hnsw_m (32), ef_construction (40), ef_search (16).
+        """
+        self.__index_type, self.__index_params = index_type, index_params or {}
+        self.__index = self.__build_index(vector_dimension)
+        self.__record_store.create_new()
+
+    def is_trained(self) -> bool:
+        """Returns False if index needs training before records can be added"""
+        return self.__index.is_trained
+
+    def train(self, vectors: numpy.ndarray, sample_size: int = None):
+        """Train index on (a random sample of) given vectors. Number of IVF lists and PQ bits are
+        reduced if there are too few vectors for them."""
+        if self.__index.is_trained:
+            return
+        vectors = numpy.array(vectors, dtype=numpy.float32)
+        if sample_size and len(vectors) > sample_size:
+            vectors = vectors[numpy.random.default_rng(0).choice(
+                len(vectors), sample_size, replace=False)]
+        faiss.normalize_L2(vectors)
+        self.__index = self.__build_index(vectors.shape[1], len(vectors))
+        self.__index.train(vectors)
+
+    def rebuild(self, index_type: str, index_params: dict = None, sample_size: int = None):
+        """Rebuild index as another type e.g. to convert a flat index to an approximate one.
+        Vectors are read back from the current index in row order, so records stay aligned."""
+        index = self.__index
+        vectors = index.reconstruct_n(0, index.ntotal)
+        self.__index_type, self.__index_params = index_type, index_params or {}
+        self.__index = self.__build_index(index.d)
+        self.train(vectors, sample_size)
+        self.__index.add(vectors)
 
     def add_record(self, vector: numpy.ndarray, content: str, metadata: dict):
         """Add a record to vector DB"""
         index = self.__index
-        data_dict, map_dict = self.__data_dict, self.__map_dict
         faiss.normalize_L2(vector)
         index.add(vector)
-        index_id = str(index.ntotal - 1)
-        data_id = str(uuid.uuid4())
-        map_dict[index_id] = data_id
-        data_dict[data_id] = {'content': content,
-                              'metadata': metadata}
+        self.__record_store.add_records(
+            index.ntotal - 1, [str(uuid.uuid4())], [content], [metadata])
+
+    def add_records(self, vectors: numpy.ndarray, contents: List[str], metadatas: List[dict]):
+        """Add records to vector DB in one go. `vectors` is of shape (n, vector_dimension)."""
+        index = self.__index
+        vectors = numpy.ascontiguousarray(vectors, dtype=numpy.float32)
+        faiss.normalize_L2(vectors)
+        start_id = index.ntotal
+        index.add(vectors)
+        self.__record_store.add_records(
+            start_id, [str(uuid.uuid4()) for _ in contents], contents, metadatas)
 
     def get_records(self, start: int = 0, end: int = -1, include_vector: bool = False) -> list:
         """Get records from vector DB
@@ -60,18 +115,15 @@ class FaissService():
             end (int): End index. -1 indicates the end of the index
         """
         index = self.__index
-        data_dict, map_dict = self.__data_dict, self.__map_dict
         _end = index.ntotal if end == -1 else end
         _end = min(index.ntotal, _end)
         records = []
-        for i in range(start, _end):
-            index_id = str(i)
-            data_id = map_dict[index_id]
+        for i, data_id, content, metadata in self.__record_store.iter_records(start, _end):
             vector = index.reconstruct(i)
             records.append({
                 'id': data_id,
-                'content': data_dict[data_id]['content'],
-                'metadata': data_dict[data_id]['metadata'],
+                'content': content,
+                'metadata': metadata,
                 'vector_size': len(vector),
             })
             if include_vector:
@@ -80,13 +132,9 @@ class FaissService():
 
     def get_custom_metadata_schema(self):
         """Get the schema of the custom_metadata object within metadata"""
-        data_dict = self.__data_dict
-        if not data_dict:
-            return {}
-
         schema = {}
-        for data_id, data in data_dict.items():
-            metadata = data.get('metadata', {})
+        for metadata in self.__record_store.iter_metadata():
+            metadata = metadata or {}
             custom_metadata = metadata.get('custom_metadata', {})
 
             # Merge the current custom_metadata keys into the schema
@@ -104,22 +152,45 @@ class FaissService():
         return len(records)
 
     def search_records(self, vector: numpy.ndarray, top_k: int = 4,
-                       filter_metadata: dict = None, fetch_k: int = 100):
+                       filter_metadata: dict = None, fetch_k: int = 100, search_params: dict = None):
         """Search for records in vector DB
         Args:
             vector: Query vector
             top_k: Number of documents to return
-            filter_metadata: Metadata to filter the search results after fetching fetch_k records.
-            fetch_k: Number of documents to fetch before filtering. Defaults to 100.
+            filter_metadata: Metadata to filter the search results. Records matching it are looked up
+                in the metadata index and only those are searched.
+            fetch_k: Number of documents to fetch before grouping by custom_metadata filter values.
+                Defaults to 100.
+            search_params: Optional. nprobe (IVF types) or ef_search (hnsw) for this search only,
+                else values set at creation are used.
         """
 
         # query, filter=filter_metadata, k=top_k, fetch_k=pre_filter_fetch_k
         index = self.__index
-        data_dict, map_dict = self.__data_dict, self.__map_dict
         faiss.normalize_L2(vector)
-        # Step 1: Get fetch_k number of records
-        _fetch_k = min(fetch_k, index.ntotal)
-        distances, distance_ids = index.search(vector, _fetch_k)
+        # Step 1: Get fetch_k number of records, from among those matching filter if known
+        filtered_row_ids = self.__record_store.get_filtered_row_ids(
+            filter_metadata) if filter_metadata else None
+        if filtered_row_ids is not None and not filtered_row_ids:
+            return []
+        _fetch_k = min(fetch_k, index.ntotal if filtered_row_ids is None else len(filtered_row_ids))
+        if filtered_row_ids is not None and len(filtered_row_ids) <= self.__EXACT_SEARCH_MAX_ROWS:
+            distances, distance_ids = self.__search_rows(
+                vector, sorted(filtered_row_ids), _fetch_k)
+        else:
+            id_selector = faiss.IDSelectorBatch(numpy.array(
+                sorted(filtered_row_ids), dtype=numpy.int64)) if filtered_row_ids is not None else None
+            # Passed per search as index may be shared by threads
+            faiss_search_params = self.__get_search_parameters(
+                search_params, id_selector)
+            if faiss_search_params:
+                distances, distance_ids = index.search(
+                    vector, _fetch_k, params=faiss_search_params)
+            else:
+                distances, distance_ids = index.search(vector, _fetch_k)
+        # Content is read later, only for the records returned
+        record_dict = self.__record_store.get_records(
+            distance_ids[0], include_content=False)
         records = []
         precomputed_filters, general_filter = {},{}
         
@@ -135,11 +206,11 @@ class FaissService():
             general_filter = {
                 k: v for k, v in filter_metadata.items() if not k.startswith('custom_metadata.')
             }
-        # Step 2: Apply filter, if available
+        # Step 2: Apply filter, if available. Needed for keys not in metadata index.
         for distance, distance_id in zip(distances[0], distance_ids[0]):
-            index_id = str(distance_id)
-            data_id = map_dict[index_id]
-            metadata = data_dict[data_id]['metadata']
+            if int(distance_id) not in record_dict:
+                continue
+            metadata = record_dict[int(distance_id)][2]
             if filter_metadata:
                 # Check general metadata
                 if general_filter and not general_filter.items() <= metadata.items():
@@ -155,12 +226,13 @@ class FaissService():
             
             records.append({
                 'distance': distance,
-                'content': data_dict[data_id]['content'],
-                'metadata': metadata
+                'content': None,
+                'metadata': metadata,
+                'row_id': int(distance_id)
             })
             
         if not filter_metadata or not custom_metadata_filter:
-            return records[:top_k]
+            return self.__fill_content(records[:top_k])
             
         # Step 3: Group records by custom_metadata filter values
         grouped_records = {}
@@ -196,55 +268,51 @@ class FaissService():
         # Step 5: Sort alternated records
             alternated_records.sort(key=lambda x: x['distance'])
 
-        return alternated_records
+        return self.__fill_content(alternated_records)
 
     def load_local(self):
         """Load the vector DB from local file system"""
         self.__validate_fields()
-        index_file_path = self.__index_file_path
-        data_file_path, map_file_path, secret_key_file_path = self.__data_file_path, self.__map_file_path, self.__secret_key_file_path
-
-        if os.path.exists(secret_key_file_path):
-            with open(secret_key_file_path, 'r', encoding='utf-8') as file:
-                secret_key_dict = json.load(file)
-                stored_secret_key = secret_key_dict.get("secret_key")
-                if self.__secret_key_dict is not None and stored_secret_key == self.__secret_key_dict.get("secret_key", ""):
-                    index = faiss.read_index(index_file_path)
-                    data_dict, map_dict = {}, {}
-                    with open(data_file_path, 'r', encoding='utf-8') as file:
-                        data_dict = json.load(file)
-                    with open(map_file_path, 'r', encoding='utf-8') as file:
-                        map_dict = json.load(file)
-                    self.__index = index
-                    self.__data_dict = data_dict
-                    self.__map_dict = map_dict
-                else:
-                    raise ValueError(
-                        "Secret key provided does not match the collection, please provide correct secret key.")
+        self.check_secret_key()
+        index = faiss.read_index(self.__index_file_path)
+        if self.__record_store.exists():
+            self.__record_store.open()
         else:
-            index = faiss.read_index(index_file_path)
-            data_dict, map_dict = {}, {}
-            with open(data_file_path, 'r', encoding='utf-8') as file:
-                data_dict = json.load(file)
-            with open(map_file_path, 'r', encoding='utf-8') as file:
-                map_dict = json.load(file)
-            self.__index = index
-            self.__data_dict = data_dict
-            self.__map_dict = map_dict
+            self.__record_store.load_from_json(
+                self.__data_file_path, self.__map_file_path)
+        self.__index = index
+
+    def check_secret_key(self):
+        """Raise error if the vector DB is protected by a secret key which doesn't match"""
+        secret_key_file_path = self.__secret_key_file_path
+        if not os.path.exists(secret_key_file_path):
+            return
+        with open(secret_key_file_path, 'r', encoding='utf-8') as file:
+            secret_key_dict = json.load(file)
+        stored_secret_key = secret_key_dict.get("secret_key")
+        if self.__secret_key_dict is None or stored_secret_key != self.__secret_key_dict.get("secret_key", ""):
+            raise ValueError(
+                "Secret key provided does not match the collection, please provide correct secret key.")
 
     def save_local(self):
         """Save the vector DB to the local file system"""
         if not os.path.exists(self.__db_folder_path):
             os.makedirs(self.__db_folder_path)
-        index_file_path = self.__index_file_path
-        data_file_path, map_file_path, secret_key_file_path = self.__data_file_path, self.__map_file_path, self.__secret_key_file_path
-        index = self.__index
-        data_dict, map_dict, secret_key_dict = self.__data_dict, self.__map_dict, self.__secret_key_dict
-        faiss.write_index(index, index_file_path)
-        with open(data_file_path, 'w', encoding='utf-8') as file:
-            json.dump(data_dict, file, indent=4, ensure_ascii=False)
-        with open(map_file_path, 'w', encoding='utf-8') as file:
-            json.dump(map_dict, file, indent=4, ensure_ascii=False)
+        index_file_path, secret_key_file_path = self.__index_file_path, self.__secret_key_file_path
+        index, secret_key_dict = self.__index, self.__secret_key_dict
+        # Written to a temp file first so that readers never see a partly written index
+        file_descriptor, temp_file_path = tempfile.mkstemp(
+            suffix='.tmp', dir=os.path.dirname(os.path.abspath(index_file_path)))
+        os.close(file_descriptor)
+        try:
+            faiss.write_index(index, temp_file_path)
+            os.replace(temp_file_path, index_file_path)
+        except BaseException:
+            if os.path.exists(temp_file_path):
+                os.remove(temp_file_path)
+            raise
+        # Only records added since last save are written
+        self.__record_store.commit()
         if secret_key_dict is not None and secret_key_dict:
             if not os.path.exists(secret_key_file_path):
                 with open(secret_key_file_path, 'w', encoding='utf-8') as file:
@@ -257,25 +325,12 @@ class FaissService():
     def delete_local(self):
         """Load the vector DB from local file system"""
         self.__validate_fields()
-        index_file_path, data_file_path, map_file_path, secret_key_file_path = self.__index_file_path, self.__data_file_path, self.__map_file_path, self.__secret_key_file_path
-        records_list = []
-        if os.path.exists(secret_key_file_path):
-            with open(secret_key_file_path, 'r', encoding='utf-8') as file:
-                secret_key_dict = json.load(file)
-                stored_secret_key = secret_key_dict.get("secret_key")
-                if self.__secret_key_dict is not None and stored_secret_key == self.__secret_key_dict.get("secret_key", ""):
-                    records_list.append(index_file_path)
-                    records_list.append(data_file_path)
-                    records_list.append(map_file_path)
-                    records_list.append(secret_key_file_path)
-                else:
-                    raise ValueError(
-                        "Secret key provided does not match the collection, please provide correct secret key.")
-        else:
-            records_list.append(index_file_path)
-            records_list.append(data_file_path)
-            records_list.append(map_file_path)
-
+        self.check_secret_key()
+        records_list = [self.__index_file_path]
+        for file_path in [self.__record_store_file_path, self.__data_file_path, self.__map_file_path,
+                          self.__secret_key_file_path]:
+            if os.path.exists(file_path):
+                records_list.append(file_path)
         return records_list
 
     # ----------- Private Methods ------------
@@ -288,9 +343,73 @@ class FaissService():
         if not self.__index_file_name or not os.path.exists(self.__index_file_path):
             message = f"'index_file_path = {self.__index_file_path}' does not exist."
             raise ValueError(message)
+        if self.__record_store.exists():
+            return
         if not self.__data_file_name or not os.path.exists(self.__data_file_path):
             message = f"'data_file_path = {self.__data_file_path}' does not exist."
             raise ValueError(message)
         if not self.__map_file_name or not os.path.exists(self.__map_file_path):
             message = f"'map_file_path = {self.__map_file_path}' does not exist."
             raise ValueError(message)
+
+    def __build_index(self, vector_dimension: int, train_size: int = None):
+        index_type, index_params = self.__index_type, self.__index_params
+        if index_type == self.INDEX_TYPE_FLAT:
+            return faiss.IndexFlatL2(vector_dimension)
+        if index_type == self.INDEX_TYPE_HNSW:
+            index = faiss.index_factory(
+                vector_dimension, f"HNSW{index_params.get('hnsw_m', 32)}")
+            index.hnsw.efConstruction = index_params.get('ef_construction', 40)
+            index.hnsw.efSearch = index_params.get('ef_search', 16)
+            return index
+        nlist = index_params.get('nlist', 1024)
+        if train_size:
+            nlist = max(1, min(nlist, train_size))
+        if index_type == self.INDEX_TYPE_IVF_FLAT:
+            description = f"IVF{nlist},Flat"
+        elif index_type == self.INDEX_TYPE_IVF_PQ:
+            pq_m, pq_nbits = index_params.get('pq_m', 16), index_params.get('pq_nbits', 8)
+            if vector_dimension % pq_m:
+                raise ValueError(
+                    f"pq_m = {pq_m} must divide vector dimension {vector_dimension}.")
+            if train_size:
+                pq_nbits = max(1, min(pq_nbits, int(math.log2(train_size))))
+            description = f"IVF{nlist},PQ{pq_m}x{pq_nbits}"
+        else:
+            raise ValueError(f"Unsupported index type '{index_type}'.")
+        index = faiss.index_factory(vector_dimension, description)
+        index.nprobe = index_params.get('nprobe', 8)
+        # Needed to read vectors back by row id e.g. in get_records
+        index.make_direct_map()
+        return index
+
+    def __search_rows(self, vector: numpy.ndarray, row_ids: List[int], k: int):
+        """Exact search of given rows. Returns same shapes as `index.search`."""
+        row_ids = numpy.array(row_ids, dtype=numpy.int64)
+        vectors = self.__index.reconstruct_batch(row_ids)
+        # Squared L2 distance, same as index
+        distances = ((vectors - vector[0]) ** 2).sum(axis=1)
+        top_idx = numpy.argpartition(distances, k - 1)[:k] if k < len(distances) else numpy.arange(len(distances))
+        top_idx = top_idx[numpy.argsort(distances[top_idx])]
+        return distances[top_idx].reshape(1, -1), row_ids[top_idx].reshape(1, -1)
+
+    def __get_search_parameters(self, search_params: dict, id_selector=None):
+        search_params = search_params or {}
+        index = self.__index
+        kwargs = {'sel': id_selector} if id_selector else {}
+        if isinstance(index, faiss.IndexIVF) and (kwargs or search_params.get('nprobe')):
+            return faiss.SearchParametersIVF(nprobe=search_params.get('nprobe') or index.nprobe, **kwargs)
+        if isinstance(index, faiss.IndexHNSW) and (kwargs or search_params.get('ef_search')):
+            return faiss.SearchParametersHNSW(efSearch=search_params.get('ef_search') or index.hnsw.efSearch,
+                                              **kwargs)
+        if kwargs:
+            return faiss.SearchParameters(**kwargs)
+        return None
+
+    def __fill_content(self, records: list) -> list:
+        """Read content of given search records"""
+        content_dict = self.__record_store.get_contents(
+            [x['row_id'] for x in records])
+        for record in records:
+            record['content'] = content_dict[record.pop('row_id')]
+        return records
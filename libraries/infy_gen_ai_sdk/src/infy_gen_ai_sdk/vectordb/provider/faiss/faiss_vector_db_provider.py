@@ -7,10 +7,14 @@
 """Module for FAISS vector DB provider"""
 
 import os
+import shutil
+import hashlib
 import logging
 from typing import List, Optional
+import numpy as np
 import infy_fs_utils
 from .faiss_service import FaissService
+from .faiss_index_registry import FaissIndexRegistry
 from ....common.app_config_manager import AppConfigManager
 from ....common.file_util import FileUtil
 from ....schema.config_data import BaseVectorDbProviderConfigData
@@ -26,6 +30,12 @@ class VectorDbProviderConfigData(BaseVectorDbProviderConfigData):
     db_folder_path: str
     db_index_name: str
     db_index_secret_key: Optional[str] = None
+    # Used when a new index is created. One of flat, ivf_flat, ivf_pq, hnsw.
+    index_type: str = FaissService.INDEX_TYPE_FLAT
+    # E.g. {"nlist": 1024, "nprobe": 8} or {"hnsw_m": 32, "ef_search": 16}. See `FaissService.create_new`.
+    index_params: Optional[dict] = None
+    # Max number of vectors used to train IVF index types
+    train_size: int = 100000
 
 
 class InsertVectorDbRecordData(BaseVectorDbRecordData):
@@ -51,12 +61,16 @@ class VectorDbRecordData(BaseVectorDbRecordData):
 
 class VectorDbQueryParamsData(BaseVectorDbQueryParamsData):
     """Domain class"""
+    # Optional search time settings of IVF index types and hnsw respectively
+    nprobe: Optional[int] = None
+    ef_search: Optional[int] = None
 
 
 class FaissVectorDbProvider(IVectorDbProvider):
     """FAISS vector DB provider"""
 
     __DB_TYPE = "FAISS"
+    __DEFAULT_BATCH_SIZE = 64
 
     def __init__(self, config_data: VectorDbProviderConfigData, embedding_provider: IEmbeddingProvider) -> None:
         if infy_fs_utils.manager.FileSystemLoggingManager().has_fs_logging_handler():
@@ -81,82 +95,98 @@ class FaissVectorDbProvider(IVectorDbProvider):
 
     def get_matches(self, query_params_data: VectorDbQueryParamsData) -> List[MatchingVectorDbRecordData]:
         try:
-            config_data = self.__internal_config_data
-            scores_list = []
-            sorted_scores_list = []
-            db_folder_path_for_load = config_data.get(
-                'local_db_folder_path', config_data['db_folder_path'])
-            if not os.path.exists(db_folder_path_for_load):
-                raise ValueError(
-                    f"File doesn't exist: {db_folder_path_for_load}")
-            faiss_service_obj = FaissService(
-                db_folder_path_for_load, config_data['db_index_name'], config_data.get('db_index_secret_key', None))
-            faiss_service_obj.load_local()
-
-            query = query_params_data.query
-            filter_metadata = query_params_data.filter_metadata
-            top_k = query_params_data.top_k
-            pre_filter_fetch_k = query_params_data.pre_filter_fetch_k
-
+            faiss_service_obj = self.__get_faiss_service_for_query()
             embedding_data: EmbeddingData = self._embedding_provider.generate_embedding(
-                query)
-
-            records = faiss_service_obj.search_records(
-                embedding_data.vector, top_k, filter_metadata, pre_filter_fetch_k)
-            # print(f"Query: {query}")
-            for record in records:
-                # print(
-                #     f"Distance: {record['distance']}, Document: {record['content']}")
-                vector_db_record_data_dict = {"db_folder_path": config_data['db_folder_path'],
-                                              'content': record['content'],
-                                              'metadata': record['metadata'],
-                                              "score": record['distance']}
-                scores_list.append(MatchingVectorDbRecordData(
-                    **vector_db_record_data_dict))
-            sorted_scores_list = sorted(scores_list, key=lambda d: d.score)
-            self.__logger.debug("Sorted scores list size: %s",
-                                len(sorted_scores_list))
+                query_params_data.query)
+            sorted_scores_list = self.__search(
+                faiss_service_obj, query_params_data, embedding_data.vector)
         except Exception as e:
             self.__logger.exception(e)
             raise e
 
         return sorted_scores_list
 
+    def get_matches_batch(self, query_params_data_list: List[VectorDbQueryParamsData]
+                          ) -> List[List[MatchingVectorDbRecordData]]:
+        """Returns matches for each query. Embeddings of all queries are generated in one call."""
+        if len(query_params_data_list) <= 1:
+            return [self.get_matches(x) for x in query_params_data_list]
+        try:
+            faiss_service_obj = self.__get_faiss_service_for_query()
+            vectors = self._embedding_provider.generate_embeddings(
+                [x.query for x in query_params_data_list])
+            matches_list = [self.__search(faiss_service_obj, query_params_data, vectors[idx:idx + 1].copy())
+                            for idx, query_params_data in enumerate(query_params_data_list)]
+        except Exception as e:
+            self.__logger.exception(e)
+            raise e
+
+        return matches_list
+
     def save_record(self, db_record_data: InsertVectorDbRecordData):
+        self.save_records([db_record_data])
+
+    def save_records(self, db_record_data_list: List[InsertVectorDbRecordData],
+                     batch_size: int = __DEFAULT_BATCH_SIZE):
+        """Save records in bulk. The index is loaded once, then for every `batch_size` records
+        embeddings are generated and the index is saved once. On cloud storage the DB is uploaded
+        once at the end. Record content is taken from `content`, else read from `content_file_path`.
+        A new IVF index is trained on the first `train_size` records before any record is added."""
+        if not db_record_data_list:
+            return
         try:
             config_data = self.__internal_config_data
             db_folder_path = config_data['db_folder_path']
             local_db_folder_path = config_data['local_db_folder_path']
             db_index_name = config_data['db_index_name']
             db_index_secret_key = config_data.get('db_index_secret_key', None)
+            train_size = config_data.get('train_size') or len(db_record_data_list)
 
-            local_content_file_path = f'{self.__app_config["CONTAINER"]["APP_DIR_TEMP_PATH"]}/{FileUtil.get_uuid()}'
-
-            content_file_path = db_record_data.content_file_path
-            with self.__fs_handler.get_file_object(content_file_path) as file:
-                with open(local_content_file_path, "wb") as output:
-                    output.write(file.read())
-
-            with open(local_content_file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-
-            embedding_data: EmbeddingData = self._embedding_provider.generate_embedding(
-                content)
             faiss_service_obj = FaissService(
                 local_db_folder_path, db_index_name, db_index_secret_key)
+            is_index_ready = False
             if os.path.exists(local_db_folder_path) and os.path.exists(f'{local_db_folder_path}/{db_index_name}.faiss'):
                 faiss_service_obj.load_local()
-            else:
-                faiss_service_obj.create_new(embedding_data.vector_dimension)
-
-            metadata = {
-                'source': content_file_path
-            }
-            metadata.update(db_record_data.metadata)
-            faiss_service_obj.add_record(
-                embedding_data.vector, content, metadata)
-
-            faiss_service_obj.save_local()
+                is_index_ready = True
+
+            # Batches held until there are enough vectors to train index
+            untrained_batch_list = []
+            for start_idx in range(0, len(db_record_data_list), batch_size):
+                batch_record_data_list = db_record_data_list[start_idx:start_idx + batch_size]
+                contents = [self.__get_content(x) for x in batch_record_data_list]
+                vectors = self._embedding_provider.generate_embeddings(
+                    contents, batch_size)
+                if not is_index_ready:
+                    faiss_service_obj.create_new(
+                        vectors.shape[1], config_data.get('index_type') or FaissService.INDEX_TYPE_FLAT,
+                        config_data.get('index_params'))
+                    is_index_ready = True
+                metadatas = []
+                for db_record_data in batch_record_data_list:
+                    metadata = {
+                        'source': db_record_data.content_file_path
+                    }
+                    metadata.update(db_record_data.metadata or {})
+                    metadatas.append(metadata)
+                batch_list = [(vectors, contents, metadatas)]
+                if not faiss_service_obj.is_trained():
+                    untrained_batch_list.extend(batch_list)
+                    untrained_count = sum(len(x[1]) for x in untrained_batch_list)
+                    if untrained_count < train_size and start_idx + batch_size < len(db_record_data_list):
+                        continue
+                    faiss_service_obj.train(
+                        np.vstack([x[0] for x in untrained_batch_list]), train_size)
+                    self.__logger.info("Trained index on %s records",
+                                       min(untrained_count, train_size))
+                    batch_list, untrained_batch_list = untrained_batch_list, []
+                for vectors, contents, metadatas in batch_list:
+                    faiss_service_obj.add_records(vectors, contents, metadatas)
+                with FaissIndexRegistry().lock(local_db_folder_path, db_index_name):
+                    faiss_service_obj.save_local()
+                self.__logger.debug("Saved %s of %s records", start_idx + len(batch_record_data_list),
+                                    len(db_record_data_list))
+
+            FaissIndexRegistry().invalidate(local_db_folder_path, db_index_name)
             total_no_of_records = faiss_service_obj.get_record_count()
             self.__logger.info(
                 'Total # of records in DB: %s', total_no_of_records)
@@ -171,6 +201,35 @@ class FaissVectorDbProvider(IVectorDbProvider):
             self.__logger.exception(e)
             raise e
 
+    def rebuild_index(self):
+        """Rebuild existing index as per `index_type` and `index_params` of config data
+        e.g. to convert a flat index to an approximate one. Meant to be run offline as
+        it reads all vectors into memory."""
+        try:
+            config_data = self.__internal_config_data
+            db_folder_path = config_data['db_folder_path']
+            local_db_folder_path = config_data['local_db_folder_path']
+            db_index_name = config_data['db_index_name']
+            faiss_service_obj = FaissService(
+                local_db_folder_path, db_index_name, config_data.get('db_index_secret_key', None))
+            faiss_service_obj.load_local()
+            faiss_service_obj.rebuild(config_data.get('index_type') or FaissService.INDEX_TYPE_FLAT,
+                                      config_data.get('index_params'), config_data.get('train_size'))
+            with FaissIndexRegistry().lock(local_db_folder_path, db_index_name):
+                faiss_service_obj.save_local()
+            FaissIndexRegistry().invalidate(local_db_folder_path, db_index_name)
+            self.__logger.info("Rebuilt index %s as %s", db_index_name,
+                               config_data.get('index_type'))
+
+            # Upload vector db if storage is cloud file system
+            if self.__fs_handler.get_scheme() != infy_fs_utils.interface.IFileSystemHandler.SCHEME_TYPE_FILE:
+                self.__fs_handler.put_folder(
+                    local_db_folder_path, db_folder_path)
+                self.__logger.debug("Uploaded DB to %s", db_folder_path)
+        except Exception as e:
+            self.__logger.exception(e)
+            raise e
+
     def get_records(self, count: int = -1) -> List[VectorDbRecordData]:
         try:
             config_data = self.__internal_config_data
@@ -179,9 +238,8 @@ class FaissVectorDbProvider(IVectorDbProvider):
             if not os.path.exists(db_folder_path_for_load):
                 raise ValueError(
                     f"File doesn't exist: {db_folder_path_for_load}")
-            faiss_service_obj = FaissService(
-                db_folder_path_for_load, config_data['db_index_name'], config_data.get('db_index_secret_key', None))
-            faiss_service_obj.load_local()
+            faiss_service_obj = self.__get_loaded_faiss_service(
+                db_folder_path_for_load)
             records = faiss_service_obj.get_records(end=count)
             record_list = []
             processed_count = 0
@@ -214,6 +272,8 @@ class FaissVectorDbProvider(IVectorDbProvider):
                 local_db_folder_path, db_index_name, db_index_secret_key)
             if os.path.exists(local_db_folder_path) and os.path.exists(f'{local_db_folder_path}/{db_index_name}.faiss'):
                 records_list = faiss_service_obj.delete_local()
+                FaissIndexRegistry().invalidate(
+                    local_db_folder_path, db_index_name)
                 base_path = (self.__fs_handler.get_abs_path(
                     rel_path=db_folder_path)).replace('filefile://', '')
                 if records_list:
@@ -243,9 +303,8 @@ class FaissVectorDbProvider(IVectorDbProvider):
             if not os.path.exists(db_folder_path_for_load):
                 raise ValueError(
                     f"File doesn't exist: {db_folder_path_for_load}")
-            faiss_service_obj = FaissService(
-                db_folder_path_for_load, config_data['db_index_name'], config_data.get('db_index_secret_key', None))
-            faiss_service_obj.load_local()
+            faiss_service_obj = self.__get_loaded_faiss_service(
+                db_folder_path_for_load)
             schema = faiss_service_obj.get_custom_metadata_schema()
 
         except Exception as e:
@@ -255,23 +314,82 @@ class FaissVectorDbProvider(IVectorDbProvider):
 
     ######## Private Methods #############
 
+    def __get_faiss_service_for_query(self) -> FaissService:
+        db_folder_path_for_load = self.__internal_config_data.get(
+            'local_db_folder_path', self.__internal_config_data['db_folder_path'])
+        if not os.path.exists(db_folder_path_for_load):
+            raise ValueError(
+                f"File doesn't exist: {db_folder_path_for_load}")
+        return self.__get_loaded_faiss_service(db_folder_path_for_load)
+
+    def __search(self, faiss_service_obj: FaissService, query_params_data: VectorDbQueryParamsData,
+                 vector: np.ndarray) -> List[MatchingVectorDbRecordData]:
+        scores_list = []
+        search_params = {'nprobe': getattr(query_params_data, 'nprobe', None),
+                         'ef_search': getattr(query_params_data, 'ef_search', None)}
+        records = faiss_service_obj.search_records(
+            vector, query_params_data.top_k, query_params_data.filter_metadata,
+            query_params_data.pre_filter_fetch_k, search_params)
+        for record in records:
+            vector_db_record_data_dict = {"db_folder_path": self.__internal_config_data['db_folder_path'],
+                                          'content': record['content'],
+                                          'metadata': record['metadata'],
+                                          "score": record['distance']}
+            scores_list.append(MatchingVectorDbRecordData(
+                **vector_db_record_data_dict))
+        sorted_scores_list = sorted(scores_list, key=lambda d: d.score)
+        self.__logger.debug("Sorted scores list size: %s",
+                            len(sorted_scores_list))
+        return sorted_scores_list
+
+    def __get_loaded_faiss_service(self, db_folder_path_for_load: str) -> FaissService:
+        """Get index for reading. It's kept loaded in `FaissIndexRegistry`, for cloud storage
+        from the local copy of the DB."""
+        config_data = self.__internal_config_data
+        return FaissIndexRegistry().get(
+            db_folder_path_for_load, config_data['db_index_name'], config_data.get('db_index_secret_key', None))
+
+    def __get_content(self, db_record_data: InsertVectorDbRecordData) -> str:
+        if db_record_data.content is not None:
+            return db_record_data.content
+        return self.__fs_handler.read_file(db_record_data.content_file_path, encoding='utf-8')
+
     def __localize_db(self, config_data):
-        """Creates a local version of cloud DB OR updates absolute path for local DB."""
+        """Creates a local version of cloud DB OR updates absolute path for local DB.
+        Cloud DB is downloaded to a folder fixed per DB, and the download is skipped while
+        the index is loaded in `FaissIndexRegistry` i.e. until it's invalidated or evicted."""
         _config_data = config_data.copy()
         storage_uri = self.__fs_handler.get_storage_root_uri()
         db_folder_path = _config_data['db_folder_path']
         # Download to local if storage is cloud file system
         if self.__fs_handler.get_scheme() != infy_fs_utils.interface.IFileSystemHandler.SCHEME_TYPE_FILE:
-            local_container_folder_path = f'{self.__app_config["CONTAINER"]["APP_DIR_TEMP_PATH"]}/{FileUtil.get_uuid()}'
-            FileUtil.create_dirs_if_absent(local_container_folder_path)
+            db_hash = hashlib.sha256(
+                f'{storage_uri}/{db_folder_path}'.encode('utf-8')).hexdigest()[:16]
+            local_db_folder_path = f'{self.__app_config["CONTAINER"]["APP_DIR_TEMP_PATH"]}/faiss_db/{db_hash}/' + \
+                os.path.basename(db_folder_path)
+            _config_data['local_db_folder_path'] = local_db_folder_path
+            if FaissIndexRegistry().contains(local_db_folder_path, _config_data['db_index_name']):
+                self.__logger.debug("Using loaded copy of %s at %s",
+                                    db_folder_path, local_db_folder_path)
+                return _config_data
             if self.__fs_handler.exists(db_folder_path):
+                FileUtil.create_dirs_if_absent(local_db_folder_path)
+                # Download to a new folder then move files, so that a concurrent download
+                # doesn't leave partly written files in the shared folder
+                local_container_folder_path = f'{self.__app_config["CONTAINER"]["APP_DIR_TEMP_PATH"]}/{FileUtil.get_uuid()}'
+                FileUtil.create_dirs_if_absent(local_container_folder_path)
                 self.__fs_handler.get_folder(
                     db_folder_path, local_container_folder_path)
-            local_db_folder_path = local_container_folder_path + '/' + \
-                os.path.basename(db_folder_path)
-            _config_data['local_db_folder_path'] = local_db_folder_path
-            self.__logger.debug("Downloaded %s to %s",
-                                db_folder_path, local_db_folder_path)
+                downloaded_folder_path = local_container_folder_path + '/' + \
+                    os.path.basename(db_folder_path)
+                for file_name in os.listdir(downloaded_folder_path):
+                    os.replace(f'{downloaded_folder_path}/{file_name}',
+                               f'{local_db_folder_path}/{file_name}')
+                shutil.rmtree(local_container_folder_path, ignore_errors=True)
+                self.__logger.debug("Downloaded %s to %s",
+                                    db_folder_path, local_db_folder_path)
+            else:  # Remove copy left from earlier download of a deleted DB
+                shutil.rmtree(local_db_folder_path, ignore_errors=True)
         else:  # Skip download, just update path if storage is local file system
             _config_data['local_db_folder_path'] = storage_uri.replace(
                 self.__fs_handler.get_scheme() + '://', '') + db_folder_path
@@ -7,6 +7,7 @@
 """Module for Online vector DB provider"""
 
 import logging
+from typing import List
 import requests
 import infy_fs_utils
 from ....schema.vector_db_data import OnlineVectorDbConfigData, BaseVectorDbRecordData, BaseVectorDbQueryParamsData
@@ -110,6 +111,36 @@ class OnlineVectorDbProvider(IOnlineVectorDbProvider):
             self.__logger.exception(e)
             raise e
 
+    def save_records(self, db_record_data_list: List[InsertVectorDbRecordData]):
+        """Save records in one request"""
+        if not db_record_data_list:
+            return None
+        try:
+            db_service_url = self.__config_data.get(
+                'db_service_url', '').rstrip('/') + '/api/v1/db/vectordb/saverecords'
+            model_name = self.__config_data.get('model_name', '')
+            index_id = self.__config_data.get('index_id', '')
+            collection_name = self.__config_data.get('collection_name', '')
+            collection_secret_key = self.__config_data.get(
+                'collection_secret_key', '')
+            record_data_list = [x.dict() for x in db_record_data_list]
+
+            query_dict = {'model_name': model_name, 'index_id': index_id, 'collection_name': collection_name,
+                          'collection_secret_key': collection_secret_key, 'record_data_list': record_data_list}
+
+            response = requests.post(
+                db_service_url, json=query_dict, timeout=120 + 5 * len(record_data_list))
+            if response.status_code != 200:
+                raise Exception("Failed to connect to endpoint")
+            response_json = response.json()
+            if response_json.get('responseCde') != 200:
+                raise Exception(
+                    f"Failed to save records: {response_json.get('responseMsg')}")
+            return response_json.get('response').get("encoded_path_list")
+        except Exception as e:
+            self.__logger.exception(e)
+            raise e
+
     def get_records(self):
         try:
             db_service_url = self.__config_data.get(
@@ -0,0 +1,102 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+""" Test BM25S index registry. Uses a minimal stopwords list so that NLTK data isn't required."""
+import os
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import infy_fs_utils
+from infy_gen_ai_sdk.sparsedb.provider.bm25s.bm25s_service import Bm25sService
+from infy_gen_ai_sdk.sparsedb.provider.bm25s.bm25s_index_registry import Bm25sIndexRegistry
+
+
+# Create inside temp folder for the purpose of unit testing
+CONTAINER_ROOT_PATH = f"C:/temp/unittest/infy_gen_ai_sdk/{__name__}/CONTAINER"
+NLTK_DATA_DIR = f"{CONTAINER_ROOT_PATH}/nltk_data"
+LOCAL_DB_FOLDER_PATH = f"{CONTAINER_ROOT_PATH}/my_db"
+
+
+@pytest.fixture(scope='module', autouse=True)
+def pre_test(create_root_folders):
+    """Initialization method"""
+    create_root_folders([CONTAINER_ROOT_PATH])
+    os.makedirs(f"{NLTK_DATA_DIR}/corpora/stopwords", exist_ok=True)
+    with open(f"{NLTK_DATA_DIR}/corpora/stopwords/english", 'w', encoding='utf-8') as file:
+        file.write('\n'.join(['the', 'a', 'is', 'of', 'and']))
+
+
+def _get_service(index_name: str, secret_key: str = '') -> Bm25sService:
+    storage_config_data = infy_fs_utils.data.StorageConfigData(
+        **{"storage_root_uri": f"file://{CONTAINER_ROOT_PATH}", "storage_server_url": "",
+           "storage_access_key": "", "storage_secret_key": ""})
+    fs_handler = infy_fs_utils.provider.FileSystemHandler(storage_config_data)
+    return Bm25sService(fs_handler, '/my_db', LOCAL_DB_FOLDER_PATH, index_name, secret_key)
+
+
+def _add_texts(index_name: str, texts: list, secret_key: str = ''):
+    bm25s_service_obj = _get_service(index_name, secret_key)
+    corpus = [{'text': x, 'metadata': {}} for x in texts]
+    if os.path.exists(f"{LOCAL_DB_FOLDER_PATH}/{index_name}/corpus.jsonl"):
+        retriever = bm25s_service_obj.load_local()
+        retriever = bm25s_service_obj.add_record(retriever, NLTK_DATA_DIR, texts, corpus)
+    else:
+        retriever = bm25s_service_obj.create_new(NLTK_DATA_DIR, texts, corpus)
+    bm25s_service_obj.save_local(retriever)
+
+
+def test_registry_reuse_and_reload():
+    """Test method"""
+    registry = Bm25sIndexRegistry()
+    registry.clear()
+    _add_texts("fruits", ["apple is red", "banana is yellow"])
+    stats_before = registry.get_stats()
+
+    retriever = registry.get(LOCAL_DB_FOLDER_PATH, "fruits")
+    assert registry.get(LOCAL_DB_FOLDER_PATH, "fruits") is retriever
+    stats = registry.get_stats()
+    assert stats['loads'] - stats_before['loads'] == 1
+    assert stats['hits'] - stats_before['hits'] == 1
+
+    # k is limited to number of records
+    docs, scores = _get_service("fruits").search_records(retriever, NLTK_DATA_DIR, "banana", 4, 16)
+    assert len(docs[0]) == 2
+    assert docs[0][0]['text'] == "banana is yellow"
+    assert scores[0][0] > scores[0][1]
+    # Query having only stop words or unknown words
+    docs, _ = _get_service("fruits").search_records(retriever, NLTK_DATA_DIR, "the is", 1, 1)
+    assert len(docs[0]) == 1
+
+    # Change on disk is picked up
+    _add_texts("fruits", ["cherry is red"])
+    retriever = registry.get(LOCAL_DB_FOLDER_PATH, "fruits")
+    assert retriever.scores['num_docs'] == 3
+    assert [x['content'] for x in _get_service("fruits").get_records(retriever)] == [
+        "apple is red", "banana is yellow", "cherry is red"]
+
+
+def test_registry_concurrent_queries_and_secret_key():
+    """Test method"""
+    registry = Bm25sIndexRegistry()
+    registry.clear()
+    texts = [f"document {x} about topic{x % 10}" for x in range(200)]
+    _add_texts("topics", texts, secret_key="abc")
+    bm25s_service_obj = _get_service("topics", "abc")
+    stats_before = registry.get_stats()
+
+    def _search(idx):
+        retriever = registry.get(LOCAL_DB_FOLDER_PATH, "topics", "abc")
+        docs, _ = bm25s_service_obj.search_records(retriever, NLTK_DATA_DIR, f"topic{idx % 10}", 5, 5)
+        return all(x['text'].endswith(f"topic{idx % 10}") for x in docs[0])
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert all(executor.map(_search, range(100)))
+    stats = registry.get_stats()
+    assert stats['loads'] - stats_before['loads'] == 1
+    # Load locks are not kept after loading
+    assert stats['load_locks'] == 0
+    # Secret key is checked even when index is already loaded
+    with pytest.raises(ValueError):
+        registry.get(LOCAL_DB_FOLDER_PATH, "topics", "xyz")
@@ -0,0 +1,94 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+""" Test BM25S wrapper service. Uses a minimal stopwords list so that NLTK data isn't required."""
+import os
+import random
+import pytest
+import bm25s
+import infy_fs_utils
+from infy_gen_ai_sdk.sparsedb.provider.bm25s.bm25s_service import Bm25sService
+
+
+# Create inside temp folder for the purpose of unit testing
+CONTAINER_ROOT_PATH = f"C:/temp/unittest/infy_gen_ai_sdk/{__name__}/CONTAINER"
+NLTK_DATA_DIR = f"{CONTAINER_ROOT_PATH}/nltk_data"
+STOP_WORDS = ['the', 'a', 'is', 'of', 'and']
+
+
+@pytest.fixture(scope='module', autouse=True)
+def pre_test(create_root_folders):
+    """Initialization method"""
+    create_root_folders([CONTAINER_ROOT_PATH])
+    os.makedirs(f"{NLTK_DATA_DIR}/corpora/stopwords", exist_ok=True)
+    with open(f"{NLTK_DATA_DIR}/corpora/stopwords/english", 'w', encoding='utf-8') as file:
+        file.write('\n'.join(STOP_WORDS))
+
+
+def _get_service(index_name: str) -> Bm25sService:
+    storage_config_data = infy_fs_utils.data.StorageConfigData(
+        **{"storage_root_uri": f"file://{CONTAINER_ROOT_PATH}", "storage_server_url": "",
+           "storage_access_key": "", "storage_secret_key": ""})
+    fs_handler = infy_fs_utils.provider.FileSystemHandler(storage_config_data)
+    return Bm25sService(fs_handler, '/my_db', f"{CONTAINER_ROOT_PATH}/my_db", index_name)
+
+
+def _get_corpus(count: int):
+    rng = random.Random(0)
+    words = [f"w{x}" for x in range(200)] + STOP_WORDS
+    texts = [" ".join(rng.choices(words, k=rng.randint(1, 30))) for _ in range(count)]
+    return texts, [{'text': x, 'metadata': {'n': idx}} for idx, x in enumerate(texts)]
+
+
+def _search(bm25s_service_obj: Bm25sService, retriever, query: str):
+    docs, scores = bm25s_service_obj.search_records(retriever, NLTK_DATA_DIR, query, 10, 10)
+    return [x['metadata']['n'] for x in docs[0]], scores[0]
+
+
+def test_add_record_matches_full_index():
+    """Test method"""
+    texts, corpus = _get_corpus(300)
+    bm25s_service_obj = _get_service("incremental")
+    retriever = bm25s_service_obj.create_new(NLTK_DATA_DIR, texts[:100], corpus[:100])
+    bm25s_service_obj.save_local(retriever)
+    for start, end in [(100, 101), (101, 300)]:
+        bm25s_service_obj = _get_service("incremental")
+        retriever = bm25s_service_obj.load_local()
+        retriever = bm25s_service_obj.add_record(retriever, NLTK_DATA_DIR, texts[start:end], corpus[start:end])
+        bm25s_service_obj.save_local(retriever)
+
+    bm25s_service_obj = _get_service("incremental")
+    retriever = bm25s_service_obj.load_local()
+    assert len(retriever.corpus) == 300
+    expected_retriever = bm25s.BM25(corpus=corpus)
+    expected_retriever.index(bm25s.tokenize(texts, lower=True, stopwords=STOP_WORDS, show_progress=False),
+                             show_progress=False)
+    for query in ["w1 w5 w77", "the w199", "w3"]:
+        doc_ids, scores = _search(bm25s_service_obj, retriever, query)
+        expected_docs, expected_scores = expected_retriever.retrieve(
+            bm25s.tokenize([query], show_progress=False), k=10, show_progress=False)
+        assert doc_ids == [x['metadata']['n'] for x in expected_docs[0]]
+        assert scores == pytest.approx(expected_scores[0], rel=1e-5)
+
+
+def test_add_record_to_db_without_postings():
+    """Test method"""
+    texts, corpus = _get_corpus(20)
+    bm25s_service_obj = _get_service("no_postings")
+    retriever = bm25s_service_obj.create_new(NLTK_DATA_DIR, texts, corpus)
+    bm25s_service_obj.save_local(retriever)
+    # Make it look like a DB saved by earlier version
+    os.remove(f"{CONTAINER_ROOT_PATH}/my_db/no_postings/{Bm25sService.POSTINGS_FILE_NAME}")
+
+    bm25s_service_obj = _get_service("no_postings")
+    retriever = bm25s_service_obj.load_local()
+    retriever = bm25s_service_obj.add_record(retriever, NLTK_DATA_DIR, ["w500 w500"],
+                                             [{'text': "w500 w500", 'metadata': {'n': 20}}])
+    bm25s_service_obj.save_local(retriever)
+    assert os.path.exists(f"{CONTAINER_ROOT_PATH}/my_db/no_postings/{Bm25sService.POSTINGS_FILE_NAME}")
+    retriever = _get_service("no_postings").load_local()
+    assert len(retriever.corpus) == 21
+    assert _search(bm25s_service_obj, retriever, "w500")[0][0] == 20
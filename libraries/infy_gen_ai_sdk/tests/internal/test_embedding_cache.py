@@ -0,0 +1,105 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+""" Test embedding cache using a dummy provider so that no embedding model is required"""
+import hashlib
+import pytest
+import numpy as np
+from infy_gen_ai_sdk.embedding.interface.i_embedding_provider import IEmbeddingProvider
+from infy_gen_ai_sdk.embedding.provider import CachedEmbeddingProvider, CachedEmbeddingProviderConfigData
+from infy_gen_ai_sdk.embedding.provider.cache.embedding_cache_store import EmbeddingCacheStore
+from infy_gen_ai_sdk.schema.embedding_data import EmbeddingData
+
+
+# Create inside temp folder for the purpose of unit testing
+CONTAINER_ROOT_PATH = f"C:/temp/unittest/infy_gen_ai_sdk/{__name__}/CONTAINER"
+VECTOR_DIMENSION = 8
+
+
+@pytest.fixture(scope='module', autouse=True)
+def pre_test(create_root_folders):
+    """Initialization method"""
+    create_root_folders([CONTAINER_ROOT_PATH])
+
+
+class _DummyEmbeddingProvider(IEmbeddingProvider):
+    """Embedding is derived from text hash. Texts sent are recorded."""
+
+    def __init__(self):
+        self.model_name = 'dummy'
+        self.texts_sent = []
+
+    def generate_embedding(self, text: str) -> EmbeddingData:
+        self.texts_sent.append(text)
+        seed = int(hashlib.md5(text.encode('utf-8')).hexdigest()[:8], 16)
+        vector = np.random.default_rng(seed).random(
+            (1, VECTOR_DIMENSION), dtype=np.float32)
+        return EmbeddingData(vector=vector, vector_dimension=VECTOR_DIMENSION, model_name=self.model_name)
+
+
+def _get_provider(cache_file_name: str, **kwargs):
+    embedding_provider = _DummyEmbeddingProvider()
+    config_data = CachedEmbeddingProviderConfigData(
+        cache_file_path=f"{CONTAINER_ROOT_PATH}/{cache_file_name}", **kwargs)
+    return embedding_provider, CachedEmbeddingProvider(embedding_provider, config_data)
+
+
+def test_cache_hit_and_miss():
+    """Test method"""
+    embedding_provider, cached_provider = _get_provider("hit_miss.db")
+    texts = ["apple", "banana", "apple", "cherry"]
+    vectors = cached_provider.generate_embeddings(texts, batch_size=2)
+    assert vectors.shape == (4, VECTOR_DIMENSION)
+    assert embedding_provider.texts_sent == ["apple", "banana", "cherry"]
+    assert np.array_equal(vectors[0], vectors[2])
+    assert np.array_equal(vectors[1], embedding_provider.generate_embedding("banana").vector[0])
+
+    # New instance having same cache file reuses embeddings
+    embedding_provider, cached_provider = _get_provider("hit_miss.db")
+    assert np.array_equal(cached_provider.generate_embeddings(["cherry", "apple"]), vectors[[3, 0]])
+    assert cached_provider.generate_embeddings([]).shape == (0, 0)
+    assert not embedding_provider.texts_sent
+
+    # Model name reported by wrapped provider is cached with vector of a single text, so that
+    # new instances (e.g. one per query) reuse it. Vectors of batches don't have it.
+    embedding_data = cached_provider.generate_embedding("banana")
+    assert np.array_equal(embedding_data.vector, vectors[1:2])
+    assert embedding_provider.texts_sent == ["banana"]
+    for _ in range(3):
+        embedding_provider, cached_provider = _get_provider("hit_miss.db")
+        embedding_data = cached_provider.generate_embedding("banana")
+        assert np.array_equal(embedding_data.vector, vectors[1:2])
+        assert embedding_data.model_name == 'dummy'
+        assert not embedding_provider.texts_sent
+
+    # Different model doesn't reuse embeddings
+    embedding_provider, cached_provider = _get_provider("hit_miss.db", model_name='other')
+    cached_provider.generate_embeddings(["cherry"])
+    assert embedding_provider.texts_sent == ["cherry"]
+    stats = cached_provider.get_stats()
+    assert stats['memory_hits'] == 6
+    assert stats['misses'] == 4
+
+
+def test_cache_persisted_and_evicted():
+    """Test method"""
+    file_path = f"{CONTAINER_ROOT_PATH}/evict.db"
+    # Each vector is 32 bytes, so about 30 fit
+    store = EmbeddingCacheStore(file_path, max_memory_entries=5, max_size_mb=1024 / (1024 * 1024))
+    keys = [('dummy', 'm1', str(x)) for x in range(40)]
+    for key in keys:
+        store.put_many({key: np.full(VECTOR_DIMENSION, float(key[2]), dtype=np.float32)})
+    stats = store.get_stats()
+    assert stats['memory_entries'] == 5
+    assert stats['size_bytes'] <= 1024
+    assert stats['disk_evictions'] > 0
+
+    # Read from file by a new store
+    store = EmbeddingCacheStore(file_path, max_memory_entries=5, max_size_mb=1)
+    vector_dict = store.get_many(keys)
+    assert keys[0] not in vector_dict
+    assert np.array_equal(vector_dict[keys[-1]], np.full(VECTOR_DIMENSION, 39.0, dtype=np.float32))
+    assert store.get_stats()['disk_hits'] == len(vector_dict)
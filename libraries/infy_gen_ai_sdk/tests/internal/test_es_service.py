@@ -0,0 +1,119 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+""" Test elasticsearch service using an in-memory node so that no elasticsearch server is required"""
+import json
+import pytest
+import numpy as np
+from elasticsearch import Elasticsearch
+from elastic_transport import ApiResponseMeta, BaseNode, HttpHeaders
+from elastic_transport._node import NodeApiResponse
+from infy_gen_ai_sdk.vectordb.provider.elasticsearch.es_service import ElasticSearchService
+
+VECTOR_DIMENSION = 4
+
+
+class _InMemoryNode(BaseNode):
+    """Serves the requests used by ElasticSearchService. Requests received are recorded."""
+    requests = []
+    index_dict = {}
+
+    def perform_request(self, method, target, body=None, headers=None, request_timeout=None):
+        path = target.split('?')[0].strip('/')
+        text = body.decode('utf-8') if body else ''
+        _InMemoryNode.requests.append((method, path, text))
+        status, response = self.__handle(method, path.split('/'), text)
+        meta = ApiResponseMeta(status=status, http_version='1.1', duration=0.0, node=self.config,
+                               headers=HttpHeaders({'content-type': 'application/json',
+                                                    'x-elastic-product': 'Elasticsearch'}))
+        return NodeApiResponse(meta, json.dumps(response).encode('utf-8'))
+
+    def __handle(self, method, parts, text):
+        index_dict = _InMemoryNode.index_dict
+        if parts[0] == '_bulk':
+            lines = [json.loads(x) for x in text.splitlines() if x]
+            items = []
+            for action, source in zip(lines[::2], lines[1::2]):
+                if action['index']['_index'] not in index_dict:
+                    # As with action.auto_create_index disabled
+                    items.append({'index': {'status': 404, 'error': {
+                        'type': 'index_not_found_exception'}}})
+                    continue
+                docs = index_dict[action['index']['_index']]['docs']
+                docs.append(source)
+                items.append({'index': {'_id': str(len(docs)), 'status': 201}})
+            return 200, {'errors': any('error' in x['index'] for x in items), 'took': 1, 'items': items}
+        if parts[0] not in index_dict and not (method == 'PUT' and len(parts) == 1):
+            return 404, {'error': {'type': 'index_not_found_exception'}, 'status': 404}
+        if method == 'PUT':
+            index_dict[parts[0]] = {'mappings': json.loads(text)['mappings'], 'docs': []}
+            return 200, {'acknowledged': True}
+        if method == 'DELETE':
+            del index_dict[parts[0]]
+            return 200, {'acknowledged': True}
+        if parts[1] == '_mapping':
+            return 200, {parts[0]: {'mappings': index_dict[parts[0]]['mappings']}}
+        query = json.loads(text)
+        hits = []
+        for doc_id, doc in enumerate(index_dict[parts[0]]['docs']):
+            distance = float(np.linalg.norm(
+                np.array(doc['embedding']) - np.array(query['knn']['query_vector'])))
+            hits.append({'_id': str(doc_id + 1), '_score': 1 / (1 + distance ** 2), '_source': doc})
+        hits = sorted(hits, key=lambda x: x['_score'], reverse=True)[:query['size']]
+        return 200, {'hits': {'total': {'value': len(hits)}, 'hits': hits}}
+
+
+def _get_service(es_client: Elasticsearch) -> ElasticSearchService:
+    return ElasticSearchService(index_id='my_index', es_client=es_client)
+
+
+def test_bulk_add_and_knn_search():
+    """Test method"""
+    _InMemoryNode.requests.clear()
+    es_client = Elasticsearch('http://localhost:9200', node_class=_InMemoryNode)
+    es_service_obj = _get_service(es_client)
+    assert not es_service_obj.check_index_exists()
+    es_service_obj.create_new_index(VECTOR_DIMENSION, {'m': 32})
+    mappings = _InMemoryNode.index_dict['idx-del-my_index']['mappings']
+    assert mappings['properties']['embedding']['index_options']['m'] == 32
+
+    vectors = np.eye(VECTOR_DIMENSION).tolist() * 3
+    records = ((vector, f"content {x}", {'tag': f"t{x % 2}"}) for x, vector in enumerate(vectors))
+    id_list = es_service_obj.add_records('my_model', records, chunk_size=5)
+    assert id_list == [str(x) for x in range(1, 13)]
+    assert [x[1] for x in _InMemoryNode.requests].count('_bulk') == 3
+    assert es_service_obj.get_record_path('12') == '/idx-del-my_index/_doc/12'
+
+    # Index details are read only once by any service for the same client
+    es_service_obj = _get_service(es_client)
+    assert es_service_obj.check_index_exists()
+    hits = es_service_obj.get_matches('my_model', [1.0, 0, 0, 0], {'tag': 't0'}, 4, 20)
+    query = json.loads(_InMemoryNode.requests[-1][2])
+    assert query['knn']['num_candidates'] == 20
+    assert {'term': {'metadata.tag': 't0'}} in query['knn']['filter']
+    assert [x[1] for x in _InMemoryNode.requests].count('idx-del-my_index/_mapping') == 1
+    # Score is distance, 3 records have the same vector as query
+    assert [x['_score'] for x in hits] == pytest.approx([0, 0, 0, np.sqrt(2)])
+
+    es_service_obj.delete_index()
+    assert not es_service_obj.check_index_exists()
+
+
+def test_bulk_add_after_index_deleted():
+    """Test method"""
+    es_client = Elasticsearch('http://localhost:9200', node_class=_InMemoryNode)
+    es_service_obj = _get_service(es_client)
+    es_service_obj.create_new_index(VECTOR_DIMENSION, {'m': 16})
+    assert es_service_obj.check_index_exists()
+    # Deleted by another process, so cached details are stale
+    del _InMemoryNode.index_dict['idx-del-my_index']
+
+    records = [(vector, f"content {x}", {}) for x, vector in enumerate(np.eye(VECTOR_DIMENSION).tolist())]
+    id_list = es_service_obj.add_records('my_model', iter(records), index_params={'m': 16})
+    assert id_list == [str(x) for x in range(1, 5)]
+    mappings = _InMemoryNode.index_dict['idx-del-my_index']['mappings']
+    assert mappings['properties']['embedding']['index_options']['m'] == 16
+    es_service_obj.delete_index()
@@ -0,0 +1,100 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+""" Test FAISS index registry using random vectors so that no embedding model is required"""
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import numpy as np
+from infy_gen_ai_sdk.vectordb.provider.faiss.faiss_service import FaissService
+from infy_gen_ai_sdk.vectordb.provider.faiss.faiss_index_registry import FaissIndexRegistry
+
+
+# Create inside temp folder for the purpose of unit testing
+CONTAINER_ROOT_PATH = f"C:/temp/unittest/infy_gen_ai_sdk/{__name__}/CONTAINER"
+VECTOR_DB_PATH = f"{CONTAINER_ROOT_PATH}/my_db"
+VECTOR_DIMENSION = 8
+
+
+@pytest.fixture(scope='module', autouse=True)
+def pre_test(create_root_folders):
+    """Initialization method"""
+    create_root_folders([CONTAINER_ROOT_PATH])
+
+
+def _create_db(db_name: str, count: int, secret_key: str = None):
+    faiss_service_obj = FaissService(VECTOR_DB_PATH, db_name, secret_key)
+    faiss_service_obj.create_new(VECTOR_DIMENSION)
+    faiss_service_obj.add_records(np.random.rand(count, VECTOR_DIMENSION).astype(np.float32),
+                                  [f"content {x}" for x in range(count)], [{} for _ in range(count)])
+    faiss_service_obj.save_local()
+
+
+def test_registry_reuse_and_reload():
+    """Test method"""
+    registry = FaissIndexRegistry()
+    registry.clear()
+    _create_db("thoughts", 5)
+    stats_before = registry.get_stats()
+
+    faiss_service_obj = registry.get(VECTOR_DB_PATH, "thoughts")
+    assert faiss_service_obj.get_record_count() == 5
+    # Same object is returned while files are unchanged
+    assert registry.get(VECTOR_DB_PATH, "thoughts") is faiss_service_obj
+    stats = registry.get_stats()
+    assert stats['loads'] - stats_before['loads'] == 1
+    assert stats['hits'] - stats_before['hits'] == 1
+
+    # Change on disk is picked up
+    _create_db("thoughts", 7)
+    assert registry.get(VECTOR_DB_PATH, "thoughts").get_record_count() == 7
+    assert registry.get_stats()['loads'] - stats_before['loads'] == 2
+
+
+def test_registry_eviction_and_secret_key():
+    """Test method"""
+    registry = FaissIndexRegistry()
+    registry.clear()
+    _create_db("db_1", 3)
+    _create_db("db_2", 3, secret_key="abc")
+    registry.configure(max_entries=1)
+    try:
+        registry.get(VECTOR_DB_PATH, "db_1")
+        registry.get(VECTOR_DB_PATH, "db_2", "abc")
+        assert registry.get_stats()['entries'] == 1
+        # Secret key is checked even when index is already loaded
+        with pytest.raises(ValueError):
+            registry.get(VECTOR_DB_PATH, "db_2", "xyz")
+    finally:
+        registry.configure(max_entries=16)
+        registry.clear()
+
+
+def test_registry_load_locks():
+    """Test method"""
+    registry = FaissIndexRegistry()
+    registry.clear()
+    db_name_list = [f"db_lock_{x}" for x in range(4)]
+    for db_name in db_name_list:
+        _create_db(db_name, 3)
+    registry.configure(max_entries=2)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            counts = list(executor.map(
+                lambda x: registry.get(VECTOR_DB_PATH, db_name_list[x % 4]).get_record_count(), range(40)))
+        assert counts == [3] * 40
+        stats = registry.get_stats()
+        assert stats['entries'] == 2
+        # Locks of evicted indexes are not kept
+        assert stats['load_locks'] == 0
+
+        registry.get(VECTOR_DB_PATH, "db_lock_0")
+        assert registry.contains(VECTOR_DB_PATH, "db_lock_0")
+        registry.invalidate(VECTOR_DB_PATH, "db_lock_0")
+        assert not registry.contains(VECTOR_DB_PATH, "db_lock_0")
+        assert registry.get_stats()['load_locks'] == 0
+    finally:
+        registry.configure(max_entries=16)
+        registry.clear()
@@ -0,0 +1,172 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+""" Test FAISS record store using random vectors so that no embedding model is required"""
+import os
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import numpy as np
+import faiss
+from infy_gen_ai_sdk.vectordb.provider.faiss.faiss_service import FaissService
+
+
+# Create inside temp folder for the purpose of unit testing
+CONTAINER_ROOT_PATH = f"C:/temp/unittest/infy_gen_ai_sdk/{__name__}/CONTAINER"
+VECTOR_DB_PATH = f"{CONTAINER_ROOT_PATH}/my_db"
+VECTOR_DIMENSION = 8
+
+
+@pytest.fixture(scope='module', autouse=True)
+def pre_test(create_root_folders):
+    """Initialization method"""
+    create_root_folders([CONTAINER_ROOT_PATH])
+
+
+def test_append_and_search():
+    """Test method"""
+    vectors = np.random.rand(6, VECTOR_DIMENSION).astype(np.float32)
+    faiss_service_obj = FaissService(VECTOR_DB_PATH, "thoughts")
+    faiss_service_obj.create_new(VECTOR_DIMENSION)
+    faiss_service_obj.add_records(vectors[:4], [f"content {x}" for x in range(4)],
+                                  [{'custom_metadata': {'tag': f"t{x}"}} for x in range(4)])
+    faiss_service_obj.save_local()
+    assert os.path.exists(f"{VECTOR_DB_PATH}/thoughts.data.db")
+    assert not os.path.exists(f"{VECTOR_DB_PATH}/thoughts.data.json")
+
+    # Append to saved DB
+    faiss_service_obj = FaissService(VECTOR_DB_PATH, "thoughts")
+    faiss_service_obj.load_local()
+    faiss_service_obj.add_records(vectors[4:], ["content 4", "content 5"],
+                                  [{'custom_metadata': {'tag': "t4"}}, {'custom_metadata': {'tag': "t5"}}])
+    faiss_service_obj.save_local()
+
+    faiss_service_obj = FaissService(VECTOR_DB_PATH, "thoughts")
+    faiss_service_obj.load_local()
+    assert [x['content'] for x in faiss_service_obj.get_records()] == [
+        f"content {x}" for x in range(6)]
+    assert faiss_service_obj.get_custom_metadata_schema() == {'tag': ''}
+    records = faiss_service_obj.search_records(vectors[5:6].copy(), 2)
+    assert records[0]['content'] == "content 5"
+    assert len(records) == 2
+    records = faiss_service_obj.search_records(vectors[5:6].copy(), 2,
+                                               {'custom_metadata.tag': ['t1', 't2']})
+    assert sorted(x['content'] for x in records) == ["content 1", "content 2"]
+
+
+def _create_legacy_db(index_name: str, count: int) -> np.ndarray:
+    """Create DB in the JSON format of earlier versions"""
+    vectors = np.random.rand(count, VECTOR_DIMENSION).astype(np.float32)
+    os.makedirs(VECTOR_DB_PATH, exist_ok=True)
+    index = faiss.IndexFlatL2(VECTOR_DIMENSION)
+    faiss.normalize_L2(vectors)
+    index.add(vectors)
+    faiss.write_index(index, f"{VECTOR_DB_PATH}/{index_name}.faiss")
+    data_dict = {f"id-{x}": {'content': f"content {x}", 'metadata': {'n': x}} for x in range(count)}
+    map_dict = {str(x): f"id-{x}" for x in range(count)}
+    with open(f"{VECTOR_DB_PATH}/{index_name}.data.json", 'w', encoding='utf-8') as file:
+        json.dump(data_dict, file)
+    with open(f"{VECTOR_DB_PATH}/{index_name}.map.json", 'w', encoding='utf-8') as file:
+        json.dump(map_dict, file)
+    return vectors
+
+
+def test_migrate_from_json():
+    """Test method"""
+    vectors = _create_legacy_db("legacy", 3)
+
+    faiss_service_obj = FaissService(VECTOR_DB_PATH, "legacy")
+    faiss_service_obj.load_local()
+    # Loading doesn't write any file
+    assert not os.path.exists(f"{VECTOR_DB_PATH}/legacy.data.db")
+    records = faiss_service_obj.get_records()
+    assert [(x['id'], x['content'], x['metadata']) for x in records] == [
+        (f"id-{x}", f"content {x}", {'n': x}) for x in range(3)]
+    records = faiss_service_obj.search_records(vectors[1:2].copy(), 1)
+    assert records[0]['content'] == "content 1"
+
+    # Store file is written on save and JSON files are kept
+    faiss_service_obj.save_local()
+    assert os.path.exists(f"{VECTOR_DB_PATH}/legacy.data.db")
+    assert os.path.exists(f"{VECTOR_DB_PATH}/legacy.data.json")
+    assert os.path.exists(f"{VECTOR_DB_PATH}/legacy.map.json")
+    assert not [x for x in os.listdir(VECTOR_DB_PATH) if x.endswith('.tmp')]
+    faiss_service_obj = FaissService(VECTOR_DB_PATH, "legacy")
+    faiss_service_obj.load_local()
+    assert [x['content'] for x in faiss_service_obj.get_records()] == [
+        f"content {x}" for x in range(3)]
+
+
+def test_migrate_from_json_concurrent_loads():
+    """Test method"""
+    vectors = _create_legacy_db("legacy_concurrent", 50)
+
+    def _load_and_search(idx):
+        faiss_service_obj = FaissService(VECTOR_DB_PATH, "legacy_concurrent")
+        faiss_service_obj.load_local()
+        # Some of the loads save, while others are loading
+        if idx % 4 == 0:
+            faiss_service_obj.save_local()
+        records = faiss_service_obj.search_records(vectors[idx % 50:idx % 50 + 1].copy(), 1)
+        return records[0]['content'] == f"content {idx % 50}"
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert all(executor.map(_load_and_search, range(40)))
+    assert os.path.exists(f"{VECTOR_DB_PATH}/legacy_concurrent.data.db")
+    assert os.path.exists(f"{VECTOR_DB_PATH}/legacy_concurrent.data.json")
+    assert not [x for x in os.listdir(VECTOR_DB_PATH) if x.endswith('.tmp')]
+
+
+@pytest.mark.parametrize('index_type', [FaissService.INDEX_TYPE_FLAT, FaissService.INDEX_TYPE_HNSW,
+                                        FaissService.INDEX_TYPE_IVF_FLAT])
+def test_pre_filter(index_type):
+    """Test method"""
+    count = 2000
+    vectors = np.random.rand(count, VECTOR_DIMENSION).astype(np.float32)
+    faiss_service_obj = FaissService(VECTOR_DB_PATH, f"filter_{index_type}")
+    faiss_service_obj.create_new(VECTOR_DIMENSION, index_type, {'nlist': 4, 'nprobe': 4})
+    faiss_service_obj.train(vectors)
+    faiss_service_obj.add_records(vectors, [str(x) for x in range(count)],
+                                  [{'tenant': f"t{x % 100}", 'page': x % 2,
+                                    'custom_metadata': {'tag': f"a{x % 50} b{x % 7}"}} for x in range(count)])
+    faiss_service_obj.save_local()
+
+    faiss_service_obj = FaissService(VECTOR_DB_PATH, f"filter_{index_type}")
+    faiss_service_obj.load_local()
+    # Only 20 records of tenant t3 are present, small fetch_k is enough
+    records = faiss_service_obj.search_records(vectors[0:1].copy(), 5, {'tenant': 't3'}, fetch_k=5)
+    assert len(records) == 5
+    assert all(x['metadata']['tenant'] == 't3' for x in records)
+    # 1.0 is equal to 1 in Python, so is matched too
+    records = faiss_service_obj.search_records(vectors[0:1].copy(), 5, {'tenant': 't3', 'page': 1.0}, fetch_k=5)
+    assert len(records) == 5
+    assert all(x['metadata']['page'] == 1 for x in records)
+    records = faiss_service_obj.search_records(vectors[0:1].copy(), 4,
+                                               {'custom_metadata.tag': ['a7', 'a8']}, fetch_k=8)
+    assert len(records) == 4
+    assert {x['metadata']['custom_metadata']['tag'].split()[0] for x in records} == {'a7', 'a8'}
+    assert not faiss_service_obj.search_records(vectors[0:1].copy(), 4, {'tenant': 'none'})
+
+
+def test_metadata_index_built_for_earlier_version():
+    """Test method"""
+    vectors = np.random.rand(10, VECTOR_DIMENSION).astype(np.float32)
+    faiss_service_obj = FaissService(VECTOR_DB_PATH, "no_metadata_index")
+    faiss_service_obj.create_new(VECTOR_DIMENSION)
+    faiss_service_obj.add_records(vectors, [str(x) for x in range(10)], [{'n': x} for x in range(10)])
+    faiss_service_obj.save_local()
+    # Make it look like a file written before metadata index was added
+    connection = sqlite3.connect(f"{VECTOR_DB_PATH}/no_metadata_index.data.db")
+    with connection:
+        connection.execute("DELETE FROM metadata_index")
+        connection.execute("PRAGMA user_version = 0")
+    connection.close()
+
+    faiss_service_obj = FaissService(VECTOR_DB_PATH, "no_metadata_index")
+    faiss_service_obj.load_local()
+    records = faiss_service_obj.search_records(vectors[0:1].copy(), 4, {'n': 3}, fetch_k=1)
+    assert [x['content'] for x in records] == ['3']
@@ -0,0 +1,128 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+""" Test hybrid retriever using in-memory providers so that no DB or embedding model is required"""
+import time
+import threading
+import pytest
+from infy_gen_ai_sdk.retriever import HybridRetriever, HybridRetrieverConfigData, HybridQueryParamsData
+from infy_gen_ai_sdk.sparsedb.interface.i_sparse_db_provider import ISparseDbProvider
+from infy_gen_ai_sdk.sparsedb.provider.bm25s import SparseDbMatchesRecordData
+from infy_gen_ai_sdk.vectordb.interface.i_vector_db_provider import IVectorDbProvider
+from infy_gen_ai_sdk.vectordb.provider.faiss import MatchingVectorDbRecordData
+
+# Chunk id -> (BM25 score, L2 distance)
+SCORE_DICT = {'c1': (9.0, 1.6), 'c2': (6.0, 0.4), 'c3': (3.0, None), 'c4': (None, 0.8)}
+DELAY = 0.2
+
+
+class _SparseDbProvider(ISparseDbProvider):
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.thread_names = []
+
+    def get_matches(self, query_params_data):
+        self.thread_names.append(threading.current_thread().name)
+        time.sleep(DELAY)
+        if self.fail:
+            raise ValueError("Collection does not exist.")
+        matches = [SparseDbMatchesRecordData(content=f"content {key}", metadata={'chunk_id': key}, score=score)
+                   for key, (score, _) in SCORE_DICT.items() if score is not None]
+        return sorted(matches, key=lambda x: x.score, reverse=True)[:query_params_data.top_k]
+
+    def save_record(self, sparse_record_config_dict):
+        raise NotImplementedError
+
+    def get_records(self):
+        raise NotImplementedError
+
+    def delete_records(self):
+        raise NotImplementedError
+
+
+class _VectorDbProvider(IVectorDbProvider):
+    def __init__(self):
+        super().__init__("TEST", None)
+        self.batch_sizes = []
+
+    def get_matches(self, query_params_data):
+        matches = [MatchingVectorDbRecordData(content=f"content {key}", metadata={'chunk_id': key}, score=distance)
+                   for key, (_, distance) in SCORE_DICT.items() if distance is not None]
+        return sorted(matches, key=lambda x: x.score)[:query_params_data.top_k]
+
+    def get_matches_batch(self, query_params_data_list):
+        self.batch_sizes.append(len(query_params_data_list))
+        time.sleep(DELAY)
+        return super().get_matches_batch(query_params_data_list)
+
+    def save_record(self, db_record_data):
+        raise NotImplementedError
+
+    def get_records(self, count: int = -1):
+        raise NotImplementedError
+
+    def delete_records(self):
+        raise NotImplementedError
+
+    def get_custom_metadata(self):
+        raise NotImplementedError
+
+
+def _get_ids(result):
+    return [x.metadata['chunk_id'] for x in result.matches]
+
+
+def test_rrf_and_concurrent_search():
+    """Test method"""
+    sparse_db_provider, vector_db_provider = _SparseDbProvider(), _VectorDbProvider()
+    retriever = HybridRetriever(HybridRetrieverConfigData(), sparse_db_provider, vector_db_provider)
+    start_time = time.time()
+    result = retriever.search(HybridQueryParamsData(query="q", top_k=3))
+    # Both searches run at the same time
+    assert time.time() - start_time < 2 * DELAY
+    # c2 is 2nd in sparse and 1st in dense, c1 is 1st and 3rd
+    assert _get_ids(result) == ['c2', 'c1', 'c4']
+    assert result.matches[0].score == pytest.approx(1 / 62 + 1 / 61)
+    assert result.matches[0].methods == ['sparse', 'dense']
+    assert (result.matches[0].sparse_rank, result.matches[0].dense_rank) == (2, 1)
+    assert set(result.timings) == {'sparse_search', 'dense_search', 'fusion', 'total'}
+    assert not result.errors
+
+    # Queries of a batch are searched concurrently, dense search as one batch
+    start_time = time.time()
+    result_list = retriever.search_batch([HybridQueryParamsData(query=f"q{x}", top_k=2) for x in range(4)])
+    assert time.time() - start_time < 2 * DELAY
+    assert [x.query for x in result_list] == ['q0', 'q1', 'q2', 'q3']
+    assert vector_db_provider.batch_sizes == [1, 4]
+    assert all(x.startswith('hybrid_retriever') for x in sparse_db_provider.thread_names)
+    retriever.close()
+
+
+@pytest.mark.parametrize('fusion_method,expected_ids', [('weighted', ['c2', 'c1', 'c4', 'c3']),
+                                                        ('convex', ['c1', 'c2', 'c4', 'c3'])])
+def test_score_fusion(fusion_method, expected_ids):
+    """Test method"""
+    retriever = HybridRetriever(HybridRetrieverConfigData(fusion_method=fusion_method),
+                                _SparseDbProvider(), _VectorDbProvider())
+    result = retriever.search(HybridQueryParamsData(query="q", top_k=4))
+    assert _get_ids(result) == expected_ids
+    if fusion_method == 'weighted':
+        # Sparse (6 - 3) / (9 - 3) + dense (1.6 - 0.4) / (1.6 - 0.4)
+        assert result.matches[0].score == pytest.approx(1.5)
+    else:
+        # 0.5 * (1 - 1.6 / 4) + 0.5 * 9 / 9
+        assert result.matches[0].score == pytest.approx(0.8)
+
+
+def test_search_with_failed_provider():
+    """Test method"""
+    retriever = HybridRetriever(HybridRetrieverConfigData(fetch_k=4), _SparseDbProvider(fail=True),
+                                _VectorDbProvider())
+    result = retriever.search(HybridQueryParamsData(query="q", top_k=2))
+    assert _get_ids(result) == ['c2', 'c4']
+    assert result.errors == {'sparse': "Collection does not exist."}
+    with pytest.raises(ValueError):
+        HybridRetriever(HybridRetrieverConfigData(fusion_method='max'))
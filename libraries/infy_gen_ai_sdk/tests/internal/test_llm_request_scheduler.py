@@ -0,0 +1,96 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+""" Test LLM request scheduler using a dummy request function so that no LLM is required"""
+import time
+import pytest
+from infy_gen_ai_sdk.llm.scheduler import LlmRequestScheduler, LlmRequestSchedulerConfigData, TokenBucket
+
+DELAY = 0.2
+
+
+class _StatusError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"Error code: {status_code}")
+        self.status_code = status_code
+
+
+class _DummyLlm():
+    """Fails the first `failure_count` calls with `status_code`"""
+
+    def __init__(self, failure_count: int = 0, status_code: int = 429):
+        self.failure_count = failure_count
+        self.status_code = status_code
+        self.call_count = 0
+
+    def get_response(self, question: str) -> str:
+        self.call_count += 1
+        if self.call_count <= self.failure_count:
+            raise _StatusError(self.status_code)
+        time.sleep(DELAY)
+        return f"answer {question}"
+
+
+def test_concurrent_requests_in_order():
+    """Test method"""
+    llm = _DummyLlm()
+    scheduler = LlmRequestScheduler(LlmRequestSchedulerConfigData(max_workers=8), 'concurrent')
+    start_time = time.time()
+    answers = scheduler.map(lambda x: scheduler.call(llm.get_response, x), [f"q{x}" for x in range(8)])
+    assert time.time() - start_time < 2 * DELAY
+    assert answers == [f"answer q{x}" for x in range(8)]
+    assert scheduler.get_stats()['requests'] == 8
+    scheduler.close()
+
+
+def test_retry_on_throttling_only():
+    """Test method"""
+    config_data = LlmRequestSchedulerConfigData(max_retries=3, initial_retry_delay=0.01)
+    scheduler = LlmRequestScheduler(config_data, 'retry')
+    llm = _DummyLlm(failure_count=2, status_code=429)
+    assert scheduler.call(llm.get_response, "q") == "answer q"
+    assert scheduler.get_stats()['retries'] == 2
+
+    # Client errors are not retried
+    llm = _DummyLlm(failure_count=1, status_code=400)
+    with pytest.raises(_StatusError):
+        scheduler.call(llm.get_response, "q")
+    assert llm.call_count == 1
+
+    # Retries are limited
+    llm = _DummyLlm(failure_count=10, status_code=503)
+    with pytest.raises(_StatusError):
+        scheduler.call(llm.get_response, "q")
+    assert llm.call_count == 4
+    assert scheduler.get_stats()['failures'] == 2
+    scheduler.close()
+
+
+def test_rate_limits():
+    """Test method"""
+    # 600 per minute is 10 per second, 2 can be sent at once
+    bucket = TokenBucket(600, 2)
+    start_time = time.time()
+    for _ in range(4):
+        bucket.acquire()
+    assert 0.15 < time.time() - start_time < 0.5
+    # Slower rate after backing off
+    bucket.set_rate(300)
+    assert bucket.get_rate() == 300
+    start_time = time.time()
+    bucket.acquire()
+    assert 0.15 < time.time() - start_time < 0.5
+
+    # Requests of scheduler with same key share the limit
+    config_data = LlmRequestSchedulerConfigData(tokens_per_minute=6000, burst_seconds=1)
+    scheduler_1 = LlmRequestScheduler(config_data, 'shared')
+    scheduler_2 = LlmRequestScheduler(config_data, 'shared')
+    start_time = time.time()
+    # Bucket has 100 tokens, request larger than that waits for full bucket
+    scheduler_1.call(str, "a", tokens=150)
+    scheduler_2.call(str, "b", tokens=50)
+    assert 0.8 < time.time() - start_time < 1.5
+    assert scheduler_2.get_stats()['throttle_seconds'] > 0.8
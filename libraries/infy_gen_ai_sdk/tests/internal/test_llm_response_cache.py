@@ -0,0 +1,72 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+""" Test LLM response caches"""
+import time
+import pytest
+from infy_gen_ai_sdk.llm.cache import (MemoryLlmResponseCache, SqliteLlmResponseCache,
+                                       SqliteLlmResponseCacheConfigData)
+
+
+# Create inside temp folder for the purpose of unit testing
+CONTAINER_ROOT_PATH = f"C:/temp/unittest/infy_gen_ai_sdk/{__name__}/CONTAINER"
+
+
+@pytest.fixture(scope='module', autouse=True)
+def pre_test(create_root_folders):
+    """Initialization method"""
+    create_root_folders([CONTAINER_ROOT_PATH])
+
+
+def test_key_and_memory_cache():
+    """Test method"""
+    key = MemoryLlmResponseCache.get_key('gpt-4', {'temperature': 0, 'max_tokens': 100}, "prompt")
+    # Order of params doesn't matter, their values do
+    assert key == MemoryLlmResponseCache.get_key('gpt-4', {'max_tokens': 100, 'temperature': 0}, "prompt")
+    assert key != MemoryLlmResponseCache.get_key('gpt-4', {'temperature': 0.5, 'max_tokens': 100}, "prompt")
+    assert key != MemoryLlmResponseCache.get_key('gpt-35', {'temperature': 0, 'max_tokens': 100}, "prompt")
+
+    cache = MemoryLlmResponseCache(max_entries=2, ttl_seconds=0.2)
+    cache.put('k1', "r1")
+    cache.put('k2', "r2")
+    assert cache.get('k1') == "r1"
+    # k2 is least recently used
+    cache.put('k3', "r3")
+    assert cache.get('k2') is None
+    time.sleep(0.3)
+    assert cache.get('k1') is None
+    assert cache.get_stats() == {'hits': 1, 'misses': 2, 'evictions': 1, 'expirations': 1, 'entries': 1}
+
+
+def test_sqlite_cache_persisted_and_evicted():
+    """Test method"""
+    file_path = f"{CONTAINER_ROOT_PATH}/llm_response_cache.db"
+    config_data = SqliteLlmResponseCacheConfigData(cache_file_path=file_path, max_memory_entries=5,
+                                                   max_size_mb=1000 / (1024 * 1024), ttl_seconds=0)
+    cache = SqliteLlmResponseCache(config_data)
+    cache.clear()
+    # Each response is 100 bytes, so about 10 fit
+    for x in range(20):
+        cache.put(f'k{x}', str(x) * 100 if x < 10 else chr(ord('a') + x - 10) * 100)
+    stats = cache.get_stats()
+    assert stats['size_bytes'] <= 1000
+    assert stats['disk_evictions'] > 0
+    assert stats['memory_entries'] == 5
+
+    # Read from file by a new cache
+    cache = SqliteLlmResponseCache(config_data)
+    assert cache.get('k19') == 'j' * 100
+    assert cache.get('k0') is None
+    assert cache.get('k19') == 'j' * 100
+    stats = cache.get_stats()
+    assert (stats['disk_hits'], stats['memory_hits'], stats['misses']) == (1, 1, 1)
+
+    # Expired responses are not returned
+    cache = SqliteLlmResponseCache(SqliteLlmResponseCacheConfigData(
+        cache_file_path=file_path, ttl_seconds=0.2))
+    assert cache.get('k18') == 'i' * 100
+    time.sleep(0.3)
+    assert cache.get('k17') is None
@@ -0,0 +1,114 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+"""Recall vs latency of approximate FAISS index types against flat (exact) index.
+Uses clustered random vectors so that no embedding model is required."""
+
+import time
+import pytest
+import numpy as np
+from infy_gen_ai_sdk.vectordb.provider.faiss.faiss_service import FaissService
+
+# Create inside temp folder for the purpose of unit testing
+CONTAINER_ROOT_PATH = f"C:/temp/unittest/infy_gen_ai_sdk/{__name__}/CONTAINER"
+VECTOR_DB_PATH = f"{CONTAINER_ROOT_PATH}/my_db"
+VECTOR_DIMENSION = 64
+RECORD_COUNT = 20000
+QUERY_COUNT = 200
+TOP_K = 10
+# index type, index params, list of search params
+BENCHMARK_CONFIG_LIST = [
+    [FaissService.INDEX_TYPE_IVF_FLAT, {'nlist': 128},
+     [{'nprobe': 1}, {'nprobe': 4}, {'nprobe': 16}]],
+    [FaissService.INDEX_TYPE_IVF_PQ, {'nlist': 128, 'pq_m': 16},
+     [{'nprobe': 4}, {'nprobe': 16}]],
+    [FaissService.INDEX_TYPE_HNSW, {'hnsw_m': 32},
+     [{'ef_search': 16}, {'ef_search': 64}]],
+]
+
+
+@pytest.fixture(scope='module', autouse=True)
+def pre_test(create_root_folders):
+    """Initialization method"""
+    create_root_folders([CONTAINER_ROOT_PATH])
+
+
+def _get_vectors():
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(100, VECTOR_DIMENSION))
+    vectors = centers[rng.integers(0, len(centers), RECORD_COUNT)] + \
+        rng.normal(scale=0.3, size=(RECORD_COUNT, VECTOR_DIMENSION))
+    queries = vectors[rng.choice(RECORD_COUNT, QUERY_COUNT, replace=False)] + \
+        rng.normal(scale=0.1, size=(QUERY_COUNT, VECTOR_DIMENSION))
+    return vectors.astype(np.float32), queries.astype(np.float32)
+
+
+def _search(faiss_service_obj: FaissService, queries: np.ndarray, search_params: dict = None):
+    results, start_time = [], time.perf_counter()
+    for query in queries:
+        records = faiss_service_obj.search_records(query.reshape(1, -1).copy(), TOP_K,
+                                                   fetch_k=TOP_K, search_params=search_params)
+        results.append({x['content'] for x in records})
+    latency_ms = (time.perf_counter() - start_time) * 1000 / len(queries)
+    return results, latency_ms
+
+
+def test_recall_vs_latency():
+    """Test method"""
+    vectors, queries = _get_vectors()
+    contents = [str(x) for x in range(RECORD_COUNT)]
+    metadatas = [{} for _ in range(RECORD_COUNT)]
+
+    faiss_service_obj = FaissService(VECTOR_DB_PATH, "flat")
+    faiss_service_obj.create_new(VECTOR_DIMENSION)
+    faiss_service_obj.add_records(vectors, contents, metadatas)
+    expected_results, flat_latency_ms = _search(faiss_service_obj, queries)
+
+    print(f"\n{'index type':<10} {'search params':<20} {'recall@10':>10} {'ms/query':>10}")
+    print(f"{'flat':<10} {'':<20} {1:>10.3f} {flat_latency_ms:>10.3f}")
+    best_recall_dict = {}
+    for index_type, index_params, search_params_list in BENCHMARK_CONFIG_LIST:
+        faiss_service_obj = FaissService(VECTOR_DB_PATH, index_type)
+        faiss_service_obj.create_new(VECTOR_DIMENSION, index_type, index_params)
+        faiss_service_obj.train(vectors, sample_size=10000)
+        faiss_service_obj.add_records(vectors, contents, metadatas)
+        for search_params in search_params_list:
+            results, latency_ms = _search(
+                faiss_service_obj, queries, search_params)
+            recall = np.mean([len(x & y) / TOP_K for x,
+                             y in zip(results, expected_results)])
+            best_recall_dict[index_type] = max(
+                best_recall_dict.get(index_type, 0), recall)
+            print(
+                f"{index_type:<10} {str(search_params):<20} {recall:>10.3f} {latency_ms:>10.3f}")
+
+    assert best_recall_dict[FaissService.INDEX_TYPE_IVF_FLAT] > 0.9
+    assert best_recall_dict[FaissService.INDEX_TYPE_HNSW] > 0.9
+    assert best_recall_dict[FaissService.INDEX_TYPE_IVF_PQ] > 0.5
+
+
+def test_rebuild_flat_to_hnsw():
+    """Test method"""
+    vectors, queries = _get_vectors()
+    faiss_service_obj = FaissService(VECTOR_DB_PATH, "rebuild")
+    faiss_service_obj.create_new(VECTOR_DIMENSION)
+    faiss_service_obj.add_records(vectors[:1000], [str(x) for x in range(1000)],
+                                  [{'n': x} for x in range(1000)])
+    faiss_service_obj.save_local()
+
+    faiss_service_obj = FaissService(VECTOR_DB_PATH, "rebuild")
+    faiss_service_obj.load_local()
+    expected_results, _ = _search(faiss_service_obj, queries[:20])
+    faiss_service_obj.rebuild(FaissService.INDEX_TYPE_HNSW, {'ef_search': 64})
+    faiss_service_obj.save_local()
+
+    faiss_service_obj = FaissService(VECTOR_DB_PATH, "rebuild")
+    faiss_service_obj.load_local()
+    assert faiss_service_obj.get_record_count() == 1000
+    assert faiss_service_obj.get_records(start=5, end=6)[0]['metadata'] == {'n': 5}
+    results, _ = _search(faiss_service_obj, queries[:20])
+    recall = np.mean([len(x & y) / TOP_K for x, y in zip(results, expected_results)])
+    assert recall > 0.9
@@ -0,0 +1,56 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+""" Test SQLite key value store used by caches"""
+import sqlite3
+import pytest
+from infy_gen_ai_sdk.common.sqlite_kv_store import SqliteKvStore
+
+
+# Create inside temp folder for the purpose of unit testing
+CONTAINER_ROOT_PATH = f"C:/temp/unittest/infy_gen_ai_sdk/{__name__}/CONTAINER"
+
+
+@pytest.fixture(scope='module', autouse=True)
+def pre_test(create_root_folders):
+    """Initialization method"""
+    create_root_folders([CONTAINER_ROOT_PATH])
+
+
+def test_tables_and_values():
+    """Test method"""
+    file_path = f"{CONTAINER_ROOT_PATH}/kv_store.db"
+    text_store = SqliteKvStore(file_path, 'texts', max_size_mb=1)
+    bytes_store = SqliteKvStore(file_path, 'blobs', max_size_mb=1)
+    text_store.clear()
+    bytes_store.clear()
+    text_store.put_many({'k1': ("value 1", None), 'k2': ("value 2", "info 2")})
+    bytes_store.put_many({'k1': (b'\x00\x01', None)})
+
+    # Tables in the same file are independent
+    entry_dict = text_store.get_many(['k1', 'k2', 'k3', 'k1'])
+    assert {key: x[:2] for key, x in entry_dict.items()} == {
+        'k1': ("value 1", None), 'k2': ("value 2", "info 2")}
+    assert bytes_store.get_many(['k1', 'k2'])['k1'][:2] == (b'\x00\x01', None)
+    assert text_store.get_stats() == {'disk_evictions': 0, 'size_bytes': 14}
+    assert bytes_store.get_stats() == {'disk_evictions': 0, 'size_bytes': 2}
+
+
+def test_table_of_earlier_version():
+    """Test method"""
+    file_path = f"{CONTAINER_ROOT_PATH}/kv_store_earlier.db"
+    connection = sqlite3.connect(file_path)
+    with connection:
+        connection.execute("DROP TABLE IF EXISTS texts")
+        connection.execute("CREATE TABLE texts (key TEXT PRIMARY KEY, response TEXT NOT NULL)")
+        connection.execute("INSERT INTO texts VALUES ('k1', 'old')")
+    connection.close()
+
+    # Table with other columns is replaced
+    store = SqliteKvStore(file_path, 'texts', max_size_mb=1)
+    assert not store.get_many(['k1'])
+    store.put_many({'k1': ("new", None)})
+    assert store.get_many(['k1'])['k1'][0] == "new"
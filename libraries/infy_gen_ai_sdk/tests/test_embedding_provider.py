@@ -7,6 +7,7 @@
 """Testing module"""
 
 import os
+import numpy as np
 import infy_gen_ai_sdk
 
 
@@ -90,6 +91,26 @@ def test_st_ray():
     assert embedding.error_message in {None, ''}
 
 
+def test_st_ray_batch():
+    """Test method"""
+    # Step 1 - Choose embedding provider
+    embedding_provider_config_data = infy_gen_ai_sdk.embedding.provider.StEmbeddingProviderConfigData(
+        **{
+            "api_url": os.environ['INFY_MODEL_SERVICE_BASE_URL']
+        })
+    embedding_provider = infy_gen_ai_sdk.embedding.provider.StEmbeddingProvider(
+        embedding_provider_config_data)
+
+    # Step 2 - Generate embeddings, 2 texts per call
+    texts = ['This is a test sentence', 'This is another one', 'And the last one']
+    vectors = embedding_provider.generate_embeddings(texts, batch_size=2)
+    assert vectors.shape == (3, 384)
+    assert vectors.dtype == np.float32
+    # Same as embedding of a single text
+    vector = embedding_provider.generate_embedding(texts[2]).vector
+    assert np.allclose(vectors[2], vector[0], atol=1e-5)
+
+
 def test_custom_embedding_1():
     """Test method"""
     # Step 1 - Choose embedding provider
@@ -200,3 +200,38 @@ def test_2():
     vector_db_provider.save_record(db_record_data)
 
     assert os.path.exists(EXPECTED_DATA['VECTOR_DB']['FILE_PATH'])
+
+
+def test_save_records_1():
+    """Test method"""
+    # Step 1 - Choose embedding provider
+    embedding_provider_config_data = infy_gen_ai_sdk.embedding.provider.StEmbeddingProviderConfigData(
+        **{
+            "api_url": os.environ['INFY_MODEL_SERVICE_BASE_URL'],
+        })
+    embedding_provider = infy_gen_ai_sdk.embedding.provider.StEmbeddingProvider(
+        embedding_provider_config_data)
+
+    # Step 2 - Choose vector db provider
+    vector_db_provider_config_data = infy_gen_ai_sdk.vectordb.provider.faiss.VectorDbProviderConfigData(
+        **{
+            'db_folder_path': '/vectordb/st_all-MiniLM-L6-v2/companies_bulk',
+            'db_index_name': 'companies_bulk',
+            "db_index_secret_key": ''
+        })
+    vector_db_provider = infy_gen_ai_sdk.vectordb.provider.faiss.FaissVectorDbProvider(
+        vector_db_provider_config_data, embedding_provider)
+
+    # Step 3 - Add all records to vector db in one go
+    db_record_data_list = [infy_gen_ai_sdk.vectordb.provider.faiss.InsertVectorDbRecordData(
+        **{
+            'content_file_path': f'/data/input/company_{x}.txt',
+            'metadata': {
+                'company': x
+            }
+        }) for x in ['google', 'ibm', 'nvidia']]
+    vector_db_provider.save_records(db_record_data_list, batch_size=2)
+
+    records = vector_db_provider.get_records()
+    assert [x.metadata['company'] for x in records] == ['google', 'ibm', 'nvidia']
+
@@ -36,10 +36,7 @@ class OpenAIFormatCustomEmbeddingProvider(Embeddings):
             })
         embedding_provider = infy_gen_ai_sdk.embedding.provider.OpenAIFormatEmbeddingProvider(
             embedding_provider_config_data)
-        embeddings = [
-            embedding_provider.generate_embedding(text).vector
-            for text in texts
-        ]
+        embeddings = embedding_provider.generate_embeddings(texts).tolist()
         return embeddings
 
     def embed_query(self, text: str) -> List[float]:
@@ -8,7 +8,6 @@ import os
 import re
 import json
 import time
-import uuid
 from typing import List
 from datetime import datetime, timezone
 import fastapi
@@ -85,7 +84,9 @@ class VectordbController(BController):
             "collection_name", '')
         db_index_secret_key = input_data.get(
             "collection_secret_key", '')
-        record_data_dict = input_data.get("record_data_dict", {})
+        record_data_dict = input_data.get("record_data_dict") or {}
+        record_data_list = ([record_data_dict] if record_data_dict else []) + \
+            (input_data.get("record_data_list") or [])
         if not model_name:
             response_data = SaveRecordsResponseData(
                 response={},
@@ -100,7 +101,7 @@ class VectordbController(BController):
                 responseMsg="ERROR: Required configuration data is missing.",
                 timestamp=datetime.now(timezone.utc),
             )
-        elif not record_data_dict:
+        elif not record_data_list:
             response_data = SaveRecordsResponseData(
                 response={},
                 responseCde=ResponseCode.FAILURE,
@@ -160,19 +161,13 @@ class VectordbController(BController):
                 vector_db_provider = infy_gen_ai_sdk.vectordb.provider.faiss.FaissVectorDbProvider(
                     vector_db_provider_config_data, embedding_provider)
 
-                unique_filename = f"{uuid.uuid4()}.txt"
-                temp_path = f"/data/temp/{unique_filename}"
-                file_sys_handler.write_file(
-                    file_path=temp_path, data=record_data_dict.get('content'))
-                # Step 3 - Add record(s) to vector db
-                db_record_data = infy_gen_ai_sdk.vectordb.provider.faiss.InsertVectorDbRecordData(
+                # Step 3 - Add record(s) to vector db in one go
+                db_record_data_list = [infy_gen_ai_sdk.vectordb.provider.faiss.InsertVectorDbRecordData(
                     **{
-                        'content_file_path': temp_path,
-                        'metadata': record_data_dict.get('metadata', {})
-                    })
-                vector_db_provider.save_record(db_record_data)
-                file_sys_handler.delete_file(
-                    file_path=temp_path)
+                        'content': x.get('content'),
+                        'metadata': x.get('metadata', {})
+                    }) for x in record_data_list]
+                vector_db_provider.save_records(db_record_data_list)
 
                 response_data = {
                     'encoded_path_list': server_faiss_write_path,
@@ -248,7 +243,7 @@ class VectordbController(BController):
                             vector_root_path)
                         index_file_list = [
                             item for item in base_file_list if index_id in item]
-                        if len(index_file_list) >= 3:
+                        if len(index_file_list) >= 2:
                             pattern = re.compile(
                                 rf"{index_id}/[^/]+\.metadata\.json$")
                             secret_key_path = ''
@@ -404,7 +399,7 @@ class VectordbController(BController):
                             vector_root_path)
                         index_file_list = [
                             item for item in base_file_list if index_id in item]
-                        if len(index_file_list) >= 3:
+                        if len(index_file_list) >= 2:
                             pattern = re.compile(
                                 rf"{index_id}/[^/]+\.metadata\.json$")
                             secret_key_path = ''
@@ -482,7 +477,9 @@ class VectordbController(BController):
                         'query': query_dict.get('query'),
                         'top_k': query_dict.get('top_k'),
                         'pre_filter_fetch_k': query_dict.get('pre_filter_fetch_k'),
-                        'filter_metadata': query_dict.get('filter_metadata')
+                        'filter_metadata': query_dict.get('filter_metadata'),
+                        'nprobe': query_dict.get('nprobe'),
+                        'ef_search': query_dict.get('ef_search')
                     })
                 records: List[infy_gen_ai_sdk.vectordb.provider.faiss.MatchingVectorDbRecordData] = vector_db_provider.get_matches(
                     query_params_data)
@@ -561,7 +558,7 @@ class VectordbController(BController):
                             vector_root_path)
                         index_file_list = [
                             item for item in base_file_list if index_id in item]
-                        if len(index_file_list) >= 3:
+                        if len(index_file_list) >= 2:
                             pattern = re.compile(
                                 rf"{index_id}/[^/]+\.metadata\.json$")
                             secret_key_path = ''
@@ -713,7 +710,7 @@ class VectordbController(BController):
                             vector_root_path)
                         index_file_list = [
                             item for item in base_file_list if index_id in item]
-                        if len(index_file_list) >= 3:
+                        if len(index_file_list) >= 2:
                             pattern = re.compile(
                                 rf"{index_id}/[^/]+\.metadata\.json$")
                             secret_key_path = ''
@@ -22,7 +22,9 @@ class SaveRecordsRequestData(BaseRequestData):
     index_id: str = ''
     collection_name: str = ''
     collection_secret_key: str = ''
-    record_data_dict: RecordData
+    record_data_dict: Optional[RecordData] = None
+    # Records to be saved in bulk along with `record_data_dict`, if any
+    record_data_list: List[RecordData] = []
 
 
 class SaveRecordsResponseData(BaseResponseData):
@@ -5,12 +5,13 @@
 # ===============================================================================================================#
 
 import sys
+from typing import List
 from common.app_config_manager import AppConfigManager
 from common.ainauto_logger_factory import AinautoLoggerFactory
 from service.st_service import StService
 from schema.embedding_data import EmbeddingData
 from ray import serve
-from fastapi import FastAPI, Body
+from fastapi import FastAPI, Body, HTTPException
 app_fastapi = FastAPI()
 
 app_config = AppConfigManager().get_app_config()
@@ -26,12 +27,20 @@ class EmbeddingGeneratorBaseApp():
                                           model_home_path=self.__model_path)
 
     @app_fastapi.post("/generate")
-    def generate_embedding(self, text: str = Body(..., embed=True)) -> EmbeddingData:
-        embedding_dict = self.__st_service_obj.generate_embedding(text,
-                                                                  self.__model_name)
-        text_embeddings = embedding_dict['embedding']
-        vector = text_embeddings
-        embedding_data = EmbeddingData(vector=[vector],
+    def generate_embedding(self, text: str = Body(None, embed=True),
+                           texts: List[str] = Body(None, embed=True)) -> EmbeddingData:
+        """Embedding of `text`, or of each of `texts` encoded in batches. `vector` has one row per text."""
+        if texts is not None:
+            embedding_dict = self.__st_service_obj.generate_embeddings(texts,
+                                                                       self.__model_name)
+            vector_list = embedding_dict['embedding']
+        else:
+            if text is None:
+                raise HTTPException(status_code=422, detail="Either text or texts is required")
+            embedding_dict = self.__st_service_obj.generate_embedding(text,
+                                                                      self.__model_name)
+            vector_list = [embedding_dict['embedding']]
+        embedding_data = EmbeddingData(vector=vector_list,
                                        vector_dimension=embedding_dict['size'],
                                        error_message=embedding_dict['error_message'],
                                        model_name=embedding_dict['model_name'])
@@ -32,7 +32,14 @@ class StService(metaclass=Singleton):
         result = self.__call_local(text, model_name)
         return result
 
-    def __call_local(self, text: str, model_name: str) -> dict:
+    def generate_embeddings(self, texts: list, model_name, batch_size: int = 32) -> dict:
+        """Generate embeddings for given texts in batches, `embedding` being list of vectors"""
+        result = self.__call_local(texts, model_name, batch_size)
+        if result['embedding']:
+            result['size'] = len(result['embedding'][0])
+        return result
+
+    def __call_local(self, text, model_name: str, batch_size: int = 32) -> dict:
         result = {
             'embedding': [],
             'size': 0,
@@ -43,7 +50,7 @@ class StService(metaclass=Singleton):
         if not model_obj:
             result['error_message'] = f'Model not found: {model_name}'
         else:
-            embedding_as_numpy = model_obj.encode(text)
+            embedding_as_numpy = model_obj.encode(text, batch_size=batch_size)
             embedding_as_list = embedding_as_numpy.astype(float).tolist()
             result['embedding'] = embedding_as_list
             result['size'] = len(embedding_as_list)
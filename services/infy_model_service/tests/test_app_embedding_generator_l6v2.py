@@ -24,6 +24,15 @@ def test_base_app():
     assert len(embedding_data.vector[0]) == 384
 
 
+def test_base_app_batch():
+    """ Test method for testing base app directly with multiple texts"""
+    base_app = EmbeddingGeneratorBaseApp()
+    embedding_data = base_app.generate_embedding(texts=["Hello world!", "Good morning!"])
+    assert embedding_data.vector_dimension == 384
+    assert len(embedding_data.vector) == 2
+    assert len(embedding_data.vector[1]) == 384
+
+
 def test_ray_app():
     """ Test method for testing all-MiniLM-L6-v2 model hosted on ray server"""
     average_time = 0
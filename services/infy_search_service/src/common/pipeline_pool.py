@@ -0,0 +1,97 @@
+# ===============================================================================================================#
+# Copyright 2024 Infosys Ltd.                                                                                    #
+# Use of this source code is governed by Apache License Version 2.0 that can be found in the LICENSE file or at  #
+# http://www.apache.org/licenses/                                                                                #
+# ===============================================================================================================#
+
+import json
+import time
+import hashlib
+import threading
+from typing import List
+import infy_fs_utils
+import infy_dpp_sdk
+from common.singleton import Singleton
+from common.app_config_manager import AppConfigManager
+from common.ainauto_logger_factory import AinautoLoggerFactory
+
+
+class PipelinePool(metaclass=Singleton):
+    """Keeps the QnA pipeline ready for requests: the dpp input config is read and interpolated,
+    and processors are imported and warmed up, once at startup instead of per request.
+    The config file is checked for changes every `config_check_interval_sec` and the pipeline is
+    reloaded when it changes.
+    Each request gets its own copy of the config. Processors are run by the SDK's
+    `OrchestratorNativeInMemory`, which reuses instances of processors that opt in with
+    `_REUSABLE_INSTANCE` across requests and creates the others per request."""
+
+    def __init__(self):
+        app_config = AppConfigManager().get_app_config()
+        self.__logger = AinautoLoggerFactory().get_logger()
+        self.__config_file_path = app_config['STORAGE']["dpp_input_config_file_path"]
+        self.__config_check_interval_sec = app_config.getfloat(
+            'PIPELINE_POOL', 'config_check_interval_sec', fallback=30)
+        self.__lock = threading.Lock()
+        self.__reload_lock = threading.Lock()
+        self.__config_hash = None
+        self.__config_checked_time = 0
+        self.__orchestrator: infy_dpp_sdk.orchestrator.OrchestratorNativeInMemory = None
+        self.__stats = {'reloads': 0}
+        self.__reload_if_changed(force_check=True)
+
+    def get_input_config_data(self) -> dict:
+        """Get a copy of interpolated dpp input config, for the request to change"""
+        self.__reload_if_changed()
+        with self.__lock:
+            return self.__orchestrator.get_input_config_data()
+
+    def run_batch(self, input_config_data: dict,
+                  document_data_list: List[infy_dpp_sdk.data.DocumentData],
+                  context_data_list: List[dict]) -> List[infy_dpp_sdk.data.ProcessorResponseData]:
+        """Run enabled processors of `input_config_data` on in-memory document and context data.
+        As with the orchestrator, an exception of a processor is returned as its response with
+        `SERVER_ERR_UNHANDLED_EXCEPTION`, which stops the pipeline."""
+        return infy_dpp_sdk.orchestrator.OrchestratorNativeInMemory(
+            input_config_data=input_config_data).run_batch(document_data_list, context_data_list)
+
+    def get_stats(self) -> dict:
+        """Get count of reloads"""
+        with self.__lock:
+            return dict(self.__stats)
+
+    # ---------- Private Methods ---------
+    def __reload_if_changed(self, force_check: bool = False):
+        if not force_check and time.time() - self.__config_checked_time < self.__config_check_interval_sec:
+            return
+        # Other requests go on with current pipeline while one of them reloads
+        if not self.__reload_lock.acquire(blocking=force_check):
+            return
+        try:
+            self.__reload(force_check)
+        except Exception as ex:
+            if self.__orchestrator is None:
+                raise
+            # E.g. file being edited, so current pipeline is kept and reload is tried again later
+            self.__logger.error(
+                "Pipeline reload from %s failed, current pipeline is kept. %s", self.__config_file_path, ex)
+        finally:
+            self.__reload_lock.release()
+
+    def __reload(self, force_check: bool):
+        if not force_check and time.time() - self.__config_checked_time < self.__config_check_interval_sec:
+            return
+        file_sys_handler = infy_fs_utils.manager.FileSystemManager().get_fs_handler()
+        config_text = file_sys_handler.read_file(self.__config_file_path)
+        self.__config_checked_time = time.time()
+        config_hash = hashlib.sha256(config_text.encode('utf-8')).hexdigest()
+        if config_hash == self.__config_hash:
+            return
+        # Processors are warmed up outside lock as it takes time
+        orchestrator = infy_dpp_sdk.orchestrator.OrchestratorNativeInMemory(
+            input_config_data=json.loads(config_text))
+        orchestrator.warm_up()
+        with self.__lock:
+            self.__config_hash = config_hash
+            self.__orchestrator = orchestrator
+            self.__stats['reloads'] += 1
+        self.__logger.info("Pipeline loaded from %s", self.__config_file_path)
@@ -7,10 +7,8 @@
 import os
 import json
 import time
-import uuid
 from datetime import datetime, timezone
 import fastapi
-import infy_fs_utils
 import infy_dpp_sdk
 from schema.qna_req_res_data import (
     QnARequestData, QnAResponseData, QueryResponseData)
@@ -18,6 +16,7 @@ from schema.base_req_res_data import (ResponseCode, ResponseMessage)
 from .b_controller import BController
 from common.app_config_manager import AppConfigManager
 from common.ainauto_logger_factory import AinautoLoggerFactory
+from common.pipeline_pool import PipelinePool
 
 
 class QnAController(BController):
@@ -41,7 +40,6 @@ class QnAController(BController):
                      ):
         app_config = AppConfigManager().get_app_config()
         logger = AinautoLoggerFactory().get_logger()
-        file_sys_handler = infy_fs_utils.manager.FileSystemManager().get_fs_handler()
 
         start_time = time.time()
         date = datetime.now(timezone.utc)
@@ -49,7 +47,6 @@ class QnAController(BController):
 
         input_data = QnA_request_data.dict()
         working_file_path_list = ['documents']
-        config_file_path = app_config['STORAGE']["dpp_input_config_file_path"]
 
         index_id = input_data.get("retrieval", {}).get(
             "index_id", '').strip()
@@ -88,8 +85,8 @@ class QnAController(BController):
             document_id_list = [os.path.basename(x)
                                 for x in working_file_path_list]
             answers = []
-            input_config_data = json.loads(file_sys_handler.read_file(
-                config_file_path))
+            # Copy of pipeline config loaded at startup, changed below for this request
+            input_config_data = PipelinePool().get_input_config_data()
             mde_enabled = False
 
             # STEP 1: Set the pipeline to run only retriever or retriever and reader
@@ -222,26 +219,12 @@ class QnAController(BController):
                 document_data.document_id = document_id
                 context_data = {
                 }
-                response_data = infy_dpp_sdk.data.ProcessorResponseData(
-                    document_data=document_data, context_data=context_data)
-                document_data_json = {
-                    'document_data': response_data.document_data.dict(),
-                    'context_data': response_data.context_data
-                }
-
-                # Write the input config data to a temp file
-                unique_filename = f"{uuid.uuid4()}_config.json"
-                temp_path = f"/data/temp/{unique_filename}"
-                file_sys_handler.write_file(
-                    temp_path, json.dumps(input_config_data, indent=4))
 
                 try:
                     # ---------------------Run the inference pipeline  LOGIC STARTS------------------------------ #
 
-                    dpp_orchestrator = infy_dpp_sdk.orchestrator.OrchestratorNativeBasic(
-                        input_config_file_path=temp_path)
-                    response_data_list = dpp_orchestrator.run_batch([infy_dpp_sdk.data.DocumentData(
-                        **document_data_json.get('document_data'))], [document_data_json.get('context_data')])
+                    response_data_list = PipelinePool().run_batch(
+                        input_config_data, [document_data], [context_data])
 
                     # ---------------------Run the inference pipeline  LOGIC ENDS------------------------------ #
 
@@ -347,9 +330,6 @@ class QnAController(BController):
                     response_msg = e
                     response_cde = ResponseCode.SERVER_FAILURE
                     error_msg = response_msg
-                finally:
-                    file_sys_handler.delete_file(
-                        file_path=temp_path)
 
             if len(answers) > 0:
                 try:
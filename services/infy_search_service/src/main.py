@@ -13,6 +13,7 @@ from controller.qna_controller import QnAController
 from controller.test_controller import TestController
 from common.app_config_manager import AppConfigManager
 from common.ainauto_logger_factory import AinautoLoggerFactory
+from common.pipeline_pool import PipelinePool
 
 CONTEXT_ROOT_PATH = "/searchservice/api/v1"
 
@@ -44,6 +45,9 @@ client_config_data = infy_dpp_sdk.ClientConfigData(
     })
 infy_dpp_sdk.ClientConfigManager().load(client_config_data)
 
+# Build QnA pipeline once, so that requests don't pay for its setup
+PipelinePool()
+
 app = fastapi.FastAPI(title='Infosys Search Service',
                       #   dependencies=[Depends(basic_authorize)],
                       openapi_url=f"{CONTEXT_ROOT_PATH}/openapi.json",